@@ -38,6 +38,9 @@ from app.application.dtos.logistics_dto import (
     BarcodeLabelResponse,
     BarcodeGenerateRequestDTO,
     QRCodeScanCreateDTO,
+    QRCodeScanBatchItemDTO,
+    QRCodeScanBatchCreateDTO,
+    QRCodeScanBatchResponse,
     QRCodeScanResponse,
     ScanLookupResponse,
     ShipmentListResponse,
@@ -183,6 +186,9 @@ __all__ = [
     "BarcodeLabelResponse",
     "BarcodeGenerateRequestDTO",
     "QRCodeScanCreateDTO",
+    "QRCodeScanBatchItemDTO",
+    "QRCodeScanBatchCreateDTO",
+    "QRCodeScanBatchResponse",
     "QRCodeScanResponse",
     "ScanLookupResponse",
     "ShipmentListResponse",
@@ -205,6 +205,56 @@ class EmailRenderResponse(BaseModel):
     reply_to_email: Optional[str]
 
 
+class EmailBulkRecipient(BaseModel):
+    """One recipient of a mail-merge; its email is validated per recipient"""
+    to_email: str = Field(..., description="Recipient email")
+    to_name: Optional[str] = Field(None, description="Recipient name")
+    context: Dict[str, Any] = Field(default_factory=dict, description="Recipient context variables")
+
+
+class EmailBulkRenderRequest(BaseModel):
+    """DTO for rendering one email template for many recipients"""
+    template_code: str = Field(..., description="Template code to render")
+    recipients: List[EmailBulkRecipient] = Field(..., min_length=1, max_length=10000)
+    shared_context: Dict[str, Any] = Field(default_factory=dict, description="Variables for every recipient (recipient context wins)")
+    include_branding: bool = Field(default=True, description="Include organization branding")
+
+
+class EmailBulkRenderedEmail(BaseModel):
+    """DTO for one rendered mail-merge email"""
+    index: int
+    to_email: str
+    to_name: Optional[str]
+    subject: str
+    body_html: str
+    body_text: Optional[str]
+
+
+class EmailBulkRecipientError(BaseModel):
+    """DTO for a recipient skipped by a mail-merge"""
+    index: int
+    to_email: str
+    error: str
+
+
+class EmailBulkRenderResponse(BaseModel):
+    """DTO for a rendered mail-merge"""
+    template_code: str
+    from_name: Optional[str]
+    from_email: Optional[str]
+    reply_to_email: Optional[str]
+    rendered: List[EmailBulkRenderedEmail]
+    errors: List[EmailBulkRecipientError]
+
+
+class EmailBulkSendResponse(BaseModel):
+    """DTO for a mail-merge queued for delivery"""
+    template_code: str
+    queued: int
+    message_ids: List[int]
+    errors: List[EmailBulkRecipientError]
+
+
 class EmailSendRequest(BaseModel):
     """DTO for sending email"""
     template_code: str = Field(..., description="Template code")
@@ -2,7 +2,7 @@
 DTOs (Data Transfer Objects) for Lane and Lane Assignment
 Using Pydantic for validation
 """
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from typing import Optional
 from datetime import date, datetime
 from decimal import Decimal
@@ -96,6 +96,10 @@ class LaneAssignmentResponse(BaseModel):
     notes: Optional[str]
     created_at: datetime
     updated_at: Optional[datetime]
+    conflicts: list[dict] = Field(
+        default_factory=list,
+        description="Lane overloads involving this assignment, checked when it is created or updated"
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -117,3 +121,76 @@ class LaneCapacityResponse(BaseModel):
     available_capacity: Decimal
     utilization_rate: Decimal  # Percentage
     assignment_count: int
+
+
+# Lane Capacity Planning DTOs
+class LaneCapacityCalendarLane(BaseModel):
+    """Daily capacity of one lane over a date range"""
+    lane_id: int
+    lane_code: str
+    lane_name: str
+    total_capacity: Decimal
+    days: list[LaneCapacityResponse]
+
+
+class LaneCapacityCalendarResponse(BaseModel):
+    """Response model for the lane capacity calendar of a plant"""
+    plant_id: int
+    start_date: date
+    end_date: date
+    lanes: list[LaneCapacityCalendarLane]
+
+
+class LaneCapacityHeatmapLane(BaseModel):
+    """Heatmap row: utilization per day, aligned with the response dates"""
+    lane_id: int
+    lane_code: str
+    lane_name: str
+    total_capacity: Decimal
+    utilization_rates: list[Decimal]
+    overbooked_days: int
+
+
+class LaneCapacityHeatmapResponse(BaseModel):
+    """Response model for the lane calendar heatmap (lanes x days)"""
+    plant_id: int
+    dates: list[date]
+    lanes: list[LaneCapacityHeatmapLane]
+
+
+class LaneOverbookingResponse(BaseModel):
+    """Consecutive days on which a lane's allocations exceed its capacity"""
+    lane_id: int
+    lane_code: str
+    start_date: date
+    end_date: date
+    total_capacity: Decimal
+    peak_allocated_capacity: Decimal
+    peak_overbooked_capacity: Decimal
+
+
+class LaneSuggestionRequest(BaseModel):
+    """Request model for a best-fit lane suggestion for a new assignment"""
+    plant_id: int = Field(..., gt=0)
+    scheduled_start: date
+    scheduled_end: date
+    allocated_capacity: Decimal = Field(..., gt=0)
+    lane_ids: Optional[list[int]] = Field(None, description="Eligible lanes (default: all active lanes of the plant)")
+
+    @model_validator(mode="after")
+    def validate_dates(self) -> "LaneSuggestionRequest":
+        """Validate the scheduled window"""
+        if self.scheduled_end < self.scheduled_start:
+            raise ValueError("scheduled_end must be on or after scheduled_start")
+        return self
+
+
+class LaneSuggestionResponse(BaseModel):
+    """Lane able to take the assignment on every day of the window"""
+    lane_id: int
+    lane_code: str
+    lane_name: str
+    total_capacity: Decimal
+    min_available_capacity: Decimal
+    remaining_capacity: Decimal  # min available after the assignment; best fit = smallest
+    peak_utilization_rate: Decimal  # Percentage after the assignment
@@ -382,6 +382,25 @@ class QRCodeScanCreateDTO(BaseModel):
     )
 
 
+class QRCodeScanBatchItemDTO(QRCodeScanCreateDTO):
+    """DTO for one scan in an offline queue sync"""
+    scan_timestamp: datetime = Field(description="Time the device captured the scan")
+
+
+class QRCodeScanBatchCreateDTO(BaseModel):
+    """DTO for syncing a handheld device's offline scan queue"""
+    scans: List[QRCodeScanBatchItemDTO] = Field(min_length=1, max_length=1000, description="Scans in capture order")
+
+
+class QRCodeScanBatchResponse(BaseModel):
+    """DTO for batched scan ingestion result"""
+    received: int
+    recorded: int
+    duplicates: int = Field(description="Scans already recorded by an earlier sync")
+    resolved: int
+    not_found: int
+
+
 class QRCodeScanResponse(BaseModel):
     """DTO for QR code scan response"""
     id: int
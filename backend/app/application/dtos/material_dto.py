@@ -4,7 +4,7 @@ Data Transfer Objects (DTOs) for Material API.
 Pydantic v2 schemas for request/response validation.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 import re
 
@@ -105,6 +105,57 @@ class MaterialSearchResult(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class MaterialSearchHit(BaseModel):
+    """DTO for one material on a search results page"""
+    id: int
+    organization_id: int
+    plant_id: int
+    material_number: str
+    material_name: str
+    description: Optional[str] = None
+    material_category_id: int
+    base_uom_id: int
+    procurement_type: str
+    mrp_type: str
+    safety_stock: float
+    reorder_point: float
+    lot_size: float
+    lead_time_days: int
+    is_active: bool
+    score: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MaterialFacetCount(BaseModel):
+    """DTO for the number of matches with one facet value"""
+    value: Union[bool, int, str, None]
+    count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MaterialSearchFacets(BaseModel):
+    """DTO for facet counts of a material search (each ignores its own filter)"""
+    procurement_type: list[MaterialFacetCount] = []
+    mrp_type: list[MaterialFacetCount] = []
+    plant_id: list[MaterialFacetCount] = []
+    material_category_id: list[MaterialFacetCount] = []
+    is_active: list[MaterialFacetCount] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MaterialSearchPageResponse(BaseModel):
+    """DTO for a keyset-paginated material search page"""
+    items: list[MaterialSearchHit]
+    total: Optional[int] = None
+    facets: Optional[MaterialSearchFacets] = None
+    next_cursor: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class ErrorResponse(BaseModel):
     """Generic error response"""
     detail: str
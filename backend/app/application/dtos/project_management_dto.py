@@ -168,6 +168,34 @@ class ProjectMilestoneResponse(BaseModel):
         from_attributes = True
 
 
+class MilestoneScheduleResponse(BaseModel):
+    """DTO for a milestone's critical path (CPM) times"""
+    milestone_id: int
+    milestone_code: str
+    milestone_name: str
+    planned_date: date
+    duration_days: int = Field(..., description="Days of work since its latest dependency (or the project start)")
+    earliest_date: date
+    latest_date: date = Field(..., description="Latest date that does not delay the earliest project finish")
+    total_float_days: int = Field(..., description="Days the milestone can slip without delaying the earliest project finish")
+    planned_end_float_days: int = Field(..., description="Days the milestone can slip before the project misses its planned end; negative when it already does")
+    free_float_days: int = Field(..., description="Days the milestone can slip without delaying a dependent milestone")
+    is_critical: bool
+
+
+class MilestoneScheduleWhatIfDTO(BaseModel):
+    """DTO for re-running the milestone schedule with changed durations"""
+    durations: Dict[int, int] = Field(..., description="New duration in days per milestone ID")
+
+    @field_validator('durations')
+    @classmethod
+    def validate_durations(cls, v):
+        """Ensure durations are not negative"""
+        if any(days < 0 for days in v.values()):
+            raise ValueError('durations must not be negative')
+        return v
+
+
 # ========== RDA Drawing DTOs ==========
 
 class RDADrawingCreateDTO(BaseModel):
@@ -68,9 +68,13 @@ class ReportCreateDTO(BaseModel):
                 "category": "PRODUCTION",
                 "query_definition": {
                     "data_source": "production_logs",
-                    "columns": ["date", "total_quantity", "good_quantity"],
-                    "aggregations": ["sum"],
-                    "group_by": ["date"]
+                    "dimensions": ["plant_id"],
+                    "measures": [
+                        {"column": "quantity_produced", "aggregation": "sum", "alias": "total_quantity"},
+                        {"column": "quantity_scrapped", "aggregation": "sum", "alias": "scrapped_quantity"}
+                    ],
+                    "time_grain": "day",
+                    "time_range": {"start": {"param": "start"}, "end": {"param": "end"}}
                 },
                 "is_public": True
             }
@@ -146,9 +150,9 @@ class ReportExecuteDTO(BaseModel):
         json_schema_extra = {
             "example": {
                 "parameters": {
-                    "date_range": {"start": "2025-11-01", "end": "2025-11-10"},
-                    "plant_id": 1,
-                    "filters": {"material_type": "FINISHED_GOOD"}
+                    "start": "2025-11-01",
+                    "end": "2025-11-11",
+                    "plant_id": 1
                 },
                 "export_format": "PDF"
             }
@@ -172,6 +176,9 @@ class ReportExecutionResponse(BaseModel):
     export_format: Optional[str]
     execution_time_ms: Optional[int]
     rows_processed: Optional[int]
+    progress_percent: int = 0
+    estimated_rows: Optional[int] = None
+    cancel_requested: bool = False
     error_message: Optional[str]
     started_at: datetime
     completed_at: Optional[datetime]
@@ -339,7 +346,12 @@ class KPICalculationRequest(BaseModel):
     """DTO for KPI calculation request"""
     kpi_type: str = Field(..., description="KPI type (OEE, FPY, OTD, etc.)")
     date_range: Dict[str, str] = Field(..., description="Date range for calculation")
-    filters: Optional[Dict[str, Any]] = Field(None, description="Additional filters")
+    filters: Optional[Dict[str, Any]] = Field(
+        None, description="Dimension filters (plant_id, line_id, machine_id, shift_id, product_id)"
+    )
+    breakdown_by: Optional[str] = Field(
+        None, description="Drill-down dimension (plant, line, machine, shift, product)"
+    )
 
     @field_validator('kpi_type')
     @classmethod
@@ -350,12 +362,22 @@ class KPICalculationRequest(BaseModel):
             raise ValueError(f'kpi_type must be one of {valid_kpis}')
         return v
 
+    @field_validator('breakdown_by')
+    @classmethod
+    def validate_breakdown_by(cls, v):
+        """Validate drill-down dimension"""
+        valid_dimensions = ['plant', 'line', 'machine', 'shift', 'product']
+        if v is not None and v not in valid_dimensions:
+            raise ValueError(f'breakdown_by must be one of {valid_dimensions}')
+        return v
+
     class Config:
         json_schema_extra = {
             "example": {
                 "kpi_type": "OEE",
                 "date_range": {"start": "2025-11-01", "end": "2025-11-10"},
-                "filters": {"machine_id": 5, "plant_id": 1}
+                "filters": {"plant_id": 1},
+                "breakdown_by": "machine"
             }
         }
 
@@ -365,8 +387,9 @@ class KPICalculationResponse(BaseModel):
     kpi_type: str
     value: float
     unit: str
+    previous_value: Optional[float] = None  # Value for the previous period of the same length
     trend: Optional[float] = None  # Percentage change from previous period
-    breakdown: Optional[Dict[str, Any]] = None  # Detailed breakdown
+    breakdown: Optional[Dict[str, Any]] = None  # Formula components; "by"/"groups" for drill-down
     calculated_at: datetime
     date_range: Dict[str, str]
 
@@ -376,11 +399,14 @@ class KPICalculationResponse(BaseModel):
                 "kpi_type": "OEE",
                 "value": 85.5,
                 "unit": "%",
+                "previous_value": 83.58,
                 "trend": 2.3,
                 "breakdown": {
                     "availability": 95.2,
                     "performance": 92.1,
-                    "quality": 97.5
+                    "quality": 97.5,
+                    "by": "machine",
+                    "groups": [{"machine_id": 5, "value": 78.4, "previous_value": 80.1, "trend": -2.12}]
                 },
                 "calculated_at": "2025-11-10T10:30:00Z",
                 "date_range": {"start": "2025-11-01", "end": "2025-11-10"}
@@ -364,6 +364,7 @@ class RecallReportRequest(BaseModel):
     severity: str = Field(..., description="Severity level")
     include_customer_details: bool = Field(default=True, description="Include customer contact details")
     include_distribution_chain: bool = Field(default=True, description="Include full distribution chain")
+    max_depth: int = Field(default=10, ge=1, le=20, description="Maximum genealogy levels to trace")
 
     @field_validator('severity')
     @classmethod
@@ -374,6 +375,17 @@ class RecallReportRequest(BaseModel):
         return v
 
 
+class RecallLotDTO(BaseModel):
+    """DTO for a lot reached by the recall genealogy trace"""
+    lot_id: int
+    lot_number: str
+    material_id: int
+    depth: int
+
+    class Config:
+        from_attributes = True
+
+
 class AffectedWorkOrderDTO(BaseModel):
     """DTO for affected work orders in recall report"""
     work_order_id: int
@@ -417,6 +429,8 @@ class DownstreamImpactDTO(BaseModel):
     total_affected_shipments: int
     total_affected_customers: int
     total_quantity_shipped: Decimal
+    total_affected_serials: int = 0
+    total_downstream_lots: int = 0
 
     class Config:
         from_attributes = True
@@ -438,6 +452,21 @@ class RecallReportResponse(BaseModel):
     affected_shipments: List[AffectedShipmentDTO]
     affected_customers: List[AffectedCustomerDTO]
     downstream_impact: DownstreamImpactDTO
+    downstream_lots: List[RecallLotDTO] = Field(default_factory=list)
+    upstream_lots: List[RecallLotDTO] = Field(default_factory=list)
 
     class Config:
         from_attributes = True
+
+
+class RecallReportJobResponse(BaseModel):
+    """DTO for a background recall report job"""
+    job_id: int
+    status: str
+    progress_percent: int
+    stage: Optional[str]
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    report: Optional[RecallReportResponse] = None
@@ -5,16 +5,16 @@ Provides data for admin dashboards and business intelligence.
 Calculates MRR, churn, trial conversion, cohorts, and forecasts.
 """
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_, case, extract
 from decimal import Decimal
 
 from app.models.subscription import SubscriptionModel, InvoiceModel
-from app.models.organization import OrganizationModel
 from app.domain.entities.subscription import SubscriptionStatus, SubscriptionTier, BillingCycle
 from app.config.pricing import PRICING_TIERS
+from app.infrastructure.repositories.platform_metrics_repository import PlatformMetricsRepository
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +34,7 @@ class AnalyticsService:
 
     def __init__(self, db: Session):
         self.db = db
+        self.platform_metrics = PlatformMetricsRepository(db)
 
     def get_mrr_breakdown(self) -> Dict[str, Any]:
         """
@@ -86,59 +87,38 @@ class AnalyticsService:
         """
         Calculate MRR growth over time
 
+        Reads the platform_metrics_daily series for the whole range and rolls
+        it up per month.
+
         Args:
             months: Number of months to include
 
         Returns:
             List of dictionaries with date, MRR, new MRR, churned MRR
         """
-        results = []
-        end_date = datetime.now(timezone.utc)
+        today = datetime.now(timezone.utc).date()
 
-        for i in range(months):
-            # Calculate date for this month
-            month_date = end_date - timedelta(days=30 * (months - i - 1))
-            month_start = month_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        # First day of each month in range, oldest first
+        month_starts = []
+        year, month = today.year, today.month
+        for _ in range(months):
+            month_starts.insert(0, date(year, month, 1))
+            year, month = (year - 1, 12) if month == 1 else (year, month - 1)
 
-            # Get active subscriptions at this point in time
-            active_subs = self.db.query(SubscriptionModel).filter(
-                and_(
-                    SubscriptionModel.created_at <= month_start,
-                    or_(
-                        SubscriptionModel.status == SubscriptionStatus.ACTIVE.value,
-                        SubscriptionModel.status == SubscriptionStatus.TRIAL.value
-                    )
-                )
-            ).all()
+        series = self.platform_metrics.get_daily_series(month_starts[0], today) if month_starts else []
 
-            # Calculate MRR
-            month_mrr = 0
-            for sub in active_subs:
-                tier_pricing = PRICING_TIERS.get(sub.tier, {})
-                if sub.billing_cycle == BillingCycle.MONTHLY.value:
-                    monthly_price = tier_pricing.get("monthly_price", 0)
-                else:
-                    annual_price = tier_pricing.get("annual_price", 0)
-                    monthly_price = annual_price / 12
-                month_mrr += monthly_price
-
-            # Get new subscriptions this month
-            new_subs = self.db.query(SubscriptionModel).filter(
-                and_(
-                    SubscriptionModel.created_at >= month_start,
-                    SubscriptionModel.created_at < month_start + timedelta(days=30),
-                    SubscriptionModel.status == SubscriptionStatus.ACTIVE.value
-                )
-            ).count()
+        by_month: Dict[str, List[Dict[str, Any]]] = {}
+        for day in series:
+            by_month.setdefault(day["metric_date"].strftime("%Y-%m"), []).append(day)
 
-            # Get churned subscriptions this month
-            churned_subs = self.db.query(SubscriptionModel).filter(
-                and_(
-                    SubscriptionModel.updated_at >= month_start,
-                    SubscriptionModel.updated_at < month_start + timedelta(days=30),
-                    SubscriptionModel.status == SubscriptionStatus.CANCELLED.value
-                )
-            ).count()
+        results = []
+        for month_start in month_starts:
+            days = by_month.get(month_start.strftime("%Y-%m"), [])
+
+            # MRR at the start of the month, new and churned during the month
+            month_mrr = days[0]["mrr_cents"] if days else 0
+            new_subs = sum(day["new_subscriptions"] for day in days)
+            churned_subs = sum(day["churned_subscriptions"] for day in days)
 
             results.append({
                 "date": month_start.strftime("%Y-%m"),
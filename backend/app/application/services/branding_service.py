@@ -2,6 +2,7 @@
 Branding Service - Business logic for white-label branding and email templates
 """
 from typing import List, Optional, Dict, Any
+from pydantic import TypeAdapter, ValidationError, EmailStr
 from sqlalchemy.orm import Session
 
 from app.models.branding import (
@@ -12,6 +13,17 @@ from app.infrastructure.repositories.branding_repository import (
     OrganizationBrandingRepository,
     EmailTemplateRepository,
 )
+from app.infrastructure.cache.tenant_config_cache import TenantConfigCache, get_tenant_config_cache
+from app.infrastructure.email.delivery import EmailDeliveryEngine
+from app.infrastructure.email.models import EmailMessage, EmailRecipient
+from app.infrastructure.email.tenant_templates import (
+    COMPILED_TEMPLATE_TTL_SECONDS,
+    CompiledEmailTemplate,
+    TemplateChrome,
+    compiled_template_cache,
+)
+from app.infrastructure.messaging.pgmq_client import PGMQClient
+from app.infrastructure.search.search_cache import SearchResultCache
 from app.application.dtos.branding_dto import (
     OrganizationBrandingCreateDTO,
     OrganizationBrandingUpdateDTO,
@@ -19,15 +31,36 @@ from app.application.dtos.branding_dto import (
     EmailTemplateUpdateDTO,
     EmailRenderRequest,
     EmailRenderResponse,
+    EmailBulkRenderRequest,
+    EmailBulkRenderedEmail,
+    EmailBulkRecipientError,
+    EmailBulkRenderResponse,
+    EmailBulkSendResponse,
 )
 
+_email_adapter = TypeAdapter(EmailStr)
+
+
+def _validate_email(email: str) -> str:
+    """Normalized email address, or ValueError"""
+    try:
+        return _email_adapter.validate_python(email)
+    except ValidationError:
+        raise ValueError(f"Invalid email address '{email}'")
+
 
 class BrandingService:
-    """Service for Organization Branding operations"""
+    """
+    Service for Organization Branding operations.
+
+    Reads by organization and subdomain are served from the tenant
+    configuration cache; writes invalidate the tenant.
+    """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, config_cache: Optional[TenantConfigCache] = None):
         self.db = db
         self.repo = OrganizationBrandingRepository(db)
+        self.config_cache = config_cache or get_tenant_config_cache()
 
     def create_branding(self, dto: OrganizationBrandingCreateDTO) -> OrganizationBranding:
         """Create organization branding (only one per organization)"""
@@ -48,19 +81,32 @@ class BrandingService:
             if existing_domain:
                 raise ValueError(f"Domain '{dto.custom_domain}' is already taken")
 
-        return self.repo.create(dto)
+        branding = self.repo.create(dto)
+        self.config_cache.invalidate(branding.organization_id)
+        return branding
 
     def get_branding(self, branding_id: int) -> Optional[OrganizationBranding]:
         """Get branding by ID"""
         return self.repo.get_by_id(branding_id)
 
     def get_by_organization(self, organization_id: int) -> Optional[OrganizationBranding]:
-        """Get branding by organization ID"""
-        return self.repo.get_by_organization(organization_id)
+        """Get active branding by organization ID (cached, read-only; caller's organization only)"""
+        return self.config_cache.get_for_session(self.db, organization_id).branding
 
     def get_by_subdomain(self, subdomain: str) -> Optional[OrganizationBranding]:
-        """Get branding by custom subdomain"""
-        return self.repo.get_by_subdomain(subdomain)
+        """Get active branding by custom subdomain (cached, read-only)"""
+        organization_id = self.config_cache.organization_for_subdomain(subdomain)
+        if organization_id is None:
+            branding = self.repo.get_by_subdomain(subdomain)
+            if not branding:
+                return None
+            organization_id = branding.organization_id
+
+        branding = self.config_cache.get_for_session(self.db, organization_id).branding
+        if branding is None or branding.custom_subdomain != subdomain:
+            # Changed since it was cached here; the notification is on its way
+            return self.repo.get_by_subdomain(subdomain)
+        return branding
 
     def get_by_domain(self, domain: str) -> Optional[OrganizationBranding]:
         """Get branding by custom domain"""
@@ -85,29 +131,32 @@ class BrandingService:
             if existing:
                 raise ValueError(f"Domain '{dto.custom_domain}' is already taken")
 
-        return self.repo.update(branding_id, dto, updated_by)
+        updated = self.repo.update(branding_id, dto, updated_by)
+        self.config_cache.invalidate(branding.organization_id)
+        return updated
 
     def delete_branding(self, branding_id: int) -> bool:
         """Delete branding (soft delete)"""
-        return self.repo.delete(branding_id)
+        branding = self.repo.get_by_id(branding_id)
+        deleted = self.repo.delete(branding_id)
+        if branding is not None:
+            self.config_cache.invalidate(branding.organization_id)
+        return deleted
 
     def get_logo_for_variant(self, organization_id: int, variant: str = 'default') -> Optional[str]:
         """Get logo URL for specific variant"""
-        branding = self.repo.get_by_organization(organization_id)
+        branding = self.get_by_organization(organization_id)
         if not branding:
             return None
         return branding.get_logo(variant)
 
     def is_feature_enabled(self, organization_id: int, feature_name: str) -> bool:
         """Check if a white-label feature is enabled"""
-        branding = self.repo.get_by_organization(organization_id)
-        if not branding:
-            return False
-        return branding.is_feature_enabled(feature_name)
+        return self.config_cache.get_for_session(self.db, organization_id).is_feature_enabled(feature_name)
 
     def get_contact_info(self, organization_id: int) -> Optional[Dict[str, Any]]:
         """Get formatted contact information"""
-        branding = self.repo.get_by_organization(organization_id)
+        branding = self.get_by_organization(organization_id)
         if not branding:
             return None
 
@@ -120,12 +169,21 @@ class BrandingService:
 
 
 class EmailTemplateService:
-    """Service for Email Template operations"""
+    """
+    Service for Email Template operations.
+
+    Rendering uses templates compiled once per (organization, code, version)
+    and branding from the tenant configuration cache; a mail-merge renders
+    one template for many recipients in a single call.
+    """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, config_cache: Optional[TenantConfigCache] = None,
+                 template_cache: Optional[SearchResultCache] = None):
         self.db = db
         self.repo = EmailTemplateRepository(db)
         self.branding_repo = OrganizationBrandingRepository(db)
+        self.config_cache = config_cache or get_tenant_config_cache()
+        self.template_cache = template_cache if template_cache is not None else compiled_template_cache
 
     def create_template(self, dto: EmailTemplateCreateDTO) -> EmailTemplate:
         """Create email template"""
@@ -165,46 +223,151 @@ class EmailTemplateService:
     def update_template(self, template_id: int, dto: EmailTemplateUpdateDTO,
                        updated_by: int) -> Optional[EmailTemplate]:
         """Update email template"""
-        return self.repo.update(template_id, dto, updated_by)
+        template = self.repo.update(template_id, dto, updated_by)
+        if template:
+            self.template_cache.invalidate(template.organization_id)
+        return template
 
     def delete_template(self, template_id: int) -> bool:
         """Delete email template (not allowed for system templates)"""
-        return self.repo.delete(template_id)
-
-    def render_template(self, organization_id: int, request: EmailRenderRequest) -> EmailRenderResponse:
-        """Render email template with context variables"""
-        # Get template
-        template = self.repo.get_by_code(organization_id, request.template_code)
+        template = self.repo.get_by_id(template_id)
+        deleted = self.repo.delete(template_id)
+        if deleted and template:
+            self.template_cache.invalidate(template.organization_id)
+        return deleted
+
+    def get_compiled(self, organization_id: int, template_code: str) -> CompiledEmailTemplate:
+        """
+        Get the compiled form of an active template.
+
+        Only (code, version, updated_at) is read from the database while the
+        cached compilation is current; bodies are loaded and compiled on a miss.
+
+        Raises:
+            ValueError: If the template is missing, inactive or does not compile
+        """
+        fingerprint = self.repo.get_fingerprint_by_code(organization_id, template_code)
+        if fingerprint is None:
+            raise ValueError(f"Template '{template_code}' not found")
+
+        compiled = self.template_cache.get(organization_id, fingerprint)
+        if compiled is not None:
+            return compiled
+
+        template = self.repo.get_by_code(organization_id, template_code)
         if not template:
-            raise ValueError(f"Template '{request.template_code}' not found")
+            raise ValueError(f"Template '{template_code}' not found")
 
-        if not template.is_active:
-            raise ValueError(f"Template '{request.template_code}' is not active")
+        compiled = CompiledEmailTemplate(template)
+        self.template_cache.set(organization_id, compiled.fingerprint, compiled, COMPILED_TEMPLATE_TTL_SECONDS)
+        return compiled
 
-        # Validate required variables
-        if template.variables:
-            for var_def in template.variables:
-                if isinstance(var_def, dict) and var_def.get('required', False):
-                    var_name = var_def.get('name')
-                    if var_name not in request.context:
-                        raise ValueError(f"Required variable '{var_name}' is missing from context")
+    def _chrome(self, organization_id: int, compiled: CompiledEmailTemplate,
+                include_branding: bool) -> Optional[TemplateChrome]:
+        """Header/footer for a render, from the cached tenant branding"""
+        if not include_branding:
+            return None
+        return compiled.chrome(self.config_cache.get_for_session(self.db, organization_id).branding)
+
+    def render_template(self, organization_id: int, request: EmailRenderRequest) -> EmailRenderResponse:
+        """Render email template with context variables"""
+        compiled = self.get_compiled(organization_id, request.template_code)
 
-        # Render template
-        rendered = template.render(request.context)
+        missing = compiled.missing_variables(request.context)
+        if missing:
+            raise ValueError(f"Required variable '{missing[0]}' is missing from context")
 
-        # Include branding if requested
-        if request.include_branding:
-            branding = self.branding_repo.get_by_organization(organization_id)
-            full_html = template.get_full_html(request.context, branding)
-            rendered['body_html'] = full_html
+        rendered = compiled.render(request.context, self._chrome(organization_id, compiled, request.include_branding))
 
         return EmailRenderResponse(
             subject=rendered['subject'],
             body_html=rendered['body_html'],
             body_text=rendered['body_text'],
-            from_name=template.from_name,
-            from_email=template.from_email,
-            reply_to_email=template.reply_to_email,
+            from_name=compiled.from_name,
+            from_email=compiled.from_email,
+            reply_to_email=compiled.reply_to_email,
+        )
+
+    def render_bulk(self, organization_id: int, request: EmailBulkRenderRequest) -> EmailBulkRenderResponse:
+        """
+        Render one template for many recipients (mail-merge).
+
+        The template is compiled and the branding chrome built once for the
+        whole batch. A recipient with an invalid email, a missing required
+        variable or a failing render is reported in errors; the others are
+        still rendered.
+
+        Raises:
+            ValueError: If the template is missing, inactive or does not compile
+        """
+        compiled = self.get_compiled(organization_id, request.template_code)
+        chrome = self._chrome(organization_id, compiled, request.include_branding)
+
+        rendered: List[EmailBulkRenderedEmail] = []
+        errors: List[EmailBulkRecipientError] = []
+        for index, recipient in enumerate(request.recipients):
+            try:
+                to_email = _validate_email(recipient.to_email)
+                context = {**request.shared_context, **recipient.context}
+                missing = compiled.missing_variables(context)
+                if missing:
+                    raise ValueError(f"Missing required variables: {', '.join(missing)}")
+                result = compiled.render(context, chrome)
+            except ValueError as e:
+                errors.append(EmailBulkRecipientError(index=index, to_email=recipient.to_email, error=str(e)))
+                continue
+
+            rendered.append(EmailBulkRenderedEmail(
+                index=index,
+                to_email=to_email,
+                to_name=recipient.to_name,
+                subject=result['subject'],
+                body_html=result['body_html'],
+                body_text=result['body_text'],
+            ))
+
+        return EmailBulkRenderResponse(
+            template_code=compiled.template_code,
+            from_name=compiled.from_name,
+            from_email=compiled.from_email,
+            reply_to_email=compiled.reply_to_email,
+            rendered=rendered,
+            errors=errors,
+        )
+
+    def send_bulk(self, organization_id: int, request: EmailBulkRenderRequest, pgmq_client: PGMQClient,
+                  batch_size: int = 500) -> EmailBulkSendResponse:
+        """
+        Render a mail-merge and queue it for the pooled delivery workers.
+
+        Messages are enqueued batch_size at a time (one round trip each);
+        recipients that failed to render are returned in errors, not queued.
+
+        Raises:
+            ValueError: If the template is missing, inactive or does not compile
+        """
+        result = self.render_bulk(organization_id, request)
+        messages = [
+            EmailMessage(
+                to=EmailRecipient(email=email.to_email, name=email.to_name or ""),
+                subject=email.subject,
+                body_text=email.body_text or "",
+                body_html=email.body_html,
+                from_email=result.from_email,
+                from_name=result.from_name,
+            )
+            for email in result.rendered
+        ]
+
+        message_ids: List[int] = []
+        for start in range(0, len(messages), batch_size):
+            message_ids.extend(EmailDeliveryEngine.enqueue(pgmq_client, messages[start:start + batch_size]))
+
+        return EmailBulkSendResponse(
+            template_code=result.template_code,
+            queued=len(message_ids),
+            message_ids=message_ids,
+            errors=result.errors,
         )
 
     def preview_template(self, template_id: int, context: Dict[str, Any]) -> Dict[str, str]:
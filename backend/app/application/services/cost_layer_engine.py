@@ -0,0 +1,463 @@
+"""
+Cost Layer Engine - Set-based FIFO/LIFO consumption of cost layers.
+Phase 2: Material Management - Material Costing
+
+Issues are allocated in SQL: a window function computes the running
+cumulative quantity of the open layers of each material/location in FIFO
+or LIFO order, and only the layers whose running total has not yet passed
+the requested quantity are returned. Layers are row-locked first, updated
+in bulk, and every consumption is written to a ledger that can be reversed.
+A moving average cost per material and location is kept incrementally.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+from sqlalchemy import and_, bindparam, case, func, insert, literal, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models.costing import (
+    CostingMethod,
+    CostLayer,
+    CostLayerConsumption,
+    MaterialLocationCost,
+)
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal("0.01")
+
+
+@dataclass
+class LayerIssueRequest:
+    """Quantity of one material to issue from one storage location."""
+
+    material_id: int
+    storage_location_id: int
+    quantity: Decimal
+
+
+def layer_allocation_query(filters: list, requested, partition_by: Sequence, order_ascending: bool = True):
+    """
+    Select the open layers an issue would consume, in consumption order.
+
+    Each row carries the running cumulative quantity of its partition
+    (cumulative) and the requested quantity; a layer is needed while the
+    quantity consumed before it is still below the request. If a partition
+    is short, all of its layers are returned and the last cumulative is the
+    available quantity.
+
+    Args:
+        filters: Predicates selecting the candidate layers
+        requested: SQL expression with the requested quantity per row
+        partition_by: Columns identifying one issue (e.g. material, location)
+        order_ascending: True for FIFO (oldest first), False for LIFO
+
+    Returns:
+        Select of id, material_id, storage_location_id, batch_number,
+        quantity_remaining, unit_cost, cumulative, requested
+    """
+    if order_ascending:
+        order = (CostLayer.receipt_date.asc(), CostLayer.id.asc())
+    else:
+        order = (CostLayer.receipt_date.desc(), CostLayer.id.desc())
+
+    ranked = select(
+        CostLayer.id,
+        CostLayer.material_id,
+        CostLayer.storage_location_id,
+        CostLayer.batch_number,
+        CostLayer.quantity_remaining,
+        CostLayer.unit_cost,
+        func.sum(CostLayer.quantity_remaining).over(
+            partition_by=list(partition_by), order_by=order
+        ).label("cumulative"),
+        requested.label("requested"),
+    ).where(
+        CostLayer.quantity_remaining > 0,
+        *filters
+    ).subquery("ranked")
+
+    return select(ranked).where(
+        ranked.c.cumulative - ranked.c.quantity_remaining < ranked.c.requested
+    ).order_by(
+        ranked.c.material_id, ranked.c.storage_location_id, ranked.c.cumulative
+    )
+
+
+def consumed_from_layer(row, requested: Decimal) -> Decimal:
+    """Quantity taken from an allocation row for a given request."""
+    remaining = Decimal(str(row.quantity_remaining))
+    consumed_before = Decimal(str(row.cumulative)) - remaining
+    return min(remaining, requested - consumed_before)
+
+
+class CostLayerEngine:
+    """
+    Engine for receiving into, issuing from and valuing cost layers.
+
+    Methods flush but do not commit: the caller owns the transaction, so an
+    issue can be committed together with its inventory posting, and the
+    layer row locks are held until then.
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize CostLayerEngine with database session.
+
+        Args:
+            db_session: SQLAlchemy session for database operations
+        """
+        self.db = db_session
+
+    def receive(
+        self,
+        organization_id: int,
+        plant_id: int,
+        material_id: int,
+        storage_location_id: int,
+        batch_number: str,
+        quantity: Decimal,
+        unit_cost: Decimal,
+        currency_code: str,
+        receipt_date: datetime,
+        transaction_reference: str
+    ) -> CostLayer:
+        """
+        Create a cost layer for a receipt and blend it into the moving average.
+
+        Returns:
+            Created CostLayer
+
+        Raises:
+            ValueError: If quantity <= 0 or unit_cost < 0
+        """
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        if unit_cost < 0:
+            raise ValueError("Unit cost must be non-negative")
+
+        layer = CostLayer(
+            organization_id=organization_id,
+            plant_id=plant_id,
+            material_id=material_id,
+            storage_location_id=storage_location_id,
+            batch_number=batch_number,
+            quantity_received=quantity,
+            quantity_remaining=quantity,
+            unit_cost=unit_cost,
+            currency_code=currency_code,
+            receipt_date=receipt_date,
+            transaction_reference=transaction_reference
+        )
+        self.db.add(layer)
+        self._receive_into_average(organization_id, plant_id, material_id, storage_location_id, quantity, unit_cost)
+        self.db.flush()
+        return layer
+
+    def issue(
+        self,
+        organization_id: int,
+        plant_id: int,
+        requests: List[LayerIssueRequest],
+        issue_reference: str,
+        costing_method: CostingMethod = CostingMethod.FIFO,
+        transaction_date: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Consume cost layers for many material/location issues at once.
+
+        Open layers of all requested materials are locked, allocated with one
+        windowed query, updated in bulk and recorded in the consumption
+        ledger under issue_reference.
+
+        Args:
+            organization_id: Organization ID
+            plant_id: Plant ID
+            requests: One request per material/location
+            issue_reference: Reference recorded on the ledger (used for reversal)
+            costing_method: FIFO or LIFO
+            transaction_date: Only layers received up to this date are used (default: now)
+
+        Returns:
+            One dict per request (same order) with material_id,
+            storage_location_id, total_cost, unit_cost and batches_used
+
+        Raises:
+            ValueError: On invalid or duplicate requests, unsupported method,
+                or insufficient inventory (nothing is consumed)
+        """
+        if costing_method not in (CostingMethod.FIFO, CostingMethod.LIFO):
+            raise ValueError(f"Cost layers are consumed by FIFO or LIFO, not {costing_method}")
+
+        requested: Dict[Tuple[int, int], Decimal] = {}
+        for request in requests:
+            if request.quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            key = (request.material_id, request.storage_location_id)
+            if key in requested:
+                raise ValueError(
+                    f"Duplicate issue for material {key[0]} at location {key[1]}"
+                )
+            requested[key] = Decimal(str(request.quantity))
+
+        if not requested:
+            return []
+
+        transaction_date = transaction_date or datetime.now(timezone.utc)
+        key_column = tuple_(CostLayer.material_id, CostLayer.storage_location_id)
+        filters = [
+            CostLayer.organization_id == organization_id,
+            key_column.in_(list(requested)),
+            CostLayer.receipt_date <= transaction_date,
+        ]
+
+        # Lock candidate layers (id order avoids deadlocks between concurrent issues);
+        # window functions cannot be combined with FOR UPDATE in one statement
+        self.db.execute(
+            select(CostLayer.id).where(CostLayer.quantity_remaining > 0, *filters)
+            .order_by(CostLayer.id).with_for_update()
+        )
+
+        requested_expr = self._requested_case(requested)
+        rows = self.db.execute(layer_allocation_query(
+            filters,
+            requested_expr,
+            (CostLayer.material_id, CostLayer.storage_location_id),
+            order_ascending=costing_method == CostingMethod.FIFO
+        )).fetchall()
+
+        allocations: Dict[Tuple[int, int], list] = {key: [] for key in requested}
+        for row in rows:
+            allocations[(row.material_id, row.storage_location_id)].append(row)
+
+        for key, layer_rows in allocations.items():
+            available = Decimal(str(layer_rows[-1].cumulative)) if layer_rows else Decimal(0)
+            if available < requested[key]:
+                raise ValueError(
+                    f"Insufficient inventory for material {key[0]} at location {key[1]}. "
+                    f"Available: {available}, Requested: {requested[key]}"
+                )
+
+        layer_updates = []
+        ledger_rows = []
+        results = {}
+        for key, layer_rows in allocations.items():
+            total_cost = Decimal("0.00")
+            batches_used = []
+            for row in layer_rows:
+                consumed = consumed_from_layer(row, requested[key])
+                unit_cost = Decimal(str(row.unit_cost))
+                layer_cost = consumed * unit_cost
+                total_cost += layer_cost
+
+                layer_updates.append({
+                    "id": row.id,
+                    "quantity_remaining": Decimal(str(row.quantity_remaining)) - consumed,
+                })
+                ledger_rows.append({
+                    "organization_id": organization_id,
+                    "plant_id": plant_id,
+                    "cost_layer_id": row.id,
+                    "material_id": key[0],
+                    "storage_location_id": key[1],
+                    "costing_method": costing_method,
+                    "quantity": consumed,
+                    "unit_cost": unit_cost,
+                    "issue_reference": issue_reference,
+                    "consumed_at": transaction_date,
+                })
+                batches_used.append({
+                    "batch_number": row.batch_number,
+                    "quantity_consumed": consumed,
+                    "unit_cost": unit_cost,
+                    "layer_cost": layer_cost
+                })
+
+            results[key] = {
+                "material_id": key[0],
+                "storage_location_id": key[1],
+                "total_cost": total_cost.quantize(CENT, rounding=ROUND_HALF_UP),
+                "unit_cost": (total_cost / requested[key]).quantize(CENT, rounding=ROUND_HALF_UP),
+                "batches_used": batches_used
+            }
+
+        # Bulk UPDATE by primary key and bulk INSERT of the ledger
+        self.db.execute(update(CostLayer), layer_updates)
+        self.db.execute(insert(CostLayerConsumption), ledger_rows)
+        # Issues lower the on-hand quantity; the moving average cost is unchanged
+        positions = MaterialLocationCost.__table__
+        self.db.execute(
+            update(positions)
+            .where(and_(
+                positions.c.material_id == bindparam("b_material_id"),
+                positions.c.storage_location_id == bindparam("b_location_id")
+            ))
+            .values(quantity_on_hand=case(
+                (positions.c.quantity_on_hand > bindparam("b_quantity"),
+                 positions.c.quantity_on_hand - bindparam("b_quantity")),
+                else_=0
+            )),
+            [
+                {"b_material_id": key[0], "b_location_id": key[1], "b_quantity": quantity}
+                for key, quantity in requested.items()
+            ]
+        )
+        self.db.flush()
+
+        logger.info(
+            f"Issued {len(requested)} materials under '{issue_reference}' "
+            f"from {len(layer_updates)} cost layers ({costing_method.value})"
+        )
+        return [results[(r.material_id, r.storage_location_id)] for r in requests]
+
+    def reverse_issue(self, issue_reference: str, reversed_at: Optional[datetime] = None) -> int:
+        """
+        Reverse every open consumption recorded under issue_reference.
+
+        Quantities are returned to their layers and blended back into the
+        moving average at their consumed cost; ledger rows are kept and
+        stamped with reversed_at.
+
+        Args:
+            issue_reference: Reference passed to issue()
+            reversed_at: Reversal time (default: now)
+
+        Returns:
+            Number of ledger rows reversed
+        """
+        consumptions = self.db.query(CostLayerConsumption).filter(
+            CostLayerConsumption.issue_reference == issue_reference,
+            CostLayerConsumption.reversed_at.is_(None)
+        ).order_by(CostLayerConsumption.cost_layer_id).with_for_update().all()
+
+        if not consumptions:
+            return 0
+
+        reversed_at = reversed_at or datetime.now(timezone.utc)
+        returned: Dict[int, Decimal] = {}
+        restocked: Dict[Tuple[int, int, int, int], List[Decimal]] = {}
+        for consumption in consumptions:
+            quantity = Decimal(str(consumption.quantity))
+            returned[consumption.cost_layer_id] = returned.get(consumption.cost_layer_id, Decimal(0)) + quantity
+            key = (consumption.organization_id, consumption.plant_id,
+                   consumption.material_id, consumption.storage_location_id)
+            totals = restocked.setdefault(key, [Decimal(0), Decimal(0)])
+            totals[0] += quantity
+            totals[1] += quantity * Decimal(str(consumption.unit_cost))
+            consumption.reversed_at = reversed_at
+
+        layers = CostLayer.__table__
+        self.db.execute(
+            update(layers)
+            .where(layers.c.id == bindparam("b_layer_id"))
+            .values(quantity_remaining=layers.c.quantity_remaining + bindparam("b_quantity")),
+            [{"b_layer_id": layer_id, "b_quantity": quantity} for layer_id, quantity in returned.items()]
+        )
+
+        for (organization_id, plant_id, material_id, location_id), (quantity, value) in restocked.items():
+            self._receive_into_average(
+                organization_id, plant_id, material_id, location_id, quantity, value / quantity
+            )
+
+        self.db.flush()
+        logger.info(f"Reversed {len(consumptions)} cost layer consumptions of '{issue_reference}'")
+        return len(consumptions)
+
+    def get_average_cost(self, material_id: int, storage_location_id: int) -> Optional[Decimal]:
+        """Moving average unit cost of a material at a location (None if never received)."""
+        return self.db.query(MaterialLocationCost.average_cost).filter(
+            MaterialLocationCost.material_id == material_id,
+            MaterialLocationCost.storage_location_id == storage_location_id
+        ).scalar()
+
+    def valuate(self, organization_id: int, plant_id: Optional[int] = None) -> List[Dict]:
+        """
+        Inventory valuation from open cost layers in one aggregate query.
+
+        Args:
+            organization_id: Organization ID
+            plant_id: Optional plant filter
+
+        Returns:
+            One dict per material/location with quantity, total_value and
+            unit_cost (value-weighted), ordered by material and location
+        """
+        query = select(
+            CostLayer.material_id,
+            CostLayer.storage_location_id,
+            CostLayer.currency_code,
+            func.sum(CostLayer.quantity_remaining).label("quantity"),
+            func.sum(CostLayer.quantity_remaining * CostLayer.unit_cost).label("total_value"),
+        ).where(
+            CostLayer.organization_id == organization_id,
+            CostLayer.quantity_remaining > 0
+        ).group_by(
+            CostLayer.material_id, CostLayer.storage_location_id, CostLayer.currency_code
+        ).order_by(
+            CostLayer.material_id, CostLayer.storage_location_id
+        )
+        if plant_id is not None:
+            query = query.where(CostLayer.plant_id == plant_id)
+
+        valuation = []
+        for row in self.db.execute(query):
+            quantity = Decimal(str(row.quantity))
+            total_value = Decimal(str(row.total_value)).quantize(CENT, rounding=ROUND_HALF_UP)
+            valuation.append({
+                "material_id": row.material_id,
+                "storage_location_id": row.storage_location_id,
+                "currency_code": row.currency_code,
+                "quantity": quantity,
+                "total_value": total_value,
+                "unit_cost": (total_value / quantity).quantize(CENT, rounding=ROUND_HALF_UP),
+            })
+        return valuation
+
+    def _requested_case(self, requested: Dict[Tuple[int, int], Decimal]):
+        """CASE mapping each layer's material/location to its requested quantity."""
+        return case(
+            *[
+                (and_(CostLayer.material_id == material_id,
+                      CostLayer.storage_location_id == location_id),
+                 literal(quantity, CostLayer.quantity_remaining.type))
+                for (material_id, location_id), quantity in requested.items()
+            ],
+            else_=literal(Decimal(0), CostLayer.quantity_remaining.type)
+        )
+
+    def _receive_into_average(
+        self,
+        organization_id: int,
+        plant_id: int,
+        material_id: int,
+        storage_location_id: int,
+        quantity: Decimal,
+        unit_cost: Decimal
+    ) -> None:
+        """Blend a receipt into the material/location moving average (row locked)."""
+        position = self.db.query(MaterialLocationCost).filter(
+            MaterialLocationCost.material_id == material_id,
+            MaterialLocationCost.storage_location_id == storage_location_id
+        ).with_for_update().first()
+
+        if position is None:
+            self.db.add(MaterialLocationCost(
+                organization_id=organization_id,
+                plant_id=plant_id,
+                material_id=material_id,
+                storage_location_id=storage_location_id,
+                quantity_on_hand=quantity,
+                average_cost=Decimal(str(unit_cost)).quantize(CENT, rounding=ROUND_HALF_UP)
+            ))
+            return
+
+        current_quantity = Decimal(str(position.quantity_on_hand))
+        current_value = current_quantity * Decimal(str(position.average_cost))
+        total_quantity = current_quantity + quantity
+        position.average_cost = (
+            (current_value + quantity * Decimal(str(unit_cost))) / total_quantity
+        ).quantize(CENT, rounding=ROUND_HALF_UP)
+        position.quantity_on_hand = total_quantity
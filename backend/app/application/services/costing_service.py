@@ -7,8 +7,10 @@ Supports FIFO, LIFO, Weighted Average, and Standard costing methods.
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime
 from typing import Dict, List, Optional
+from sqlalchemy import func, literal
 from sqlalchemy.orm import Session
 from app.models.costing import MaterialCosting, CostLayer, CostingMethod
+from app.application.services.cost_layer_engine import layer_allocation_query, consumed_from_layer
 
 
 class CostingService:
@@ -16,7 +18,8 @@ class CostingService:
     Application service for material costing calculations.
 
     Implements FIFO, LIFO, Weighted Average, and Standard costing methods.
-    Uses CostLayer entities for FIFO/LIFO tracking.
+    Uses CostLayer entities for FIFO/LIFO tracking. Calculations are read-only
+    quotes; CostLayerEngine consumes layers.
     """
 
     def __init__(self, db_session: Session):
@@ -57,48 +60,45 @@ class CostingService:
         """
         self._validate_quantity(quantity)
 
-        # Fetch cost layers ordered by receipt_date
-        order_clause = CostLayer.receipt_date.asc() if order_ascending else CostLayer.receipt_date.desc()
-        cost_layers = self.db.query(CostLayer).filter(
-            CostLayer.material_id == material_id,
-            CostLayer.quantity_remaining > 0,
-            CostLayer.receipt_date <= transaction_date
-        ).order_by(order_clause).all()
-
-        # Calculate total available quantity
-        total_available = sum(layer.quantity_remaining for layer in cost_layers)
+        # Select only the layers the issue reaches (running total in SQL)
+        rows = self.db.execute(layer_allocation_query(
+            filters=[
+                CostLayer.material_id == material_id,
+                CostLayer.receipt_date <= transaction_date
+            ],
+            requested=literal(quantity, CostLayer.quantity_remaining.type),
+            partition_by=(CostLayer.material_id,),
+            order_ascending=order_ascending
+        )).fetchall()
+
+        # If inventory is short every layer is returned; the last running total is the stock
+        total_available = Decimal(str(rows[-1].cumulative)) if rows else Decimal("0")
         if total_available < quantity:
             raise ValueError(
                 f"Insufficient inventory. Available: {total_available}, Requested: {quantity}"
             )
 
         # Consume batches
-        remaining_to_consume = quantity
         total_cost = Decimal("0.00")
         batches_used = []
 
-        for layer in cost_layers:
-            if remaining_to_consume <= 0:
-                break
-
+        for row in rows:
             # Determine how much to consume from this layer
-            quantity_from_layer = min(layer.quantity_remaining, remaining_to_consume)
+            quantity_from_layer = consumed_from_layer(row, quantity)
+            unit_cost = Decimal(str(row.unit_cost))
 
             # Calculate cost from this layer
-            layer_cost = quantity_from_layer * layer.unit_cost
+            layer_cost = quantity_from_layer * unit_cost
             total_cost += layer_cost
 
             # Track batch usage
             batches_used.append({
-                "batch_number": layer.batch_number,
+                "batch_number": row.batch_number,
                 "quantity_consumed": quantity_from_layer,
-                "unit_cost": layer.unit_cost,
+                "unit_cost": unit_cost,
                 "layer_cost": layer_cost
             })
 
-            # Update remaining quantity to consume
-            remaining_to_consume -= quantity_from_layer
-
         # Calculate unit cost (round to 2 decimal places)
         unit_cost = (total_cost / quantity).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
@@ -202,24 +202,22 @@ class CostingService:
         """
         self._validate_quantity(quantity)
 
-        # Fetch all cost layers for the material
-        cost_layers = self.db.query(CostLayer).filter(
+        # Aggregate available layers in one query
+        totals = self.db.query(
+            func.count(CostLayer.id),
+            func.sum(CostLayer.quantity_remaining),
+            func.sum(CostLayer.quantity_remaining * CostLayer.unit_cost)
+        ).filter(
             CostLayer.material_id == material_id,
             CostLayer.quantity_remaining > 0,
             CostLayer.receipt_date <= transaction_date
-        ).all()
+        ).one()
 
-        if not cost_layers:
+        if not totals[0]:
             raise ValueError(f"No inventory available for material {material_id}")
 
-        # Calculate total quantity and total value
-        total_quantity = Decimal("0.00")
-        total_value = Decimal("0.00")
-
-        for layer in cost_layers:
-            layer_value = layer.quantity_remaining * layer.unit_cost
-            total_quantity += layer.quantity_remaining
-            total_value += layer_value
+        total_quantity = Decimal(str(totals[1]))
+        total_value = Decimal(str(totals[2]))
 
         if total_quantity < quantity:
             raise ValueError(
@@ -0,0 +1,218 @@
+"""
+Dashboard Data Engine - Runs dashboard widget queries in parallel.
+
+Each widget is a report query definition (see report_query_engine) or a KPI
+spec ({"kpi": {"kpi_type", "breakdown_by"}}, see kpi_engine). For one
+dashboard request:
+
+- Widgets whose result is cached for the tenant are served from memory
+  (dashboard_widget_cache, TTL = the widget's refresh interval)
+- The rest run concurrently on a shared thread pool, each on its own pooled
+  connection, so the dashboard takes about as long as its slowest widget
+- Identical queries (same definition and parameters) share one execution:
+  within the dashboard, and across concurrent requests of the tenant's users
+- Widgets not finished by the dashboard deadline are returned as "timeout";
+  their queries keep running and fill the cache for the next refresh
+"""
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.application.services.kpi_engine import KPI_FILTERS, KPIEngine, parse_kpi_period
+from app.application.services.report_query_engine import ReportQueryEngine
+from app.core.config import settings
+from app.infrastructure.cache.dashboard_widget_cache import dashboard_widget_cache
+from app.infrastructure.database.rls import set_rls_context
+
+
+logger = logging.getLogger(__name__)
+
+# Shared by all requests of the process; bounds the connections widgets use
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Widget queries currently running, keyed by (organization_id, query key)
+_in_flight: Dict[Tuple[int, str], Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the widget thread pool on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.DASHBOARD_MAX_PARALLEL_WIDGETS,
+                thread_name_prefix="dashboard-widget"
+            )
+        return _executor
+
+
+@dataclass(frozen=True)
+class WidgetQuery:
+    """Query behind one widget and how long its result stays fresh."""
+
+    query_definition: Dict[str, Any]
+    refresh_interval_seconds: int
+
+
+class DashboardDataEngine:
+    """
+    Loads widget data for a dashboard with parallel, de-duplicated queries.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        cache=None,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        """
+        Initialize dashboard data engine.
+
+        Args:
+            session_factory: Creates the session a widget query runs on
+                (default: SessionLocal, one pooled connection per widget)
+            cache: Widget result cache (default: dashboard_widget_cache)
+            executor: Thread pool (default: process-wide widget pool)
+        """
+        if session_factory is None:
+            from app.core.database import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.cache = cache or dashboard_widget_cache
+        self.executor = executor or _get_executor()
+
+    def load(
+        self,
+        organization_id: int,
+        widgets: Dict[str, WidgetQuery],
+        parameters: Optional[Dict[str, Any]] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get data for widgets, waiting at most deadline_seconds for queries.
+
+        Args:
+            organization_id: Organization the dashboard belongs to
+            widgets: Widget queries keyed by widget ID
+            parameters: Execution parameters (dashboard filters, date range)
+            deadline_seconds: Time budget for the whole dashboard
+                (default: DASHBOARD_DEADLINE_SECONDS)
+
+        Returns:
+            Per widget: status ("loaded", "timeout" or "error"), data (report
+            query result or None), cached, last_updated and error if any
+        """
+        parameters = parameters or {}
+        deadline = settings.DASHBOARD_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+
+        widget_data: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Future] = {}
+        for widget_id, widget in widgets.items():
+            key = self.query_key(widget.query_definition, parameters)
+            cached = self.cache.get(organization_id, key)
+            if cached is not None:
+                widget_data[widget_id] = {**cached, "status": "loaded", "cached": True}
+            else:
+                pending[widget_id] = self._submit(organization_id, key, widget, parameters)
+
+        if pending:
+            wait(set(pending.values()), timeout=deadline)
+
+        for widget_id, future in pending.items():
+            if not future.done():
+                widget_data[widget_id] = {
+                    "status": "timeout", "data": None, "cached": False, "last_updated": None
+                }
+            elif future.exception() is not None:
+                widget_data[widget_id] = {
+                    "status": "error", "data": None, "cached": False, "last_updated": None,
+                    "error": str(future.exception())
+                }
+            else:
+                widget_data[widget_id] = {**future.result(), "status": "loaded", "cached": False}
+
+        timed_out = [widget_id for widget_id, data in widget_data.items() if data["status"] == "timeout"]
+        if timed_out:
+            logger.warning(
+                f"Dashboard widgets {timed_out} of organization {organization_id} "
+                f"missed the {deadline}s deadline"
+            )
+
+        return widget_data
+
+    @staticmethod
+    def query_key(query_definition: Dict[str, Any], parameters: Dict[str, Any]) -> str:
+        """Key identifying a widget query's result within a tenant."""
+        canonical = json.dumps([query_definition, parameters], sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _submit(
+        self,
+        organization_id: int,
+        key: str,
+        widget: WidgetQuery,
+        parameters: Dict[str, Any]
+    ) -> Future:
+        """Start a widget query, or join the identical one already running."""
+        in_flight_key = (organization_id, key)
+        with _in_flight_lock:
+            future = _in_flight.get(in_flight_key)
+            if future is not None:
+                return future
+
+            future = self.executor.submit(
+                self._run_widget_query, organization_id, widget.query_definition, parameters
+            )
+            _in_flight[in_flight_key] = future
+
+        def finished(done: Future) -> None:
+            # Cache before leaving the in-flight map so no request misses both
+            if done.exception() is None:
+                self.cache.set(organization_id, key, done.result(), widget.refresh_interval_seconds)
+            with _in_flight_lock:
+                if _in_flight.get(in_flight_key) is done:
+                    del _in_flight[in_flight_key]
+
+        future.add_done_callback(finished)
+        return future
+
+    def _run_widget_query(
+        self,
+        organization_id: int,
+        query_definition: Dict[str, Any],
+        parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run one widget query on its own session, in the tenant's RLS context."""
+        db = self.session_factory()
+        try:
+            set_rls_context(db, organization_id=organization_id)
+            if 'kpi' in query_definition:
+                data = self._run_kpi(db, organization_id, query_definition['kpi'], parameters)
+            else:
+                data = ReportQueryEngine(db).run(query_definition, organization_id, parameters)
+            return {"data": data, "last_updated": datetime.now(timezone.utc).isoformat()}
+        finally:
+            db.close()
+
+    @staticmethod
+    def _run_kpi(
+        db: Session,
+        organization_id: int,
+        kpi: Dict[str, Any],
+        parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Calculate a KPI widget for the dashboard's date range and dimension filters."""
+        filters = {key: value for key, value in parameters.items() if key in KPI_FILTERS}
+        return KPIEngine(db).calculate(
+            organization_id, kpi.get('kpi_type'), parse_kpi_period(parameters),
+            filters=filters, breakdown_by=kpi.get('breakdown_by')
+        )
@@ -0,0 +1,219 @@
+"""
+Application service projecting work orders onto a Gantt board.
+
+Every task of a board (plant, date window, lanes) is built from one
+streamed query (SchedulingRepository.iter_gantt_rows): work orders joined
+with their operations, work centers and lane assignment. Operation start and
+end times (sequential / overlap / parallel scheduling, as in
+OperationSchedulingService) and progress are computed in the same pass over
+the rows, one work order at a time, so memory is bounded by the largest work
+order rather than the board.
+
+Boards are paged by work order (skip/limit) so a client can load the
+viewport it shows and fetch more while scrolling; iter_ndjson streams a page
+as newline-delimited JSON.
+"""
+import json
+import logging
+from datetime import date, timedelta
+from itertools import groupby
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.infrastructure.repositories.scheduling_repository import SchedulingRepository
+from app.models.work_order import OperationStatus, SchedulingMode
+
+
+logger = logging.getLogger(__name__)
+
+# Work orders per page when the client does not ask for a viewport size
+DEFAULT_PAGE_SIZE = 200
+
+
+def _enum_value(value: Any) -> Optional[str]:
+    return getattr(value, "value", value)
+
+
+class GanttProjectionService:
+    """
+    Application service building Gantt tasks in bulk.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize Gantt projection service.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+        self.repo = SchedulingRepository(db)
+
+    def iter_work_order_tasks(
+        self,
+        organization_id: int,
+        plant_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        lane_ids: Optional[List[int]] = None,
+        include_completed: bool = False,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the tasks of each work order on the board, in board order.
+
+        A work order with operations yields one task per operation; one
+        without operations yields a single work-order task spanning its
+        planned dates.
+
+        Args:
+            organization_id: Organization
+            plant_id: Filter by plant
+            start_date: Window start (work orders planned to end on/after it)
+            end_date: Window end (work orders planned to start on/before it)
+            lane_ids: Only work orders assigned to these lanes
+            include_completed: Include completed work orders
+            skip: Work orders to skip
+            limit: Maximum work orders
+
+        Yields:
+            List of task dicts (GanttTaskResponse fields) per work order
+        """
+        rows = self.repo.iter_gantt_rows(
+            organization_id=organization_id,
+            plant_id=plant_id,
+            window_start=start_date,
+            window_end=end_date,
+            lane_ids=lane_ids,
+            include_completed=include_completed,
+            skip=skip,
+            limit=limit
+        )
+        for _, work_order_rows in groupby(rows, key=attrgetter("work_order_id")):
+            yield self._project_work_order(list(work_order_rows))
+
+    def iter_ndjson(
+        self,
+        organization_id: int,
+        plant_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        lane_ids: Optional[List[int]] = None,
+        include_completed: bool = False,
+        skip: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[str]:
+        """
+        Stream one page of the board as newline-delimited JSON.
+
+        Lines are {"type": "task", ...} per task, as soon as its work order
+        is projected, then one {"type": "end", "work_orders", "next_skip"}
+        line; next_skip is None on the last page.
+        """
+        work_orders = 0
+        has_more = False
+        # One extra work order tells whether another page exists
+        for tasks in self.iter_work_order_tasks(
+            organization_id, plant_id, start_date, end_date, lane_ids, include_completed, skip, limit + 1
+        ):
+            if work_orders == limit:
+                has_more = True
+                break
+            work_orders += 1
+            yield "".join(json.dumps({"type": "task", **task}, default=str) + "\n" for task in tasks)
+
+        yield json.dumps({
+            "type": "end",
+            "work_orders": work_orders,
+            "next_skip": skip + work_orders if has_more else None,
+        }) + "\n"
+
+    def _project_work_order(self, rows: List[Any]) -> List[Dict[str, Any]]:
+        """Schedule a work order's operations and compute their progress."""
+        work_order = rows[0]
+        start = work_order.start_date_planned
+        base = {
+            "work_order_id": work_order.work_order_id,
+            "work_order_number": work_order.work_order_number,
+            "lane_id": work_order.lane_id,
+            "lane_code": work_order.lane_code,
+            "due_date": work_order.end_date_planned,
+            "is_critical_path": False,
+        }
+
+        if work_order.operation_id is None:
+            end = work_order.end_date_planned or start
+            planned = float(work_order.planned_quantity or 0)
+            progress = min(100.0, float(work_order.actual_quantity or 0) / planned * 100) if planned > 0 else 0.0
+            return [{
+                **base,
+                "operation_id": None,
+                "operation_name": None,
+                "operation_number": None,
+                "work_center_id": None,
+                "work_center_code": None,
+                "start_date": start,
+                "end_date": end,
+                "duration_hours": (end - start).total_seconds() / 3600.0,
+                "dependencies": [],
+                "progress_percent": round(progress, 2),
+                "status": _enum_value(work_order.order_status),
+                "scheduling_mode": None,
+            }]
+
+        quantity = max(float(work_order.planned_quantity or 0), 0.0)
+        scheduled: Dict[int, Dict[str, Any]] = {}
+        tasks = []
+        for row in rows:
+            duration = (row.setup_time_minutes or 0.0) + (row.run_time_per_unit_minutes or 0.0) * quantity
+
+            predecessor = scheduled.get(row.predecessor_operation_id)
+            if row.predecessor_operation_id and predecessor is None:
+                logger.warning(
+                    f"Operation {row.operation_id} of work order {work_order.work_order_number} has "
+                    f"predecessor {row.predecessor_operation_id} outside its earlier operations; "
+                    f"scheduled from the work order start"
+                )
+
+            if predecessor is None or row.scheduling_mode == SchedulingMode.PARALLEL:
+                op_start = start
+            elif row.scheduling_mode == SchedulingMode.OVERLAP:
+                elapsed = (row.can_start_at_percentage or 0.0) / 100.0 * predecessor["duration_minutes"]
+                op_start = predecessor["start_date"] + timedelta(minutes=elapsed)
+            else:
+                op_start = predecessor["end_date"]
+            op_end = op_start + timedelta(minutes=duration)
+
+            scheduled[row.operation_id] = {
+                "start_date": op_start, "end_date": op_end, "duration_minutes": duration
+            }
+            tasks.append({
+                **base,
+                "operation_id": row.operation_id,
+                "operation_name": row.operation_name,
+                "operation_number": row.operation_number,
+                "work_center_id": row.work_center_id,
+                "work_center_code": row.work_center_code,
+                "start_date": op_start,
+                "end_date": op_end,
+                "duration_hours": duration / 60.0,
+                "dependencies": [row.predecessor_operation_id] if row.predecessor_operation_id else [],
+                "progress_percent": self._operation_progress(row, duration),
+                "status": _enum_value(row.operation_status),
+                "scheduling_mode": _enum_value(row.scheduling_mode),
+            })
+
+        return tasks
+
+    @staticmethod
+    def _operation_progress(row: Any, planned_minutes: float) -> float:
+        """Completed/skipped = 100%; in progress = actual time over planned time (< 100%)."""
+        if row.operation_status in (OperationStatus.COMPLETED, OperationStatus.SKIPPED):
+            return 100.0
+        if row.operation_status != OperationStatus.IN_PROGRESS or planned_minutes <= 0:
+            return 0.0
+        actual_minutes = (row.actual_setup_time or 0.0) + (row.actual_run_time or 0.0)
+        return round(min(99.0, actual_minutes / planned_minutes * 100), 2)
@@ -21,6 +21,7 @@ from app.infrastructure.repositories.infrastructure_repository import (
     SAPSyncLogRepository,
     SAPMappingRepository,
 )
+from app.infrastructure.cache.tenant_config_cache import TenantConfigCache, get_tenant_config_cache
 from app.application.dtos.infrastructure_dto import (
     AuditLogCreateDTO,
     NotificationCreateDTO,
@@ -157,11 +158,17 @@ class NotificationService:
 
 
 class SystemSettingService:
-    """Service for System Setting operations"""
+    """
+    Service for System Setting operations.
 
-    def __init__(self, db: Session):
+    Typed values are read from the tenant configuration cache; writes
+    invalidate the tenant.
+    """
+
+    def __init__(self, db: Session, config_cache: Optional[TenantConfigCache] = None):
         self.db = db
         self.repo = SystemSettingRepository(db)
+        self.config_cache = config_cache or get_tenant_config_cache()
 
     def create_setting(self, dto: SystemSettingCreateDTO) -> SystemSetting:
         """Create system setting"""
@@ -170,7 +177,9 @@ class SystemSettingService:
         if existing:
             raise ValueError(f"Setting key '{dto.setting_key}' already exists")
 
-        return self.repo.create(dto)
+        setting = self.repo.create(dto)
+        self.config_cache.invalidate(setting.organization_id)
+        return setting
 
     def get_setting(self, setting_id: int) -> Optional[SystemSetting]:
         """Get setting by ID"""
@@ -186,13 +195,10 @@ class SystemSettingService:
         Get typed setting value by key.
 
         Returns the typed value (e.g., int, bool, dict) or default if not found.
+        Served from the tenant configuration snapshot (caller's organization
+        only); JSON values are shared, do not modify them.
         """
-        setting = self.repo.get_by_key(organization_id, setting_key)
-        if not setting:
-            return default
-
-        typed_value = setting.get_typed_value()
-        return typed_value if typed_value is not None else default
+        return self.config_cache.get_for_session(self.db, organization_id).get_setting(setting_key, default)
 
     def list_settings(self, organization_id: int,
                      category: Optional[str] = None) -> List[SystemSetting]:
@@ -206,7 +212,10 @@ class SystemSettingService:
     def update_setting(self, setting_id: int, dto: SystemSettingUpdateDTO,
                       updated_by: int) -> Optional[SystemSetting]:
         """Update system setting"""
-        return self.repo.update(setting_id, dto, updated_by)
+        setting = self.repo.update(setting_id, dto, updated_by)
+        if setting is not None:
+            self.config_cache.invalidate(setting.organization_id)
+        return setting
 
     def update_setting_value(self, organization_id: int, setting_key: str,
                            value: str, updated_by: int) -> Optional[SystemSetting]:
@@ -216,11 +225,15 @@ class SystemSettingService:
             return None
 
         dto = SystemSettingUpdateDTO(setting_value=value)
-        return self.repo.update(setting.id, dto, updated_by)
+        return self.update_setting(setting.id, dto, updated_by)
 
     def delete_setting(self, setting_id: int) -> bool:
         """Delete system setting (not allowed for system settings)"""
-        return self.repo.delete(setting_id)
+        setting = self.repo.get_by_id(setting_id)
+        deleted = self.repo.delete(setting_id)
+        if deleted and setting is not None:
+            self.config_cache.invalidate(setting.organization_id)
+        return deleted
 
 
 class FileUploadService:
@@ -0,0 +1,445 @@
+"""
+Inventory Posting Service - batched receipts, issues and transfers.
+Phase 2: Material Management - Inventory Tracking
+
+A posting is a batch of movements written in one database transaction:
+materials, locations and costs are validated with one query each, the
+affected inventory rows are locked in key order (so concurrent postings
+cannot deadlock), transactions and on-hand deltas are written in bulk and
+committed once. Either every line is posted or none is.
+
+Postings can carry an idempotency key: a retried scan with the same key
+returns the original transactions instead of moving stock twice.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import enum
+import hashlib
+import json
+import logging
+
+from sqlalchemy import bindparam, insert, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.costing import MaterialCosting
+from app.models.inventory import (
+    Inventory,
+    InventoryPosting,
+    InventoryTransaction,
+    StorageLocation,
+    TransactionType,
+)
+from app.models.material import Material
+from app.core.exceptions import (
+    ConflictException,
+    EntityNotFoundException,
+    InsufficientInventoryException,
+    ValidationException,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_POSTING_LINES = 500
+
+
+class MovementType(str, enum.Enum):
+    """Movement posted by one posting line"""
+    RECEIPT = "RECEIPT"
+    ISSUE = "ISSUE"
+    TRANSFER = "TRANSFER"
+
+
+@dataclass
+class PostingLine:
+    """One movement of a material batch (transfers also name the target location)."""
+
+    movement_type: MovementType
+    material_id: int
+    storage_location_id: int
+    quantity: Decimal
+    batch_number: str
+    to_storage_location_id: Optional[int] = None
+    unit_cost: Optional[Decimal] = None
+    notes: Optional[str] = None
+
+
+@dataclass
+class PostingResult:
+    """Posted (or replayed) batch with its transactions in line order."""
+
+    posting_id: int
+    transactions: List[InventoryTransaction] = field(default_factory=list)
+    replayed: bool = False
+
+
+InventoryKey = Tuple[int, int, str]  # (material_id, storage_location_id, batch_number)
+
+
+class InventoryPostingService:
+    """
+    Service for posting batches of inventory movements.
+
+    Transaction quantities are signed as documented on InventoryTransaction:
+    positive for receipts and transfers in, negative for issues and
+    transfers out. Availability is checked against the net change of each
+    material/location/batch across the whole batch.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize InventoryPostingService with database session.
+
+        Args:
+            db: SQLAlchemy session for database operations
+        """
+        self.db = db
+
+    def post(
+        self,
+        organization_id: int,
+        plant_id: int,
+        user_id: int,
+        lines: List[PostingLine],
+        transaction_reference: str,
+        idempotency_key: Optional[str] = None,
+        transaction_date: Optional[datetime] = None
+    ) -> PostingResult:
+        """
+        Post a batch of receipts, issues and transfers all-or-nothing.
+
+        Args:
+            organization_id: Organization ID
+            plant_id: Plant ID
+            user_id: Posting user
+            lines: Movements to post (1 to MAX_POSTING_LINES)
+            transaction_reference: Reference recorded on every transaction (WO, PO, etc.)
+            idempotency_key: Optional client key; a repeat returns the original posting
+            transaction_date: Date of the movements (default: now)
+
+        Returns:
+            PostingResult with the created (or previously created) transactions
+
+        Raises:
+            EntityNotFoundException: If a material or location does not exist
+            ValidationException: If a line is invalid or its cost cannot be determined
+            InsufficientInventoryException: If a batch would go below its reserved quantity
+            ConflictException: If idempotency_key was used for a different request,
+                or a concurrent posting created the same inventory record
+        """
+        self._validate_lines(lines)
+        request_hash = self._request_hash(lines, transaction_reference)
+
+        if idempotency_key:
+            existing = self._find_posting(organization_id, idempotency_key)
+            if existing:
+                return self._replay(existing, request_hash)
+
+        try:
+            result = self._post(
+                organization_id, plant_id, user_id, lines, transaction_reference,
+                idempotency_key, request_hash, transaction_date or datetime.now(timezone.utc)
+            )
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            # A concurrent retry with the same key won the race: return its posting
+            existing = self._find_posting(organization_id, idempotency_key) if idempotency_key else None
+            if existing:
+                return self._replay(existing, request_hash)
+            raise ConflictException(
+                resource_type="Inventory",
+                message="Inventory was changed by a concurrent posting, please retry"
+            )
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(
+            f"Posted {len(lines)} inventory movements as posting {result.posting_id} "
+            f"('{transaction_reference}')"
+        )
+        return result
+
+    def _post(
+        self,
+        organization_id: int,
+        plant_id: int,
+        user_id: int,
+        lines: List[PostingLine],
+        transaction_reference: str,
+        idempotency_key: Optional[str],
+        request_hash: str,
+        transaction_date: datetime
+    ) -> PostingResult:
+        """Validate, lock and write one posting inside the current transaction."""
+        materials = self._load_materials(organization_id, {line.material_id for line in lines})
+        location_ids = {line.storage_location_id for line in lines}
+        location_ids.update(line.to_storage_location_id for line in lines if line.to_storage_location_id)
+        self._load_locations(organization_id, location_ids)
+        unit_costs = self._resolve_unit_costs(organization_id, plant_id, lines, materials)
+
+        # Net change per material/location/batch
+        deltas: Dict[InventoryKey, Decimal] = {}
+        for line in lines:
+            source = (line.material_id, line.storage_location_id, line.batch_number)
+            if line.movement_type == MovementType.RECEIPT:
+                deltas[source] = deltas.get(source, Decimal(0)) + line.quantity
+                continue
+            deltas[source] = deltas.get(source, Decimal(0)) - line.quantity
+            if line.movement_type == MovementType.TRANSFER:
+                target = (line.material_id, line.to_storage_location_id, line.batch_number)
+                deltas[target] = deltas.get(target, Decimal(0)) + line.quantity
+
+        stock = self._lock_inventory(organization_id, plant_id, sorted(deltas))
+        for key, delta in deltas.items():
+            if delta >= 0:
+                continue
+            row = stock.get(key)
+            available = Decimal(str(row.quantity_on_hand - row.quantity_reserved)) if row else Decimal(0)
+            if available + delta < 0:
+                raise InsufficientInventoryException(
+                    material_code=materials[key[0]].material_number,
+                    requested=float(-delta),
+                    available=float(available)
+                )
+
+        posting = InventoryPosting(
+            organization_id=organization_id,
+            plant_id=plant_id,
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+            transaction_reference=transaction_reference,
+            line_count=len(lines),
+            posted_by_user_id=user_id
+        )
+        self.db.add(posting)
+        self.db.flush()
+
+        rows = []
+        for line, unit_cost in zip(lines, unit_costs):
+            legs = {
+                MovementType.RECEIPT: [(TransactionType.GOODS_RECEIPT, line.storage_location_id, 1)],
+                MovementType.ISSUE: [(TransactionType.GOODS_ISSUE, line.storage_location_id, -1)],
+                MovementType.TRANSFER: [
+                    (TransactionType.TRANSFER_OUT, line.storage_location_id, -1),
+                    (TransactionType.TRANSFER_IN, line.to_storage_location_id, 1),
+                ],
+            }[line.movement_type]
+            for transaction_type, location_id, sign in legs:
+                quantity = float(line.quantity) * sign
+                rows.append({
+                    "organization_id": organization_id,
+                    "plant_id": plant_id,
+                    "material_id": line.material_id,
+                    "storage_location_id": location_id,
+                    "transaction_type": transaction_type,
+                    "transaction_reference": transaction_reference,
+                    "batch_number": line.batch_number,
+                    "quantity": quantity,
+                    "unit_of_measure_id": materials[line.material_id].base_uom_id,
+                    "unit_cost": unit_cost,
+                    "total_value": unit_cost * quantity,
+                    "transaction_date": transaction_date,
+                    "posted_by_user_id": user_id,
+                    "notes": line.notes,
+                    "posting_id": posting.id,
+                })
+
+        transactions = self.db.scalars(
+            insert(InventoryTransaction).returning(InventoryTransaction, sort_by_parameter_order=True),
+            rows
+        ).all()
+
+        # On-hand deltas: bulk UPDATE of existing rows, bulk INSERT of new batches
+        updates = [
+            {"b_id": stock[key].id, "b_delta": float(delta), "b_moved_at": transaction_date}
+            for key, delta in deltas.items() if key in stock and delta != 0
+        ]
+        if updates:
+            inventory = Inventory.__table__
+            self.db.execute(
+                update(inventory)
+                .where(inventory.c.id == bindparam("b_id"))
+                .values(
+                    quantity_on_hand=inventory.c.quantity_on_hand + bindparam("b_delta"),
+                    last_movement_date=bindparam("b_moved_at")
+                ),
+                updates
+            )
+
+        new_rows = [
+            {
+                "organization_id": organization_id,
+                "plant_id": plant_id,
+                "material_id": key[0],
+                "storage_location_id": key[1],
+                "batch_number": key[2],
+                "quantity_on_hand": float(delta),
+                "quantity_reserved": 0.0,
+                "unit_of_measure_id": materials[key[0]].base_uom_id,
+                "last_movement_date": transaction_date,
+            }
+            for key, delta in deltas.items() if key not in stock and delta > 0
+        ]
+        if new_rows:
+            self.db.execute(insert(Inventory), new_rows)
+
+        self.db.flush()
+        return PostingResult(posting_id=posting.id, transactions=list(transactions))
+
+    def _validate_lines(self, lines: List[PostingLine]) -> None:
+        """Validate line shape before touching the database."""
+        if not lines:
+            raise ValidationException("A posting needs at least one line", field="lines")
+        if len(lines) > MAX_POSTING_LINES:
+            raise ValidationException(
+                f"A posting is limited to {MAX_POSTING_LINES} lines, got {len(lines)}",
+                field="lines"
+            )
+
+        for index, line in enumerate(lines):
+            if line.quantity <= 0:
+                raise ValidationException(f"Line {index + 1}: quantity must be positive", field="quantity")
+            if line.unit_cost is not None and line.unit_cost < 0:
+                raise ValidationException(f"Line {index + 1}: unit cost must be non-negative", field="unit_cost")
+            if line.movement_type == MovementType.TRANSFER:
+                if not line.to_storage_location_id:
+                    raise ValidationException(
+                        f"Line {index + 1}: transfer needs a target storage location",
+                        field="to_storage_location_id"
+                    )
+                if line.to_storage_location_id == line.storage_location_id:
+                    raise ValidationException(
+                        f"Line {index + 1}: transfer source and target location are the same",
+                        field="to_storage_location_id"
+                    )
+            elif line.to_storage_location_id:
+                raise ValidationException(
+                    f"Line {index + 1}: only transfers have a target storage location",
+                    field="to_storage_location_id"
+                )
+
+    def _load_materials(self, organization_id: int, material_ids: set) -> Dict[int, Material]:
+        """Load all materials of the batch in one query; all must exist and be active."""
+        materials = {
+            material.id: material
+            for material in self.db.query(Material).filter(
+                Material.organization_id == organization_id,
+                Material.id.in_(material_ids)
+            )
+        }
+        for material_id in sorted(material_ids):
+            material = materials.get(material_id)
+            if not material:
+                raise EntityNotFoundException(entity_type="Material", entity_id=material_id)
+            if not material.is_active:
+                raise ValidationException(
+                    f"Material '{material.material_number}' is inactive",
+                    field="material_id"
+                )
+        return materials
+
+    def _load_locations(self, organization_id: int, location_ids: set) -> Dict[int, StorageLocation]:
+        """Load all storage locations of the batch in one query; all must exist and be active."""
+        locations = {
+            location.id: location
+            for location in self.db.query(StorageLocation).filter(
+                StorageLocation.organization_id == organization_id,
+                StorageLocation.id.in_(location_ids)
+            )
+        }
+        for location_id in sorted(location_ids):
+            location = locations.get(location_id)
+            if not location:
+                raise EntityNotFoundException(entity_type="StorageLocation", entity_id=location_id)
+            if not location.is_active:
+                raise ValidationException(
+                    f"Storage location '{location.location_code}' is inactive",
+                    field="storage_location_id"
+                )
+        return locations
+
+    def _resolve_unit_costs(
+        self,
+        organization_id: int,
+        plant_id: int,
+        lines: List[PostingLine],
+        materials: Dict[int, Material]
+    ) -> List[float]:
+        """
+        Unit cost per line: the line's own cost, else the material's current
+        average cost, else its standard cost (one query for the whole batch).
+        """
+        uncosted = {line.material_id for line in lines if line.unit_cost is None}
+        costs: Dict[int, Decimal] = {}
+        if uncosted:
+            for costing in self.db.query(MaterialCosting).filter(
+                MaterialCosting.organization_id == organization_id,
+                MaterialCosting.plant_id == plant_id,
+                MaterialCosting.material_id.in_(uncosted),
+                MaterialCosting.is_active.is_(True)
+            ):
+                cost = costing.current_average_cost if costing.current_average_cost is not None else costing.standard_cost
+                if cost is not None:
+                    costs[costing.material_id] = cost
+
+        unit_costs = []
+        for line in lines:
+            cost = line.unit_cost if line.unit_cost is not None else costs.get(line.material_id)
+            if cost is None:
+                raise ValidationException(
+                    f"Cannot determine cost for material '{materials[line.material_id].material_number}'. "
+                    f"No unit cost given and no average or standard cost defined.",
+                    field="unit_cost"
+                )
+            unit_costs.append(float(cost))
+        return unit_costs
+
+    def _lock_inventory(
+        self,
+        organization_id: int,
+        plant_id: int,
+        keys: List[InventoryKey]
+    ) -> Dict[InventoryKey, Inventory]:
+        """Lock the inventory rows of the batch in key order and return them by key."""
+        rows = self.db.query(Inventory).filter(
+            Inventory.organization_id == organization_id,
+            Inventory.plant_id == plant_id,
+            tuple_(Inventory.material_id, Inventory.storage_location_id, Inventory.batch_number).in_(keys)
+        ).order_by(
+            Inventory.material_id, Inventory.storage_location_id, Inventory.batch_number
+        ).with_for_update().all()
+        return {(row.material_id, row.storage_location_id, row.batch_number): row for row in rows}
+
+    def _find_posting(self, organization_id: int, idempotency_key: str) -> Optional[InventoryPosting]:
+        """Get a posting by idempotency key."""
+        return self.db.query(InventoryPosting).filter(
+            InventoryPosting.organization_id == organization_id,
+            InventoryPosting.idempotency_key == idempotency_key
+        ).first()
+
+    def _replay(self, posting: InventoryPosting, request_hash: str) -> PostingResult:
+        """Return a stored posting for a retried request."""
+        if posting.request_hash != request_hash:
+            raise ConflictException(
+                resource_type="InventoryPosting",
+                message=f"Idempotency key '{posting.idempotency_key}' was already used for a different posting"
+            )
+        logger.info(f"Replayed inventory posting {posting.id} for key '{posting.idempotency_key}'")
+        return PostingResult(posting_id=posting.id, transactions=list(posting.transactions), replayed=True)
+
+    @staticmethod
+    def _request_hash(lines: List[PostingLine], transaction_reference: str) -> str:
+        """Stable hash of the posted lines, used to detect reuse of an idempotency key."""
+        payload = [transaction_reference] + [
+            [
+                line.movement_type.value, line.material_id, line.storage_location_id,
+                str(Decimal(str(line.quantity)).normalize()), line.batch_number, line.to_storage_location_id,
+                None if line.unit_cost is None else str(Decimal(str(line.unit_cost)).normalize()),
+            ]
+            for line in lines
+        ]
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
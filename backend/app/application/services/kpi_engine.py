@@ -0,0 +1,609 @@
+"""
+KPI Engine - Set-based KPI calculation shared by the KPI API and dashboards.
+
+Every KPI type is registered with the measures it needs (sums and counts over
+production logs, machine status history, machines, inspection logs and work
+orders) and a formula over those measures. For one calculation:
+
+- One SQL statement returns every measure for the current period and the
+  previous period of the same length (aggregate FILTER clauses over the union
+  of both periods), so the trend costs no second round trip
+- With a drill-down dimension (plant, line, machine, shift or product) the
+  statement groups by it; totals are the sum of the groups, so the KPI value
+  and its breakdown come from the same rows
+- Results are cached per tenant (kpi_result_cache) for KPI_CACHE_SECONDS
+
+Measures are additive, so ratios (OEE, FPY, OTD, ...) are computed from the
+summed measures of a group, never by averaging per-row ratios.
+"""
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, exists, func, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.entities.machine import MachineStatus
+from app.infrastructure.cache.kpi_result_cache import kpi_result_cache
+from app.models.inspection import InspectionLog
+from app.models.machine import Machine, MachineStatusHistory
+from app.models.production_log import ProductionLog
+from app.models.work_order import OrderStatus, WorkOrder
+
+
+logger = logging.getLogger(__name__)
+
+# Core tables: statements are built without configuring the ORM mappers
+_logs = ProductionLog.__table__
+_status_history = MachineStatusHistory.__table__
+_machines = Machine.__table__
+_inspections = InspectionLog.__table__
+_work_orders = WorkOrder.__table__
+
+# Drill-down dimensions and the filter key selecting values of each
+KPI_DIMENSIONS = {
+    "plant": "plant_id",
+    "line": "line_id",
+    "machine": "machine_id",
+    "shift": "shift_id",
+    "product": "product_id",
+}
+KPI_FILTERS = {filter_key: dimension for dimension, filter_key in KPI_DIMENSIONS.items()}
+
+# Period used when a request has no date range
+DEFAULT_PERIOD_DAYS = 30
+
+Period = Tuple[datetime, datetime]
+
+
+@dataclass(frozen=True)
+class KPISource:
+    """
+    A table KPI measures are aggregated from.
+
+    Attributes:
+        table: Table the statement selects from
+        organization_column: Tenant column
+        dimensions: Drill-down dimension -> (column, join needed for it or None)
+        joins: Join name -> (table, ON clause), outer-joined on demand
+        always_join: Joins every statement needs (e.g. for the tenant column)
+        in_period: (start, end) -> condition for rows counted in that period;
+            None for sources without time (counted in both periods)
+        conditions: Conditions every row must meet
+    """
+
+    table: Any
+    organization_column: Any
+    dimensions: Dict[str, Tuple[Any, Optional[str]]]
+    joins: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    always_join: Tuple[str, ...] = ()
+    in_period: Optional[Callable[[datetime, datetime], Any]] = None
+    conditions: Tuple[Any, ...] = ()
+
+
+def _between(column) -> Callable[[datetime, datetime], Any]:
+    return lambda start, end: and_(column >= start, column < end)
+
+
+def _downtime_overlaps(start: datetime, end: datetime):
+    return and_(
+        _status_history.c.started_at < end,
+        func.coalesce(_status_history.c.ended_at, func.now()) > start
+    )
+
+
+_WORK_ORDER_DUE = func.coalesce(_work_orders.c.end_date_actual, _work_orders.c.end_date_planned)
+
+KPI_SOURCES: Dict[str, KPISource] = {
+    "production": KPISource(
+        table=_logs,
+        organization_column=_logs.c.organization_id,
+        dimensions={
+            "plant": (_logs.c.plant_id, None),
+            "line": (_machines.c.work_center_id, "machine"),
+            "machine": (_logs.c.machine_id, None),
+            "shift": (_logs.c.shift_id, None),
+            "product": (_work_orders.c.material_id, "work_order"),
+        },
+        joins={
+            "machine": (_machines, _machines.c.id == _logs.c.machine_id),
+            "work_order": (_work_orders, _work_orders.c.id == _logs.c.work_order_id),
+        },
+        in_period=_between(_logs.c.timestamp),
+    ),
+    "downtime": KPISource(
+        table=_status_history,
+        organization_column=_machines.c.organization_id,
+        dimensions={
+            "plant": (_machines.c.plant_id, None),
+            "line": (_machines.c.work_center_id, None),
+            "machine": (_status_history.c.machine_id, None),
+        },
+        joins={"machine": (_machines, _machines.c.id == _status_history.c.machine_id)},
+        always_join=("machine",),
+        in_period=_downtime_overlaps,
+        conditions=(_status_history.c.status.in_([MachineStatus.DOWN, MachineStatus.MAINTENANCE]),),
+    ),
+    "machines": KPISource(
+        table=_machines,
+        organization_column=_machines.c.organization_id,
+        dimensions={
+            "plant": (_machines.c.plant_id, None),
+            "line": (_machines.c.work_center_id, None),
+            "machine": (_machines.c.id, None),
+        },
+        conditions=(_machines.c.is_active == True,),  # noqa: E712
+    ),
+    "inspections": KPISource(
+        table=_inspections,
+        organization_column=_inspections.c.organization_id,
+        dimensions={
+            "plant": (_inspections.c.plant_id, None),
+            "product": (_work_orders.c.material_id, "work_order"),
+        },
+        joins={"work_order": (_work_orders, _work_orders.c.id == _inspections.c.work_order_id)},
+        in_period=_between(_inspections.c.inspected_at),
+    ),
+    "work_orders": KPISource(
+        table=_work_orders,
+        organization_column=_work_orders.c.organization_id,
+        dimensions={
+            "plant": (_work_orders.c.plant_id, None),
+            "product": (_work_orders.c.material_id, None),
+        },
+        in_period=_between(_WORK_ORDER_DUE),
+        conditions=(_work_orders.c.order_status == OrderStatus.COMPLETED,),
+    ),
+}
+
+
+# Measure expressions: (period start, period end) -> value summed per row
+def _constant(value) -> Callable[[datetime, datetime], Any]:
+    return lambda start, end: literal(value)
+
+
+def _column(column) -> Callable[[datetime, datetime], Any]:
+    return lambda start, end: column
+
+
+def _downtime_minutes(start: datetime, end: datetime):
+    # Only the part of a status interval that falls inside the period counts
+    return func.extract(
+        'epoch',
+        func.least(func.coalesce(_status_history.c.ended_at, func.now()), end)
+        - func.greatest(_status_history.c.started_at, start)
+    ) / 60.0
+
+
+def _flag(condition) -> Callable[[datetime, datetime], Any]:
+    return lambda start, end: case((condition, 1), else_=0)
+
+
+_ON_TIME = or_(
+    _work_orders.c.end_date_actual <= _work_orders.c.end_date_planned,
+    _work_orders.c.end_date_actual.is_(None)
+)
+_WITHOUT_FAILED_INSPECTION = ~exists().where(
+    _inspections.c.work_order_id == _work_orders.c.id,
+    _inspections.c.failed_quantity > 0
+)
+
+_MEASURES: Dict[str, Tuple[str, Callable[[datetime, datetime], Any]]] = {
+    "produced": ("production", _column(_logs.c.quantity_produced)),
+    "scrapped": ("production", _column(_logs.c.quantity_scrapped)),
+    "reworked": ("production", _column(_logs.c.quantity_reworked)),
+    "downtime_minutes": ("downtime", _downtime_minutes),
+    "machine_count": ("machines", _constant(1)),
+    "inspected": ("inspections", _column(_inspections.c.inspected_quantity)),
+    "passed": ("inspections", _column(_inspections.c.passed_quantity)),
+    "failed": ("inspections", _column(_inspections.c.failed_quantity)),
+    "completed_orders": ("work_orders", _constant(1)),
+    "on_time_orders": ("work_orders", _flag(_ON_TIME)),
+    "quality_orders": ("work_orders", _flag(_WITHOUT_FAILED_INSPECTION)),
+    "delay_days": ("work_orders", lambda start, end: func.coalesce(
+        func.extract('epoch', _work_orders.c.end_date_actual - _work_orders.c.end_date_planned) / 86400.0, 0
+    )),
+    "delay_count": ("work_orders", _flag(and_(
+        _work_orders.c.end_date_actual.isnot(None), _work_orders.c.end_date_planned.isnot(None)
+    ))),
+}
+
+
+def _percent(numerator: float, denominator: float) -> float:
+    return numerator / denominator * 100 if denominator > 0 else 0.0
+
+
+def _oee(m: Dict[str, float], period_hours: float) -> Dict[str, float]:
+    planned_minutes = m["machine_count"] * period_hours * 60
+    operating_minutes = max(planned_minutes - m["downtime_minutes"], 0.0)
+    good = m["produced"] - m["scrapped"]
+    availability = operating_minutes / planned_minutes if planned_minutes > 0 else 0.0
+    # No ideal cycle times yet: performance is 100% when anything was produced
+    performance = 1.0 if m["produced"] > 0 else 0.0
+    quality = good / m["produced"] if m["produced"] > 0 else 0.0
+    return {
+        "value": availability * performance * quality * 100,
+        "availability": availability * 100,
+        "performance": performance * 100,
+        "quality": quality * 100,
+        "planned_minutes": planned_minutes,
+        "downtime_minutes": m["downtime_minutes"],
+        "total_pieces": m["produced"],
+        "good_pieces": good,
+    }
+
+
+def _fpy(m: Dict[str, float], period_hours: float) -> Dict[str, float]:
+    return {
+        "value": _percent(m["passed"], m["inspected"]),
+        "total_inspected": m["inspected"],
+        "total_passed": m["passed"],
+        "total_failed": m["failed"],
+        "defect_rate": _percent(m["failed"], m["inspected"]),
+    }
+
+
+def _otd(m: Dict[str, float], period_hours: float) -> Dict[str, float]:
+    return {
+        "value": _percent(m["on_time_orders"], m["completed_orders"]),
+        "total_completed": m["completed_orders"],
+        "on_time": m["on_time_orders"],
+        "late": m["completed_orders"] - m["on_time_orders"],
+        "average_delay_days": m["delay_days"] / m["delay_count"] if m["delay_count"] else 0.0,
+    }
+
+
+def _oqd(m: Dict[str, float], period_hours: float) -> Dict[str, float]:
+    return {
+        "value": _percent(m["quality_orders"], m["completed_orders"]),
+        "total_completed": m["completed_orders"],
+        "without_failed_inspection": m["quality_orders"],
+    }
+
+
+def _downtime(m: Dict[str, float], period_hours: float) -> Dict[str, float]:
+    return {"value": m["downtime_minutes"]}
+
+
+def _yield(m: Dict[str, float], period_hours: float) -> Dict[str, float]:
+    return {
+        "value": _percent(m["produced"] - m["scrapped"], m["produced"]),
+        "total_pieces": m["produced"],
+        "scrapped_pieces": m["scrapped"],
+        "reworked_pieces": m["reworked"],
+    }
+
+
+def _throughput(m: Dict[str, float], period_hours: float) -> Dict[str, float]:
+    good = m["produced"] - m["scrapped"]
+    return {
+        "value": good / period_hours if period_hours > 0 else 0.0,
+        "good_pieces": good,
+        "period_hours": period_hours,
+    }
+
+
+@dataclass(frozen=True)
+class KPIDefinition:
+    """A KPI type: its unit, the measures it needs and its formula."""
+
+    unit: str
+    measures: Tuple[str, ...]
+    formula: Callable[[Dict[str, float], float], Dict[str, float]]
+
+    @property
+    def sources(self) -> List[str]:
+        return list(dict.fromkeys(_MEASURES[measure][0] for measure in self.measures))
+
+    @property
+    def dimensions(self) -> List[str]:
+        """Dimensions every source of the KPI can be grouped and filtered by."""
+        return [
+            dimension for dimension in KPI_DIMENSIONS
+            if all(dimension in KPI_SOURCES[source].dimensions for source in self.sources)
+        ]
+
+
+KPI_REGISTRY: Dict[str, KPIDefinition] = {
+    "OEE": KPIDefinition("%", ("produced", "scrapped", "downtime_minutes", "machine_count"), _oee),
+    "FPY": KPIDefinition("%", ("inspected", "passed", "failed"), _fpy),
+    "OTD": KPIDefinition("%", ("completed_orders", "on_time_orders", "delay_days", "delay_count"), _otd),
+    "OQD": KPIDefinition("%", ("completed_orders", "quality_orders"), _oqd),
+    "DOWNTIME": KPIDefinition("min", ("downtime_minutes",), _downtime),
+    "YIELD": KPIDefinition("%", ("produced", "scrapped", "reworked"), _yield),
+    "THROUGHPUT": KPIDefinition("units/h", ("produced", "scrapped"), _throughput),
+}
+
+
+def parse_kpi_period(date_range: Optional[Dict[str, Any]]) -> Period:
+    """
+    Convert a {"start", "end"} date range to a half-open period.
+
+    A date-only end includes that whole day. Without a date range the period
+    is the last DEFAULT_PERIOD_DAYS days up to the end of today (UTC), so
+    repeated requests share one cache entry.
+
+    Raises:
+        ValueError: If a date is malformed or start is not before end
+    """
+    date_range = date_range or {}
+    if date_range.get("end"):
+        end = _parse_datetime(date_range["end"], end_of_day=True)
+    else:
+        end = datetime.combine(datetime.now(timezone.utc).date() + timedelta(days=1),
+                               datetime.min.time(), tzinfo=timezone.utc)
+    if date_range.get("start"):
+        start = _parse_datetime(date_range["start"], end_of_day=False)
+    else:
+        start = end - timedelta(days=DEFAULT_PERIOD_DAYS)
+
+    if start.tzinfo is None and end.tzinfo is not None:
+        start = start.replace(tzinfo=end.tzinfo)
+    elif end.tzinfo is None and start.tzinfo is not None:
+        end = end.replace(tzinfo=start.tzinfo)
+    if start >= end:
+        raise ValueError("date_range start must be before end")
+    return start, end
+
+
+def _parse_datetime(value: Any, end_of_day: bool) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        parsed, date_only = datetime.combine(value, datetime.min.time()), True
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError(f"Invalid date '{value}' in date_range")
+        date_only = len(str(value)) == 10
+    return parsed + timedelta(days=1) if date_only and end_of_day else parsed
+
+
+class KPIEngine:
+    """
+    Calculates registered KPIs with trend and optional drill-down.
+    """
+
+    def __init__(self, db: Session, cache=None):
+        """
+        Initialize KPI engine.
+
+        Args:
+            db: SQLAlchemy session (tenant RLS context already set)
+            cache: KPI result cache (default: kpi_result_cache)
+        """
+        self.db = db
+        self.cache = cache or kpi_result_cache
+
+    @staticmethod
+    def validate(
+        kpi_type: str,
+        filters: Optional[Dict[str, Any]] = None,
+        breakdown_by: Optional[str] = None
+    ) -> KPIDefinition:
+        """
+        Check a KPI request against the registry.
+
+        Returns:
+            KPIDefinition of kpi_type
+
+        Raises:
+            ValueError: If the KPI type, a filter or the breakdown is unsupported
+        """
+        definition = KPI_REGISTRY.get(kpi_type)
+        if definition is None:
+            raise ValueError(f"Unknown KPI type '{kpi_type}'. Must be one of {list(KPI_REGISTRY)}")
+
+        for filter_key in filters or {}:
+            if filter_key not in KPI_FILTERS:
+                raise ValueError(f"Unknown KPI filter '{filter_key}'. Must be one of {list(KPI_FILTERS)}")
+            if KPI_FILTERS[filter_key] not in definition.dimensions:
+                raise ValueError(f"KPI {kpi_type} cannot be filtered by {filter_key}")
+
+        if breakdown_by is not None and breakdown_by not in definition.dimensions:
+            raise ValueError(
+                f"KPI {kpi_type} cannot be broken down by '{breakdown_by}'. "
+                f"Must be one of {definition.dimensions}"
+            )
+        return definition
+
+    def calculate(
+        self,
+        organization_id: int,
+        kpi_type: str,
+        period: Period,
+        filters: Optional[Dict[str, Any]] = None,
+        breakdown_by: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate a KPI for a period, with its trend against the previous one.
+
+        Args:
+            organization_id: Tenant
+            kpi_type: Registered KPI type (OEE, FPY, OTD, ...)
+            period: Half-open (start, end); the previous period is the same
+                length immediately before start
+            filters: Dimension filters (plant_id, line_id, machine_id,
+                shift_id, product_id), each an ID or a list of IDs
+            breakdown_by: Drill-down dimension (plant, line, machine, shift,
+                product)
+
+        Returns:
+            kpi_type, value, previous_value, trend (percent change), unit,
+            breakdown (formula components; "by" and "groups" for drill-down),
+            calculated_at and period
+
+        Raises:
+            ValueError: If the request does not fit the KPI
+        """
+        filters = filters or {}
+        definition = self.validate(kpi_type, filters, breakdown_by)
+
+        key = self._cache_key(kpi_type, period, filters, breakdown_by)
+        cached = self.cache.get(organization_id, key)
+        if cached is not None:
+            return cached
+
+        rows = self.db.execute(
+            self.build_query(definition, organization_id, period, filters, breakdown_by)
+        ).all()
+        result = self.evaluate(kpi_type, definition, rows, period, breakdown_by)
+
+        self.cache.set(organization_id, key, result, settings.KPI_CACHE_SECONDS)
+        return result
+
+    def build_query(
+        self,
+        definition: KPIDefinition,
+        organization_id: int,
+        period: Period,
+        filters: Dict[str, Any],
+        breakdown_by: Optional[str] = None
+    ):
+        """
+        Build the statement returning one row per group (a single row without
+        breakdown): group key, then <measure>_current and <measure>_previous.
+        """
+        start, end = period
+        previous_start = start - (end - start)
+        labels = [
+            f"{measure}_{suffix}" for measure in definition.measures for suffix in ("current", "previous")
+        ]
+
+        selects = []
+        for source_name in definition.sources:
+            source = KPI_SOURCES[source_name]
+            needed_joins = set()
+
+            if breakdown_by:
+                group_column, join = source.dimensions[breakdown_by]
+                needed_joins.add(join)
+            else:
+                group_column = None
+
+            conditions = [source.organization_column == organization_id, *source.conditions]
+            if source.in_period is not None:
+                conditions.append(source.in_period(previous_start, end))
+            for filter_key, value in filters.items():
+                column, join = source.dimensions[KPI_FILTERS[filter_key]]
+                needed_joins.add(join)
+                conditions.append(column.in_(value) if isinstance(value, (list, tuple)) else column == value)
+
+            columns = [(group_column if group_column is not None else null()).label("group_key")]
+            for measure in definition.measures:
+                measure_source, expression = _MEASURES[measure]
+                for suffix, (period_start, period_end) in (
+                    ("current", (start, end)), ("previous", (previous_start, start))
+                ):
+                    label = f"{measure}_{suffix}"
+                    if measure_source != source_name:
+                        columns.append(null().label(label))
+                    elif source.in_period is None:
+                        columns.append(func.sum(expression(period_start, period_end)).label(label))
+                    else:
+                        columns.append(
+                            func.sum(expression(period_start, period_end))
+                            .filter(source.in_period(period_start, period_end))
+                            .label(label)
+                        )
+
+            from_clause = source.table
+            for join in sorted(j for j in needed_joins | set(source.always_join) if j):
+                join_table, onclause = source.joins[join]
+                from_clause = from_clause.outerjoin(join_table, onclause)
+
+            statement = select(*columns).select_from(from_clause).where(*conditions)
+            if group_column is not None:
+                statement = statement.group_by(group_column)
+            selects.append(statement)
+
+        if len(selects) == 1:
+            return selects[0]
+
+        combined = union_all(*selects).subquery("kpi_measures")
+        return select(
+            combined.c.group_key,
+            *[func.sum(combined.c[label]).label(label) for label in labels]
+        ).group_by(combined.c.group_key)
+
+    @staticmethod
+    def evaluate(
+        kpi_type: str,
+        definition: KPIDefinition,
+        rows,
+        period: Period,
+        breakdown_by: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Apply the KPI formula to the totals and to every group."""
+        start, end = period
+        period_hours = (end - start).total_seconds() / 3600
+
+        def measures(row_values: List[Dict[str, float]], suffix: str) -> Dict[str, float]:
+            return {
+                measure: sum(values.get(f"{measure}_{suffix}", 0.0) for values in row_values)
+                for measure in definition.measures
+            }
+
+        # Sums come back as Decimal/float; a source with no rows gives NULL
+        row_values = [
+            {label: float(value or 0) for label, value in row._mapping.items() if label != "group_key"}
+            for row in rows
+        ]
+
+        current = definition.formula(measures(row_values, "current"), period_hours)
+        previous = definition.formula(measures(row_values, "previous"), period_hours)
+        breakdown: Dict[str, Any] = {
+            name: round(value, 2) for name, value in current.items() if name != "value"
+        }
+
+        if breakdown_by:
+            groups = []
+            for row, values in zip(rows, row_values):
+                group_current = definition.formula(measures([values], "current"), period_hours)
+                group_previous = definition.formula(measures([values], "previous"), period_hours)
+                groups.append({
+                    KPI_DIMENSIONS[breakdown_by]: row.group_key,
+                    "value": round(group_current["value"], 2),
+                    "previous_value": round(group_previous["value"], 2),
+                    "trend": KPIEngine._trend(group_current["value"], group_previous["value"]),
+                    **{name: round(value, 2) for name, value in group_current.items() if name != "value"},
+                })
+            groups.sort(key=lambda group: group["value"])
+            breakdown["by"] = breakdown_by
+            breakdown["groups"] = groups
+
+        return {
+            "kpi_type": kpi_type,
+            "value": round(current["value"], 2),
+            "previous_value": round(previous["value"], 2),
+            "trend": KPIEngine._trend(current["value"], previous["value"]),
+            "unit": definition.unit,
+            "breakdown": breakdown,
+            "calculated_at": datetime.now(timezone.utc),
+            "period": {"start": start.isoformat(), "end": end.isoformat()},
+        }
+
+    @staticmethod
+    def _trend(current: float, previous: float) -> Optional[float]:
+        """Percent change from the previous period (None without a baseline)."""
+        if not previous:
+            return None
+        return round((current - previous) / abs(previous) * 100, 2)
+
+    @staticmethod
+    def _cache_key(
+        kpi_type: str,
+        period: Period,
+        filters: Dict[str, Any],
+        breakdown_by: Optional[str]
+    ) -> str:
+        canonical = json.dumps(
+            [kpi_type, period[0].isoformat(), period[1].isoformat(), filters, breakdown_by],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
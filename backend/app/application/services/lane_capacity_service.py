@@ -0,0 +1,212 @@
+"""
+Application service for lane capacity planning.
+
+Builds on LaneRepository.get_capacity_calendar (one query per plant and
+date range) to provide:
+- Capacity calendar and heatmap (lanes x days)
+- Overbooking detection (days where allocations exceed lane capacity)
+- Best-fit lane suggestion for a new lane assignment
+"""
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.application.dtos.lane_dto import (
+    LaneCapacityCalendarResponse,
+    LaneCapacityHeatmapLane,
+    LaneCapacityHeatmapResponse,
+    LaneOverbookingResponse,
+    LaneSuggestionRequest,
+    LaneSuggestionResponse,
+)
+from app.infrastructure.repositories.lane_repository import LaneRepository
+
+
+logger = logging.getLogger(__name__)
+
+# Longest date range served by one calendar request
+MAX_CALENDAR_DAYS = 366
+
+
+class LaneCapacityService:
+    """
+    Application service for lane capacity planning.
+
+    Every operation reads the capacity of all lanes in scope over the whole
+    range with a single repository call.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize lane capacity service.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+        self.repo = LaneRepository(db)
+
+    def get_calendar(
+        self,
+        plant_id: int,
+        start_date: date,
+        end_date: date,
+        lane_ids: Optional[List[int]] = None
+    ) -> LaneCapacityCalendarResponse:
+        """
+        Get allocated, available capacity and utilization per lane per day.
+
+        Args:
+            plant_id: Plant ID
+            start_date: First day
+            end_date: Last day (inclusive)
+            lane_ids: Optional lanes to restrict to
+
+        Returns:
+            LaneCapacityCalendarResponse
+
+        Raises:
+            ValueError: If the date range is invalid or too long
+        """
+        self._validate_range(start_date, end_date)
+        return LaneCapacityCalendarResponse(
+            plant_id=plant_id,
+            start_date=start_date,
+            end_date=end_date,
+            lanes=self.repo.get_capacity_calendar(plant_id, start_date, end_date, lane_ids)
+        )
+
+    def get_heatmap(self, plant_id: int, start_date: date, end_date: date) -> LaneCapacityHeatmapResponse:
+        """
+        Get the lane calendar heatmap: utilization rate per lane per day.
+
+        Args:
+            plant_id: Plant ID
+            start_date: First day
+            end_date: Last day (inclusive)
+
+        Returns:
+            LaneCapacityHeatmapResponse with one utilization row per lane
+
+        Raises:
+            ValueError: If the date range is invalid or too long
+        """
+        calendar = self.get_calendar(plant_id, start_date, end_date)
+        dates = [day.date for day in calendar.lanes[0].days] if calendar.lanes else []
+
+        return LaneCapacityHeatmapResponse(
+            plant_id=plant_id,
+            dates=dates,
+            lanes=[
+                LaneCapacityHeatmapLane(
+                    lane_id=lane.lane_id,
+                    lane_code=lane.lane_code,
+                    lane_name=lane.lane_name,
+                    total_capacity=lane.total_capacity,
+                    utilization_rates=[day.utilization_rate for day in lane.days],
+                    overbooked_days=sum(1 for day in lane.days if day.available_capacity < 0)
+                )
+                for lane in calendar.lanes
+            ]
+        )
+
+    def find_overbookings(
+        self,
+        plant_id: int,
+        start_date: date,
+        end_date: date
+    ) -> List[LaneOverbookingResponse]:
+        """
+        Find periods where a lane's allocated capacity exceeds its daily capacity.
+
+        Consecutive overbooked days of a lane are reported as one period.
+
+        Args:
+            plant_id: Plant ID
+            start_date: First day
+            end_date: Last day (inclusive)
+
+        Returns:
+            List of LaneOverbookingResponse ordered by lane and start date
+
+        Raises:
+            ValueError: If the date range is invalid or too long
+        """
+        overbookings = []
+        for lane in self.get_calendar(plant_id, start_date, end_date).lanes:
+            period = None
+            for day in lane.days + [None]:
+                if day is not None and day.available_capacity < 0:
+                    if period is None:
+                        period = LaneOverbookingResponse(
+                            lane_id=lane.lane_id,
+                            lane_code=lane.lane_code,
+                            start_date=day.date,
+                            end_date=day.date,
+                            total_capacity=lane.total_capacity,
+                            peak_allocated_capacity=day.allocated_capacity,
+                            peak_overbooked_capacity=-day.available_capacity
+                        )
+                    period.end_date = day.date
+                    period.peak_allocated_capacity = max(period.peak_allocated_capacity, day.allocated_capacity)
+                    period.peak_overbooked_capacity = max(period.peak_overbooked_capacity, -day.available_capacity)
+                elif period is not None:
+                    overbookings.append(period)
+                    period = None
+
+        if overbookings:
+            logger.warning(f"Found {len(overbookings)} overbooked lane periods in plant {plant_id}")
+
+        return overbookings
+
+    def suggest_lanes(self, request: LaneSuggestionRequest) -> List[LaneSuggestionResponse]:
+        """
+        Rank eligible lanes for a new assignment by best fit.
+
+        A lane is eligible when it has the requested capacity available on
+        every day of the window. Lanes are ranked by the capacity left on the
+        tightest day after the assignment (smallest first), which keeps
+        larger gaps free for larger assignments; ties go to the lower lane ID.
+
+        Args:
+            request: Window, capacity and optional eligible lanes
+
+        Returns:
+            Eligible lanes, best fit first (empty if no lane fits)
+
+        Raises:
+            ValueError: If the date range is too long
+        """
+        calendar = self.get_calendar(
+            request.plant_id, request.scheduled_start, request.scheduled_end, request.lane_ids
+        )
+
+        suggestions = []
+        for lane in calendar.lanes:
+            min_available = min(day.available_capacity for day in lane.days)
+            if min_available < request.allocated_capacity:
+                continue
+
+            peak_allocated = max(day.allocated_capacity for day in lane.days) + request.allocated_capacity
+            suggestions.append(LaneSuggestionResponse(
+                lane_id=lane.lane_id,
+                lane_code=lane.lane_code,
+                lane_name=lane.lane_name,
+                total_capacity=lane.total_capacity,
+                min_available_capacity=min_available,
+                remaining_capacity=min_available - request.allocated_capacity,
+                peak_utilization_rate=(peak_allocated / lane.total_capacity * 100).quantize(Decimal("0.01"))
+            ))
+
+        suggestions.sort(key=lambda suggestion: (suggestion.remaining_capacity, suggestion.lane_id))
+        return suggestions
+
+    def _validate_range(self, start_date: date, end_date: date) -> None:
+        """Validate a calendar date range."""
+        if end_date < start_date:
+            raise ValueError("end_date must be on or after start_date")
+        if (end_date - start_date).days + 1 > MAX_CALENDAR_DAYS:
+            raise ValueError(f"Date range cannot exceed {MAX_CALENDAR_DAYS} days")
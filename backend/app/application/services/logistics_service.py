@@ -26,6 +26,11 @@ from app.infrastructure.repositories.logistics_repository import (
     QRCodeScanRepository,
 )
 from app.infrastructure.messaging.pgmq_tasks import get_pgmq_client
+from app.infrastructure.cache.barcode_resolution_cache import (
+    BARCODE_RESOLUTION_TTL_SECONDS,
+    barcode_resolution_cache,
+)
+from app.models.logistics import ScanResolution
 
 logger = logging.getLogger(__name__)
 
@@ -467,7 +472,7 @@ class LogisticsService:
             scan_value: Scanned value
             operation_type: Optional operation (receiving, shipping, inventory, production)
             metadata: Optional metadata
-            **kwargs: Additional scan attributes (location, device_id, etc.)
+            **kwargs: Additional scan attributes (scan_location, device_id, etc.)
 
         Returns:
             Dictionary with scan details and resolved entity
@@ -475,59 +480,94 @@ class LogisticsService:
         logger.info(f"Processing scan: {scan_value} by user {scanned_by_user_id}")
 
         # Attempt to resolve entity from barcode value
-        entity = self._resolve_barcode(scan_value)
-
-        # Determine resolution status
-        if entity:
-            resolution_status = "resolved"
-            entity_type = entity["entity_type"]
-            entity_id = entity["entity_id"]
-        else:
-            resolution_status = "not_found"
-            entity_type = None
-            entity_id = None
-
-        # Record scan
-        scan_data = {
-            "organization_id": org_id,
-            "plant_id": plant_id,
-            "scanned_by": scanned_by_user_id,
-            "scan_type": scan_type,
-            "scan_value": scan_value,
-            "entity_type": entity_type,
-            "entity_id": entity_id,
-            "resolution_status": resolution_status,
-            "operation_type": operation_type,
-            "metadata": metadata,
+        entity = self._resolve_barcode(scan_value, org_id)
+
+        scan = self._scan_repo.create(self._scan_record(
+            org_id,
+            plant_id,
+            scanned_by_user_id,
+            scan_value,
+            entity,
+            operation_context=operation_type,
+            scan_data=json.dumps({"scan_type": scan_type, **(metadata or {})}),
             **kwargs,
-        }
-
-        scan = self._scan_repo.create(scan_data)
+        ))
 
         logger.info(
-            f"Recorded scan {scan.id}: {resolution_status} "
-            f"({entity_type}/{entity_id if resolved else 'N/A'})"
+            f"Recorded scan {scan.id}: {scan.scan_resolution} "
+            f"({scan.entity_type}/{scan.entity_id if entity else 'N/A'})"
         )
 
         return {
             "scan_id": scan.id,
             "scan_value": scan_value,
-            "resolution_status": resolution_status,
+            "resolution_status": scan.scan_resolution,
             "entity": entity,
-            "scanned_at": scan.scanned_at.isoformat(),
+            "scanned_at": scan.scan_timestamp.isoformat(),
+        }
+
+    def ingest_scans(
+        self,
+        org_id: int,
+        plant_id: int,
+        scanned_by_user_id: int,
+        scans: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Record a batch of scans synced from a handheld device's offline queue.
+
+        Distinct codes are resolved through the barcode resolution cache,
+        with one query for all misses; the scans are then written with one
+        INSERT. Scans already recorded (same device, code and timestamp) are
+        skipped, so a device can safely resend a batch.
+
+        Args:
+            org_id: Organization ID
+            plant_id: Plant ID
+            scanned_by_user_id: User ID who scanned
+            scans: Scan dictionaries with scan_code, scan_timestamp and
+                optional QRCodeScan attributes (device_id, operation_context, ...)
+
+        Returns:
+            Dictionary with received, recorded, duplicates, resolved and
+            not_found counts
+        """
+        entities = self._resolve_barcodes(org_id, [scan["scan_code"] for scan in scans])
+
+        rows = [
+            self._scan_record(org_id, plant_id, scanned_by_user_id, scan["scan_code"], entities[scan["scan_code"]], **{
+                key: value for key, value in scan.items() if key != "scan_code"
+            })
+            for scan in scans
+        ]
+        recorded = self._scan_repo.create_batch(rows)
+        resolved = sum(1 for scan in scans if entities[scan["scan_code"]])
+
+        logger.info(
+            f"Ingested {recorded} of {len(scans)} scans for org {org_id} "
+            f"({resolved} resolved)"
+        )
+
+        return {
+            "received": len(scans),
+            "recorded": recorded,
+            "duplicates": len(scans) - recorded,
+            "resolved": resolved,
+            "not_found": len(scans) - resolved,
         }
 
-    def lookup_barcode(self, barcode_value: str) -> Optional[Dict[str, Any]]:
+    def lookup_barcode(self, barcode_value: str, org_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         Look up entity by barcode value.
 
         Args:
             barcode_value: Barcode value to search
+            org_id: Organization ID (enables the resolution cache)
 
         Returns:
             Entity dictionary or None if not found
         """
-        return self._resolve_barcode(barcode_value)
+        return self._resolve_barcode(barcode_value, org_id)
 
     def get_scan_history(
         self,
@@ -578,20 +618,59 @@ class LogisticsService:
 
     # ==================== Helper Methods ====================
 
-    def _resolve_barcode(self, barcode_value: str) -> Optional[Dict[str, Any]]:
+    def _resolve_barcode(self, barcode_value: str, org_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         Resolve barcode value to entity.
 
-        Looks up barcode in barcode_labels table.
+        Looks up barcode in barcode_labels table, through the barcode
+        resolution cache when the organization is known.
 
         Args:
             barcode_value: Barcode value to resolve
+            org_id: Organization ID (None bypasses the cache)
 
         Returns:
             Dictionary with entity_type and entity_id, or None if not found
         """
-        label = self._label_repo.get_by_value(barcode_value)
+        if org_id is None:
+            return self._label_to_entity(self._label_repo.get_by_value(barcode_value))
+
+        return self._resolve_barcodes(org_id, [barcode_value])[barcode_value]
+
+    def _resolve_barcodes(self, org_id: int, barcode_values: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve many barcode values, querying only cache misses (in one query).
+
+        Args:
+            org_id: Organization ID
+            barcode_values: Barcode values to resolve (duplicates allowed)
 
+        Returns:
+            Dictionary of barcode value to entity dictionary or None
+        """
+        entities: Dict[str, Optional[Dict[str, Any]]] = {}
+        misses = []
+        for barcode_value in set(barcode_values):
+            cached = barcode_resolution_cache.get(org_id, barcode_value)
+            if cached is None:
+                misses.append(barcode_value)
+            else:
+                entities[barcode_value] = cached or None
+
+        if misses:
+            labels = self._label_repo.get_by_values(org_id, misses)
+            for barcode_value in misses:
+                entity = self._label_to_entity(labels.get(barcode_value))
+                # Unknown codes are cached as {} so repeated misreads stay in memory
+                barcode_resolution_cache.set(
+                    org_id, barcode_value, entity or {}, BARCODE_RESOLUTION_TTL_SECONDS
+                )
+                entities[barcode_value] = entity
+
+        return entities
+
+    def _label_to_entity(self, label: Optional[Any]) -> Optional[Dict[str, Any]]:
+        """Convert BarcodeLabel to the resolved entity dictionary."""
         if not label:
             return None
 
@@ -602,6 +681,28 @@ class LogisticsService:
             "label_id": label.id,
         }
 
+    def _scan_record(
+        self,
+        org_id: int,
+        plant_id: int,
+        scanned_by_user_id: int,
+        scan_code: str,
+        entity: Optional[Dict[str, Any]],
+        **attributes,
+    ) -> Dict[str, Any]:
+        """Build QRCodeScan attributes for a scan resolved to entity (or None)."""
+        return {
+            "scan_timestamp": datetime.utcnow(),
+            **attributes,
+            "organization_id": org_id,
+            "plant_id": plant_id,
+            "scanned_by_user_id": scanned_by_user_id,
+            "scan_code": scan_code,
+            "scan_resolution": (ScanResolution.SUCCESS if entity else ScanResolution.NOT_FOUND).value,
+            "entity_type": entity["entity_type"] if entity else None,
+            "entity_id": entity["entity_id"] if entity else None,
+        }
+
     def _shipment_to_dict(self, shipment: Any) -> Dict[str, Any]:
         """Convert shipment entity to dictionary."""
         return {
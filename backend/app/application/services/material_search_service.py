@@ -2,7 +2,8 @@
 MaterialSearchService - Application service for material search.
 
 Provides search functionality with filtering and result formatting.
-Coordinates between repository and presentation layers.
+Coordinates between repository and presentation layers. Filters are passed
+to the repository query, never applied to a fetched page.
 """
 from typing import Optional, List, Dict
 import logging
@@ -13,13 +14,16 @@ from app.models.material import Material
 
 logger = logging.getLogger(__name__)
 
+# Filters accepted by search(), each a search_materials argument
+SEARCH_FILTERS = ("category_id", "procurement_type", "mrp_type", "is_active")
+
 
 class MaterialSearchService:
     """
     Application service for material search operations.
 
-    Combines repository search with filtering and formats results
-    for presentation layer.
+    Runs filtered repository searches and formats results for the
+    presentation layer.
     """
 
     def __init__(self, repository: MaterialRepository):
@@ -51,20 +55,23 @@ class MaterialSearchService:
 
         Returns:
             List of material dictionaries with search results
+
+        Raises:
+            ValueError: On an unknown filter
         """
+        unknown = set(filters or {}) - set(SEARCH_FILTERS)
+        if unknown:
+            raise ValueError(f"Unsupported search filters: {sorted(unknown)}")
+
         if not query or not query.strip():
             logger.debug("Empty search query, returning empty results")
             return []
 
-        # Get materials from repository
+        # Filters go into the query so the limit applies to matching materials
         materials = self._repository.search_materials(
-            query=query, org_id=organization_id, plant_id=plant_id, limit=limit
+            query=query, org_id=organization_id, plant_id=plant_id, limit=limit, **(filters or {})
         )
 
-        # Apply additional filters (post-search filtering)
-        if filters:
-            materials = self._apply_filters(materials, filters)
-
         # Format results for presentation
         results = [self._format_material(material) for material in materials]
 
@@ -75,37 +82,6 @@ class MaterialSearchService:
 
         return results
 
-    def _apply_filters(self, materials: List[Material], filters: dict) -> List[Material]:
-        """
-        Apply post-search filters to material list.
-
-        Args:
-            materials: List of Material entities
-            filters: Filter dictionary
-
-        Returns:
-            Filtered list of materials
-        """
-        filtered = materials
-
-        if "category_id" in filters:
-            filtered = [
-                m for m in filtered if m.material_category_id == filters["category_id"]
-            ]
-
-        if "procurement_type" in filters:
-            filtered = [
-                m for m in filtered if m.procurement_type.value == filters["procurement_type"]
-            ]
-
-        if "mrp_type" in filters:
-            filtered = [m for m in filtered if m.mrp_type.value == filters["mrp_type"]]
-
-        if "is_active" in filters:
-            filtered = [m for m in filtered if m.is_active == filters["is_active"]]
-
-        return filtered
-
     def _format_material(self, material: Material) -> Dict:
         """
         Format Material entity as dictionary for API response.
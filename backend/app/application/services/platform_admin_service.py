@@ -20,6 +20,8 @@ from app.models.subscription import (
 from app.models.admin_audit_log import AdminAuditLogModel
 from app.infrastructure.persistence.models import UserModel
 from app.infrastructure.security.jwt_handler import JWTHandler
+from app.infrastructure.repositories.tenant_directory_repository import TenantDirectoryRepository
+from app.infrastructure.repositories.platform_metrics_repository import PlatformMetricsRepository
 from app.core.exceptions import (
     ResourceNotFoundException,
     ValidationException,
@@ -46,6 +48,8 @@ class PlatformAdminService:
         """
         self.db = db
         self.jwt_handler = JWTHandler()
+        self.tenant_directory = TenantDirectoryRepository(db)
+        self.platform_metrics = PlatformMetricsRepository(db)
 
     # ========================================================================
     # ORGANIZATION MANAGEMENT
@@ -57,81 +61,39 @@ class PlatformAdminService:
         status: Optional[str] = None,
         tier: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        fuzzy: bool = False
     ) -> Tuple[List[Dict[str, Any]], int, bool]:
         """
         List all organizations with filters and pagination
 
+        Each page, including usage, last activity and total count, is read
+        with a single query (see TenantDirectoryRepository).
+
         Args:
             search: Search by name, subdomain, or org_code
             status: Filter by active status ("active", "inactive", "all")
             tier: Filter by subscription tier
             limit: Results per page
-            offset: Pagination offset
+            offset: Pagination offset (ignored when after_id is given)
+            after_id: Keyset cursor - last organization id of the previous page
+            fuzzy: Also match organization names by trigram similarity
 
         Returns:
             tuple: (organizations list, total count, has_more)
         """
         try:
-            query = self.db.query(Organization).join(
-                SubscriptionModel,
-                Organization.id == SubscriptionModel.organization_id
+            return self.tenant_directory.list_page(
+                search=search,
+                status=status,
+                tier=tier,
+                limit=limit,
+                after_id=after_id,
+                offset=offset,
+                fuzzy=fuzzy
             )
 
-            # Apply filters
-            if search:
-                search_pattern = f"%{search}%"
-                query = query.filter(or_(
-                    Organization.org_name.ilike(search_pattern),
-                    Organization.org_code.ilike(search_pattern),
-                    Organization.subdomain.ilike(search_pattern)
-                ))
-
-            if status and status != "all":
-                is_active = status == "active"
-                query = query.filter(Organization.is_active == is_active)
-
-            if tier:
-                query = query.filter(SubscriptionModel.tier == tier)
-
-            # Get total count
-            total_count = query.count()
-
-            # Get paginated results with subscription info
-            organizations = query.limit(limit).offset(offset).all()
-
-            # Enrich with additional data
-            result = []
-            for org in organizations:
-                subscription = org.subscription
-
-                # Get usage data
-                usage = self.db.query(SubscriptionUsageModel).filter(
-                    SubscriptionUsageModel.organization_id == org.id
-                ).order_by(desc(SubscriptionUsageModel.measured_at)).first()
-
-                # Get last activity (last updated user or entity)
-                last_active = self._get_last_activity(org.id)
-
-                result.append({
-                    "id": org.id,
-                    "org_code": org.org_code,
-                    "org_name": org.org_name,
-                    "subdomain": org.subdomain,
-                    "is_active": org.is_active,
-                    "subscription_tier": subscription.tier if subscription else "unknown",
-                    "subscription_status": subscription.status if subscription else "unknown",
-                    "user_count": usage.current_users if usage else 0,
-                    "plant_count": usage.current_plants if usage else 0,
-                    "storage_used_gb": float(usage.storage_used_gb) if usage else 0.0,
-                    "last_active_at": last_active,
-                    "created_at": org.created_at
-                })
-
-            has_more = (offset + limit) < total_count
-
-            return result, total_count, has_more
-
         except Exception as e:
             logger.error(f"Failed to list organizations: {e}", exc_info=True)
             raise
@@ -172,13 +134,8 @@ class PlatformAdminService:
                 "created_at": subscription.created_at
             } if subscription else None
 
-            # Get usage
-            usage = self.db.query(SubscriptionUsageModel).filter(
-                SubscriptionUsageModel.organization_id == organization_id
-            ).order_by(desc(SubscriptionUsageModel.measured_at)).first()
-
-            # Get additional metrics
-            metrics = self._get_organization_metrics(organization_id)
+            # Usage, last activity and entity counts in one query
+            stats = self.tenant_directory.get_stats(organization_id) or {}
 
             return {
                 "id": org.id,
@@ -189,13 +146,13 @@ class PlatformAdminService:
                 "created_at": org.created_at,
                 "updated_at": org.updated_at,
                 "subscription": subscription_data,
-                "user_count": usage.current_users if usage else 0,
-                "plant_count": usage.current_plants if usage else 0,
-                "storage_used_gb": float(usage.storage_used_gb) if usage else 0.0,
-                "last_active_at": self._get_last_activity(organization_id),
-                "total_work_orders": metrics["work_orders"],
-                "total_materials": metrics["materials"],
-                "total_machines": metrics["machines"]
+                "user_count": stats.get("user_count", 0),
+                "plant_count": stats.get("plant_count", 0),
+                "storage_used_gb": stats.get("storage_used_gb", 0.0),
+                "last_active_at": stats.get("last_active_at"),
+                "total_work_orders": stats.get("work_orders", 0),
+                "total_materials": stats.get("materials", 0),
+                "total_machines": stats.get("machines", 0)
             }
 
         except ResourceNotFoundException:
@@ -507,58 +464,26 @@ class PlatformAdminService:
         """
         Get platform-wide KPI metrics
 
+        All KPIs come from a single aggregate statement
+        (see PlatformMetricsRepository.get_kpis).
+
         Returns:
             Dictionary with platform metrics
         """
         try:
-            # Organization counts
-            total_orgs = self.db.query(Organization).count()
-            active_orgs = self.db.query(Organization).filter(
-                Organization.is_active == True
-            ).count()
-            inactive_orgs = total_orgs - active_orgs
-
-            # Subscription counts
-            active_subs = self.db.query(SubscriptionModel).filter(
-                SubscriptionModel.status == "active"
-            ).count()
-
-            trial_subs = self.db.query(SubscriptionModel).filter(
-                SubscriptionModel.status == "trial"
-            ).count()
-
-            cancelled_subs = self.db.query(SubscriptionModel).filter(
-                SubscriptionModel.status == "cancelled"
-            ).count()
-
-            # Calculate MRR (Monthly Recurring Revenue)
-            # This is a simplified calculation - in production, integrate with Stripe
-            mrr = self._calculate_mrr()
-
-            # Total users across all organizations
-            total_users = self.db.query(UserModel).count()
-
-            # Total plants
-            from app.models.plant import Plant
-            total_plants = self.db.query(Plant).count()
-
-            # Total storage used
-            storage_result = self.db.query(
-                func.sum(SubscriptionUsageModel.storage_used_gb)
-            ).scalar()
-            total_storage_gb = float(storage_result) if storage_result else 0.0
+            kpis = self.platform_metrics.get_kpis()
 
             return {
-                "total_organizations": total_orgs,
-                "active_organizations": active_orgs,
-                "inactive_organizations": inactive_orgs,
-                "active_subscriptions": active_subs,
-                "trial_subscriptions": trial_subs,
-                "cancelled_subscriptions": cancelled_subs,
-                "monthly_recurring_revenue": mrr,
-                "total_users": total_users,
-                "total_plants": total_plants,
-                "storage_used_gb": total_storage_gb,
+                "total_organizations": kpis["total_organizations"],
+                "active_organizations": kpis["active_organizations"],
+                "inactive_organizations": kpis["total_organizations"] - kpis["active_organizations"],
+                "active_subscriptions": kpis["active_subscriptions"],
+                "trial_subscriptions": kpis["trial_subscriptions"],
+                "cancelled_subscriptions": kpis["cancelled_subscriptions"],
+                "monthly_recurring_revenue": Decimal(kpis["mrr_cents"]) / 100,
+                "total_users": kpis["total_users"],
+                "total_plants": kpis["total_plants"],
+                "storage_used_gb": float(kpis["storage_used_gb"] or 0),
                 "measured_at": datetime.utcnow()
             }
 
@@ -570,6 +495,9 @@ class PlatformAdminService:
         """
         Get growth metrics over time period
 
+        Reads the platform_metrics_daily series for the period instead of
+        rescanning subscriptions.
+
         Args:
             period_days: Number of days to analyze (default 30)
 
@@ -577,51 +505,37 @@ class PlatformAdminService:
             Growth metrics including signups, conversions, churn
         """
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=period_days)
-
-            # New signups (organizations created)
-            signups = self.db.query(
-                func.date(Organization.created_at).label('date'),
-                func.count(Organization.id).label('count')
-            ).filter(
-                Organization.created_at >= cutoff_date
-            ).group_by(
-                func.date(Organization.created_at)
-            ).all()
-
-            # Trial conversions
-            conversions = self.db.query(
-                func.date(SubscriptionModel.updated_at).label('date'),
-                func.count(SubscriptionModel.id).label('count')
-            ).filter(and_(
-                SubscriptionModel.trial_converted == True,
-                SubscriptionModel.updated_at >= cutoff_date
-            )).group_by(
-                func.date(SubscriptionModel.updated_at)
-            ).all()
+            today = datetime.utcnow().date()
+            series = self.platform_metrics.get_daily_series(
+                today - timedelta(days=period_days), today
+            )
 
-            # Churn count (subscriptions cancelled in period)
-            churn_count = self.db.query(SubscriptionModel).filter(and_(
-                SubscriptionModel.status == "cancelled",
-                SubscriptionModel.cancelled_at >= cutoff_date
-            )).count()
+            churn_count = sum(day["churned_subscriptions"] for day in series)
 
-            # Calculate churn rate
-            total_active_start = self.db.query(SubscriptionModel).filter(
-                SubscriptionModel.status.in_(["active", "trial"])
-            ).count()
+            # Churn rate relative to subscriptions at the start of the period
+            first = series[0] if series else None
+            last = series[-1] if series else None
+            total_active_start = (
+                first["active_subscriptions"] + first["trial_subscriptions"] if first else 0
+            )
             churn_rate = (churn_count / total_active_start * 100) if total_active_start > 0 else 0
 
             # MRR growth
-            mrr_current = self._calculate_mrr()
-            mrr_start = self._calculate_mrr(as_of=cutoff_date)
+            mrr_start = Decimal(first["mrr_cents"]) / 100 if first else Decimal("0.00")
+            mrr_current = Decimal(last["mrr_cents"]) / 100 if last else Decimal("0.00")
             mrr_growth = mrr_current - mrr_start
             mrr_growth_pct = (mrr_growth / mrr_start * 100) if mrr_start > 0 else 0
 
             return {
                 "period_days": period_days,
-                "signups": [{"date": s.date, "value": s.count} for s in signups],
-                "trial_conversions": [{"date": c.date, "value": c.count} for c in conversions],
+                "signups": [
+                    {"date": day["metric_date"], "value": day["signups"]}
+                    for day in series if day["signups"]
+                ],
+                "trial_conversions": [
+                    {"date": day["metric_date"], "value": day["trial_conversions"]}
+                    for day in series if day["trial_conversions"]
+                ],
                 "churn_count": churn_count,
                 "churn_rate": round(Decimal(str(churn_rate)), 2),
                 "mrr_growth": round(Decimal(str(mrr_growth)), 2),
@@ -866,99 +780,6 @@ class PlatformAdminService:
     # HELPER METHODS
     # ========================================================================
 
-    def _get_last_activity(self, organization_id: int) -> Optional[datetime]:
-        """Get last activity timestamp for organization"""
-        try:
-            # Check last user update
-            last_user = self.db.query(func.max(UserModel.updated_at)).filter(
-                UserModel.organization_id == organization_id
-            ).scalar()
-
-            return last_user
-
-        except Exception as e:
-            logger.error(f"Failed to get last activity: {e}")
-            return None
-
-    def _get_organization_metrics(self, organization_id: int) -> Dict[str, int]:
-        """Get additional metrics for organization"""
-        try:
-            from app.models.work_order import WorkOrder
-            from app.models.material import Material
-            from app.models.machine import Machine
-
-            work_orders = self.db.query(WorkOrder).filter(
-                WorkOrder.organization_id == organization_id
-            ).count()
-
-            materials = self.db.query(Material).filter(
-                Material.organization_id == organization_id
-            ).count()
-
-            machines = self.db.query(Machine).filter(
-                Machine.organization_id == organization_id
-            ).count()
-
-            return {
-                "work_orders": work_orders,
-                "materials": materials,
-                "machines": machines
-            }
-
-        except Exception as e:
-            logger.error(f"Failed to get organization metrics: {e}")
-            return {"work_orders": 0, "materials": 0, "machines": 0}
-
-    def _calculate_mrr(self, as_of: Optional[datetime] = None) -> Decimal:
-        """
-        Calculate Monthly Recurring Revenue
-
-        This is a simplified calculation. In production, integrate with Stripe
-        to get actual billing amounts.
-        """
-        try:
-            # Simplified: Estimate based on tier and billing cycle
-            # In production, query Stripe for actual amounts
-            tier_prices = {
-                "starter": Decimal("99.00"),
-                "professional": Decimal("299.00"),
-                "enterprise": Decimal("999.00")
-            }
-
-            query = self.db.query(
-                SubscriptionModel.tier,
-                SubscriptionModel.billing_cycle,
-                func.count(SubscriptionModel.id).label('count')
-            ).filter(
-                SubscriptionModel.status == "active"
-            )
-
-            if as_of:
-                query = query.filter(SubscriptionModel.created_at <= as_of)
-
-            results = query.group_by(
-                SubscriptionModel.tier,
-                SubscriptionModel.billing_cycle
-            ).all()
-
-            total_mrr = Decimal("0.00")
-            for tier, cycle, count in results:
-                base_price = tier_prices.get(tier, Decimal("0.00"))
-
-                # Convert annual to monthly
-                if cycle == "annual":
-                    monthly_price = base_price * Decimal("0.83")  # Annual discount
-                else:
-                    monthly_price = base_price
-
-                total_mrr += monthly_price * count
-
-            return total_mrr
-
-        except Exception as e:
-            logger.error(f"Failed to calculate MRR: {e}")
-            return Decimal("0.00")
-
     def _subscription_to_dict(self, subscription: SubscriptionModel) -> Dict[str, Any]:
         """Convert subscription model to dictionary"""
         return {
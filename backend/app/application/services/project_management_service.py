@@ -1,10 +1,11 @@
 """
 Project Management Service - Business logic for documents, milestones, RDA, BOM
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+from app.domain.services.critical_path import build_milestone_network, planned_end_slack
 from app.models.project_management import ProjectDocument, ProjectMilestone, RDADrawing, ProjectBOM
 from app.infrastructure.repositories.project_management_repository import (
     ProjectDocumentRepository,
@@ -25,6 +26,7 @@ from app.application.dtos.project_management_dto import (
     ProjectBOMUpdateDTO,
     DocumentVersionCreateDTO,
     MilestoneProgressUpdateDTO,
+    MilestoneScheduleResponse,
 )
 
 
@@ -163,8 +165,58 @@ class ProjectMilestoneService:
         return [m for m in all_milestones if m.is_overdue()]
 
     def get_critical_path(self, project_id: int) -> List[ProjectMilestone]:
-        """Get critical path milestones"""
-        return self.repo.list_by_project(project_id, limit=1000, critical_only=True)
+        """Get critical path milestones (zero float against the earliest project finish), by earliest date"""
+        milestones = self.repo.list_by_project(project_id, limit=None)
+        project_start, _ = self.repo.get_project_window(project_id)
+        network, _ = build_milestone_network(milestones, project_start)
+        by_id = {m.id: m for m in milestones}
+        return [by_id[milestone_id] for milestone_id in network.critical_path()]
+
+    def get_schedule(self, project_id: int,
+                     durations: Optional[Dict[int, int]] = None) -> List[MilestoneScheduleResponse]:
+        """
+        Get earliest/latest dates and float of every milestone (CPM).
+
+        See build_milestone_network for how milestone durations are derived.
+        Total float is measured against the earliest project finish (the
+        critical path has zero float); planned_end_float_days against the
+        project's planned end.
+
+        Args:
+            project_id: Project ID
+            durations: What-if durations in days per milestone ID, applied
+                incrementally on top of the current schedule
+
+        Raises:
+            ValueError: On a dependency cycle or an unknown milestone in durations
+        """
+        rows = self.repo.get_schedule_rows(project_id)
+        project_start, project_end = self.repo.get_project_window(project_id)
+        network, origin = build_milestone_network(rows, project_start)
+        for milestone_id, days in (durations or {}).items():
+            if milestone_id not in network:
+                raise ValueError(f"Milestone {milestone_id} is not an active milestone of project {project_id}")
+            network.update_duration(milestone_id, days)
+
+        slack = planned_end_slack(network, origin, project_end)
+        by_id = {row.id: row for row in rows}
+        schedule = []
+        for milestone_id, times in network.schedule().items():
+            row = by_id[milestone_id]
+            schedule.append(MilestoneScheduleResponse(
+                milestone_id=row.id,
+                milestone_code=row.milestone_code,
+                milestone_name=row.milestone_name,
+                planned_date=row.planned_date,
+                duration_days=round(times.duration),
+                earliest_date=origin + timedelta(days=times.earliest_finish),
+                latest_date=origin + timedelta(days=times.latest_finish),
+                total_float_days=round(times.total_float),
+                planned_end_float_days=round(times.total_float + slack),
+                free_float_days=round(times.free_float),
+                is_critical=times.is_critical,
+            ))
+        return sorted(schedule, key=lambda item: (item.earliest_date, item.milestone_id))
 
 
 class RDADrawingService:
@@ -0,0 +1,256 @@
+"""
+Report Execution Runner - Background execution of queued reports.
+
+ReportingService.execute_report records a PENDING execution and queues its
+id to PGMQ (report_executions). Workers take executions from the queue:
+
+- Claim: PENDING -> RUNNING, at most REPORT_MAX_CONCURRENT_PER_TENANT running
+  per organization; a busy tenant's message is made visible again after
+  REPORT_BUSY_RETRY_SECONDS. Workers heartbeat on claim, before the query,
+  after every chunk and before the upload. A RUNNING execution silent for
+  longer than the visibility timeout and the export statement timeout (plus
+  REPORT_STALE_MARGIN_SECONDS) belongs to a dead worker: it no longer counts
+  towards the cap and is claimed again under a new claim token, and the old
+  worker stops at its next heartbeat. A message finding its execution still
+  running elsewhere is checked again after the visibility timeout
+- JSON (no export format): aggregated rows stored on the execution
+  (bounded by REPORT_MAX_ROWS)
+- CSV/XLSX/PDF: rows streamed from a server-side cursor in chunks into an
+  export writer backed by a temporary file, then uploaded to MinIO; progress
+  and row counts are committed after every chunk, and a cancellation request
+  stops the export at the next chunk
+"""
+import logging
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.application.services.report_query_engine import ReportQueryEngine
+from app.core.config import settings
+from app.infrastructure.reporting.export_writers import CONTENT_TYPES, create_export_writer
+from app.infrastructure.repositories.reporting_repository import (
+    CLAIMED,
+    TENANT_BUSY,
+    ExecutionClaimLost,
+    ReportExecutionRepository,
+)
+
+
+logger = logging.getLogger(__name__)
+
+REPORT_EXECUTION_QUEUE = "report_executions"
+
+
+class ReportExecutionCancelled(Exception):
+    """Raised inside an export when its cancellation was requested."""
+
+
+class ReportExecutionRunner:
+    """
+    Runs queued report executions.
+
+    Bookkeeping (claim, progress, result) is committed on db; the report query
+    itself streams on a separate session from stream_session_factory, because
+    committing progress would close a server-side cursor on the same
+    connection.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        stream_session_factory: Optional[Callable[[], Session]] = None,
+        storage=None
+    ):
+        """
+        Initialize report execution runner.
+
+        Args:
+            db: SQLAlchemy session for execution bookkeeping
+            stream_session_factory: Creates the session the report query
+                streams on (default: new session on db's engine)
+            storage: MinIOClient for exports (created on first export)
+        """
+        self.db = db
+        self.execution_repo = ReportExecutionRepository(db)
+        self.stream_session_factory = stream_session_factory or (lambda: Session(bind=db.get_bind()))
+        self._storage = storage
+
+    @property
+    def storage(self):
+        """MinIO client, created on first use."""
+        if self._storage is None:
+            from app.infrastructure.storage.minio_client import MinIOClient
+            self._storage = MinIOClient()
+        return self._storage
+
+    def process_queue_batch(self, pgmq_client, batch_size: int = 1, vt: int = 600) -> Dict[str, int]:
+        """
+        Read report executions from PGMQ and run them.
+
+        Handled messages are archived. Messages of organizations already at
+        their concurrency cap are put back; a message whose execution is
+        still RUNNING on another worker is checked again after vt, so if
+        that worker dies its execution is claimed again once stale.
+
+        Args:
+            pgmq_client: PGMQClient instance
+            batch_size: Maximum messages per batch
+            vt: Visibility timeout in seconds (must exceed an export's runtime)
+
+        Returns:
+            Count of executions per outcome
+        """
+        messages = pgmq_client.dequeue_batch(REPORT_EXECUTION_QUEUE, batch_size, vt=vt)
+        stale_after = self.stale_after_seconds(vt)
+
+        outcomes: Dict[str, int] = {}
+        handled = []
+        for message in messages:
+            outcome = self.run_execution(message.message.get("execution_id"), stale_after_seconds=stale_after)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if outcome == TENANT_BUSY:
+                pgmq_client.set_visibility_timeout(
+                    REPORT_EXECUTION_QUEUE, message.msg_id, settings.REPORT_BUSY_RETRY_SECONDS
+                )
+            elif outcome == 'RUNNING':
+                pgmq_client.set_visibility_timeout(REPORT_EXECUTION_QUEUE, message.msg_id, vt)
+            else:
+                handled.append(message.msg_id)
+
+        pgmq_client.archive_batch(REPORT_EXECUTION_QUEUE, handled)
+        return outcomes
+
+    @staticmethod
+    def stale_after_seconds(vt: int) -> int:
+        """
+        Heartbeat age after which a RUNNING execution is taken over.
+
+        Above both the visibility timeout and the export statement timeout,
+        the longest a live worker can wait on one fetch without a heartbeat.
+        """
+        statement_timeout = settings.REPORT_EXPORT_STATEMENT_TIMEOUT_MS // 1000
+        return max(vt, statement_timeout) + settings.REPORT_STALE_MARGIN_SECONDS
+
+    def run_execution(self, execution_id: int, stale_after_seconds: int = 2100) -> str:
+        """
+        Claim and run one execution.
+
+        Args:
+            execution_id: Execution ID
+            stale_after_seconds: Heartbeat age after which a RUNNING execution
+                is taken over from its worker
+
+        Returns:
+            Final status (COMPLETED, FAILED, CANCELLED), TENANT_BUSY if the
+            organization is at its concurrency cap, 'missing', 'SUPERSEDED'
+            if another worker took the execution over meanwhile, or the
+            current status of an execution that could not be claimed
+        """
+        claim_token = str(uuid.uuid4())
+        claim = self.execution_repo.claim(
+            execution_id, settings.REPORT_MAX_CONCURRENT_PER_TENANT, stale_after_seconds, claim_token
+        )
+        if claim != CLAIMED:
+            return claim
+
+        execution = self.execution_repo.get_by_id(execution_id)
+        report = execution.report
+        start_time = datetime.now(timezone.utc)
+
+        try:
+            if execution.export_format in CONTENT_TYPES:
+                self._export(execution, report, start_time, claim_token)
+            else:
+                result_data = ReportQueryEngine(self.db).run(
+                    report.query_definition, report.organization_id, execution.parameters
+                )
+                stored = self.execution_repo.update_result(
+                    execution_id,
+                    result_count=len(result_data['rows']),
+                    result_data=result_data,
+                    execution_time_ms=self._elapsed_ms(start_time),
+                    rows_processed=len(result_data['rows']),
+                    claim_token=claim_token
+                )
+                if stored is None:
+                    raise ExecutionClaimLost(f"Report execution {execution_id} is no longer owned by this worker")
+        except ExecutionClaimLost:
+            logger.warning(f"Report execution {execution_id} was taken over by another worker; stopping")
+            return 'SUPERSEDED'
+        except ReportExecutionCancelled:
+            logger.info(f"Report execution {execution_id} cancelled")
+            self.execution_repo.update_status(execution_id, 'CANCELLED', claim_token=claim_token)
+            return 'CANCELLED'
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Report execution {execution_id} failed: {e}", exc_info=True)
+            self.execution_repo.update_status(execution_id, 'FAILED', error_message=str(e), claim_token=claim_token)
+            return 'FAILED'
+
+        return 'COMPLETED'
+
+    def _export(self, execution, report, start_time: datetime, claim_token: str) -> None:
+        """Stream the report into an export file and upload it to MinIO."""
+        export_format = execution.export_format
+        export_file = tempfile.NamedTemporaryFile(suffix=f".{export_format.lower()}", delete=False)
+        stream_db = self.stream_session_factory()
+        try:
+            with export_file:
+                # Planning and the first fetch can take up to the statement timeout
+                if self.execution_repo.heartbeat(execution.id, claim_token=claim_token):
+                    raise ReportExecutionCancelled()
+                columns, estimated_rows, chunks = ReportQueryEngine(stream_db).stream(
+                    report.query_definition, report.organization_id, execution.parameters
+                )
+                self.execution_repo.record_progress(
+                    execution.id, 0, 0, estimated_rows=estimated_rows, claim_token=claim_token
+                )
+
+                writer = create_export_writer(export_format, export_file, columns)
+                for chunk in chunks:
+                    writer.write_rows(chunk)
+                    percent = min(99, writer.rows_written * 100 // estimated_rows) if estimated_rows else 0
+                    if self.execution_repo.record_progress(
+                        execution.id, writer.rows_written, percent, claim_token=claim_token
+                    ):
+                        raise ReportExecutionCancelled()
+                writer.close()
+            stream_db.close()
+
+            if self.execution_repo.heartbeat(execution.id, claim_token=claim_token):
+                raise ReportExecutionCancelled()
+            object_name = self.storage.build_object_path(
+                str(report.organization_id), "reports", str(execution.id),
+                f"{report.report_code}.{export_format.lower()}"
+            )
+            self.storage.upload_file(export_file.name, object_name, content_type=CONTENT_TYPES[export_format])
+        finally:
+            stream_db.close()
+            os.unlink(export_file.name)
+
+        stored = self.execution_repo.update_result(
+            execution.id,
+            result_count=writer.rows_written,
+            result_data={
+                "columns": columns,
+                "summary": {"total_rows": writer.rows_written, "estimated_rows": estimated_rows},
+            },
+            result_file_path=object_name,
+            execution_time_ms=self._elapsed_ms(start_time),
+            rows_processed=writer.rows_written,
+            claim_token=claim_token
+        )
+        if stored is None:
+            raise ExecutionClaimLost(f"Report execution {execution.id} is no longer owned by this worker")
+        logger.info(
+            f"Report execution {execution.id} exported {writer.rows_written} rows "
+            f"as {export_format} to {object_name}"
+        )
+
+    @staticmethod
+    def _elapsed_ms(start_time: datetime) -> int:
+        return int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
@@ -0,0 +1,640 @@
+"""
+Report Query Engine - Compiles saved report definitions into safe SQL.
+
+A report's query_definition is compiled into a parameterized SQLAlchemy Core
+SELECT that aggregates inside PostgreSQL:
+
+    {
+        "data_source": "production_logs",
+        "dimensions": ["plant_id", "machine_id"],
+        "measures": [
+            {"column": "quantity_produced", "aggregation": "sum", "alias": "produced"},
+            {"column": "*", "aggregation": "count", "alias": "log_count"}
+        ],
+        "filters": [
+            {"column": "plant_id", "operator": "eq", "value": {"param": "plant_id"}}
+        ],
+        "time_grain": "day",
+        "time_range": {"start": {"param": "start"}, "end": {"param": "end"}},
+        "sort": [{"column": "produced", "direction": "desc"}],
+        "limit": 500
+    }
+
+Safety:
+- Only whitelisted columns of whitelisted data sources can be referenced;
+  identifiers never reach the SQL text from user input, values are bound
+- Every query is scoped to the report's organization
+- The time range is applied to the raw time column (never wrapped in
+  date_trunc) so the (organization_id, time) indexes stay usable
+- The planner's estimated cost (EXPLAIN) must be under REPORT_MAX_QUERY_COST
+- The query runs under a transaction-local statement_timeout
+
+Exports use stream(), which applies the REPORT_EXPORT_* limits and reads
+the result through a server-side cursor in fixed-size chunks.
+"""
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Boolean, DateTime, Float, Integer, Numeric, String, and_, column, func, literal_column, select, table, text,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select, TableClause
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReportDataSource:
+    """
+    Whitelisted table a report can query.
+
+    dimensions can be grouped and filtered on, measures can be aggregated
+    and filtered on. time_column is used for time_grain and time_range.
+    """
+
+    table: TableClause
+    dimensions: Tuple[str, ...]
+    measures: Tuple[str, ...]
+    time_column: str
+    requires_time_range: bool = False
+
+    def column(self, name: str):
+        """Get a column of the source table."""
+        return self.table.c[name]
+
+
+REPORT_DATA_SOURCES: Dict[str, ReportDataSource] = {
+    # TimescaleDB hypertable: unbounded scans are rejected up front
+    "production_logs": ReportDataSource(
+        table=table(
+            "production_logs",
+            column("organization_id", Integer),
+            column("plant_id", Integer),
+            column("work_order_id", Integer),
+            column("operation_id", Integer),
+            column("machine_id", Integer),
+            column("operator_id", Integer),
+            column("shift_id", Integer),
+            column("timestamp", DateTime(timezone=True)),
+            column("quantity_produced", Numeric),
+            column("quantity_scrapped", Numeric),
+            column("quantity_reworked", Numeric),
+        ),
+        dimensions=("plant_id", "work_order_id", "operation_id", "machine_id", "operator_id", "shift_id"),
+        measures=("quantity_produced", "quantity_scrapped", "quantity_reworked"),
+        time_column="timestamp",
+        requires_time_range=True,
+    ),
+    "work_orders": ReportDataSource(
+        table=table(
+            "work_order",
+            column("organization_id", Integer),
+            column("plant_id", Integer),
+            column("material_id", Integer),
+            column("order_type", String),
+            column("order_status", String),
+            column("priority", Integer),
+            column("is_rework_order", Boolean),
+            column("created_at", DateTime(timezone=True)),
+            column("planned_quantity", Float),
+            column("actual_quantity", Float),
+            column("total_actual_cost", Float),
+        ),
+        dimensions=("plant_id", "material_id", "order_type", "order_status", "priority", "is_rework_order"),
+        measures=("planned_quantity", "actual_quantity", "total_actual_cost"),
+        time_column="created_at",
+    ),
+    "ncr": ReportDataSource(
+        table=table(
+            "ncr",
+            column("organization_id", Integer),
+            column("plant_id", Integer),
+            column("work_order_id", Integer),
+            column("material_id", Integer),
+            column("defect_type", String),
+            column("status", String),
+            column("disposition_type", String),
+            column("customer_affected", Boolean),
+            column("created_at", DateTime(timezone=True)),
+            column("quantity_defective", Float),
+            column("rework_cost", Float),
+            column("scrap_cost", Float),
+        ),
+        dimensions=(
+            "plant_id", "work_order_id", "material_id", "defect_type", "status",
+            "disposition_type", "customer_affected",
+        ),
+        measures=("quantity_defective", "rework_cost", "scrap_cost"),
+        time_column="created_at",
+    ),
+    "materials": ReportDataSource(
+        table=table(
+            "material",
+            column("organization_id", Integer),
+            column("plant_id", Integer),
+            column("material_category_id", Integer),
+            column("procurement_type", String),
+            column("mrp_type", String),
+            column("is_active", Boolean),
+            column("created_at", DateTime(timezone=True)),
+            column("safety_stock", Float),
+            column("reorder_point", Float),
+            column("lead_time_days", Integer),
+        ),
+        dimensions=("plant_id", "material_category_id", "procurement_type", "mrp_type", "is_active"),
+        measures=("safety_stock", "reorder_point", "lead_time_days"),
+        time_column="created_at",
+    ),
+    "machines": ReportDataSource(
+        table=table(
+            "machine",
+            column("organization_id", Integer),
+            column("plant_id", Integer),
+            column("work_center_id", Integer),
+            column("status", String),
+            column("is_active", Boolean),
+            column("created_at", DateTime(timezone=True)),
+            column("capacity_units_per_hour", Float),
+        ),
+        dimensions=("plant_id", "work_center_id", "status", "is_active"),
+        measures=("capacity_units_per_hour",),
+        time_column="created_at",
+    ),
+    "inspections": ReportDataSource(
+        table=table(
+            "inspection_log",
+            column("organization_id", Integer),
+            column("plant_id", Integer),
+            column("inspection_plan_id", Integer),
+            column("work_order_id", Integer),
+            column("inspector_user_id", Integer),
+            column("inspected_at", DateTime(timezone=True)),
+            column("inspected_quantity", Integer),
+            column("passed_quantity", Integer),
+            column("failed_quantity", Integer),
+        ),
+        dimensions=("plant_id", "inspection_plan_id", "work_order_id", "inspector_user_id"),
+        measures=("inspected_quantity", "passed_quantity", "failed_quantity"),
+        time_column="inspected_at",
+    ),
+    "shipments": ReportDataSource(
+        table=table(
+            "shipment",
+            column("organization_id", Integer),
+            column("plant_id", Integer),
+            column("shipment_type", String),
+            column("shipment_status", String),
+            column("carrier_name", String),
+            column("currency_code", String),
+            column("created_at", DateTime(timezone=True)),
+            column("total_weight", Float),
+            column("total_volume", Float),
+            column("freight_cost", Float),
+        ),
+        dimensions=("plant_id", "shipment_type", "shipment_status", "carrier_name", "currency_code"),
+        measures=("total_weight", "total_volume", "freight_cost"),
+        time_column="created_at",
+    ),
+}
+
+AGGREGATIONS = {
+    "sum": func.sum,
+    "avg": func.avg,
+    "min": func.min,
+    "max": func.max,
+    "count": func.count,
+    "count_distinct": lambda col: func.count(col.distinct()),
+}
+
+FILTER_OPERATORS = {
+    "eq": lambda col, value: col == value,
+    "ne": lambda col, value: col != value,
+    "gt": lambda col, value: col > value,
+    "gte": lambda col, value: col >= value,
+    "lt": lambda col, value: col < value,
+    "lte": lambda col, value: col <= value,
+    "in": lambda col, value: col.in_(value),
+    "not_in": lambda col, value: col.not_in(value),
+    "between": lambda col, value: col.between(value[0], value[1]),
+    "is_null": lambda col, value: col.is_(None),
+    "is_not_null": lambda col, value: col.is_not(None),
+}
+
+LIST_OPERATORS = ("in", "not_in", "between")
+UNARY_OPERATORS = ("is_null", "is_not_null")
+
+TIME_GRAINS = ("hour", "day", "week", "month", "quarter", "year")
+
+# Output column holding the time bucket when time_grain is set
+PERIOD_COLUMN = "period"
+
+
+class ReportQueryCompiler:
+    """
+    Compiles query definitions into parameterized SELECT statements.
+
+    Stateless; validate() checks a definition when a report is saved,
+    compile() builds the statement for one execution.
+    """
+
+    def validate(self, query_def: Dict[str, Any]) -> None:
+        """
+        Validate a query definition without execution parameters.
+
+        Args:
+            query_def: Report query definition
+
+        Raises:
+            ValueError: If the definition references unknown sources, columns,
+                aggregations, operators or grains
+        """
+        self._build(query_def, organization_id=0, parameters=None, row_limit=settings.REPORT_MAX_ROWS)
+
+    def compile(
+        self,
+        query_def: Dict[str, Any],
+        organization_id: int,
+        parameters: Optional[Dict[str, Any]] = None,
+        row_limit: Optional[int] = None
+    ) -> Select:
+        """
+        Compile a query definition for one organization.
+
+        Args:
+            query_def: Report query definition
+            organization_id: Organization the query is scoped to
+            parameters: Execution parameters referenced as {"param": name}
+            row_limit: Maximum rows to return (defaults to REPORT_MAX_ROWS)
+
+        Returns:
+            SELECT statement with all values bound
+
+        Raises:
+            ValueError: If the definition is invalid or a parameter is missing
+        """
+        return self._build(
+            query_def, organization_id, parameters or {}, row_limit or settings.REPORT_MAX_ROWS
+        )
+
+    def _build(
+        self,
+        query_def: Dict[str, Any],
+        organization_id: int,
+        parameters: Optional[Dict[str, Any]],
+        row_limit: int
+    ) -> Select:
+        """Build the statement; parameters=None only checks references."""
+        source_name = query_def.get("data_source")
+        source = REPORT_DATA_SOURCES.get(source_name)
+        if source is None:
+            raise ValueError(f"Invalid data_source. Must be one of {sorted(REPORT_DATA_SOURCES)}")
+
+        dimensions = query_def.get("dimensions") or []
+        measures = query_def.get("measures") or []
+        if not dimensions and not measures and not query_def.get("time_grain"):
+            raise ValueError("Query definition must include dimensions, measures or a time_grain")
+
+        selected = {}
+        group_by = []
+
+        time_grain = query_def.get("time_grain")
+        if time_grain:
+            if time_grain not in TIME_GRAINS:
+                raise ValueError(f"Invalid time_grain '{time_grain}'. Must be one of {list(TIME_GRAINS)}")
+            # Whitelisted grain inlined so SELECT and GROUP BY match textually
+            bucket = func.date_trunc(literal_column(f"'{time_grain}'"), source.column(source.time_column))
+            selected[PERIOD_COLUMN] = bucket.label(PERIOD_COLUMN)
+            group_by.append(bucket)
+
+        for name in dimensions:
+            if name not in source.dimensions:
+                raise ValueError(f"Unknown dimension '{name}' for data source '{source_name}'")
+            if name in selected:
+                raise ValueError(f"Duplicate output column '{name}'")
+            selected[name] = source.column(name)
+            group_by.append(source.column(name))
+
+        for measure in measures:
+            name, expression = self._measure(source, source_name, measure)
+            if name in selected:
+                raise ValueError(f"Duplicate output column '{name}'")
+            selected[name] = expression.label(name)
+
+        conditions = [source.column("organization_id") == organization_id]
+        conditions.extend(self._time_range(source, source_name, query_def.get("time_range"), parameters))
+        for condition in query_def.get("filters") or []:
+            expression = self._filter(source, source_name, condition, parameters)
+            if expression is not None:
+                conditions.append(expression)
+
+        stmt = select(*selected.values()).select_from(source.table).where(and_(*conditions))
+        if group_by and measures:
+            stmt = stmt.group_by(*group_by)
+        elif group_by:
+            stmt = stmt.distinct()
+
+        order_by = [self._sort(selected, sort) for sort in query_def.get("sort") or []]
+        if not order_by:
+            order_by = [selected[name] for name in selected if name == PERIOD_COLUMN or name in dimensions]
+        if order_by:
+            stmt = stmt.order_by(*order_by)
+
+        limit = query_def.get("limit")
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ValueError("limit must be a positive integer")
+        return stmt.limit(min(limit or row_limit, row_limit))
+
+    def _measure(self, source: ReportDataSource, source_name: str, measure: Dict[str, Any]):
+        """Build one aggregate expression; returns (output name, expression)."""
+        column_name = measure.get("column")
+        aggregation = measure.get("aggregation", "sum")
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Invalid aggregation '{aggregation}'. Must be one of {list(AGGREGATIONS)}")
+
+        if column_name == "*":
+            if aggregation != "count":
+                raise ValueError("Only the count aggregation can be applied to '*'")
+            expression = func.count()
+        elif column_name in source.measures or (aggregation.startswith("count") and column_name in source.dimensions):
+            expression = AGGREGATIONS[aggregation](source.column(column_name))
+        else:
+            raise ValueError(f"Unknown measure '{column_name}' for data source '{source_name}'")
+
+        alias = measure.get("alias") or (
+            "count" if column_name == "*" else f"{aggregation}_{column_name}"
+        )
+        if not isinstance(alias, str) or not alias.isidentifier():
+            raise ValueError(f"Invalid measure alias '{alias}'")
+        return alias, expression
+
+    def _filter(
+        self,
+        source: ReportDataSource,
+        source_name: str,
+        condition: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]]
+    ):
+        """Build one WHERE condition on a whitelisted column."""
+        column_name = condition.get("column")
+        if column_name not in source.dimensions + source.measures + (source.time_column,):
+            raise ValueError(f"Unknown filter column '{column_name}' for data source '{source_name}'")
+
+        operator = condition.get("operator", "eq")
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"Invalid filter operator '{operator}'. Must be one of {list(FILTER_OPERATORS)}")
+
+        value = None
+        if operator not in UNARY_OPERATORS:
+            if "value" not in condition:
+                raise ValueError(f"Filter on '{column_name}' must include a value")
+            value = self._resolve(condition["value"], parameters)
+            if value is None and parameters is None:
+                # Parameter reference checked without execution parameters
+                return None
+            if operator in LIST_OPERATORS:
+                if not isinstance(value, list) or not value:
+                    raise ValueError(f"Filter operator '{operator}' requires a non-empty list value")
+                if operator == "between" and len(value) != 2:
+                    raise ValueError("Filter operator 'between' requires exactly two values")
+
+        return FILTER_OPERATORS[operator](source.column(column_name), value)
+
+    def _time_range(
+        self,
+        source: ReportDataSource,
+        source_name: str,
+        time_range: Optional[Dict[str, Any]],
+        parameters: Optional[Dict[str, Any]]
+    ) -> List[Any]:
+        """Build [start, end) conditions on the raw time column."""
+        if not time_range:
+            if source.requires_time_range:
+                raise ValueError(f"Data source '{source_name}' requires a time_range")
+            return []
+        if "start" not in time_range or "end" not in time_range:
+            raise ValueError("time_range must include start and end")
+
+        start = self._to_datetime(self._resolve(time_range["start"], parameters))
+        end = self._to_datetime(self._resolve(time_range["end"], parameters))
+        if start is not None and end is not None and start >= end:
+            raise ValueError("time_range start must be before end")
+
+        if parameters is None:
+            return []
+        time_column = source.column(source.time_column)
+        return [time_column >= start, time_column < end]
+
+    def _sort(self, selected: Dict[str, Any], sort: Dict[str, Any]):
+        """Build one ORDER BY item on an output column."""
+        name = sort.get("column")
+        if name not in selected:
+            raise ValueError(f"Sort column '{name}' must be a selected dimension or measure")
+
+        direction = sort.get("direction", "asc")
+        if direction not in ("asc", "desc"):
+            raise ValueError("Sort direction must be 'asc' or 'desc'")
+
+        expression = selected[name]
+        return expression.desc() if direction == "desc" else expression.asc()
+
+    @staticmethod
+    def _resolve(value: Any, parameters: Optional[Dict[str, Any]]) -> Any:
+        """Substitute a {"param": name} reference with its execution parameter."""
+        if isinstance(value, dict) and set(value) == {"param"}:
+            if parameters is None:
+                return None
+            if value["param"] not in parameters:
+                raise ValueError(f"Missing report parameter '{value['param']}'")
+            return parameters[value["param"]]
+        return value
+
+    @staticmethod
+    def _to_datetime(value: Any) -> Any:
+        """Parse ISO date/datetime strings so they bind as timestamps."""
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"Invalid time_range value '{value}'")
+        if isinstance(value, date) and not isinstance(value, datetime):
+            return datetime(value.year, value.month, value.day)
+        return value
+
+
+class ReportQueryEngine:
+    """
+    Runs compiled report queries with cost and time guards.
+
+    The query, its EXPLAIN and the statement_timeout run in a savepoint, so
+    a rejected or cancelled query leaves the caller's transaction usable
+    (e.g. to mark the execution as failed).
+    """
+
+    def __init__(self, db: Session, compiler: Optional[ReportQueryCompiler] = None):
+        """
+        Initialize report query engine.
+
+        Args:
+            db: SQLAlchemy database session
+            compiler: Query compiler (defaults to ReportQueryCompiler)
+        """
+        self.db = db
+        self.compiler = compiler or ReportQueryCompiler()
+
+    def run(
+        self,
+        query_def: Dict[str, Any],
+        organization_id: int,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Compile and execute a report query.
+
+        Args:
+            query_def: Report query definition
+            organization_id: Organization the query is scoped to
+            parameters: Execution parameters
+
+        Returns:
+            Result with columns, rows (JSON-ready dicts) and summary
+            (total_rows, truncated, estimated_cost)
+
+        Raises:
+            ValueError: If the definition is invalid, the estimated cost is
+                over REPORT_MAX_QUERY_COST or the statement timeout is hit
+        """
+        max_rows = settings.REPORT_MAX_ROWS
+        # One extra row tells whether the result was truncated
+        stmt = self.compiler.compile(query_def, organization_id, parameters, row_limit=max_rows + 1)
+
+        try:
+            with self.db.begin_nested():
+                self.db.execute(
+                    text("SELECT set_config('statement_timeout', :timeout, true)"),
+                    {"timeout": str(settings.REPORT_STATEMENT_TIMEOUT_MS)}
+                )
+                cost = self.estimate_cost(stmt)
+                if cost > settings.REPORT_MAX_QUERY_COST:
+                    raise ValueError(
+                        f"Report query is too expensive (estimated cost {cost:.0f}, "
+                        f"limit {settings.REPORT_MAX_QUERY_COST:.0f}); narrow the time range or add filters"
+                    )
+                result = self.db.execute(stmt)
+                columns = list(result.keys())
+                rows = result.fetchall()
+        except DBAPIError as e:
+            if "statement timeout" in str(e.orig):
+                raise ValueError(
+                    f"Report query exceeded the statement timeout of {settings.REPORT_STATEMENT_TIMEOUT_MS} ms"
+                )
+            raise
+
+        truncated = len(rows) > max_rows
+        rows = rows[:max_rows]
+        if truncated:
+            logger.warning(f"Report query for organization {organization_id} truncated to {max_rows} rows")
+
+        return {
+            "columns": columns,
+            "rows": [
+                {name: self._json_value(value) for name, value in zip(columns, row)}
+                for row in rows
+            ],
+            "summary": {
+                "total_rows": len(rows),
+                "truncated": truncated,
+                "estimated_cost": cost,
+            },
+        }
+
+    def stream(
+        self,
+        query_def: Dict[str, Any],
+        organization_id: int,
+        parameters: Optional[Dict[str, Any]] = None,
+        chunk_size: Optional[int] = None
+    ) -> Tuple[List[str], int, Iterator[Sequence[Any]]]:
+        """
+        Compile a report query and stream its rows for an export.
+
+        Rows come from a server-side cursor, chunk_size at a time, so memory
+        does not grow with the result. Export limits (REPORT_EXPORT_MAX_ROWS,
+        REPORT_EXPORT_STATEMENT_TIMEOUT_MS, REPORT_EXPORT_MAX_QUERY_COST)
+        apply; the timeout holds until the session's transaction ends.
+
+        Args:
+            query_def: Report query definition
+            organization_id: Organization the query is scoped to
+            parameters: Execution parameters
+            chunk_size: Rows per chunk (default: REPORT_EXPORT_CHUNK_ROWS)
+
+        Returns:
+            (columns, planner row estimate, iterator of row chunks)
+
+        Raises:
+            ValueError: If the definition is invalid or the estimated cost is
+                over REPORT_EXPORT_MAX_QUERY_COST
+        """
+        chunk_size = chunk_size or settings.REPORT_EXPORT_CHUNK_ROWS
+        stmt = self.compiler.compile(
+            query_def, organization_id, parameters, row_limit=settings.REPORT_EXPORT_MAX_ROWS
+        )
+
+        self.db.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {"timeout": str(settings.REPORT_EXPORT_STATEMENT_TIMEOUT_MS)}
+        )
+        plan = self._plan(stmt)
+        cost = float(plan["Total Cost"])
+        if cost > settings.REPORT_EXPORT_MAX_QUERY_COST:
+            raise ValueError(
+                f"Report export is too expensive (estimated cost {cost:.0f}, "
+                f"limit {settings.REPORT_EXPORT_MAX_QUERY_COST:.0f}); narrow the time range or add filters"
+            )
+
+        result = self.db.execute(
+            stmt, execution_options={"stream_results": True, "max_row_buffer": chunk_size}
+        )
+        return list(result.keys()), int(plan["Plan Rows"]), result.partitions(chunk_size)
+
+    def estimate_cost(self, stmt: Select) -> float:
+        """
+        Get the planner's total cost estimate for a statement.
+
+        Args:
+            stmt: Compiled report statement
+
+        Returns:
+            EXPLAIN total cost of the plan's root node
+        """
+        return float(self._plan(stmt)["Total Cost"])
+
+    def _plan(self, stmt: Select) -> Dict[str, Any]:
+        """EXPLAIN a statement and return the root plan node."""
+        compiled = stmt.compile(
+            dialect=postgresql.dialect(paramstyle="named"),
+            compile_kwargs={"render_postcompile": True}
+        )
+        plan = self.db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"), compiled.params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]
+
+    @staticmethod
+    def _json_value(value: Any) -> Any:
+        """Convert a result value for JSONB storage."""
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
@@ -5,7 +5,12 @@ from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
+from app.core.config import settings
 from app.models.reporting import Report, ReportExecution, Dashboard
+from app.application.services.dashboard_data_engine import DashboardDataEngine, WidgetQuery
+from app.application.services.kpi_engine import KPIEngine, parse_kpi_period
+from app.application.services.report_execution_runner import REPORT_EXECUTION_QUEUE
+from app.application.services.report_query_engine import ReportQueryCompiler
 from app.infrastructure.repositories.reporting_repository import (
     ReportRepository,
     ReportExecutionRepository,
@@ -100,10 +105,11 @@ class ReportingService:
     def execute_report(self, report_id: int, dto: ReportExecuteDTO,
                       user_id: Optional[int] = None) -> ReportExecution:
         """
-        Execute a report.
+        Queue a report execution.
 
-        This creates an execution record and triggers the actual report generation.
-        The execution can be async (via PGMQ) or synchronous depending on report size.
+        The execution is recorded as PENDING and its id is sent to the
+        report_executions PGMQ queue in the same transaction; a report worker
+        (ReportExecutionRunner) runs it and records progress and results.
         """
         # Get the report
         report = self.report_repo.get_by_id(report_id)
@@ -114,33 +120,40 @@ class ReportingService:
         if not report.is_active:
             raise ValueError("Cannot execute inactive report")
 
-        # Create execution record
+        # Reject definitions that cannot compile before queueing
+        self._validate_query_definition(report.query_definition)
+
         execution = self.execution_repo.create(
             report_id=report_id,
             organization_id=report.organization_id,
             trigger_type='MANUAL',
             triggered_by=user_id,
             parameters=dto.parameters,
-            export_format=dto.export_format or (report.export_formats[0] if report.export_formats else None)
+            export_format=dto.export_format or (report.export_formats[0] if report.export_formats else None),
+            queue=REPORT_EXECUTION_QUEUE
         )
 
-        # TODO: In production, this should be async via PGMQ
-        # For now, execute synchronously
-        try:
-            self._execute_report_query(execution, report)
-        except Exception as e:
-            self.execution_repo.update_status(
-                execution.id,
-                'FAILED',
-                error_message=str(e)
-            )
-            raise
-
         # Update last executed timestamp
         self.report_repo.update_last_executed_at(report_id)
 
         return execution
 
+    def cancel_execution(self, execution_id: int) -> Optional[ReportExecution]:
+        """
+        Cancel a report execution.
+
+        A pending execution is cancelled immediately; a running one stops
+        after the chunk its worker is writing.
+        """
+        execution = self.execution_repo.get_by_id(execution_id)
+        if not execution:
+            return None
+
+        if execution.execution_status not in ('PENDING', 'RUNNING'):
+            raise ValueError(f"Cannot cancel a {execution.execution_status.lower()} execution")
+
+        return self.execution_repo.request_cancel(execution_id)
+
     def get_execution(self, execution_id: int) -> Optional[ReportExecution]:
         """Get report execution by ID"""
         return self.execution_repo.get_by_id(execution_id)
@@ -154,62 +167,11 @@ class ReportingService:
     # ========== Private Helper Methods ==========
 
     def _validate_query_definition(self, query_def: Dict[str, Any]) -> None:
-        """Validate the query definition structure"""
-        required_fields = ['data_source']
-        for field in required_fields:
-            if field not in query_def:
-                raise ValueError(f"Query definition must include '{field}'")
-
-        # Validate data source
-        valid_sources = [
-            'production_logs', 'work_orders', 'ncr', 'materials',
-            'machines', 'inspections', 'shipments', 'custom'
-        ]
-        if query_def['data_source'] not in valid_sources:
-            raise ValueError(f"Invalid data_source. Must be one of {valid_sources}")
-
-    def _execute_report_query(self, execution: ReportExecution, report: Report) -> None:
-        """
-        Execute the actual report query and update execution record.
-
-        NOTE: This is a simplified implementation. In production, this should:
-        1. Use pg_duckdb for analytics queries
-        2. Support complex aggregations and joins
-        3. Handle large result sets
-        4. Generate exports (PDF, CSV, XLSX)
-        5. Be executed asynchronously via PGMQ
-        """
-        start_time = datetime.now(timezone.utc)
-
-        # Update status to RUNNING
-        self.execution_repo.update_status(execution.id, 'RUNNING')
-
-        # TODO: Implement actual query execution logic
-        # For now, return a placeholder result
-        result_data = {
-            "columns": ["date", "value"],
-            "rows": [
-                {"date": "2025-11-01", "value": 100},
-                {"date": "2025-11-02", "value": 150},
-            ],
-            "summary": {
-                "total_rows": 2,
-                "aggregations": {}
-            }
-        }
+        """Validate the query definition against the report query whitelists"""
+        if 'data_source' not in query_def:
+            raise ValueError("Query definition must include 'data_source'")
 
-        # Calculate execution time
-        end_time = datetime.now(timezone.utc)
-        execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
-
-        # Update execution with results
-        self.execution_repo.update_result(
-            execution.id,
-            result_count=len(result_data.get('rows', [])),
-            result_data=result_data,
-            execution_time_ms=execution_time_ms,
-            rows_processed=len(result_data.get('rows', []))
-        )
+        ReportQueryCompiler().validate(query_def)
 
 
 class DashboardService:
@@ -299,11 +261,14 @@ class DashboardService:
         """
         Get data for all widgets in a dashboard.
 
-        NOTE: This is a simplified implementation. In production, this should:
-        1. Execute queries for each widget in parallel
-        2. Apply dashboard filters
-        3. Cache results for refresh intervals
-        4. Support real-time data updates via WebSocket
+        A widget's query is its own "query" definition, a "kpi" spec
+        (kpi_type, optional breakdown_by) calculated by the KPI engine, or
+        the query definition of the report named by its data_source (report
+        ID or code). Dashboard filters and the date range (as "start"/"end") are
+        the query parameters. Queries run in parallel through
+        DashboardDataEngine, cached per tenant for the widget's
+        refresh_interval; widgets still running at the deadline come back
+        with status "timeout".
         """
         dashboard = self.dashboard_repo.get_by_id(dashboard_id)
         if not dashboard:
@@ -311,16 +276,12 @@ class DashboardService:
 
         # Merge dashboard default filters with request filters
         filters = {**(dashboard.default_filters or {}), **(request.filters or {})}
+        parameters = dict(filters)
+        if request.date_range:
+            parameters.update(request.date_range)
 
-        # TODO: Execute queries for each widget
-        # For now, return placeholder data
-        widget_data = {}
-        for widget_id, widget_config in dashboard.widgets.items():
-            widget_data[widget_id] = {
-                "status": "loaded",
-                "data": {"value": 0, "trend": "+0%"},
-                "last_updated": datetime.now(timezone.utc).isoformat()
-            }
+        queries, widget_data = self._resolve_widget_queries(dashboard)
+        widget_data.update(DashboardDataEngine().load(dashboard.organization_id, queries, parameters))
 
         return {
             "dashboard_id": dashboard_id,
@@ -347,6 +308,56 @@ class DashboardService:
         if layout_widget_ids != widget_ids:
             raise ValueError("Layout widgets must match widget definitions")
 
+        # Inline widget queries must compile; KPI widgets must name a registered KPI
+        for widget_id, widget in widgets.items():
+            try:
+                if isinstance(widget.get('query'), dict):
+                    ReportQueryCompiler().validate(widget['query'])
+                if isinstance(widget.get('kpi'), dict):
+                    KPIEngine.validate(widget['kpi'].get('kpi_type'), breakdown_by=widget['kpi'].get('breakdown_by'))
+            except ValueError as e:
+                raise ValueError(f"Widget '{widget_id}': {e}")
+
+    def _resolve_widget_queries(
+        self, dashboard: Dashboard
+    ) -> Tuple[Dict[str, WidgetQuery], Dict[str, Dict[str, Any]]]:
+        """
+        Map widgets to their queries, loading referenced reports in one query.
+
+        Returns:
+            (queries keyed by widget ID, error entries for widgets without one)
+        """
+        widgets = dashboard.widgets or {}
+        report_ids = [w['data_source'] for w in widgets.values() if isinstance(w.get('data_source'), int)]
+        report_codes = [w['data_source'] for w in widgets.values() if isinstance(w.get('data_source'), str)]
+        reports = self.report_repo.list_by_ids_or_codes(dashboard.organization_id, report_ids, report_codes)
+        reports_by_ref = {**{r.report_code: r for r in reports}, **{r.id: r for r in reports}}
+
+        default_refresh = dashboard.refresh_interval_seconds or settings.DASHBOARD_WIDGET_CACHE_SECONDS
+        queries = {}
+        errors = {}
+        for widget_id, widget in widgets.items():
+            query_definition = widget.get('query')
+            if isinstance(widget.get('kpi'), dict):
+                query_definition = {'kpi': widget['kpi']}
+            elif not isinstance(query_definition, dict):
+                report = reports_by_ref.get(widget.get('data_source'))
+                query_definition = report.query_definition if report else None
+
+            if query_definition is None:
+                errors[widget_id] = {
+                    "status": "error", "data": None, "cached": False, "last_updated": None,
+                    "error": f"Widget data source '{widget.get('data_source')}' not found"
+                }
+                continue
+
+            queries[widget_id] = WidgetQuery(
+                query_definition=query_definition,
+                refresh_interval_seconds=widget.get('refresh_interval') or default_refresh
+            )
+
+        return queries, errors
+
 
 class KPIService:
     """Service for KPI calculations"""
@@ -354,26 +365,17 @@ class KPIService:
     def __init__(self, db: Session):
         self.db = db
 
-    def calculate_kpi(self, request: KPICalculationRequest) -> Dict[str, Any]:
+    def calculate_kpi(self, request: KPICalculationRequest, organization_id: int) -> Dict[str, Any]:
         """
-        Calculate a specific KPI.
+        Calculate a KPI for the requested period through the KPI engine.
 
-        NOTE: This is a simplified implementation. In production, this should:
-        1. Use pg_duckdb for fast analytics
-        2. Support multiple KPI types (OEE, FPY, OTD, etc.)
-        3. Cache calculations
-        4. Support drill-down analysis
+        The value comes with the previous period's value and the trend
+        between them; breakdown holds the formula components and, with
+        breakdown_by, one entry per plant/line/machine/shift/product.
         """
-        kpi_type = request.kpi_type
-
-        # TODO: Implement actual KPI calculations
-        # For now, return placeholder values
-        return {
-            "kpi_type": kpi_type,
-            "value": 85.5,
-            "unit": "%",
-            "trend": 2.3,
-            "breakdown": {},
-            "calculated_at": datetime.now(timezone.utc),
-            "date_range": request.date_range
-        }
+        period = parse_kpi_period(request.date_range)
+        result = KPIEngine(self.db).calculate(
+            organization_id, request.kpi_type, period,
+            filters=request.filters, breakdown_by=request.breakdown_by
+        )
+        return {**result, "date_range": request.date_range}
@@ -0,0 +1,477 @@
+"""
+Stripe Webhook Service - Asynchronous, idempotent webhook ingestion
+
+Webhook requests only verify the signature and persist the event in the
+stripe_webhook_events inbox; the event id is enqueued to PGMQ in the same
+transaction so Stripe is acknowledged after a single short write. Workers
+then apply events:
+
+- Idempotently: an event already processed is skipped, and the business
+  changes and the processed marker are committed in the same transaction.
+- In order per customer: an event waits while an older event (by Stripe
+  creation time) for the same customer is still pending.
+- Replayably: failed or selected events can be reset and re-enqueued.
+"""
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import logging
+
+from sqlalchemy import and_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.application.services.subscription_service import SubscriptionService
+from app.domain.entities.subscription import SubscriptionStatus, BillingCycle, SubscriptionTier
+from app.models.subscription import InvoiceModel, SubscriptionModel, StripeWebhookEventModel
+
+logger = logging.getLogger(__name__)
+
+STRIPE_WEBHOOK_QUEUE = "stripe_webhooks"
+
+# Statuses that still need processing and therefore block later events of the same customer
+PENDING_STATUSES = ("received", "failed")
+
+
+def extract_stripe_customer_id(event: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the Stripe customer an event belongs to (ordering key).
+
+    Args:
+        event: Stripe event dictionary
+
+    Returns:
+        Stripe customer ID or None for events without a customer
+    """
+    data_object = event.get("data", {}).get("object", {}) or {}
+    customer = data_object.get("customer")
+    if isinstance(customer, dict):
+        customer = customer.get("id")
+    if not customer and data_object.get("object") == "customer":
+        customer = data_object.get("id")
+    return customer
+
+
+class StripeWebhookService:
+    """
+    Service for ingesting and processing Stripe webhook events
+
+    Dependency Injection: Inject SQLAlchemy session
+    """
+
+    def __init__(self, db: Session, max_attempts: int = 5):
+        """
+        Initialize webhook service
+
+        Args:
+            db: SQLAlchemy database session
+            max_attempts: Processing attempts before an event is marked dead
+        """
+        self.db = db
+        self.max_attempts = max_attempts
+        self.subscription_service = SubscriptionService(db)
+
+        self._handlers: Dict[str, Callable[[dict], Tuple[bool, str]]] = {
+            "checkout.session.completed": self._handle_checkout_completed,
+            "customer.subscription.created": self._handle_subscription_created,
+            "customer.subscription.updated": self._handle_subscription_updated,
+            "customer.subscription.deleted": self._handle_subscription_deleted,
+            "invoice.payment_succeeded": self._handle_invoice_paid,
+            "invoice.payment_failed": self._handle_invoice_failed,
+        }
+
+    # ========================================================================
+    # INGESTION (request path)
+    # ========================================================================
+
+    def ingest(self, event: Dict[str, Any]) -> bool:
+        """
+        Persist a verified event and enqueue it for processing.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING on event_id, so Stripe retries
+        of an already received event are acknowledged without new work. The
+        PGMQ message is sent in the same transaction as the insert.
+
+        Args:
+            event: Verified Stripe event dictionary
+
+        Returns:
+            True if the event is new, False if it was a duplicate
+        """
+        created = event.get("created")
+        stmt = pg_insert(StripeWebhookEventModel).values(
+            event_id=event["id"],
+            event_type=event.get("type", "unknown"),
+            stripe_customer_id=extract_stripe_customer_id(event),
+            stripe_created_at=datetime.fromtimestamp(created, tz=timezone.utc) if created else None,
+            payload=event,
+            status="received",
+            attempts=0,
+        ).on_conflict_do_nothing(
+            index_elements=[StripeWebhookEventModel.event_id]
+        ).returning(StripeWebhookEventModel.id)
+
+        inserted_id = self.db.execute(stmt).scalar()
+        if inserted_id is not None:
+            self._enqueue([event["id"]])
+
+        self.db.commit()
+        return inserted_id is not None
+
+    def _enqueue(self, event_ids: List[str]) -> None:
+        """Send event ids to the processing queue inside the current transaction."""
+        for event_id in event_ids:
+            self.db.execute(
+                text("SELECT pgmq.send(:queue, CAST(:message AS jsonb))"),
+                {"queue": STRIPE_WEBHOOK_QUEUE, "message": json.dumps({"event_id": event_id})}
+            )
+
+    # ========================================================================
+    # PROCESSING (worker path)
+    # ========================================================================
+
+    def process_event(self, event_id: str) -> str:
+        """
+        Apply one stored event.
+
+        Args:
+            event_id: Stripe event ID
+
+        Returns:
+            Outcome: processed, ignored, duplicate, deferred, busy, failed, dead or missing
+        """
+        record = self.db.query(StripeWebhookEventModel).filter(
+            StripeWebhookEventModel.event_id == event_id
+        ).with_for_update(skip_locked=True).first()
+
+        if record is None:
+            self.db.rollback()
+            exists = self.db.query(StripeWebhookEventModel.id).filter(
+                StripeWebhookEventModel.event_id == event_id
+            ).first()
+            # Locked rows are being handled by another worker
+            return "busy" if exists else "missing"
+
+        if record.status not in PENDING_STATUSES:
+            self.db.rollback()
+            return "duplicate"
+
+        if self._has_earlier_pending_event(record):
+            self.db.rollback()
+            logger.info(f"Deferring webhook {event_id}: earlier event pending for {record.stripe_customer_id}")
+            return "deferred"
+
+        handler = self._handlers.get(record.event_type)
+        event_data = (record.payload or {}).get("data", {}).get("object", {})
+
+        try:
+            if handler is None:
+                processed, message = False, f"Event type {record.event_type} not handled"
+            else:
+                processed, message = handler(event_data)
+
+            record.status = "processed" if processed else "ignored"
+            record.result_message = message
+            record.attempts += 1
+            record.last_error = None
+            record.processed_at = datetime.now(timezone.utc)
+            self.db.commit()
+
+            logger.info(f"Webhook {event_id} ({record.event_type}): {record.status} - {message}")
+            return record.status
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error processing webhook {event_id}: {e}")
+            return self._record_failure(event_id, str(e))
+
+    def _has_earlier_pending_event(self, record: StripeWebhookEventModel) -> bool:
+        """Check for an older, still pending event for the same customer."""
+        if not record.stripe_customer_id or record.stripe_created_at is None:
+            return False
+
+        earlier = self.db.query(StripeWebhookEventModel.id).filter(
+            and_(
+                StripeWebhookEventModel.stripe_customer_id == record.stripe_customer_id,
+                StripeWebhookEventModel.stripe_created_at < record.stripe_created_at,
+                StripeWebhookEventModel.status.in_(PENDING_STATUSES),
+                StripeWebhookEventModel.id != record.id,
+            )
+        ).first()
+        return earlier is not None
+
+    def _record_failure(self, event_id: str, error: str) -> str:
+        """Increment attempts in a fresh transaction; mark dead when exhausted."""
+        record = self.db.query(StripeWebhookEventModel).filter(
+            StripeWebhookEventModel.event_id == event_id
+        ).first()
+        if record is None:
+            return "missing"
+
+        record.attempts += 1
+        record.last_error = error
+        record.status = "dead" if record.attempts >= self.max_attempts else "failed"
+        self.db.commit()
+        return record.status
+
+    def process_queue_batch(self, pgmq_client, batch_size: int = 20, vt: int = 30) -> Dict[str, int]:
+        """
+        Read a batch of event ids from PGMQ and process them.
+
+        Messages for finished events (processed, ignored, duplicate, dead or
+        missing) are archived together. Deferred, busy and failed events are
+        left in the queue and become visible again after the visibility timeout.
+
+        Args:
+            pgmq_client: PGMQClient instance
+            batch_size: Maximum messages per batch
+            vt: Visibility timeout in seconds (retry/defer delay)
+
+        Returns:
+            Count of messages per outcome
+        """
+        messages = pgmq_client.dequeue_batch(STRIPE_WEBHOOK_QUEUE, batch_size, vt=vt)
+
+        outcomes: Dict[str, int] = {}
+        finished: List[int] = []
+        for message in messages:
+            outcome = self.process_event(message.message.get("event_id"))
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if outcome in ("processed", "ignored", "duplicate", "dead", "missing"):
+                finished.append(message.msg_id)
+
+        pgmq_client.archive_batch(STRIPE_WEBHOOK_QUEUE, finished)
+        return outcomes
+
+    # ========================================================================
+    # REPLAY TOOLING
+    # ========================================================================
+
+    def replay(
+        self,
+        event_ids: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        limit: int = 500
+    ) -> List[str]:
+        """
+        Reset selected events to received and re-enqueue them.
+
+        Args:
+            event_ids: Specific events to replay
+            statuses: Replay events currently in these statuses (e.g. ["failed", "dead"])
+            since: Only events received at or after this time
+            limit: Maximum number of events to replay
+
+        Returns:
+            Replayed event IDs
+        """
+        query = self.db.query(StripeWebhookEventModel)
+        if event_ids:
+            query = query.filter(StripeWebhookEventModel.event_id.in_(event_ids))
+        if statuses:
+            query = query.filter(StripeWebhookEventModel.status.in_(statuses))
+        if since:
+            query = query.filter(StripeWebhookEventModel.received_at >= since)
+
+        records = query.order_by(StripeWebhookEventModel.stripe_created_at).limit(limit).all()
+        for record in records:
+            record.status = "received"
+            record.attempts = 0
+            record.last_error = None
+
+        replayed = [record.event_id for record in records]
+        self._enqueue(replayed)
+        self.db.commit()
+
+        logger.info(f"Replayed {len(replayed)} Stripe webhook events")
+        return replayed
+
+    # ========================================================================
+    # EVENT HANDLERS
+    # Handlers stage changes only; process_event commits them together with
+    # the event status so an event's effects are applied exactly once.
+    # ========================================================================
+
+    def _handle_checkout_completed(self, session_data: dict) -> Tuple[bool, str]:
+        """Handle checkout.session.completed: convert trial to paid subscription."""
+        metadata = session_data.get("metadata", {})
+        organization_id = int(metadata.get("organization_id"))
+        tier = metadata.get("tier")
+        billing_cycle = metadata.get("billing_cycle")
+
+        logger.info(
+            f"Processing checkout completion for org {organization_id}, "
+            f"tier={tier}, cycle={billing_cycle}"
+        )
+
+        # convert_trial_to_paid commits on its own; a retry after that commit
+        # must not fail on the already converted subscription
+        subscription = self.subscription_service.get_subscription(organization_id)
+        if subscription.trial_converted and \
+                subscription.stripe_subscription_id == session_data.get("subscription"):
+            return False, f"Trial already converted for organization {organization_id}"
+
+        self.subscription_service.convert_trial_to_paid(
+            organization_id=organization_id,
+            stripe_subscription_id=session_data.get("subscription"),
+            stripe_customer_id=session_data.get("customer"),
+            billing_cycle=BillingCycle(billing_cycle),
+            tier=SubscriptionTier(tier) if tier else None
+        )
+
+        return True, f"Trial converted to paid subscription for organization {organization_id}"
+
+    def _handle_subscription_created(self, subscription_data: dict) -> Tuple[bool, str]:
+        """Handle customer.subscription.created: store Stripe IDs and billing period."""
+        metadata = subscription_data.get("metadata", {})
+        organization_id = int(metadata.get("organization_id"))
+
+        subscription = self.subscription_service.get_subscription(organization_id)
+
+        if not subscription.stripe_subscription_id:
+            subscription.stripe_subscription_id = subscription_data.get("id")
+        if not subscription.stripe_customer_id:
+            subscription.stripe_customer_id = subscription_data.get("customer")
+
+        subscription.current_period_start = datetime.fromtimestamp(
+            subscription_data.get("current_period_start")
+        )
+        subscription.current_period_end = datetime.fromtimestamp(
+            subscription_data.get("current_period_end")
+        )
+
+        return True, f"Subscription created for organization {organization_id}"
+
+    def _handle_subscription_updated(self, subscription_data: dict) -> Tuple[bool, str]:
+        """Handle customer.subscription.updated: sync status and billing period."""
+        stripe_subscription_id = subscription_data.get("id")
+
+        subscription = self.db.query(SubscriptionModel).filter(
+            SubscriptionModel.stripe_subscription_id == stripe_subscription_id
+        ).first()
+
+        if not subscription:
+            logger.warning(f"Subscription not found for Stripe ID {stripe_subscription_id}")
+            return False, f"Subscription not found: {stripe_subscription_id}"
+
+        status_mapping = {
+            "active": SubscriptionStatus.ACTIVE.value,
+            "past_due": SubscriptionStatus.PAST_DUE.value,
+            "canceled": SubscriptionStatus.CANCELLED.value,
+            "unpaid": SubscriptionStatus.SUSPENDED.value
+        }
+
+        subscription.status = status_mapping.get(subscription_data.get("status"), subscription.status)
+        subscription.current_period_start = datetime.fromtimestamp(
+            subscription_data.get("current_period_start")
+        )
+        subscription.current_period_end = datetime.fromtimestamp(
+            subscription_data.get("current_period_end")
+        )
+
+        if subscription_data.get("cancel_at_period_end", False):
+            subscription.cancelled_at = subscription.current_period_end
+
+        return True, f"Subscription updated for organization {subscription.organization_id}"
+
+    def _handle_subscription_deleted(self, subscription_data: dict) -> Tuple[bool, str]:
+        """Handle customer.subscription.deleted: mark subscription cancelled."""
+        stripe_subscription_id = subscription_data.get("id")
+
+        subscription = self.db.query(SubscriptionModel).filter(
+            SubscriptionModel.stripe_subscription_id == stripe_subscription_id
+        ).first()
+
+        if not subscription:
+            logger.warning(f"Subscription not found for Stripe ID {stripe_subscription_id}")
+            return False, f"Subscription not found: {stripe_subscription_id}"
+
+        subscription.status = SubscriptionStatus.CANCELLED.value
+        subscription.cancelled_at = datetime.utcnow()
+
+        return True, f"Subscription cancelled for organization {subscription.organization_id}"
+
+    def _get_subscription_by_customer(self, stripe_customer_id: str) -> Optional[SubscriptionModel]:
+        return self.db.query(SubscriptionModel).filter(
+            SubscriptionModel.stripe_customer_id == stripe_customer_id
+        ).first()
+
+    def _get_or_build_invoice(
+        self,
+        invoice_data: dict,
+        subscription: SubscriptionModel,
+        status: str,
+        amount_paid: int
+    ) -> InvoiceModel:
+        stripe_invoice_id = invoice_data.get("id")
+        invoice = self.db.query(InvoiceModel).filter(
+            InvoiceModel.stripe_invoice_id == stripe_invoice_id
+        ).first()
+
+        if not invoice:
+            invoice = InvoiceModel(
+                organization_id=subscription.organization_id,
+                subscription_id=subscription.id,
+                stripe_invoice_id=stripe_invoice_id,
+                stripe_payment_intent_id=invoice_data.get("payment_intent"),
+                invoice_number=invoice_data.get("number", f"INV-{stripe_invoice_id}"),
+                amount_due=invoice_data.get("amount_due", 0),
+                amount_paid=amount_paid,
+                currency=invoice_data.get("currency", "usd").upper(),
+                status=status,
+                invoice_date=datetime.fromtimestamp(invoice_data.get("created")),
+                due_date=datetime.fromtimestamp(invoice_data.get("due_date"))
+                if invoice_data.get("due_date") else None,
+                invoice_pdf_url=invoice_data.get("invoice_pdf")
+            )
+            self.db.add(invoice)
+        return invoice
+
+    def _handle_invoice_paid(self, invoice_data: dict) -> Tuple[bool, str]:
+        """Handle invoice.payment_succeeded: record payment, reactivate if suspended."""
+        stripe_customer_id = invoice_data.get("customer")
+
+        subscription = self._get_subscription_by_customer(stripe_customer_id)
+        if not subscription:
+            logger.warning(f"Subscription not found for customer {stripe_customer_id}")
+            return False, f"Subscription not found for customer {stripe_customer_id}"
+
+        invoice = self._get_or_build_invoice(
+            invoice_data, subscription, status="paid", amount_paid=invoice_data.get("amount_paid", 0)
+        )
+        invoice.status = "paid"
+        invoice.amount_paid = invoice_data.get("amount_paid", 0)
+        invoice.paid_at = datetime.utcnow()
+        invoice.invoice_pdf_url = invoice_data.get("invoice_pdf")
+
+        if subscription.status == SubscriptionStatus.SUSPENDED.value:
+            subscription.status = SubscriptionStatus.ACTIVE.value
+            logger.info(f"Reactivated subscription for org {subscription.organization_id}")
+
+        return True, f"Invoice paid for organization {subscription.organization_id}"
+
+    def _handle_invoice_failed(self, invoice_data: dict) -> Tuple[bool, str]:
+        """Handle invoice.payment_failed: mark invoice open, past due or suspend."""
+        stripe_customer_id = invoice_data.get("customer")
+        attempt_count = invoice_data.get("attempt_count", 0)
+
+        subscription = self._get_subscription_by_customer(stripe_customer_id)
+        if not subscription:
+            logger.warning(f"Subscription not found for customer {stripe_customer_id}")
+            return False, f"Subscription not found for customer {stripe_customer_id}"
+
+        invoice = self._get_or_build_invoice(invoice_data, subscription, status="open", amount_paid=0)
+        invoice.status = "open"
+
+        # Suspend subscription after multiple failed attempts (e.g., 3+)
+        if attempt_count >= 3:
+            subscription.status = SubscriptionStatus.SUSPENDED.value
+            logger.warning(
+                f"Suspended subscription for org {subscription.organization_id} "
+                f"after {attempt_count} failed payment attempts"
+            )
+        else:
+            subscription.status = SubscriptionStatus.PAST_DUE.value
+
+        return True, f"Invoice payment failed for organization {subscription.organization_id}"
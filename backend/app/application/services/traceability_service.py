@@ -1,27 +1,30 @@
 """
 Traceability Service - Business logic for lot/serial tracking and genealogy
 """
-from typing import List, Optional, Dict, Set
+from typing import Callable, Iterator, List, Optional, Dict, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, text
 from datetime import datetime, timezone
 from decimal import Decimal
+import csv
+import io
+import json
 import logging
 
 from app.models.traceability import (
     LotBatch,
     SerialNumber,
     TraceabilityLink,
-    GenealogyRecord
+    GenealogyRecord,
+    RecallReportJob
 )
-from app.models.work_order import WorkOrder
 from app.models.material import Material
-from app.models.logistics import Shipment, ShipmentItem
 from app.infrastructure.repositories.traceability_repository import (
     LotBatchRepository,
     SerialNumberRepository,
     TraceabilityLinkRepository,
     GenealogyRecordRepository,
+    RecallTraceRepository,
 )
 from app.application.dtos.traceability_dto import (
     LotBatchCreateDTO,
@@ -40,6 +43,7 @@ from app.application.dtos.traceability_dto import (
     GenealogyTreeResponse,
     RecallReportRequest,
     RecallReportResponse,
+    RecallLotDTO,
     AffectedWorkOrderDTO,
     AffectedShipmentDTO,
     AffectedCustomerDTO,
@@ -48,6 +52,8 @@ from app.application.dtos.traceability_dto import (
 
 logger = logging.getLogger(__name__)
 
+RECALL_REPORT_QUEUE = "recall_reports"
+
 
 class LotBatchService:
     """Service for Lot Batch operations"""
@@ -529,29 +535,38 @@ class GenealogyService:
 
 
 class RecallReportService:
-    """Service for Recall Report generation"""
+    """
+    Service for Recall Report generation
+
+    Lots are resolved in one query and the genealogy is walked by the database
+    (RecallTraceRepository), so report cost does not grow with per-lot round
+    trips. Reports can also run in the background: a job row records progress
+    and the finished report, and its id is queued to PGMQ (recall_reports).
+    """
 
     def __init__(self, db: Session):
         self.db = db
         self.lot_repo = LotBatchRepository(db)
-        self.link_repo = TraceabilityLinkRepository(db)
-        self.serial_repo = SerialNumberRepository(db)
+        self.trace_repo = RecallTraceRepository(db)
 
     def generate_recall_report(
         self,
         request: RecallReportRequest,
         user_id: int,
-        organization_id: int
+        organization_id: int,
+        progress: Optional[Callable[[int, str], None]] = None
     ) -> RecallReportResponse:
         """
         Generate a comprehensive recall report for affected lots.
 
-        Performs forward genealogy trace: Lot → Work Orders → Shipments → Customers
+        Performs forward genealogy trace: Lot → Work Orders → Shipments → Customers,
+        and (with include_distribution_chain) lists downstream and source lots.
 
         Args:
             request: Recall report request with material_id, lot_numbers, reason, severity
             user_id: User ID generating the report
             organization_id: Organization ID for multi-tenant isolation
+            progress: Optional callback(percent, stage) for background jobs
 
         Returns:
             RecallReportResponse with complete traceability data
@@ -559,36 +574,56 @@ class RecallReportService:
         Raises:
             ValueError: If material or lot numbers are invalid
         """
-        logger.info(f"Generating recall report for material_id={request.material_id}, lots={request.lot_numbers}")
+        report_progress = progress or (lambda percent, stage: None)
+        logger.info(
+            f"Generating recall report for material_id={request.material_id}, "
+            f"{len(request.lot_numbers)} lots"
+        )
 
         # Step 1: Validate inputs
+        report_progress(5, "Resolving lots")
         material = self._validate_material(request.material_id, organization_id)
         lot_batches = self._validate_lots(request.lot_numbers, request.material_id, organization_id)
+        lot_ids = [lot.id for lot in lot_batches]
 
         # Step 2: Generate report ID
         report_id = self._generate_report_id()
 
         # Step 3: Calculate total quantity affected
         total_quantity_affected = sum(
-            Decimal(str(lot.initial_quantity)) for lot in lot_batches
+            (Decimal(str(lot.initial_quantity)) for lot in lot_batches), Decimal(0)
+        )
+
+        # Step 4: Forward genealogy trace - work orders, serials, shipments (one statement)
+        report_progress(20, "Tracing downstream impact")
+        impact_rows = self.trace_repo.get_downstream_impact(
+            organization_id, lot_ids, request.max_depth, request.include_distribution_chain
         )
 
-        # Step 4: Forward Genealogy Trace - Find affected work orders
-        affected_work_orders = self._trace_affected_work_orders(lot_batches)
+        # Step 5: Backward genealogy trace - source lots
+        upstream_lots = []
+        if request.include_distribution_chain:
+            report_progress(60, "Tracing upstream sources")
+            upstream_lots = [
+                RecallLotDTO(lot_id=row.id, lot_number=row.lot_number,
+                             material_id=row.material_id, depth=row.depth)
+                for row in self.trace_repo.get_upstream_lots(organization_id, lot_ids, request.max_depth)
+            ]
 
-        # Step 5: Find affected shipments and customers
-        affected_shipments, affected_customers = self._trace_affected_shipments(
-            lot_batches,
-            affected_work_orders,
-            request.include_customer_details
+        # Step 6: Aggregate work orders, shipments and customers
+        report_progress(85, "Aggregating impact")
+        (affected_work_orders, affected_shipments, affected_customers,
+         downstream_lots, affected_serial_count) = self._aggregate_impact(
+            impact_rows, request.include_customer_details
         )
 
-        # Step 6: Build downstream impact summary
         downstream_impact = DownstreamImpactDTO(
             total_affected_work_orders=len(affected_work_orders),
             total_affected_shipments=len(affected_shipments),
             total_affected_customers=len(affected_customers),
-            total_quantity_shipped=sum(s.quantity for s in affected_shipments)
+            total_quantity_shipped=sum((s.quantity for s in affected_shipments), Decimal(0)),
+            total_affected_serials=affected_serial_count,
+            total_downstream_lots=len(downstream_lots)
         )
 
         # Step 7: Build and return report
@@ -606,8 +641,11 @@ class RecallReportService:
             affected_work_orders=affected_work_orders,
             affected_shipments=affected_shipments,
             affected_customers=affected_customers,
-            downstream_impact=downstream_impact
+            downstream_impact=downstream_impact,
+            downstream_lots=downstream_lots,
+            upstream_lots=upstream_lots
         )
+        report_progress(100, "Completed")
 
         logger.info(
             f"Recall report {report_id} generated: "
@@ -638,23 +676,26 @@ class RecallReportService:
         material_id: int,
         organization_id: int
     ) -> List[LotBatch]:
-        """Validate all lot numbers exist and belong to the material"""
-        lot_batches = []
-
-        for lot_number in lot_numbers:
-            lot = self.lot_repo.get_by_lot_number(organization_id, lot_number)
-
-            if not lot:
-                raise ValueError(f"Lot '{lot_number}' not found")
-
-            if lot.material_id != material_id:
-                raise ValueError(
-                    f"Lot '{lot_number}' does not belong to material {material_id}"
-                )
-
-            lot_batches.append(lot)
+        """Validate all lot numbers exist and belong to the material (one query)"""
+        lots_by_number = {
+            lot.lot_number: lot
+            for lot in self.lot_repo.list_by_lot_numbers(organization_id, lot_numbers)
+        }
+
+        missing = [number for number in lot_numbers if number not in lots_by_number]
+        if len(missing) == 1:
+            raise ValueError(f"Lot '{missing[0]}' not found")
+        if missing:
+            raise ValueError(f"{len(missing)} lots not found: {', '.join(missing[:20])}")
+
+        foreign = [number for number, lot in lots_by_number.items() if lot.material_id != material_id]
+        if foreign:
+            raise ValueError(
+                f"Lot '{foreign[0]}' does not belong to material {material_id}"
+            )
 
-        return lot_batches
+        # Preserve request order, one entry per distinct lot
+        return [lots_by_number[number] for number in dict.fromkeys(lot_numbers)]
 
     def _generate_report_id(self) -> str:
         """Generate unique report ID in format RECALL-YYYY-NNNN"""
@@ -666,167 +707,255 @@ class RecallReportService:
 
         return f"RECALL-{current_year}-{timestamp:04d}"
 
-    def _trace_affected_work_orders(
+    def _aggregate_impact(
         self,
-        lot_batches: List[LotBatch]
-    ) -> List[AffectedWorkOrderDTO]:
+        rows: list,
+        include_customer_details: bool
+    ) -> Tuple[List[AffectedWorkOrderDTO], List[AffectedShipmentDTO], List[AffectedCustomerDTO],
+               List[RecallLotDTO], int]:
         """
-        Trace which work orders consumed the affected lots.
+        Split downstream impact rows into report sections in one pass.
 
-        Uses traceability_links table to find work orders that consumed these lots.
+        Customer name comes from the shipped serials' custom_attributes
+        (customer_name/customer_email), falling back to the shipment
+        destination; customers are aggregated by name.
         """
-        lot_ids = [lot.id for lot in lot_batches]
-
-        # Query traceability links to find work orders that consumed these lots
-        # Parent lot = affected lot, Child = produced lot/serial
-        links = self.db.query(TraceabilityLink).filter(
-            and_(
-                TraceabilityLink.parent_lot_id.in_(lot_ids),
-                TraceabilityLink.work_order_id.isnot(None)
-            )
-        ).all()
-
-        # Get unique work order IDs
-        work_order_ids = list(set(link.work_order_id for link in links if link.work_order_id))
+        affected_wos = []
+        affected_shipments = []
+        downstream_lots = []
+        serial_count = 0
+        customer_data = {}  # For aggregating customer information
 
-        if not work_order_ids:
+        for row in rows:
+            if row.kind == 'work_order':
+                affected_wos.append(AffectedWorkOrderDTO(
+                    work_order_id=row.id,
+                    work_order_number=row.code,
+                    quantity_consumed=Decimal(str(row.quantity or 0)),
+                    status=row.status,
+                    completion_date=row.event_date
+                ))
+            elif row.kind == 'lot':
+                downstream_lots.append(RecallLotDTO(
+                    lot_id=row.id,
+                    lot_number=row.code,
+                    material_id=row.material_id,
+                    depth=row.depth
+                ))
+            elif row.kind == 'serials':
+                serial_count = int(row.quantity or 0)
+            elif row.kind == 'shipment':
+                customer_name = None
+                customer_email = None
+                if include_customer_details:
+                    customer_name = row.customer_name or row.destination
+                    customer_email = row.customer_email if row.customer_name else None
+
+                quantity = Decimal(int(row.quantity))
+                affected_shipments.append(AffectedShipmentDTO(
+                    shipment_id=row.id,
+                    shipment_number=row.code,
+                    customer_name=customer_name,
+                    customer_email=customer_email,
+                    shipped_date=row.event_date,
+                    quantity=quantity,
+                    serial_numbers=list(row.serial_numbers or [])
+                ))
+
+                # Aggregate customer data
+                if customer_name:
+                    if customer_name not in customer_data:
+                        customer_data[customer_name] = {
+                            'email': customer_email,
+                            'total_quantity': Decimal(0),
+                            'shipment_count': 0
+                        }
+                    customer_data[customer_name]['total_quantity'] += quantity
+                    customer_data[customer_name]['shipment_count'] += 1
+
+        if not affected_wos:
             logger.info("No work orders found that consumed the affected lots")
-            return []
+        if not affected_shipments:
+            logger.info("No shipments found for affected lots/work orders")
 
-        # Query work orders with details
-        work_orders = self.db.query(WorkOrder).filter(
-            WorkOrder.id.in_(work_order_ids)
-        ).all()
+        affected_wos.sort(key=lambda wo: wo.work_order_number)
+        affected_shipments.sort(key=lambda shipment: shipment.shipment_number)
+        downstream_lots.sort(key=lambda lot: (lot.depth, lot.lot_number))
 
-        # Build affected work orders list
-        affected_wos = []
-        for wo in work_orders:
-            # Calculate total quantity consumed from affected lots
-            consumed_qty = sum(
-                Decimal(str(link.quantity_used or 0))
-                for link in links
-                if link.work_order_id == wo.id
+        # Build affected customers list
+        affected_customers = [
+            AffectedCustomerDTO(
+                customer_name=name,
+                customer_email=data['email'],
+                total_quantity=data['total_quantity'],
+                shipment_count=data['shipment_count']
             )
+            for name, data in customer_data.items()
+        ]
 
-            affected_wos.append(AffectedWorkOrderDTO(
-                work_order_id=wo.id,
-                work_order_number=wo.work_order_number,
-                quantity_consumed=consumed_qty,
-                status=wo.order_status.value if hasattr(wo.order_status, 'value') else str(wo.order_status),
-                completion_date=wo.end_date_actual
-            ))
+        return affected_wos, affected_shipments, affected_customers, downstream_lots, serial_count
 
-        return affected_wos
+    # ==================== Background jobs ====================
 
-    def _trace_affected_shipments(
+    def enqueue_report_job(
         self,
-        lot_batches: List[LotBatch],
-        affected_work_orders: List[AffectedWorkOrderDTO],
-        include_customer_details: bool
-    ) -> tuple[List[AffectedShipmentDTO], List[AffectedCustomerDTO]]:
+        request: RecallReportRequest,
+        user_id: int,
+        organization_id: int
+    ) -> RecallReportJob:
         """
-        Trace affected shipments and customers.
+        Record a recall report job and queue it for a worker.
 
-        Logic:
-        1. Find serial numbers produced from affected lots or work orders
-        2. Find shipments containing these serial numbers
-        3. Aggregate customer information
+        The job row and the PGMQ message are committed in one transaction.
         """
-        lot_ids = [lot.id for lot in lot_batches]
-        wo_ids = [wo.work_order_id for wo in affected_work_orders]
-
-        # Find serial numbers linked to affected lots or work orders
-        serial_numbers_query = self.db.query(SerialNumber).filter(
-            or_(
-                SerialNumber.lot_batch_id.in_(lot_ids),
-                SerialNumber.work_order_id.in_(wo_ids)
-            )
+        job = RecallReportJob(
+            organization_id=organization_id,
+            requested_by=user_id,
+            request=request.model_dump(),
+            status='QUEUED',
+            progress_percent=0,
+            stage='Queued'
         )
+        self.db.add(job)
+        self.db.flush()
 
-        # Filter to shipped serial numbers
-        serial_numbers = serial_numbers_query.filter(
-            SerialNumber.status == 'SHIPPED'
-        ).all()
+        self.db.execute(
+            text("SELECT pgmq.send(:queue, CAST(:message AS jsonb))"),
+            {"queue": RECALL_REPORT_QUEUE, "message": json.dumps({"job_id": job.id})}
+        )
+        self.db.commit()
+        self.db.refresh(job)
 
-        if not serial_numbers:
-            logger.info("No shipped serial numbers found for affected lots/work orders")
-            return [], []
+        logger.info(f"Queued recall report job {job.id} ({len(request.lot_numbers)} lots)")
+        return job
 
-        # Get shipment IDs from serial numbers
-        shipment_ids = list(set(
-            sn.shipment_id for sn in serial_numbers
-            if sn.shipment_id is not None
-        ))
+    def get_job(self, job_id: int, organization_id: int) -> Optional[RecallReportJob]:
+        """Get a recall report job of the organization"""
+        return self.db.query(RecallReportJob).filter(
+            and_(
+                RecallReportJob.id == job_id,
+                RecallReportJob.organization_id == organization_id
+            )
+        ).first()
 
-        if not shipment_ids:
-            logger.info("No shipments found for affected serial numbers")
-            return [], []
+    def run_report_job(self, job_id: int) -> str:
+        """
+        Generate the report of a queued job, committing progress as it goes.
 
-        # Query shipments
-        shipments = self.db.query(Shipment).filter(
-            Shipment.id.in_(shipment_ids)
-        ).all()
+        Returns:
+            Final job status (COMPLETED, FAILED), or 'missing' / the current
+            status if the job does not exist or was already finished
+        """
+        job = self.db.query(RecallReportJob).filter(RecallReportJob.id == job_id).first()
+        if not job:
+            return 'missing'
+        if job.status in ('COMPLETED', 'FAILED'):
+            return job.status
+
+        job.status = 'RUNNING'
+        job.started_at = datetime.now(timezone.utc)
+        self.db.commit()
 
-        # Build affected shipments list
-        affected_shipments = []
-        customer_data = {}  # For aggregating customer information
+        def record_progress(percent: int, stage: str) -> None:
+            job.progress_percent = percent
+            job.stage = stage
+            self.db.commit()
+
+        try:
+            report = self.generate_recall_report(
+                RecallReportRequest(**job.request),
+                job.requested_by,
+                job.organization_id,
+                progress=record_progress
+            )
+            job.report = report.model_dump(mode='json')
+            job.status = 'COMPLETED'
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Recall report job {job_id} failed: {e}", exc_info=True)
+            job.status = 'FAILED'
+            job.error = str(e)
+
+        job.completed_at = datetime.now(timezone.utc)
+        self.db.commit()
+        return job.status
 
-        for shipment in shipments:
-            # Find serial numbers in this shipment
-            shipment_serials = [
-                sn for sn in serial_numbers
-                if sn.shipment_id == shipment.id
-            ]
+    def process_queue_batch(self, pgmq_client, batch_size: int = 5, vt: int = 300) -> Dict[str, int]:
+        """
+        Read recall report jobs from PGMQ and run them.
 
-            serial_nums = [sn.serial_number for sn in shipment_serials]
-            quantity = Decimal(len(serial_nums))
-
-            # Extract customer info from serial numbers or shipment metadata
-            # Since we don't have a Customer table, use metadata from serial numbers
-            customer_name = None
-            customer_email = None
-
-            if shipment_serials and include_customer_details:
-                # Try to get customer info from first serial number's custom_attributes
-                first_serial = shipment_serials[0]
-                if first_serial.custom_attributes:
-                    customer_name = first_serial.custom_attributes.get('customer_name')
-                    customer_email = first_serial.custom_attributes.get('customer_email')
-
-                # Fallback: use shipment destination as customer name
-                if not customer_name and shipment.destination_location:
-                    customer_name = shipment.destination_location
-
-            affected_shipments.append(AffectedShipmentDTO(
-                shipment_id=shipment.id,
-                shipment_number=shipment.shipment_number,
-                customer_name=customer_name,
-                customer_email=customer_email,
-                shipped_date=shipment.actual_ship_date,
-                quantity=quantity,
-                serial_numbers=serial_nums
-            ))
-
-            # Aggregate customer data
-            if customer_name:
-                if customer_name not in customer_data:
-                    customer_data[customer_name] = {
-                        'email': customer_email,
-                        'total_quantity': Decimal(0),
-                        'shipment_count': 0
-                    }
-                customer_data[customer_name]['total_quantity'] += quantity
-                customer_data[customer_name]['shipment_count'] += 1
+        Every handled message is archived; a job whose worker dies stays in the
+        queue and is redelivered after the visibility timeout.
 
-        # Build affected customers list
-        affected_customers = [
-            AffectedCustomerDTO(
-                customer_name=name,
-                customer_email=data['email'],
-                total_quantity=data['total_quantity'],
-                shipment_count=data['shipment_count']
-            )
-            for name, data in customer_data.items()
-        ]
+        Args:
+            pgmq_client: PGMQClient instance
+            batch_size: Maximum messages per batch
+            vt: Visibility timeout in seconds (must exceed a report's runtime)
 
-        return affected_shipments, affected_customers
+        Returns:
+            Count of jobs per final status
+        """
+        messages = pgmq_client.dequeue_batch(RECALL_REPORT_QUEUE, batch_size, vt=vt)
+
+        outcomes: Dict[str, int] = {}
+        for message in messages:
+            outcome = self.run_report_job(message.message.get("job_id"))
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        pgmq_client.archive_batch(RECALL_REPORT_QUEUE, [message.msg_id for message in messages])
+        return outcomes
+
+
+def iter_recall_report_csv(report: RecallReportResponse, chunk_rows: int = 500) -> Iterator[str]:
+    """
+    Render a recall report as CSV, yielding chunks of rows for streaming.
+
+    Every row starts with its section (report, work_order, shipment,
+    customer, downstream_lot, upstream_lot) so one file holds the whole report.
+
+    Args:
+        report: Recall report
+        chunk_rows: Rows per yielded chunk
+
+    Yields:
+        CSV text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
+
+    def rows():
+        yield ["section", "id", "number", "name", "status_or_email", "date", "quantity", "details"]
+        yield ["report", report.report_id, report.material_number, report.material_description,
+               report.severity, report.generated_at.isoformat(), report.total_quantity_affected,
+               report.reason]
+        for wo in report.affected_work_orders:
+            yield ["work_order", wo.work_order_id, wo.work_order_number, "", wo.status,
+                   wo.completion_date.isoformat() if wo.completion_date else "", wo.quantity_consumed, ""]
+        for shipment in report.affected_shipments:
+            yield ["shipment", shipment.shipment_id, shipment.shipment_number, shipment.customer_name or "",
+                   shipment.customer_email or "",
+                   shipment.shipped_date.isoformat() if shipment.shipped_date else "",
+                   shipment.quantity, " ".join(shipment.serial_numbers)]
+        for customer in report.affected_customers:
+            yield ["customer", "", "", customer.customer_name, customer.customer_email or "", "",
+                   customer.total_quantity, f"{customer.shipment_count} shipments"]
+        for section, lots in (("downstream_lot", report.downstream_lots), ("upstream_lot", report.upstream_lots)):
+            for lot in lots:
+                yield [section, lot.lot_id, lot.lot_number, "", "", "", "", f"depth {lot.depth}"]
+
+    for row in rows():
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield flush()
+            pending = 0
+
+    if pending:
+        yield flush()
@@ -4,8 +4,8 @@ Use Case: Handle Trial Expiration
 Manages trial expiration logic, including suspension of expired trials
 and notification triggers. Typically called by a scheduled job.
 """
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 import logging
@@ -14,6 +14,7 @@ from app.models.subscription import SubscriptionModel
 from app.domain.entities.subscription import SubscriptionStatus
 from app.application.services.subscription_service import SubscriptionService
 from app.config.pricing import TRIAL_WARNING_DAYS
+from app.infrastructure.repositories.usage_snapshot_repository import UsageSnapshotRepository
 
 
 logger = logging.getLogger(__name__)
@@ -41,11 +42,20 @@ class HandleTrialExpirationUseCase:
         """
         self.db = db
         self.subscription_service = SubscriptionService(db)
+        self.snapshots = UsageSnapshotRepository(db)
 
-    def execute(self) -> Dict[str, Any]:
+    def execute(self, now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Execute trial expiration handling
 
+        Expired trials are suspended with one UPDATE and trials in the
+        warning window are read with one SELECT; a notification per
+        organization is queued in the same transaction. Nothing is
+        committed here.
+
+        Args:
+            now: Current time (defaults to UTC now)
+
         Returns:
             Dictionary with summary:
             {
@@ -57,19 +67,20 @@ class HandleTrialExpirationUseCase:
             }
         """
         logger.info("Running trial expiration handler")
+        now = now or datetime.now(timezone.utc)
 
         # Step 1: Handle expired trials
-        expired_result = self._handle_expired_trials()
+        expired_result = self._handle_expired_trials(now)
 
         # Step 2: Handle trials expiring soon (warnings)
-        warning_result = self._handle_expiring_soon_trials()
+        warning_result = self._handle_expiring_soon_trials(now)
 
         result = {
             "expired_count": len(expired_result),
             "expired_org_ids": expired_result,
             "warning_count": len(warning_result),
             "warning_org_ids": warning_result,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now.isoformat()
         }
 
         logger.info(
@@ -79,125 +90,57 @@ class HandleTrialExpirationUseCase:
 
         return result
 
-    def _handle_expired_trials(self) -> List[int]:
+    def _handle_expired_trials(self, now: datetime) -> List[int]:
         """
-        Find and suspend expired trials
+        Suspend expired trials and queue trial_expired notifications
+
+        Args:
+            now: Current time
 
         Returns:
             List of organization IDs with expired trials
         """
-        now = datetime.utcnow()
-
-        # Find expired trials that are still active
-        expired_trials = self.db.query(SubscriptionModel).filter(
-            and_(
-                SubscriptionModel.status == SubscriptionStatus.TRIAL.value,
-                SubscriptionModel.trial_ends_at <= now,
-                SubscriptionModel.trial_converted == False
-            )
-        ).all()
-
-        suspended_org_ids = []
-
-        for subscription in expired_trials:
-            try:
-                # Suspend expired trial
-                self.subscription_service.suspend_subscription(
-                    subscription.organization_id
-                )
-                suspended_org_ids.append(subscription.organization_id)
-
-                logger.info(
-                    f"Suspended expired trial for organization {subscription.organization_id}"
-                )
-
-                # TODO: Trigger notification email
-                # self._send_trial_expired_email(subscription)
-
-            except Exception as e:
-                logger.error(
-                    f"Failed to suspend trial for organization {subscription.organization_id}: {e}"
-                )
-
-        return suspended_org_ids
-
-    def _handle_expiring_soon_trials(self) -> List[int]:
-        """
-        Find trials expiring soon and trigger warning notifications
+        expired = self.snapshots.suspend_expired_trials(now)
 
-        Returns:
-            List of organization IDs with trials expiring soon
-        """
-        now = datetime.utcnow()
-        warning_threshold = now + timedelta(days=TRIAL_WARNING_DAYS)
-
-        # Find trials expiring within warning period
-        expiring_soon = self.db.query(SubscriptionModel).filter(
-            and_(
-                SubscriptionModel.status == SubscriptionStatus.TRIAL.value,
-                SubscriptionModel.trial_ends_at > now,
-                SubscriptionModel.trial_ends_at <= warning_threshold,
-                SubscriptionModel.trial_converted == False
-            )
-        ).all()
-
-        warning_org_ids = []
-
-        for subscription in expiring_soon:
-            days_remaining = (subscription.trial_ends_at - now).days
-
-            logger.info(
-                f"Trial expiring soon for organization {subscription.organization_id}: "
-                f"{days_remaining} days remaining"
-            )
-
-            warning_org_ids.append(subscription.organization_id)
+        self.snapshots.enqueue_notifications([
+            {
+                "type": "trial_expired",
+                "organization_id": trial["organization_id"],
+                "billing_email": trial["billing_email"],
+                "trial_ends_at": trial["trial_ends_at"].isoformat(),
+            }
+            for trial in expired
+        ])
 
-            # TODO: Trigger warning notification email
-            # self._send_trial_expiring_email(subscription, days_remaining)
+        if expired:
+            logger.info(f"Suspended {len(expired)} expired trials")
 
-        return warning_org_ids
+        return [trial["organization_id"] for trial in expired]
 
-    def _send_trial_expired_email(self, subscription: SubscriptionModel) -> None:
+    def _handle_expiring_soon_trials(self, now: datetime) -> List[int]:
         """
-        Send trial expired notification email
+        Find trials expiring soon and queue trial_expiring notifications
 
         Args:
-            subscription: Expired subscription
+            now: Current time
 
-        TODO: Implement email sending via email service
-        """
-        logger.info(f"TODO: Send trial expired email for org {subscription.organization_id}")
-        # email_service.send_trial_expired_email(
-        #     to=subscription.billing_email,
-        #     organization_id=subscription.organization_id,
-        #     trial_ended=subscription.trial_ends_at
-        # )
-
-    def _send_trial_expiring_email(
-        self,
-        subscription: SubscriptionModel,
-        days_remaining: int
-    ) -> None:
+        Returns:
+            List of organization IDs with trials expiring soon
         """
-        Send trial expiring soon notification email
+        expiring = self.snapshots.find_expiring_trials(now, now + timedelta(days=TRIAL_WARNING_DAYS))
 
-        Args:
-            subscription: Subscription with trial expiring soon
-            days_remaining: Days until trial expiration
+        self.snapshots.enqueue_notifications([
+            {
+                "type": "trial_expiring",
+                "organization_id": trial["organization_id"],
+                "billing_email": trial["billing_email"],
+                "trial_ends_at": trial["trial_ends_at"].isoformat(),
+                "days_remaining": (trial["trial_ends_at"] - now).days,
+            }
+            for trial in expiring
+        ])
 
-        TODO: Implement email sending via email service
-        """
-        logger.info(
-            f"TODO: Send trial expiring email for org {subscription.organization_id}, "
-            f"days remaining: {days_remaining}"
-        )
-        # email_service.send_trial_expiring_email(
-        #     to=subscription.billing_email,
-        #     organization_id=subscription.organization_id,
-        #     days_remaining=days_remaining,
-        #     trial_ends=subscription.trial_ends_at
-        # )
+        return [trial["organization_id"] for trial in expiring]
 
     def get_trials_requiring_action(self) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -4,14 +4,18 @@ Use Case: Track Usage
 Calculates and records resource usage for organizations.
 Typically called by a scheduled job (e.g., every 6 hours).
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 import logging
 
-from app.models.subscription import SubscriptionModel
-from app.domain.entities.subscription import SubscriptionStatus
 from app.application.services.usage_tracking_service import UsageTrackingService
+from app.config.pricing import USAGE_SNAPSHOT_INTERVAL_HOURS, USAGE_WARNING_THRESHOLD
+from app.infrastructure.repositories.usage_snapshot_repository import (
+    LEVEL_EXCEEDED,
+    UsageSnapshotRepository,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -39,6 +43,7 @@ class TrackUsageUseCase:
         """
         self.db = db
         self.usage_service = UsageTrackingService(db)
+        self.snapshots = UsageSnapshotRepository(db)
 
     def execute(self, organization_ids: List[int] = None) -> Dict[str, Any]:
         """
@@ -46,7 +51,8 @@ class TrackUsageUseCase:
 
         Args:
             organization_ids: Optional list of specific organization IDs.
-                            If None, tracks all active subscriptions.
+                            If None, tracks all active subscriptions
+                            set-based (see track_all).
 
         Returns:
             Dictionary with tracking summary:
@@ -63,13 +69,13 @@ class TrackUsageUseCase:
                 "failed_org_ids": [456, 789]
             }
         """
-        logger.info("Running usage tracking job")
+        if not organization_ids:
+            return self.track_all()
+
+        logger.info(f"Running usage tracking for {len(organization_ids)} organizations")
 
         # Step 1: Get organizations to track
-        if organization_ids:
-            orgs_to_track = organization_ids
-        else:
-            orgs_to_track = self._get_active_subscriptions()
+        orgs_to_track = organization_ids
 
         # Step 2: Track usage for each organization
         tracked = []
@@ -120,21 +126,80 @@ class TrackUsageUseCase:
 
         return result
 
-    def _get_active_subscriptions(self) -> List[int]:
+    def track_all(self, now: Optional[datetime] = None) -> Dict[str, Any]:
         """
-        Get list of organization IDs with active subscriptions
+        Track usage of all trial/active organizations in a few statements
+
+        The snapshot is one GROUP BY upsert keyed by the current
+        USAGE_SNAPSHOT_INTERVAL_HOURS slot, so reruns overwrite it. Limit and
+        threshold crossings are computed in SQL; a notification is queued
+        only when a resource escalates (below -> warning -> exceeded) since
+        the previous snapshot. Nothing is committed here.
+
+        Args:
+            now: Current time (defaults to UTC now)
 
         Returns:
-            List of organization IDs
+            Same summary as execute, plus warning_count, notifications_queued
+            and measured_at
         """
-        subscriptions = self.db.query(SubscriptionModel.organization_id).filter(
-            SubscriptionModel.status.in_([
-                SubscriptionStatus.TRIAL.value,
-                SubscriptionStatus.ACTIVE.value
-            ])
-        ).all()
-
-        return [s.organization_id for s in subscriptions]
+        snapshot_at = self._snapshot_slot(now or datetime.now(timezone.utc))
+        logger.info(f"Running usage tracking for all organizations (slot {snapshot_at.isoformat()})")
+
+        tracked_count = self.snapshots.snapshot_usage(snapshot_at)
+        crossings = self.snapshots.find_limit_crossings(snapshot_at, USAGE_WARNING_THRESHOLD)
+
+        at_limit: Dict[int, List[str]] = {}
+        warning_count = 0
+        for crossing in crossings:
+            if crossing["level"] == LEVEL_EXCEEDED:
+                at_limit.setdefault(crossing["organization_id"], []).append(crossing["resource"])
+            else:
+                warning_count += 1
+
+        queued = self.snapshots.enqueue_notifications([
+            {
+                "type": "usage_limit_exceeded" if crossing["level"] == LEVEL_EXCEEDED else "usage_limit_warning",
+                "organization_id": crossing["organization_id"],
+                "resource": crossing["resource"],
+                "current": crossing["current_value"],
+                "limit": crossing["limit_value"],
+                "measured_at": snapshot_at.isoformat(),
+            }
+            for crossing in crossings
+            if crossing["escalated"]
+        ])
+
+        result = {
+            "tracked_count": tracked_count,
+            "at_limit_count": len(at_limit),
+            "organizations_at_limit": [
+                {"organization_id": org_id, "violations": violations}
+                for org_id, violations in at_limit.items()
+            ],
+            "warning_count": warning_count,
+            "notifications_queued": queued,
+            "failed_count": 0,
+            "failed_org_ids": [],
+            "measured_at": snapshot_at.isoformat(),
+        }
+
+        logger.info(
+            f"Usage tracking completed: {tracked_count} tracked, {len(at_limit)} at limit, "
+            f"{warning_count} warnings, {queued} notifications queued"
+        )
+
+        return result
+
+    @staticmethod
+    def _snapshot_slot(now: datetime) -> datetime:
+        """Start of the USAGE_SNAPSHOT_INTERVAL_HOURS slot containing now"""
+        return now.replace(
+            hour=now.hour - now.hour % USAGE_SNAPSHOT_INTERVAL_HOURS,
+            minute=0,
+            second=0,
+            microsecond=0
+        )
 
     def _send_limit_alerts(self, organizations_at_limit: List[Dict[str, Any]]) -> None:
         """
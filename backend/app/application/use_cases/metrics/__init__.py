@@ -5,13 +5,16 @@ Business logic for KPI calculations:
 - OEE (Overall Equipment Effectiveness)
 - OTD (On-Time Delivery)
 - FPY (First Pass Yield)
+- Fleet reliability (MTBF/MTTR/availability)
 """
 from app.application.use_cases.metrics.calculate_oee import CalculateOEEUseCase
 from app.application.use_cases.metrics.calculate_otd import CalculateOTDUseCase
 from app.application.use_cases.metrics.calculate_fpy import CalculateFPYUseCase
+from app.application.use_cases.metrics.calculate_reliability import CalculateReliabilityUseCase
 
 __all__ = [
     "CalculateOEEUseCase",
     "CalculateOTDUseCase",
-    "CalculateFPYUseCase"
+    "CalculateFPYUseCase",
+    "CalculateReliabilityUseCase"
 ]
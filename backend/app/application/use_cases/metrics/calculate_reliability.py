@@ -0,0 +1,223 @@
+"""
+Calculate Fleet Reliability Use Case
+
+Calculates MTBF, MTTR and availability for every machine in a plant.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.domain.entities.maintenance import DowntimeCategory
+from app.infrastructure.repositories.maintenance_repository import MaintenanceRepository
+from app.infrastructure.cache.cache_service import CacheService
+
+
+class CalculateReliabilityDTO:
+    """Data Transfer Object for fleet reliability calculation request."""
+
+    def __init__(
+        self,
+        organization_id: int,
+        plant_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        bucket: Optional[str] = None
+    ):
+        self.organization_id = organization_id
+        self.plant_id = plant_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.bucket = bucket
+
+
+class CalculateReliabilityUseCase:
+    """
+    Use case for calculating fleet-wide reliability (MTBF/MTTR/availability).
+
+    Formulas (minutes):
+    - MTBF = Operating Time / Failures
+    - MTTR = Repair Time / Failures
+    - Availability = (Total Time - Downtime) / Total Time
+
+    Business Rules:
+    - BR-REL-001: Failures and repair time come from completed BREAKDOWN events
+    - BR-REL-002: Downtime is clipped to the period; ongoing events count up to end_date
+    - BR-REL-003: All downtime is aggregated by one grouped query for the whole plant
+    - BR-REL-004: Results cached for 15 minutes, same TTL as OEE (BR-OEE-004)
+    """
+
+    CACHE_TTL = 900
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = MaintenanceRepository(db)
+        self.cache = CacheService(db)
+
+    def execute(self, dto: CalculateReliabilityDTO) -> dict:
+        """
+        Execute fleet reliability calculation.
+
+        Args:
+            dto: CalculateReliabilityDTO with plant, period and optional bucket
+
+        Returns:
+            Dict with machine_metrics, plant_aggregate and trend (empty without bucket)
+
+        Raises:
+            ValidationException: If date range or bucket is invalid
+        """
+        from app.core.exceptions import ValidationException
+
+        if dto.start_date and dto.end_date and dto.start_date >= dto.end_date:
+            raise ValidationException(
+                "Start date must be before end date",
+                details={"field": "start_date"}
+            )
+
+        start_date = dto.start_date or (datetime.now() - timedelta(days=30))
+        end_date = dto.end_date or datetime.now()
+
+        cache_key = self._generate_cache_key(dto, start_date, end_date)
+        cached_result = self.cache.get(cache_key)
+        if cached_result:
+            return cached_result
+
+        from app.models.machine import Machine
+
+        machines = self.db.query(Machine.id, Machine.machine_code, Machine.machine_name).filter(
+            Machine.organization_id == dto.organization_id,
+            Machine.plant_id == dto.plant_id,
+            Machine.is_active == True
+        ).order_by(Machine.id).all()
+
+        try:
+            rollup = self.repo.get_downtime_rollup(
+                organization_id=dto.organization_id,
+                plant_id=dto.plant_id,
+                start_date=start_date,
+                end_date=end_date,
+                bucket=dto.bucket
+            )
+        except ValueError as e:
+            raise ValidationException(str(e), details={"field": "bucket"})
+
+        # Inactive machines are excluded from the fleet figures
+        active_ids = {machine.id for machine in machines}
+        rollup = [row for row in rollup if row["machine_id"] in active_ids]
+
+        total_minutes = (end_date - start_date).total_seconds() / 60.0
+        totals = self._totals_by(rollup, lambda row: row["machine_id"])
+
+        machine_metrics = []
+        for machine in machines:
+            machine_metrics.append({
+                "machine_id": machine.id,
+                "machine_code": machine.machine_code,
+                "machine_name": machine.machine_name,
+                **self._reliability(totals.get(machine.id), total_minutes)
+            })
+
+        fleet_totals = self._totals_by(rollup, lambda row: "fleet").get("fleet")
+        result = {
+            "period_start": start_date.isoformat(),
+            "period_end": end_date.isoformat(),
+            "machine_metrics": machine_metrics,
+            "plant_aggregate": {
+                "machine_count": len(machines),
+                **self._reliability(fleet_totals, total_minutes * len(machines))
+            },
+            "trend": self._trend(rollup, dto.bucket, start_date, end_date, len(machines))
+        }
+
+        self.cache.set(cache_key, result, ttl=self.CACHE_TTL)
+
+        return result
+
+    def _generate_cache_key(
+        self,
+        dto: CalculateReliabilityDTO,
+        start_date: datetime,
+        end_date: datetime
+    ) -> str:
+        """Generate cache key for reliability result (stored next to OEE keys)."""
+        return (
+            f"reliability_org{dto.organization_id}_plant{dto.plant_id}_"
+            f"{start_date.strftime('%Y%m%d%H%M')}_{end_date.strftime('%Y%m%d%H%M')}_"
+            f"bucket{dto.bucket}"
+        )
+
+    @staticmethod
+    def _totals_by(rollup: List[dict], key) -> Dict:
+        """Sum failures, repair and clipped downtime minutes per key."""
+        totals: Dict = {}
+        for row in rollup:
+            entry = totals.setdefault(key(row), {"failures": 0, "repair_minutes": 0.0, "downtime_minutes": 0.0})
+            if row["category"] == DowntimeCategory.BREAKDOWN:
+                entry["failures"] += row["event_count"]
+                entry["repair_minutes"] += row["downtime_minutes"]
+            entry["downtime_minutes"] += row["clipped_downtime_minutes"]
+        return totals
+
+    @staticmethod
+    def _reliability(totals: Optional[dict], total_minutes: float) -> dict:
+        """Derive MTBF/MTTR/availability (hours, percent) from summed minutes."""
+        totals = totals or {"failures": 0, "repair_minutes": 0.0, "downtime_minutes": 0.0}
+        failures = totals["failures"]
+        downtime = min(totals["downtime_minutes"], total_minutes)
+        operating = max(0.0, total_minutes - downtime)
+
+        return {
+            "mtbf_hours": round(operating / failures / 60.0, 2) if failures else None,
+            "mttr_hours": round(totals["repair_minutes"] / failures / 60.0, 2) if failures else 0.0,
+            "total_failures": failures,
+            "total_downtime_hours": round(downtime / 60.0, 2),
+            "total_repair_hours": round(totals["repair_minutes"] / 60.0, 2),
+            "total_operating_hours": round(operating / 60.0, 2),
+            "availability_percent": round(operating / total_minutes * 100, 2) if total_minutes > 0 else 0.0
+        }
+
+    def _trend(
+        self,
+        rollup: List[dict],
+        bucket: Optional[str],
+        start_date: datetime,
+        end_date: datetime,
+        machine_count: int
+    ) -> List[dict]:
+        """Plant-level reliability per time bucket, ordered by bucket."""
+        if not bucket:
+            return []
+
+        period_start, period_end = _naive_utc(start_date), _naive_utc(end_date)
+        trend = []
+        for bucket_start, totals in sorted(self._totals_by(rollup, lambda row: row["bucket"]).items()):
+            bucket_start = _naive_utc(bucket_start)
+            bucket_end = _next_bucket(bucket_start, bucket)
+            # Edge buckets only cover the part inside the period
+            bucket_minutes = (
+                min(bucket_end, period_end) - max(bucket_start, period_start)
+            ).total_seconds() / 60.0
+            trend.append({
+                "bucket": bucket_start.isoformat(),
+                **self._reliability(totals, max(0.0, bucket_minutes) * machine_count)
+            })
+        return trend
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Drop timezone after converting aware datetimes to UTC."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _next_bucket(bucket_start: datetime, bucket: str) -> datetime:
+    """Start of the bucket following bucket_start."""
+    if bucket == "hour":
+        return bucket_start + timedelta(hours=1)
+    if bucket == "day":
+        return bucket_start + timedelta(days=1)
+    if bucket == "week":
+        return bucket_start + timedelta(weeks=1)
+    if bucket_start.month == 12:
+        return bucket_start.replace(year=bucket_start.year + 1, month=1)
+    return bucket_start.replace(month=bucket_start.month + 1)
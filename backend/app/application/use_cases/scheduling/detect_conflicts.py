@@ -1,11 +1,12 @@
 """
 Detect Conflicts Use Case
 
-Detects scheduling conflicts (lane overload, dependency violations).
+Detects scheduling conflicts (lane overload, machine overload, operator double booking).
 """
 from datetime import date
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from app.application.services.schedule_conflict_service import ScheduleConflictService
 from app.infrastructure.repositories.scheduling_repository import SchedulingRepository
 
 
@@ -16,11 +17,13 @@ class DetectConflictsDTO:
         self,
         plant_id: int,
         start_date: date,
-        end_date: date
+        end_date: date,
+        organization_id: Optional[int] = None
     ):
         self.plant_id = plant_id
         self.start_date = start_date
         self.end_date = end_date
+        self.organization_id = organization_id
 
 
 class ConflictResponse:
@@ -28,7 +31,7 @@ class ConflictResponse:
 
     def __init__(
         self,
-        conflict_type: str,  # "LANE_OVERLOAD", "DEPENDENCY_VIOLATION"
+        conflict_type: str,  # "LANE_OVERLOAD", "MACHINE_OVERLOAD", "OPERATOR_DOUBLE_BOOKING"
         severity: str,  # "HIGH", "MEDIUM", "LOW"
         description: str,
         affected_work_orders: List[int],
@@ -48,8 +51,10 @@ class DetectConflictsUseCase:
     Use case for detecting scheduling conflicts.
 
     Business Rules:
-    - BR-SCHED-001: No overlapping assignments - Lane can only have one WO at a time
+    - BR-SCHED-001: No overloaded lanes - Concurrent assignments within lane capacity
     - BR-SCHED-002: Dependency validation - Predecessor must complete before successor
+    - BR-SCHED-003: No double booking - Work center runs at most one operation per machine,
+      an operator works one job at a time
     """
 
     def __init__(self, db: Session):
@@ -66,31 +71,11 @@ class DetectConflictsUseCase:
         Returns:
             List of ConflictResponse objects
         """
-        conflicts = []
-
-        # Detect lane overload conflicts
-        lane_conflicts = self.repo.detect_lane_conflicts(
+        conflicts = ScheduleConflictService(self.db).detect(
             plant_id=dto.plant_id,
             start_date=dto.start_date,
-            end_date=dto.end_date
+            end_date=dto.end_date,
+            organization_id=dto.organization_id
         )
 
-        for conflict_data in lane_conflicts:
-            conflicts.append(ConflictResponse(
-                conflict_type="LANE_OVERLOAD",
-                severity="HIGH",
-                description=f"Lane {conflict_data['lane_code']} has overlapping assignments",
-                affected_work_orders=[
-                    conflict_data['work_order_1_id'],
-                    conflict_data['work_order_2_id']
-                ],
-                affected_lanes=[conflict_data['lane_id']],
-                details={
-                    "work_order_1": conflict_data['work_order_1_number'],
-                    "work_order_2": conflict_data['work_order_2_number'],
-                    "overlap_start": conflict_data['overlap_start'].isoformat(),
-                    "overlap_end": conflict_data['overlap_end'].isoformat()
-                }
-            ))
-
-        return conflicts
+        return [ConflictResponse(**conflict) for conflict in conflicts]
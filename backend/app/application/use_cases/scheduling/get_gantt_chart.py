@@ -6,12 +6,10 @@ Generates Gantt chart data for work orders with operations, lanes, and dependenc
 from datetime import datetime, date
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from app.application.services.gantt_projection_service import GanttProjectionService
+from app.application.services.schedule_conflict_service import ScheduleConflictService
+from app.domain.services.critical_path import CriticalPathNetwork
 from app.infrastructure.repositories.scheduling_repository import SchedulingRepository
-from app.domain.services.operation_scheduling_service import (
-    OperationSchedulingService,
-    GanttChartData
-)
-from app.models.work_order import WorkOrder
 from app.core.exceptions import ValidationException
 
 
@@ -25,7 +23,9 @@ class GetGanttChartDTO:
         end_date: Optional[date] = None,
         lane_ids: Optional[List[int]] = None,
         include_completed: bool = False,
-        organization_id: Optional[int] = None
+        organization_id: Optional[int] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
     ):
         self.plant_id = plant_id
         self.start_date = start_date
@@ -33,6 +33,8 @@ class GetGanttChartDTO:
         self.lane_ids = lane_ids
         self.include_completed = include_completed
         self.organization_id = organization_id
+        self.skip = skip
+        self.limit = limit
 
 
 class GanttChartTask:
@@ -54,7 +56,12 @@ class GanttChartTask:
         progress_percent: float,
         status: str,
         is_critical_path: bool = False,
-        scheduling_mode: Optional[str] = None
+        scheduling_mode: Optional[str] = None,
+        work_center_id: Optional[int] = None,
+        work_center_code: Optional[str] = None,
+        due_date: Optional[datetime] = None,
+        total_float_hours: Optional[float] = None,
+        free_float_hours: Optional[float] = None
     ):
         self.work_order_id = work_order_id
         self.work_order_number = work_order_number
@@ -71,6 +78,11 @@ class GanttChartTask:
         self.status = status
         self.is_critical_path = is_critical_path
         self.scheduling_mode = scheduling_mode
+        self.work_center_id = work_center_id
+        self.work_center_code = work_center_code
+        self.due_date = due_date
+        self.total_float_hours = total_float_hours
+        self.free_float_hours = free_float_hours
 
 
 class GanttChartResponse:
@@ -98,17 +110,16 @@ class GetGanttChartUseCase:
     Use case for generating Gantt chart visualization data.
 
     Business Logic:
-    1. Query work orders for the given filters (plant, date range, lanes)
-    2. For each work order, generate operation schedule using domain service
-    3. Aggregate all tasks into single Gantt chart
-    4. Detect lane conflicts (multiple WOs on same lane at same time)
-    5. Calculate critical path (longest sequence of dependent operations)
+    1. Project all tasks of the board (plant, date window, lanes, page of
+       work orders) in one pass over one query (GanttProjectionService)
+    2. Detect lane, machine and operator conflicts
+    3. Calculate slack and the critical path over the operation network (CPM)
     """
 
     def __init__(self, db: Session):
         self.db = db
         self.repo = SchedulingRepository(db)
-        self.scheduling_service = OperationSchedulingService(db)
+        self.projection = GanttProjectionService(db)
 
     def execute(self, dto: GetGanttChartDTO) -> GanttChartResponse:
         """
@@ -130,17 +141,22 @@ class GetGanttChartUseCase:
                 field="start_date"
             )
 
-        # Get work orders matching filters
-        work_orders = self.repo.get_work_orders_for_gantt(
+        tasks = []
+        total_work_orders = 0
+        for work_order_tasks in self.projection.iter_work_order_tasks(
+            organization_id=dto.organization_id,
             plant_id=dto.plant_id,
             start_date=dto.start_date,
             end_date=dto.end_date,
             lane_ids=dto.lane_ids,
             include_completed=dto.include_completed,
-            organization_id=dto.organization_id
-        )
+            skip=dto.skip,
+            limit=dto.limit
+        ):
+            total_work_orders += 1
+            tasks.extend(GanttChartTask(**task) for task in work_order_tasks)
 
-        if not work_orders:
+        if not tasks:
             # Return empty chart
             return GanttChartResponse(
                 tasks=[],
@@ -151,147 +167,90 @@ class GetGanttChartUseCase:
                 total_work_orders=0
             )
 
-        # Generate tasks for all work orders
-        tasks = []
-        all_start_dates = []
-        all_end_dates = []
-
-        for work_order in work_orders:
-            # Get lane assignment
-            lane_assignment = work_order.lane_assignments[0] if work_order.lane_assignments else None
-
-            if work_order.operations:
-                # Generate operation-level tasks using domain service
-                try:
-                    gantt_data = self.scheduling_service.generate_gantt_chart_data(
-                        work_order_id=work_order.id,
-                        start_date=work_order.planned_start_date,
-                        quantity=work_order.quantity_ordered
-                    )
-
-                    # Convert to tasks
-                    for task_data in gantt_data.tasks:
-                        task = GanttChartTask(
-                            work_order_id=work_order.id,
-                            work_order_number=work_order.work_order_number,
-                            operation_id=task_data['id'],
-                            operation_name=task_data['name'],
-                            operation_number=task_data['operation_number'],
-                            start_date=datetime.fromisoformat(task_data['start']),
-                            end_date=datetime.fromisoformat(task_data['end']),
-                            duration_hours=task_data['duration_minutes'] / 60.0,
-                            lane_id=lane_assignment.lane_id if lane_assignment else None,
-                            lane_code=lane_assignment.lane.lane_code if lane_assignment and lane_assignment.lane else None,
-                            dependencies=[task_data['predecessor_id']] if task_data.get('predecessor_id') else [],
-                            progress_percent=self._calculate_operation_progress(work_order, task_data['id']),
-                            status=work_order.order_status.value,
-                            scheduling_mode=task_data.get('scheduling_mode')
-                        )
-                        tasks.append(task)
-
-                        all_start_dates.append(task.start_date)
-                        all_end_dates.append(task.end_date)
-
-                except Exception as e:
-                    # Log error but continue with other work orders
-                    print(f"Error generating Gantt for WO {work_order.work_order_number}: {e}")
-                    continue
-            else:
-                # Work order level task (no operations defined)
-                task = GanttChartTask(
-                    work_order_id=work_order.id,
-                    work_order_number=work_order.work_order_number,
-                    operation_id=None,
-                    operation_name=work_order.product.description if work_order.product else "Production",
-                    operation_number=None,
-                    start_date=work_order.planned_start_date,
-                    end_date=work_order.planned_end_date,
-                    duration_hours=(work_order.planned_end_date - work_order.planned_start_date).total_seconds() / 3600.0,
-                    lane_id=lane_assignment.lane_id if lane_assignment else None,
-                    lane_code=lane_assignment.lane.lane_code if lane_assignment and lane_assignment.lane else None,
-                    dependencies=[work_order.predecessor_work_order_id] if work_order.predecessor_work_order_id else [],
-                    progress_percent=self._calculate_work_order_progress(work_order),
-                    status=work_order.order_status.value
-                )
-                tasks.append(task)
-
-                all_start_dates.append(task.start_date)
-                all_end_dates.append(task.end_date)
-
-        # Detect lane conflicts
+        # Detect lane, machine and operator conflicts
         conflicts = []
         if dto.plant_id and dto.start_date and dto.end_date:
-            conflicts = self.repo.detect_lane_conflicts(
+            conflicts = ScheduleConflictService(self.db).detect(
                 plant_id=dto.plant_id,
                 start_date=dto.start_date,
-                end_date=dto.end_date
+                end_date=dto.end_date,
+                organization_id=dto.organization_id
             )
 
-        # Calculate critical path (simplified - just find longest sequence)
+        # Slack per task; zero-float tasks form the critical path
         critical_path = self._calculate_critical_path(tasks)
 
-        # Mark critical path tasks
-        critical_task_ids = set(critical_path)
-        for task in tasks:
-            if task.work_order_id in critical_task_ids:
-                task.is_critical_path = True
-
-        # Calculate overall timeline
-        overall_start = min(all_start_dates) if all_start_dates else datetime.now()
-        overall_end = max(all_end_dates) if all_end_dates else datetime.now()
-
         return GanttChartResponse(
             tasks=tasks,
             conflicts=conflicts,
             critical_path=critical_path,
-            start_date=overall_start,
-            end_date=overall_end,
-            total_work_orders=len(work_orders)
+            start_date=min(task.start_date for task in tasks),
+            end_date=max(task.end_date for task in tasks),
+            total_work_orders=total_work_orders
         )
 
-    def _calculate_operation_progress(self, work_order: WorkOrder, operation_id: int) -> float:
-        """
-        Calculate operation progress percentage.
-
-        TODO: Implement based on production logs
-        """
-        return 0.0
-
-    def _calculate_work_order_progress(self, work_order: WorkOrder) -> float:
-        """
-        Calculate work order progress percentage.
-
-        Based on quantity_completed / quantity_ordered
-        """
-        if work_order.quantity_ordered <= 0:
-            return 0.0
-
-        return (work_order.quantity_completed / work_order.quantity_ordered) * 100.0
-
     def _calculate_critical_path(self, tasks: List[GanttChartTask]) -> List[int]:
         """
-        Calculate critical path (simplified algorithm).
+        Run CPM over the board's tasks and set their float.
 
-        Returns list of work order IDs on critical path.
+        Activities are the tasks, in hours from the board start, released at
+        their work order's planned start. Operation dependencies become
+        finish-to-start edges, or a partial-duration edge for overlapping
+        operations (parallel operations have none). Each work order gets a
+        zero-length finish activity due at its planned end, so float is
+        measured against due dates: negative float means the work order is
+        late, and every task at or below zero float is critical.
 
-        For full CPM implementation, would need to calculate:
-        - Early Start/Finish times
-        - Late Start/Finish times
-        - Float (slack) for each task
-        - Tasks with zero float are on critical path
+        Returns:
+            IDs of work orders with critical tasks, by earliest critical start
         """
         if not tasks:
             return []
 
-        # Simplified: Return longest sequence of dependent tasks
-        # Group by work order
-        wo_tasks = {}
-        for task in tasks:
-            if task.work_order_id not in wo_tasks:
-                wo_tasks[task.work_order_id] = []
-            wo_tasks[task.work_order_id].append(task)
+        origin = min(task.start_date for task in tasks)
 
-        # Find work order with longest duration
-        longest_wo = max(wo_tasks.items(), key=lambda x: sum(t.duration_hours for t in x[1]))
+        def hours(moment: datetime) -> float:
+            return (moment - origin).total_seconds() / 3600.0
 
-        return [longest_wo[0]]
+        def key(task: GanttChartTask):
+            return ("operation", task.operation_id) if task.operation_id else ("work_order", task.work_order_id)
+
+        by_operation = {task.operation_id: task for task in tasks if task.operation_id}
+        work_order_starts = {}
+        for task in tasks:
+            start = work_order_starts.get(task.work_order_id)
+            work_order_starts[task.work_order_id] = task.start_date if start is None else min(start, task.start_date)
+
+        durations, release_times, deadlines, dependencies = {}, {}, {}, []
+        for task in tasks:
+            node = key(task)
+            finish = ("finish", task.work_order_id)
+            durations[node] = task.duration_hours
+            release_times[node] = hours(work_order_starts[task.work_order_id])
+            durations[finish] = 0.0
+            if task.due_date:
+                deadlines[finish] = hours(task.due_date)
+            dependencies.append((node, finish))
+
+            predecessor = by_operation.get(task.dependencies[0]) if task.dependencies else None
+            if predecessor is None or task.scheduling_mode == "PARALLEL":
+                continue
+            fraction = 1.0
+            if task.scheduling_mode == "OVERLAP" and predecessor.duration_hours > 0:
+                # The projection started the task after this share of its predecessor
+                elapsed = hours(task.start_date) - hours(predecessor.start_date)
+                fraction = min(1.0, max(0.0, elapsed / predecessor.duration_hours))
+            dependencies.append((key(predecessor), node, fraction))
+
+        network = CriticalPathNetwork(durations, dependencies, release_times, deadlines)
+
+        critical = []
+        for task in tasks:
+            times = network.activity(key(task))
+            task.total_float_hours = round(times.total_float, 2)
+            task.free_float_hours = round(times.free_float, 2)
+            task.is_critical_path = times.is_critical
+            if times.is_critical:
+                critical.append((times.earliest_start, task.work_order_id))
+
+        return list(dict.fromkeys(work_order_id for _, work_order_id in sorted(critical)))
@@ -142,6 +142,43 @@ VOLUME_DISCOUNTS: Dict[AddOnType, list[Tuple[int, float]]] = {
 }
 
 
+# ============================================================================
+# API RATE LIMITS
+# ============================================================================
+
+# Per-tenant API limits (requests per minute). "routes" maps path prefixes of
+# expensive endpoints to their own, lower per-tenant limit.
+API_RATE_LIMITS: Dict[SubscriptionTier, Dict[str, any]] = {
+    SubscriptionTier.STARTER: {
+        "requests_per_minute": 300,
+        "mutations_per_minute": 60,
+        "routes": {
+            "/api/v1/reports": 20,
+            "/api/v1/analytics": 20,
+            "/api/v1/traceability": 60,
+        }
+    },
+    SubscriptionTier.PROFESSIONAL: {
+        "requests_per_minute": 1200,
+        "mutations_per_minute": 300,
+        "routes": {
+            "/api/v1/reports": 120,
+            "/api/v1/analytics": 120,
+            "/api/v1/traceability": 300,
+        }
+    },
+    SubscriptionTier.ENTERPRISE: {
+        "requests_per_minute": 6000,
+        "mutations_per_minute": 1500,
+        "routes": {
+            "/api/v1/reports": 600,
+            "/api/v1/analytics": 600,
+            "/api/v1/traceability": 1500,
+        }
+    }
+}
+
+
 # ============================================================================
 # TRIAL CONFIGURATION
 # ============================================================================
@@ -151,6 +188,14 @@ TRIAL_DEFAULT_TIER = SubscriptionTier.STARTER
 TRIAL_WARNING_DAYS = 3  # Send warning email 3 days before expiry
 
 
+# ============================================================================
+# USAGE TRACKING
+# ============================================================================
+
+USAGE_SNAPSHOT_INTERVAL_HOURS = 6  # Usage snapshots are keyed by 6-hour slot
+USAGE_WARNING_THRESHOLD = 0.9  # Warn at 90% of a resource limit
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -339,3 +384,16 @@ def calculate_total_subscription_cost(
         "base_price_dollars": Decimal(base_price) / 100,
         "total_cost_dollars": Decimal(total_cost) / 100
     }
+
+
+def get_api_rate_limits(tier: SubscriptionTier) -> Dict[str, any]:
+    """
+    Get API rate limits for a subscription tier
+
+    Args:
+        tier: Subscription tier
+
+    Returns:
+        Dict with requests_per_minute, mutations_per_minute and routes
+    """
+    return API_RATE_LIMITS[tier]
@@ -39,6 +39,14 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = ""
     SMTP_TLS: bool = True
 
+    # Outbound email delivery (connection pooling, batching, rate limiting)
+    SMTP_POOL_SIZE: int = 4
+    SMTP_POOL_MAX_IDLE_SECONDS: float = 30.0
+    SMTP_POOL_MAX_MESSAGES_PER_CONNECTION: int = 100
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_RATE_LIMIT_PER_SECOND: float = 10.0
+    EMAIL_RATE_LIMIT_BURST: int = 20
+
     # SendGrid Settings
     SENDGRID_API_KEY: str = ""
 
@@ -59,6 +67,46 @@ class Settings(BaseSettings):
     STRIPE_CHECKOUT_SUCCESS_URL: str = "http://localhost:3000/billing/success"
     STRIPE_CHECKOUT_CANCEL_URL: str = "http://localhost:3000/billing/cancel"
 
+    # API Rate Limiting (memory = per worker; postgres/redis = shared across workers)
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres", "redis"] = "memory"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_TIER_CACHE_SECONDS: int = 300
+
+    # Admin audit log pipeline (memory = buffered per worker, flushed in batches;
+    # pgmq = buffered per worker, sent to PGMQ in batches, written by the audit worker)
+    AUDIT_SINK_BACKEND: Literal["memory", "pgmq"] = "memory"
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_HASH_CHAIN_ENABLED: bool = True
+
+    # Report query engine (guards applied to every compiled report query)
+    REPORT_STATEMENT_TIMEOUT_MS: int = 30000
+    REPORT_MAX_QUERY_COST: float = 1000000.0
+    REPORT_MAX_ROWS: int = 10000
+
+    # Background report exports (pgmq report_executions queue -> MinIO)
+    REPORT_EXPORT_CHUNK_ROWS: int = 5000
+    REPORT_EXPORT_MAX_ROWS: int = 10000000
+    REPORT_EXPORT_STATEMENT_TIMEOUT_MS: int = 1800000
+    REPORT_EXPORT_MAX_QUERY_COST: float = 100000000.0
+    REPORT_MAX_CONCURRENT_PER_TENANT: int = 2
+    REPORT_BUSY_RETRY_SECONDS: int = 15
+    # Added to max(visibility timeout, export statement timeout) before a silent RUNNING execution is reclaimed
+    REPORT_STALE_MARGIN_SECONDS: int = 300
+
+    # Dashboard widgets (queries run in parallel, results cached per tenant)
+    DASHBOARD_MAX_PARALLEL_WIDGETS: int = 8
+    DASHBOARD_DEADLINE_SECONDS: float = 10.0
+    DASHBOARD_WIDGET_CACHE_SECONDS: int = 60
+
+    # KPI engine (set-based KPI calculation, results cached per tenant)
+    KPI_CACHE_SECONDS: int = 300
+
+    # Tenant configuration snapshots (branding, typed settings, feature flags),
+    # invalidated by NOTIFY tenant_config; the TTL bounds staleness without the listener
+    TENANT_CONFIG_CACHE_SECONDS: int = 300
+    TENANT_CONFIG_LISTEN: bool = True
+
     # Row-Level Security (RLS) Configuration
     RLS_ENABLED: bool = True
     RLS_AUDIT_LOG_ENABLED: bool = True
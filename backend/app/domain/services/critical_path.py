@@ -0,0 +1,335 @@
+"""
+Domain service for the critical path method (CPM).
+
+A CriticalPathNetwork holds activities (operations, milestones) with a
+duration and the dependencies between them, a DAG. A dependency
+(predecessor, successor, fraction) lets the successor start once the
+predecessor has run that fraction of its duration: 1.0 is finish-to-start,
+below 1.0 an overlap (SchedulingMode.OVERLAP).
+
+The forward pass gives earliest start/finish from release times; the
+backward pass gives latest start/finish from the project finish, or an
+activity's own deadline where it has one. Both run in topological order,
+O(V + E).
+
+update_duration re-runs only what a changed duration can reach: descendants
+in the forward pass and ancestors in the backward pass, unless the project
+finish moves, in which case the backward pass is redone in full.
+
+Times are plain numbers in whatever unit the caller uses (hours, days).
+"""
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+# Float at or below this counts as zero
+FLOAT_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class ActivitySchedule:
+    """CPM times of one activity."""
+
+    duration: float
+    earliest_start: float
+    earliest_finish: float
+    latest_start: float
+    latest_finish: float
+    total_float: float
+    free_float: float
+
+    @property
+    def is_critical(self) -> bool:
+        """No slack (negative when a deadline cannot be met)."""
+        return self.total_float <= FLOAT_TOLERANCE
+
+
+class CriticalPathNetwork:
+    """
+    Activity network with CPM times kept up to date.
+    """
+
+    def __init__(
+        self,
+        durations: Dict[Hashable, float],
+        dependencies: Iterable[Sequence] = (),
+        release_times: Optional[Dict[Hashable, float]] = None,
+        deadlines: Optional[Dict[Hashable, float]] = None,
+        project_deadline: Optional[float] = None
+    ):
+        """
+        Build the network and run both passes.
+
+        Args:
+            durations: Duration per activity
+            dependencies: (predecessor, successor) or (predecessor, successor, fraction)
+            release_times: Earliest start per activity (default 0)
+            deadlines: Latest finish per activity, in place of the project finish
+                (float is then measured against the activity's own due date)
+            project_deadline: Latest finish of activities without a deadline;
+                defaults to the earliest project finish
+
+        Raises:
+            ValueError: On negative durations, unknown activities or a dependency cycle
+        """
+        self._nodes: List[Hashable] = list(durations)
+        self._index = {node: i for i, node in enumerate(self._nodes)}
+        self._duration = [self._checked_duration(node, durations[node]) for node in self._nodes]
+
+        self._successors: List[List[tuple]] = [[] for _ in self._nodes]
+        self._predecessors: List[List[tuple]] = [[] for _ in self._nodes]
+        for dependency in dependencies:
+            predecessor, successor = dependency[0], dependency[1]
+            fraction = float(dependency[2]) if len(dependency) > 2 else 1.0
+            if predecessor not in self._index or successor not in self._index:
+                raise ValueError(f"Dependency {predecessor} -> {successor} references an unknown activity")
+            if not 0.0 <= fraction <= 1.0:
+                raise ValueError(f"Dependency {predecessor} -> {successor} fraction must be between 0 and 1")
+            p, s = self._index[predecessor], self._index[successor]
+            self._successors[p].append((s, fraction))
+            self._predecessors[s].append((p, fraction))
+
+        release_times = release_times or {}
+        deadlines = deadlines or {}
+        self._release = [float(release_times.get(node, 0.0)) for node in self._nodes]
+        self._deadline = [
+            float(deadlines[node]) if deadlines.get(node) is not None else None for node in self._nodes
+        ]
+        self._project_deadline = float(project_deadline) if project_deadline is not None else None
+
+        self._order = self._topological_order()
+        self._position = [0] * len(self._nodes)
+        for position, i in enumerate(self._order):
+            self._position[i] = position
+
+        self._es = [0.0] * len(self._nodes)
+        self._ls = [0.0] * len(self._nodes)
+        for i in self._order:
+            self._es[i] = self._earliest_start(i)
+        self._finish = self._project_finish()
+        self._backward_pass()
+
+    @property
+    def project_finish(self) -> float:
+        """Finish time the backward pass works back from."""
+        return self._finish
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._index
+
+    def activity(self, node: Hashable) -> ActivitySchedule:
+        """
+        Get the CPM times of an activity.
+
+        Raises:
+            KeyError: If the activity is not in the network
+        """
+        return self._schedule(self._index[node])
+
+    def schedule(self) -> Dict[Hashable, ActivitySchedule]:
+        """CPM times of every activity, in topological order."""
+        return {self._nodes[i]: self._schedule(i) for i in self._order}
+
+    def critical_path(self) -> List[Hashable]:
+        """Critical activities ordered by earliest start."""
+        critical = [i for i in self._order if self._ls[i] - self._es[i] <= FLOAT_TOLERANCE]
+        return [self._nodes[i] for i in sorted(critical, key=lambda i: (self._es[i], self._position[i]))]
+
+    def update_duration(self, node: Hashable, duration: float) -> Set[Hashable]:
+        """
+        Change one activity's duration and recompute the times it affects.
+
+        Args:
+            node: Activity
+            duration: New duration
+
+        Returns:
+            Activities whose earliest or latest times changed (including node
+            itself when its duration did)
+
+        Raises:
+            KeyError: If the activity is not in the network
+            ValueError: If duration is negative
+        """
+        i = self._index[node]
+        duration = self._checked_duration(node, duration)
+        if duration == self._duration[i]:
+            return set()
+        self._duration[i] = duration
+        changed = {i}
+
+        # Forward: successors in topological order, stopping where ES settles
+        queue = [(self._position[s], s) for s, _ in self._successors[i]]
+        heapq.heapify(queue)
+        queued = {s for _, s in queue}
+        while queue:
+            _, j = heapq.heappop(queue)
+            queued.discard(j)
+            earliest = self._earliest_start(j)
+            if earliest != self._es[j]:
+                self._es[j] = earliest
+                changed.add(j)
+                for s, _ in self._successors[j]:
+                    if s not in queued:
+                        queued.add(s)
+                        heapq.heappush(queue, (self._position[s], s))
+
+        finish = self._project_finish()
+        if finish != self._finish:
+            self._finish = finish
+            previous = list(self._ls)
+            self._backward_pass()
+            changed.update(j for j, latest in enumerate(previous) if latest != self._ls[j])
+        else:
+            # Backward: only node's own LS depends on its duration; walk predecessors
+            queue = [(-self._position[i], i)]
+            queued = {i}
+            while queue:
+                _, j = heapq.heappop(queue)
+                queued.discard(j)
+                latest = self._latest_start(j)
+                if latest != self._ls[j]:
+                    self._ls[j] = latest
+                    changed.add(j)
+                    for p, _ in self._predecessors[j]:
+                        if p not in queued:
+                            queued.add(p)
+                            heapq.heappush(queue, (-self._position[p], p))
+
+        return {self._nodes[j] for j in changed}
+
+    def _schedule(self, i: int) -> ActivitySchedule:
+        es, ls, duration = self._es[i], self._ls[i], self._duration[i]
+        if self._successors[i]:
+            free_float = min(self._es[s] - es - fraction * duration for s, fraction in self._successors[i])
+        else:
+            free_float = self._finish_bound(i) - es - duration
+        return ActivitySchedule(
+            duration=duration,
+            earliest_start=es,
+            earliest_finish=es + duration,
+            latest_start=ls,
+            latest_finish=ls + duration,
+            total_float=ls - es,
+            free_float=free_float
+        )
+
+    def _earliest_start(self, i: int) -> float:
+        earliest = self._release[i]
+        for p, fraction in self._predecessors[i]:
+            earliest = max(earliest, self._es[p] + fraction * self._duration[p])
+        return earliest
+
+    def _latest_start(self, i: int) -> float:
+        latest = self._finish_bound(i) - self._duration[i]
+        for s, fraction in self._successors[i]:
+            latest = min(latest, self._ls[s] - fraction * self._duration[i])
+        return latest
+
+    def _finish_bound(self, i: int) -> float:
+        """Deadline if set; else the project finish, unless a finish-to-start successor bounds it already."""
+        if self._deadline[i] is not None:
+            return self._deadline[i]
+        if any(fraction >= 1.0 for _, fraction in self._successors[i]):
+            return float("inf")
+        return self._finish
+
+    def _project_finish(self) -> float:
+        if self._project_deadline is not None:
+            return self._project_deadline
+        return max((es + duration for es, duration in zip(self._es, self._duration)), default=0.0)
+
+    def _backward_pass(self) -> None:
+        for i in reversed(self._order):
+            self._ls[i] = self._latest_start(i)
+
+    def _topological_order(self) -> List[int]:
+        """Kahn's algorithm, keeping insertion order among ready activities."""
+        remaining = [len(predecessors) for predecessors in self._predecessors]
+        ready = deque(i for i, count in enumerate(remaining) if count == 0)
+        order = []
+        while ready:
+            i = ready.popleft()
+            order.append(i)
+            for s, _ in self._successors[i]:
+                remaining[s] -= 1
+                if remaining[s] == 0:
+                    ready.append(s)
+
+        if len(order) < len(self._nodes):
+            cycle = [self._nodes[i] for i, count in enumerate(remaining) if count > 0]
+            raise ValueError(f"Dependency cycle among activities {cycle[:10]}")
+        return order
+
+    @staticmethod
+    def _checked_duration(node: Hashable, duration: float) -> float:
+        duration = float(duration)
+        if duration < 0:
+            raise ValueError(f"Activity {node} has negative duration {duration}")
+        return duration
+
+
+def build_milestone_network(
+    milestones: Iterable[Any],
+    project_start: Optional[date] = None
+) -> Tuple[CriticalPathNetwork, date]:
+    """
+    Build a project's milestone network, in days from the project start.
+
+    A milestone is the end of the work leading up to it: its duration is the
+    days from its latest dependency (or the project start) to its date,
+    actual if reached, else planned. Dependencies on milestones outside the
+    set are ignored.
+
+    Float is measured against the earliest project finish, so the chain that
+    determines the finish is always critical; see planned_end_slack for the
+    margin to the project's planned end.
+
+    Args:
+        milestones: Objects with id, planned_date, actual_date and dependencies
+        project_start: Origin; defaults to the earliest milestone date
+
+    Returns:
+        (network keyed by milestone ID, origin date)
+
+    Raises:
+        ValueError: On a dependency cycle
+    """
+    milestones = list(milestones)
+    dates = {m.id: m.actual_date or m.planned_date for m in milestones}
+    origin = project_start or min(dates.values(), default=date.today())
+
+    durations, dependencies = {}, []
+    for m in milestones:
+        predecessors = [d for d in (m.dependencies or []) if d in dates and d != m.id]
+        begins = max((dates[d] for d in predecessors), default=origin)
+        durations[m.id] = max((dates[m.id] - begins).days, 0)
+        dependencies.extend((d, m.id) for d in predecessors)
+
+    return CriticalPathNetwork(durations, dependencies), origin
+
+
+def planned_end_slack(network: CriticalPathNetwork, origin: date, project_end: Optional[date]) -> float:
+    """
+    Days between the earliest project finish and the planned project end.
+
+    Added to a milestone's total float, gives how far it can slip before the
+    project misses its planned end (negative when it already does).
+
+    Args:
+        network: Milestone network from build_milestone_network
+        origin: Its origin date
+        project_end: Planned project end (None = the earliest finish)
+
+    Returns:
+        Slack in days
+    """
+    if project_end is None:
+        return 0.0
+    return (project_end - origin).days - network.project_finish
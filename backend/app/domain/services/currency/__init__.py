@@ -4,16 +4,19 @@ Currency Service Package - Multi-Currency Costing Module
 Public API:
     - CurrencyService: Main service for currency conversion
     - ExchangeRateRepository: Repository for exchange rate persistence
+    - ExchangeRateCache: In-memory cache of currencies and rate time series
     - Currency, ExchangeRate, CurrencyRoundingRule: Domain models
 """
 
 from app.domain.services.currency.currency_service import CurrencyService
 from app.domain.services.currency.exchange_rate_repository import ExchangeRateRepository
+from app.domain.services.currency.rate_cache import ExchangeRateCache
 from app.domain.services.currency.models import Currency, ExchangeRate, CurrencyRoundingRule
 
 __all__ = [
     'CurrencyService',
     'ExchangeRateRepository',
+    'ExchangeRateCache',
     'Currency',
     'ExchangeRate',
     'CurrencyRoundingRule',
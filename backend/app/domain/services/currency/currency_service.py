@@ -6,10 +6,11 @@ Supports real-time and historical exchange rates with configurable rounding rule
 """
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Sequence, Union
 from sqlalchemy.orm import Session
 from app.models.currency import Currency as CurrencyModel, ExchangeRate as ExchangeRateModel
 from app.domain.services.currency.models import CurrencyRoundingRule
+from app.domain.services.currency.rate_cache import ExchangeRateCache
 
 
 class CurrencyService:
@@ -22,16 +23,19 @@ class CurrencyService:
     - Rounding rules per currency
     - Inverse and cross-rate conversions
     - Audit trail for exchange rate changes
+    - Batch conversion backed by an in-memory rate cache
     """
 
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, rate_cache: Optional[ExchangeRateCache] = None):
         """
         Initialize CurrencyService with database session.
 
         Args:
             db_session: SQLAlchemy session for database operations
+            rate_cache: Optional shared rate cache (created per service if omitted)
         """
         self.db = db_session
+        self.rate_cache = rate_cache or ExchangeRateCache(db_session)
 
     def _get_currency(self, currency_code: str) -> CurrencyModel:
         """
@@ -46,9 +50,7 @@ class CurrencyService:
         Raises:
             ValueError: If currency not found
         """
-        currency = self.db.query(CurrencyModel).filter(
-            CurrencyModel.code == currency_code
-        ).first()
+        currency = self.rate_cache.get_currency(currency_code)
 
         if not currency:
             raise ValueError(f"Invalid currency code: {currency_code}")
@@ -64,109 +66,16 @@ class CurrencyService:
 
         Returns:
             Rounding rule for the currency
-        """
-        currency = self._get_currency(currency_code)
-        return CurrencyRoundingRule(
-            currency_code=currency.code,
-            decimal_places=currency.decimal_places
-        )
-
-    def _get_exchange_rate(
-        self,
-        from_currency: str,
-        to_currency: str,
-        conversion_date: datetime
-    ) -> Optional[ExchangeRateModel]:
-        """
-        Retrieve latest exchange rate before or on conversion date.
-
-        Args:
-            from_currency: Source currency code
-            to_currency: Target currency code
-            conversion_date: Date for rate lookup
-
-        Returns:
-            Exchange rate model or None if not found
-        """
-        exchange_rate = self.db.query(ExchangeRateModel).filter(
-            ExchangeRateModel.from_currency_code == from_currency,
-            ExchangeRateModel.to_currency_code == to_currency,
-            ExchangeRateModel.effective_date <= conversion_date
-        ).order_by(ExchangeRateModel.effective_date.desc()).first()
-
-        return exchange_rate
 
-    def _get_inverse_rate(
-        self,
-        from_currency: str,
-        to_currency: str,
-        conversion_date: datetime
-    ) -> Optional[Decimal]:
-        """
-        Get inverse exchange rate (reciprocal).
-
-        If USD->EUR rate exists, calculate EUR->USD as 1/rate.
-
-        Args:
-            from_currency: Source currency code
-            to_currency: Target currency code
-            conversion_date: Date for rate lookup
-
-        Returns:
-            Inverse rate or None if not found
-        """
-        # Look for inverse rate (to->from)
-        inverse_rate_record = self._get_exchange_rate(to_currency, from_currency, conversion_date)
-
-        if inverse_rate_record:
-            # Return reciprocal
-            return Decimal("1.0") / inverse_rate_record.rate
-
-        return None
-
-    def _get_cross_rate(
-        self,
-        from_currency: str,
-        to_currency: str,
-        conversion_date: datetime,
-        base_currency: str = "USD"
-    ) -> Optional[Decimal]:
+        Raises:
+            ValueError: If currency not found
         """
-        Calculate cross-rate through base currency.
+        rounding_rule = self.rate_cache.get_rounding_rule(currency_code)
 
-        Example: EUR->GBP via USD = (EUR->USD) * (USD->GBP)
-
-        Args:
-            from_currency: Source currency code
-            to_currency: Target currency code
-            conversion_date: Date for rate lookup
-            base_currency: Intermediate currency for cross-rate calculation
+        if not rounding_rule:
+            raise ValueError(f"Invalid currency code: {currency_code}")
 
-        Returns:
-            Cross rate or None if cannot be calculated
-        """
-        # Get from_currency -> base_currency rate
-        rate1_record = self._get_exchange_rate(from_currency, base_currency, conversion_date)
-        if not rate1_record:
-            # Try inverse
-            rate1 = self._get_inverse_rate(from_currency, base_currency, conversion_date)
-            if not rate1:
-                return None
-        else:
-            rate1 = rate1_record.rate
-
-        # Get base_currency -> to_currency rate
-        rate2_record = self._get_exchange_rate(base_currency, to_currency, conversion_date)
-        if not rate2_record:
-            # Try inverse
-            rate2 = self._get_inverse_rate(base_currency, to_currency, conversion_date)
-            if not rate2:
-                return None
-        else:
-            rate2 = rate2_record.rate
-
-        # Calculate cross rate
-        return rate1 * rate2
+        return rounding_rule
 
     def convert(
         self,
@@ -201,37 +110,91 @@ class CurrencyService:
 
         # Validate currencies exist
         self._get_currency(from_currency)
-        to_currency_obj = self._get_currency(to_currency)
+        rounding_rule = self._get_rounding_rule(to_currency)
 
         # Same currency - return original amount
         if from_currency == to_currency:
             return amount
 
-        # Try to get direct exchange rate
-        exchange_rate_record = self._get_exchange_rate(from_currency, to_currency, conversion_date)
+        # Direct, inverse, then cross-rate through base currency
+        rate = self.rate_cache.get_rate(from_currency, to_currency, conversion_date, base_currency)
 
-        if exchange_rate_record:
-            rate = exchange_rate_record.rate
-        else:
-            # Try inverse rate
-            rate = self._get_inverse_rate(from_currency, to_currency, conversion_date)
+        if not rate:
+            raise ValueError(
+                f"No exchange rate found for {from_currency} to {to_currency} "
+                f"on or before {conversion_date}"
+            )
 
-            if not rate and base_currency:
-                # Try cross-rate through base currency
-                rate = self._get_cross_rate(from_currency, to_currency, conversion_date, base_currency)
+        # Convert amount and apply rounding rule for target currency
+        return rounding_rule.round_amount(amount * rate)
+
+    def convert_many(
+        self,
+        amounts: Sequence[Decimal],
+        from_currencies: Union[str, Sequence[str]],
+        to_currencies: Union[str, Sequence[str]],
+        conversion_dates: Union[datetime, Sequence[datetime]],
+        base_currency: Optional[str] = "USD"
+    ) -> List[Decimal]:
+        """
+        Convert many amounts in one call.
 
+        Currency codes and dates may be given once (applied to every amount)
+        or per amount. All rates between the involved currencies are loaded
+        in a single query; each distinct (pair, date) is resolved once.
+
+        Args:
+            amounts: Amounts to convert
+            from_currencies: Source currency code, or one per amount
+            to_currencies: Target currency code, or one per amount
+            conversion_dates: Date for rate lookup, or one per amount
+            base_currency: Base currency for cross-rate calculation (default: USD)
+
+        Returns:
+            Converted amounts, in input order, rounded to target currency precision
+
+        Raises:
+            ValueError: If any amount is negative, a currency is invalid,
+                no rate is found, or per-amount sequences differ in length
+        """
+        count = len(amounts)
+        from_list = self._broadcast(from_currencies, count, "from_currencies")
+        to_list = self._broadcast(to_currencies, count, "to_currencies")
+        date_list = self._broadcast(conversion_dates, count, "conversion_dates")
+
+        if any(amount < 0 for amount in amounts):
+            raise ValueError("Amount must be non-negative")
+
+        codes = set(from_list) | set(to_list)
+        rounding_rules = {code: self._get_rounding_rule(code) for code in codes}
+
+        self.rate_cache.preload(codes | ({base_currency} if base_currency else set()))
+
+        results = []
+        for amount, from_currency, to_currency, conversion_date in zip(amounts, from_list, to_list, date_list):
+            if from_currency == to_currency:
+                results.append(amount)
+                continue
+
+            rate = self.rate_cache.get_rate(from_currency, to_currency, conversion_date, base_currency)
             if not rate:
                 raise ValueError(
                     f"No exchange rate found for {from_currency} to {to_currency} "
                     f"on or before {conversion_date}"
                 )
+            results.append(rounding_rules[to_currency].round_amount(amount * rate))
 
-        # Convert amount
-        converted_amount = amount * rate
+        return results
 
-        # Apply rounding rule for target currency
-        rounding_rule = self._get_rounding_rule(to_currency)
-        return rounding_rule.round_amount(converted_amount)
+    @staticmethod
+    def _broadcast(value, count: int, name: str) -> list:
+        """Expand a scalar argument to a list of length count."""
+        if isinstance(value, (str, datetime)):
+            return [value] * count
+        values = list(value)
+        if len(values) != count:
+            raise ValueError(f"{name} must have {count} entries, got {len(values)}")
+        return values
 
     def create_exchange_rate(
         self,
@@ -284,6 +247,9 @@ class CurrencyService:
         self.db.commit()
         self.db.refresh(exchange_rate)
 
+        # Cached series and resolved cross rates for this pair are now stale
+        self.rate_cache.invalidate(from_currency, to_currency)
+
         return exchange_rate
 
     def get_exchange_rate_history(
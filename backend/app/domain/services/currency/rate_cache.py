@@ -0,0 +1,314 @@
+"""
+Exchange Rate Cache - Multi-Currency Costing Module.
+In-memory cache of currencies and exchange rate time series.
+
+Loads each currency pair's rate history once, answers "latest rate on or
+before date" lookups by bisecting the sorted effective dates, and memoizes
+resolved (direct, inverse or cross) rates per conversion date.
+"""
+from bisect import bisect_right
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+from app.models.currency import Currency as CurrencyModel, ExchangeRate as ExchangeRateModel
+from app.domain.services.currency.models import CurrencyRoundingRule
+
+
+Pair = Tuple[str, str]
+
+
+def _date_key(value: datetime) -> datetime:
+    """
+    Normalize a datetime for ordering comparisons.
+
+    Aware datetimes are converted to naive UTC; naive datetimes are assumed
+    to already be UTC (SQLite returns naive values for timezone columns).
+    """
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class _RateSeries:
+    """Rate time series for one currency pair, sorted by effective date."""
+
+    __slots__ = ("dates", "rates")
+
+    def __init__(self, points: Iterable[Tuple[datetime, Decimal]]):
+        ordered = sorted(points, key=lambda point: point[0])
+        self.dates: List[datetime] = [point[0] for point in ordered]
+        self.rates: List[Decimal] = [point[1] for point in ordered]
+
+    def rate_on(self, conversion_date: datetime) -> Optional[Decimal]:
+        """Return latest rate effective on or before conversion_date."""
+        index = bisect_right(self.dates, conversion_date)
+        if index == 0:
+            return None
+        return self.rates[index - 1]
+
+
+class ExchangeRateCache:
+    """
+    In-memory cache for currency metadata and exchange rates.
+
+    Responsibilities:
+    - Load currency metadata (rounding rules) in a single query
+    - Load rate time series per currency pair once, in batches
+    - Bisect lookups of the latest rate on or before a date
+    - Per-date matrix of resolved direct, inverse and cross rates
+    - Explicit invalidation when rates are created
+
+    The cache is bound to a session and is not thread-safe; share it only
+    between services that use the same session.
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize cache with database session.
+
+        Args:
+            db_session: SQLAlchemy session used to load currencies and rates
+        """
+        self.db = db_session
+        self._currencies: Optional[Dict[str, CurrencyModel]] = None
+        self._series: Dict[Pair, _RateSeries] = {}
+        self._matrices: Dict[Tuple[datetime, Optional[str]], Dict[Pair, Optional[Decimal]]] = {}
+
+    # ------------------------------------------------------------------
+    # Currencies
+    # ------------------------------------------------------------------
+
+    def _load_currencies(self) -> Dict[str, CurrencyModel]:
+        currencies = self.db.query(CurrencyModel).all()
+        self._currencies = {currency.code: currency for currency in currencies}
+        return self._currencies
+
+    def get_currency(self, currency_code: str) -> Optional[CurrencyModel]:
+        """
+        Retrieve currency by code, reloading once on a miss.
+
+        Args:
+            currency_code: ISO currency code (USD, EUR, etc.)
+
+        Returns:
+            Currency model or None if not found
+        """
+        if self._currencies is None:
+            self._load_currencies()
+        currency = self._currencies.get(currency_code)
+        if currency is None:
+            # Currency may have been created after the cache was populated
+            currency = self._load_currencies().get(currency_code)
+        return currency
+
+    def get_rounding_rule(self, currency_code: str) -> Optional[CurrencyRoundingRule]:
+        """Return rounding rule for currency or None if not found."""
+        currency = self.get_currency(currency_code)
+        if currency is None:
+            return None
+        return CurrencyRoundingRule(
+            currency_code=currency.code,
+            decimal_places=currency.decimal_places
+        )
+
+    # ------------------------------------------------------------------
+    # Rate series
+    # ------------------------------------------------------------------
+
+    def preload(self, currency_codes: Iterable[str]) -> None:
+        """
+        Load all rate series between the given currencies in one query.
+
+        Pairs already cached are skipped. Pairs without any rate are cached
+        as empty series so they are not queried again.
+
+        Args:
+            currency_codes: Currency codes whose mutual rates will be needed
+        """
+        codes = sorted(set(currency_codes))
+        missing: Set[Pair] = {
+            (from_code, to_code)
+            for from_code in codes
+            for to_code in codes
+            if from_code != to_code and (from_code, to_code) not in self._series
+        }
+        if not missing:
+            return
+
+        rows = self.db.query(
+            ExchangeRateModel.from_currency_code,
+            ExchangeRateModel.to_currency_code,
+            ExchangeRateModel.effective_date,
+            ExchangeRateModel.rate
+        ).filter(
+            ExchangeRateModel.from_currency_code.in_(codes),
+            ExchangeRateModel.to_currency_code.in_(codes)
+        ).all()
+
+        points: Dict[Pair, List[Tuple[datetime, Decimal]]] = {pair: [] for pair in missing}
+        for from_code, to_code, effective_date, rate in rows:
+            pair = (from_code, to_code)
+            if pair in points:
+                points[pair].append((_date_key(effective_date), Decimal(rate)))
+
+        for pair, pair_points in points.items():
+            self._series[pair] = _RateSeries(pair_points)
+
+    def _get_series(self, from_currency: str, to_currency: str) -> _RateSeries:
+        pair = (from_currency, to_currency)
+        series = self._series.get(pair)
+        if series is None:
+            rows = self.db.query(
+                ExchangeRateModel.from_currency_code,
+                ExchangeRateModel.effective_date,
+                ExchangeRateModel.rate
+            ).filter(
+                or_(
+                    and_(
+                        ExchangeRateModel.from_currency_code == from_currency,
+                        ExchangeRateModel.to_currency_code == to_currency
+                    ),
+                    and_(
+                        ExchangeRateModel.from_currency_code == to_currency,
+                        ExchangeRateModel.to_currency_code == from_currency
+                    )
+                )
+            ).all()
+
+            direct = [
+                (_date_key(effective_date), Decimal(rate))
+                for from_code, effective_date, rate in rows if from_code == from_currency
+            ]
+            inverse = [
+                (_date_key(effective_date), Decimal(rate))
+                for from_code, effective_date, rate in rows if from_code == to_currency
+            ]
+            series = _RateSeries(direct)
+            self._series[pair] = series
+            # Inverse direction is almost always looked up next
+            self._series.setdefault((to_currency, from_currency), _RateSeries(inverse))
+        return series
+
+    def get_direct_rate(
+        self,
+        from_currency: str,
+        to_currency: str,
+        conversion_date: datetime
+    ) -> Optional[Decimal]:
+        """
+        Latest stored from->to rate effective on or before conversion date.
+
+        Args:
+            from_currency: Source currency code
+            to_currency: Target currency code
+            conversion_date: Date for rate lookup
+
+        Returns:
+            Rate or None if no stored rate applies
+        """
+        return self._get_series(from_currency, to_currency).rate_on(_date_key(conversion_date))
+
+    # ------------------------------------------------------------------
+    # Resolved rates
+    # ------------------------------------------------------------------
+
+    def _pair_rate(self, from_currency: str, to_currency: str, date_key: datetime) -> Optional[Decimal]:
+        """Direct rate, falling back to the reciprocal of the inverse rate."""
+        rate = self._get_series(from_currency, to_currency).rate_on(date_key)
+        if rate:
+            return rate
+        inverse = self._get_series(to_currency, from_currency).rate_on(date_key)
+        if inverse:
+            return Decimal("1.0") / inverse
+        return None
+
+    def get_rate(
+        self,
+        from_currency: str,
+        to_currency: str,
+        conversion_date: datetime,
+        base_currency: Optional[str] = "USD"
+    ) -> Optional[Decimal]:
+        """
+        Resolve conversion rate using direct, inverse, then cross rate.
+
+        Resolved rates are memoized in a per-date matrix, so repeated
+        conversions for the same date cost a dictionary lookup.
+
+        Args:
+            from_currency: Source currency code
+            to_currency: Target currency code
+            conversion_date: Date for rate lookup
+            base_currency: Intermediate currency for cross rates (None disables)
+
+        Returns:
+            Rate or None if it cannot be resolved
+        """
+        if from_currency == to_currency:
+            return Decimal("1")
+
+        date_key = _date_key(conversion_date)
+        matrix = self._matrices.setdefault((date_key, base_currency), {})
+        pair = (from_currency, to_currency)
+        if pair in matrix:
+            return matrix[pair]
+
+        rate = self._pair_rate(from_currency, to_currency, date_key)
+        if not rate and base_currency and base_currency not in pair:
+            rate1 = self._pair_rate(from_currency, base_currency, date_key)
+            rate2 = self._pair_rate(base_currency, to_currency, date_key) if rate1 else None
+            rate = rate1 * rate2 if rate1 and rate2 else None
+
+        matrix[pair] = rate
+        return rate
+
+    def get_rate_matrix(
+        self,
+        currency_codes: Iterable[str],
+        conversion_date: datetime,
+        base_currency: Optional[str] = "USD"
+    ) -> Dict[Pair, Optional[Decimal]]:
+        """
+        Precompute resolved rates between every pair of currencies for a date.
+
+        Args:
+            currency_codes: Currencies to include in the matrix
+            conversion_date: Date for rate lookup
+            base_currency: Intermediate currency for cross rates
+
+        Returns:
+            Mapping of (from, to) to rate, or None where no rate resolves
+        """
+        codes = sorted(set(currency_codes))
+        self.preload(codes + ([base_currency] if base_currency else []))
+        return {
+            (from_code, to_code): self.get_rate(from_code, to_code, conversion_date, base_currency)
+            for from_code in codes
+            for to_code in codes
+        }
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, from_currency: Optional[str] = None, to_currency: Optional[str] = None) -> None:
+        """
+        Drop cached rates.
+
+        With both codes given, only that pair (both directions) is reloaded on
+        next use; otherwise all series are dropped. Resolved rate matrices are
+        always cleared since cross rates may depend on the changed pair.
+
+        Args:
+            from_currency: Source currency code of the changed rate
+            to_currency: Target currency code of the changed rate
+        """
+        if from_currency and to_currency:
+            self._series.pop((from_currency, to_currency), None)
+            self._series.pop((to_currency, from_currency), None)
+        else:
+            self._series.clear()
+            self._currencies = None
+        self._matrices.clear()
@@ -0,0 +1,18 @@
+"""
+Barcode resolution cache - barcode value -> labelled entity, per tenant, in-process.
+
+Every scan resolves its code through barcode_label; handhelds scan the same
+labels over and over, so resolutions are kept in an LRU keyed by
+(organization_id, barcode_value). Unknown codes are cached too (as an empty
+dict) so repeated misreads do not hit the database.
+
+BarcodeLabelRepository discards a value when a label for it is created or
+changed. Other worker processes only see the change when their entry
+expires, which bounds staleness to BARCODE_RESOLUTION_TTL_SECONDS.
+"""
+from app.infrastructure.search.search_cache import SearchResultCache
+
+BARCODE_RESOLUTION_TTL_SECONDS = 300
+
+# Process-wide cache shared by LogisticsService instances (one per request)
+barcode_resolution_cache = SearchResultCache(max_entries=50_000)
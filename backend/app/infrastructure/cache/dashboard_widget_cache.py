@@ -0,0 +1,12 @@
+"""
+Dashboard widget cache - widget query results, per tenant, in-process.
+
+Dashboards of one tenant are opened by many users who see the same widgets;
+results are cached under (organization_id, widget query key) for the
+widget's refresh interval, so every user within that window shares one
+query execution.
+"""
+from app.infrastructure.search.search_cache import SearchResultCache
+
+# Process-wide cache shared by DashboardDataEngine instances (one per request)
+dashboard_widget_cache = SearchResultCache(max_entries=10_000)
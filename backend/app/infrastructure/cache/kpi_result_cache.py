@@ -0,0 +1,11 @@
+"""
+KPI result cache - calculated KPIs, per tenant, in-process.
+
+The KPI API and KPI dashboard widgets ask for the same KPI, period and
+drill-down over and over; results are cached under (organization_id, KPI
+request key) for KPI_CACHE_SECONDS so they share one aggregate query.
+"""
+from app.infrastructure.search.search_cache import SearchResultCache
+
+# Process-wide cache shared by KPIEngine instances (one per request)
+kpi_result_cache = SearchResultCache(max_entries=5_000)
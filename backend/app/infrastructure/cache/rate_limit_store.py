@@ -0,0 +1,267 @@
+"""
+Rate limit state stores using GCRA (Generic Cell Rate Algorithm).
+
+GCRA keeps a single number per key, the theoretical arrival time (TAT), so
+state is O(1) per client regardless of the configured limit:
+
+- emission interval T = period / limit
+- tolerance tau = T * burst
+- a request is allowed when max(TAT, now) + T - now <= tau, and TAT moves
+  to max(TAT, now) + T
+
+Backends:
+- InMemoryRateLimitStore: per-process dict (single worker, tests)
+- PostgresRateLimitStore: shared UNLOGGED table, atomic upsert
+- RedisRateLimitStore: shared Redis, atomic Lua script
+"""
+import asyncio
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Limit of `limit` requests per `period` seconds, allowing `burst` at once."""
+    limit: int
+    period: float = 60.0
+    burst: Optional[int] = None
+
+    @property
+    def emission_interval(self) -> float:
+        return self.period / self.limit
+
+    @property
+    def tolerance(self) -> float:
+        return self.emission_interval * (self.burst or self.limit)
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int = 0
+
+
+def gcra_decide(tat: Optional[float], now: float, rate: RateLimit) -> tuple:
+    """
+    Apply GCRA to a stored TAT.
+
+    Args:
+        tat: Stored theoretical arrival time (None for a new key)
+        now: Current time in seconds
+        rate: Limit to apply
+
+    Returns:
+        (decision, new_tat) - new_tat is None when the request is rejected
+    """
+    interval = rate.emission_interval
+    new_tat = max(tat or now, now) + interval
+    allow_at = new_tat - rate.tolerance
+
+    if allow_at > now:
+        return RateLimitDecision(
+            allowed=False,
+            limit=rate.limit,
+            remaining=0,
+            retry_after=max(1, math.ceil(allow_at - now))
+        ), None
+
+    remaining = int((now - allow_at) / interval)
+    return RateLimitDecision(allowed=True, limit=rate.limit, remaining=remaining), new_tat
+
+
+class RateLimitStore(ABC):
+    """Abstract GCRA state store."""
+
+    @abstractmethod
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        """Consume one request for key under rate."""
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    Per-process GCRA store.
+
+    Limits are per worker: with N workers the effective limit is N times the
+    configured one. Use the PostgreSQL or Redis store for shared limits.
+    """
+
+    CLEANUP_INTERVAL = 300  # Drop idle keys every 5 minutes
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._tats: Dict[str, float] = {}
+        self._clock = clock
+        self._last_cleanup = clock()
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        now = self._clock()
+        self._cleanup(now)
+
+        decision, new_tat = gcra_decide(self._tats.get(key), now, rate)
+        if new_tat is not None:
+            self._tats[key] = new_tat
+        return decision
+
+    def _cleanup(self, now: float) -> None:
+        """Remove keys whose TAT is in the past (bucket fully refilled)."""
+        if now - self._last_cleanup < self.CLEANUP_INTERVAL:
+            return
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        self._last_cleanup = now
+
+
+class PostgresRateLimitStore(RateLimitStore):
+    """
+    Shared GCRA store in the UNLOGGED rate_limit_state table.
+
+    One upsert per request; the WHERE clause of ON CONFLICT DO UPDATE makes
+    check-and-consume atomic across workers. Statements run in a thread so
+    the event loop is not blocked.
+    """
+
+    CLEANUP_INTERVAL = 300
+
+    HIT_SQL = text("""
+        INSERT INTO rate_limit_state AS s (key, tat)
+        VALUES (:key, :now + :interval)
+        ON CONFLICT (key) DO UPDATE
+            SET tat = GREATEST(s.tat, :now) + :interval
+            WHERE GREATEST(s.tat, :now) + :interval - :now <= :tolerance
+        RETURNING tat
+    """)
+
+    def __init__(self, engine, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            engine: SQLAlchemy engine
+            clock: Time source (seconds)
+        """
+        self.engine = engine
+        self._clock = clock
+        self._last_cleanup = clock()
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        return await asyncio.to_thread(self._hit_sync, key, rate)
+
+    def _hit_sync(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        now = self._clock()
+        params = {
+            "key": key,
+            "now": now,
+            "interval": rate.emission_interval,
+            "tolerance": rate.tolerance,
+        }
+        with self.engine.begin() as conn:
+            new_tat = conn.execute(self.HIT_SQL, params).scalar()
+            if new_tat is None:
+                tat = conn.execute(
+                    text("SELECT tat FROM rate_limit_state WHERE key = :key"), {"key": key}
+                ).scalar()
+                decision, _ = gcra_decide(tat, now, rate)
+            else:
+                allow_at = new_tat - rate.tolerance
+                decision = RateLimitDecision(
+                    allowed=True,
+                    limit=rate.limit,
+                    remaining=int((now - allow_at) / rate.emission_interval)
+                )
+
+            if now - self._last_cleanup >= self.CLEANUP_INTERVAL:
+                conn.execute(text("DELETE FROM rate_limit_state WHERE tat < :now"), {"now": now})
+                self._last_cleanup = now
+
+        return decision
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Shared GCRA store in Redis, evaluated atomically by a Lua script.
+
+    Keys expire once the bucket is full again, so idle clients cost nothing.
+    """
+
+    GCRA_SCRIPT = """
+        local tat = tonumber(redis.call('GET', KEYS[1]))
+        local now = tonumber(ARGV[1])
+        local interval = tonumber(ARGV[2])
+        local tolerance = tonumber(ARGV[3])
+        if tat == nil or tat < now then tat = now end
+        local new_tat = tat + interval
+        local allow_at = new_tat - tolerance
+        if allow_at > now then
+            return {0, tostring(allow_at - now)}
+        end
+        redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+        return {1, tostring(now - allow_at)}
+    """
+
+    def __init__(self, client, key_prefix: str = "ratelimit:", clock: Callable[[], float] = time.time):
+        """
+        Args:
+            client: redis.asyncio.Redis client
+            key_prefix: Prefix for rate limit keys
+            clock: Time source (seconds)
+        """
+        self.client = client
+        self.key_prefix = key_prefix
+        self._clock = clock
+        self._script = client.register_script(self.GCRA_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitStore":
+        """Create store from a redis:// URL (requires the redis package)."""
+        import redis.asyncio as redis_asyncio
+
+        return cls(redis_asyncio.from_url(url))
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        allowed, seconds = await self._script(
+            keys=[f"{self.key_prefix}{key}"],
+            args=[self._clock(), rate.emission_interval, rate.tolerance]
+        )
+        seconds = float(seconds)
+        if int(allowed):
+            return RateLimitDecision(
+                allowed=True,
+                limit=rate.limit,
+                remaining=int(seconds / rate.emission_interval)
+            )
+        return RateLimitDecision(
+            allowed=False,
+            limit=rate.limit,
+            remaining=0,
+            retry_after=max(1, math.ceil(seconds))
+        )
+
+
+def create_rate_limit_store(settings) -> RateLimitStore:
+    """
+    Create the store selected by settings.RATE_LIMIT_BACKEND.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        RateLimitStore instance (memory, postgres or redis)
+    """
+    backend = settings.RATE_LIMIT_BACKEND
+
+    if backend == "postgres":
+        from app.core.database import engine
+
+        return PostgresRateLimitStore(engine)
+
+    if backend == "redis":
+        return RedisRateLimitStore.from_url(settings.RATE_LIMIT_REDIS_URL)
+
+    return InMemoryRateLimitStore()
@@ -0,0 +1,385 @@
+"""
+Tenant configuration cache - branding, typed settings and feature flags, per tenant, in-process.
+
+Subdomain login, branded pages and every settings-driven branch read the
+same few rows per tenant. TenantConfigCache keeps one snapshot per
+organization: its active branding (with the white-label feature flags) and
+its active system settings, already converted with get_typed_value. A miss
+loads the snapshot in its own session with the tenant's RLS context (two
+queries); later reads are served from memory.
+
+Invalidation:
+- BrandingService and SystemSettingService invalidate the tenant locally as
+  soon as they change its branding or settings.
+- Triggers on organization_branding and system_settings send
+  NOTIFY tenant_config '<organization_id>' on commit (migration 035). A
+  TenantConfigListener thread per process invalidates on receipt, so other
+  workers follow within a poll interval.
+- Every invalidation bumps the tenant's version. A load that started before
+  the bump is returned to its caller but not cached, so a slow load cannot
+  put superseded rows back.
+- Snapshots also expire after TENANT_CONFIG_CACHE_SECONDS, which bounds
+  staleness while the listener is disconnected; it invalidates every tenant
+  when it reconnects, since notifications may have been missed.
+
+Snapshots are loaded under the tenant's own RLS context, so request paths
+read them with get_for_session: a session whose RLS context is another
+organization gets an empty snapshot, as its own query would have returned
+no rows.
+
+Snapshots are shared between requests: treat the branding object and JSON
+setting values as read-only.
+"""
+import atexit
+import logging
+import select
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database.rls import get_current_org_id
+from app.models.branding import OrganizationBranding
+
+logger = logging.getLogger(__name__)
+
+TENANT_CONFIG_CHANNEL = "tenant_config"
+
+# Loader result: (active branding or None, setting_key -> typed value)
+TenantConfigRows = Tuple[Optional[OrganizationBranding], Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class TenantConfigSnapshot:
+    """Branding, typed settings and feature flags of one organization."""
+
+    organization_id: int
+    version: int
+    branding: Optional[OrganizationBranding]
+    settings: Mapping[str, Any]
+
+    @property
+    def feature_flags(self) -> Mapping[str, Any]:
+        """White-label feature flags (empty without branding)."""
+        flags = self.branding.feature_flags if self.branding is not None else None
+        return MappingProxyType(flags if isinstance(flags, dict) else {})
+
+    def is_feature_enabled(self, feature_name: str) -> bool:
+        """Check a white-label feature flag (False without branding)."""
+        return self.branding is not None and bool(self.branding.is_feature_enabled(feature_name))
+
+    def get_setting(self, setting_key: str, default: Any = None) -> Any:
+        """Typed setting value, or default if missing or unparseable."""
+        value = self.settings.get(setting_key)
+        return value if value is not None else default
+
+
+def load_tenant_config(organization_id: int) -> TenantConfigRows:
+    """
+    Load a tenant's branding and settings in a new session.
+
+    The session carries the tenant's RLS context, so the snapshot does not
+    depend on who triggered the load.
+
+    Args:
+        organization_id: Organization ID
+
+    Returns:
+        (active branding or None, typed values of active settings by key)
+    """
+    from app.core.database import SessionLocal
+    from app.infrastructure.database.rls import set_rls_context
+    from app.infrastructure.repositories.branding_repository import OrganizationBrandingRepository
+    from app.infrastructure.repositories.infrastructure_repository import SystemSettingRepository
+
+    db = SessionLocal()
+    try:
+        set_rls_context(db, organization_id=organization_id)
+        branding = OrganizationBrandingRepository(db).get_by_organization(organization_id)
+        settings = {
+            setting.setting_key: setting.get_typed_value()
+            for setting in SystemSettingRepository(db).list_by_organization(organization_id)
+        }
+        return branding, settings
+    finally:
+        db.close()
+
+
+class TenantConfigCache:
+    """
+    Versioned per-tenant configuration snapshots with a TTL.
+
+    Thread-safe; bounded by max_tenants (least recently used evicted).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        max_tenants: int = 10_000,
+        loader: Optional[Callable[[int], TenantConfigRows]] = None
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: Snapshot lifetime (safety net behind NOTIFY invalidation)
+            max_tenants: Maximum cached tenants
+            loader: Loads (branding, typed settings) for an organization
+                (default: load_tenant_config)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_tenants = max_tenants
+        self._loader = loader or load_tenant_config
+        self._snapshots: "OrderedDict[int, Tuple[float, TenantConfigSnapshot]]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._epoch = 0
+        self._subdomains: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, organization_id: int) -> TenantConfigSnapshot:
+        """
+        Get a tenant's snapshot, loading it from the database on a miss.
+
+        Args:
+            organization_id: Organization ID
+
+        Returns:
+            TenantConfigSnapshot (branding None if the tenant has none)
+        """
+        with self._lock:
+            entry = self._snapshots.get(organization_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._snapshots.move_to_end(organization_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            version = (self._epoch, self._versions.get(organization_id, 0))
+
+        branding, settings = self._loader(organization_id)
+        snapshot = TenantConfigSnapshot(
+            organization_id=organization_id,
+            version=version[1],
+            branding=branding,
+            settings=MappingProxyType(dict(settings))
+        )
+
+        with self._lock:
+            if version == (self._epoch, self._versions.get(organization_id, 0)):
+                self._store(snapshot)
+        return snapshot
+
+    def get_for_session(self, db: Session, organization_id: int) -> TenantConfigSnapshot:
+        """
+        Get a tenant's snapshot as visible to a request session.
+
+        With RLS enabled, only the organization of the session's RLS context
+        is served; any other organization (or no context) gets an empty
+        snapshot, matching the org_isolation policies on
+        organization_branding and system_settings.
+
+        Args:
+            db: Caller's session (its RLS context is checked)
+            organization_id: Organization ID
+
+        Returns:
+            TenantConfigSnapshot (empty if the session may not see the tenant)
+        """
+        from app.core.config import settings
+
+        if settings.RLS_ENABLED and get_current_org_id(db) != organization_id:
+            return TenantConfigSnapshot(
+                organization_id=organization_id,
+                version=self.version(organization_id),
+                branding=None,
+                settings=MappingProxyType({})
+            )
+        return self.get(organization_id)
+
+    def organization_for_subdomain(self, subdomain: str) -> Optional[int]:
+        """
+        Organization whose cached branding uses a custom subdomain.
+
+        Args:
+            subdomain: Custom subdomain
+
+        Returns:
+            Organization ID, or None if no cached snapshot claims it
+        """
+        with self._lock:
+            return self._subdomains.get(subdomain)
+
+    def invalidate(self, organization_id: Optional[int] = None) -> None:
+        """
+        Drop snapshots and bump their version.
+
+        Args:
+            organization_id: Tenant to invalidate (None = all tenants)
+        """
+        with self._lock:
+            if organization_id is None:
+                self._epoch += 1
+                self._snapshots.clear()
+                self._subdomains.clear()
+                return
+            self._versions[organization_id] = self._versions.get(organization_id, 0) + 1
+            self._snapshots.pop(organization_id, None)
+            for subdomain in [s for s, org in self._subdomains.items() if org == organization_id]:
+                del self._subdomains[subdomain]
+
+    def version(self, organization_id: int) -> int:
+        """Current version of a tenant's configuration in this process."""
+        with self._lock:
+            return self._versions.get(organization_id, 0)
+
+    def stats(self) -> Dict[str, int]:
+        """Return tenant count and hit/miss counters."""
+        with self._lock:
+            return {"tenants": len(self._snapshots), "hits": self.hits, "misses": self.misses}
+
+    def _store(self, snapshot: TenantConfigSnapshot) -> None:
+        """Cache a snapshot and index its subdomain (lock held)."""
+        organization_id = snapshot.organization_id
+        self._snapshots[organization_id] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._snapshots.move_to_end(organization_id)
+
+        subdomain = snapshot.branding.custom_subdomain if snapshot.branding is not None else None
+        if subdomain:
+            self._subdomains[subdomain] = organization_id
+
+        while len(self._snapshots) > self.max_tenants:
+            evicted, (_, old) = self._snapshots.popitem(last=False)
+            old_subdomain = old.branding.custom_subdomain if old.branding is not None else None
+            if old_subdomain and self._subdomains.get(old_subdomain) == evicted:
+                del self._subdomains[old_subdomain]
+
+
+def _listen_connection():
+    """Dedicated autocommit psycopg2 connection, detached from the pool."""
+    from app.core.database import engine
+
+    connection = engine.raw_connection()
+    connection.detach()
+    driver_connection = connection.driver_connection
+    driver_connection.autocommit = True
+    return driver_connection
+
+
+class TenantConfigListener:
+    """
+    Background thread that LISTENs on tenant_config and invalidates the cache.
+
+    The payload is an organization ID, or '*' for every tenant.
+    """
+
+    def __init__(
+        self,
+        cache: TenantConfigCache,
+        connect: Callable[[], Any] = _listen_connection,
+        channel: str = TENANT_CONFIG_CHANNEL,
+        poll_interval: float = 1.0,
+        reconnect_delay: float = 5.0
+    ):
+        """
+        Initialize listener.
+
+        Args:
+            cache: Cache to invalidate
+            connect: Opens an autocommit DB-API connection with notifies/poll (psycopg2)
+            channel: NOTIFY channel
+            poll_interval: Seconds between checks for stop while idle
+            reconnect_delay: Seconds to wait after a connection failure
+        """
+        self.cache = cache
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self._connect = connect
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def handle(self, payload: str) -> None:
+        """
+        Apply one notification.
+
+        Args:
+            payload: Organization ID, or '*' (or empty) for every tenant
+        """
+        payload = (payload or "").strip()
+        if payload in ("", "*"):
+            self.cache.invalidate()
+            return
+        try:
+            self.cache.invalidate(int(payload))
+        except ValueError:
+            logger.warning(f"Ignoring {self.channel} notification with payload '{payload}'")
+
+    def start(self) -> None:
+        """Start the listener thread (idempotent)."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="tenant-config-listener", daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Stop the listener thread."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 5)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                cursor = connection.cursor()
+                cursor.execute(f"LISTEN {self.channel}")
+                # Changes made while not listening were missed
+                self.cache.invalidate()
+                logger.info(f"Listening for tenant configuration changes on '{self.channel}'")
+
+                while not self._stopping.is_set():
+                    if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self.handle(connection.notifies.pop(0).payload)
+
+            except Exception as e:
+                logger.error(f"Tenant configuration listener error: {e}")
+                self._stopping.wait(self.reconnect_delay)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+_tenant_config_cache: Optional[TenantConfigCache] = None
+_tenant_config_lock = threading.Lock()
+
+
+def get_tenant_config_cache() -> TenantConfigCache:
+    """Process-wide cache (created from settings on first use, with its listener)."""
+    global _tenant_config_cache
+    if _tenant_config_cache is None:
+        with _tenant_config_lock:
+            if _tenant_config_cache is None:
+                from app.core.config import settings
+
+                cache = TenantConfigCache(ttl_seconds=settings.TENANT_CONFIG_CACHE_SECONDS)
+                if settings.TENANT_CONFIG_LISTEN:
+                    TenantConfigListener(cache).start()
+                _tenant_config_cache = cache
+    return _tenant_config_cache
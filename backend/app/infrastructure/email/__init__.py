@@ -4,6 +4,9 @@ from app.infrastructure.email.sendgrid_adapter import SendGridEmailAdapter
 from app.infrastructure.email.aws_ses_adapter import AWSEmailAdapter
 from app.infrastructure.email.email_factory import EmailServiceFactory
 from app.infrastructure.email.smtp_client import BillionMailSMTPClient
+from app.infrastructure.email.smtp_pool import SMTPConnectionPool, get_smtp_pool
+from app.infrastructure.email.rate_limiter import ProviderRateLimiter
+from app.infrastructure.email.delivery import EmailDeliveryEngine
 from app.infrastructure.email.email_service import NotificationEmailService
 from app.infrastructure.email.templates import TemplateManager
 from app.infrastructure.email.models import (
@@ -20,6 +23,10 @@ __all__ = [
     'AWSEmailAdapter',
     'EmailServiceFactory',
     'BillionMailSMTPClient',
+    'SMTPConnectionPool',
+    'get_smtp_pool',
+    'ProviderRateLimiter',
+    'EmailDeliveryEngine',
     'NotificationEmailService',
     'TemplateManager',
     'EmailRecipient',
@@ -0,0 +1,230 @@
+"""Batched outbound email delivery over pooled SMTP connections.
+
+Producers enqueue serialized EmailMessage payloads to PGMQ; workers read
+them in batches, send each batch over persistent SMTP connections under a
+per-provider rate limit, archive the delivered messages in one call and
+retry or dead-letter the failures.
+
+Usage:
+    engine = EmailDeliveryEngine.from_settings(settings)
+    engine.enqueue(get_pgmq_client(), messages)
+
+    # Worker process
+    engine.run_worker(get_pgmq_client())
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.infrastructure.email.models import EmailMessage
+from app.infrastructure.email.rate_limiter import ProviderRateLimiter
+from app.infrastructure.email.smtp_client import BillionMailSMTPClient
+from app.infrastructure.email.smtp_pool import SMTPConnectionPool, get_smtp_pool
+from app.infrastructure.messaging.pgmq_client import PGMQClient, PGMQMessage
+
+logger = logging.getLogger(__name__)
+
+EMAIL_DELIVERY_QUEUE = "email_delivery"
+
+
+class EmailDeliveryEngine:
+    """Delivery engine for batched, rate-limited SMTP sending.
+
+    Wraps a BillionMailSMTPClient backed by an SMTPConnectionPool so every
+    message in a batch reuses an already authenticated connection.
+    """
+
+    def __init__(
+        self,
+        smtp_client: BillionMailSMTPClient,
+        rate_limiter: Optional[ProviderRateLimiter] = None,
+        provider: str = "smtp",
+        batch_size: int = 50
+    ):
+        """Initialize delivery engine.
+
+        Args:
+            smtp_client: SMTP client (should be configured with a pool)
+            rate_limiter: Optional per-provider rate limiter
+            provider: Provider name used as the rate limit key
+            batch_size: Messages read from the queue per batch
+        """
+        self.smtp_client = smtp_client
+        self.rate_limiter = rate_limiter
+        self.provider = provider
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings,
+        pool: Optional[SMTPConnectionPool] = None
+    ) -> "EmailDeliveryEngine":
+        """Create engine from application settings.
+
+        Args:
+            settings: Application settings with SMTP and delivery configuration
+            pool: Optional pool (defaults to the shared pool for the SMTP server)
+
+        Returns:
+            Configured EmailDeliveryEngine
+        """
+        smtp_client = BillionMailSMTPClient(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            user=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            use_tls=settings.SMTP_TLS,
+            pool=pool or get_smtp_pool(settings)
+        )
+        rate_limiter = ProviderRateLimiter(
+            default_rate=settings.EMAIL_RATE_LIMIT_PER_SECOND,
+            default_burst=settings.EMAIL_RATE_LIMIT_BURST
+        )
+        return cls(
+            smtp_client=smtp_client,
+            rate_limiter=rate_limiter,
+            provider="smtp",
+            batch_size=settings.EMAIL_BATCH_SIZE
+        )
+
+    def send(self, message: EmailMessage) -> bool:
+        """Send one message, honouring the provider rate limit.
+
+        Args:
+            message: EmailMessage DTO
+
+        Returns:
+            bool: True if sent successfully, False otherwise
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.provider)
+        return self.smtp_client.send(message)
+
+    def send_batch(self, messages: Sequence[EmailMessage]) -> List[bool]:
+        """Send several messages over pooled connections.
+
+        A failure of one message does not stop the rest of the batch.
+
+        Args:
+            messages: EmailMessage DTOs
+
+        Returns:
+            Per-message success flags, in input order
+        """
+        return [self.send(message) for message in messages]
+
+    @staticmethod
+    def enqueue(
+        pgmq_client: PGMQClient,
+        messages: Sequence[EmailMessage],
+        queue_name: str = EMAIL_DELIVERY_QUEUE
+    ) -> List[int]:
+        """Enqueue messages for batched delivery in one round trip.
+
+        Args:
+            pgmq_client: PGMQ client
+            messages: EmailMessage DTOs
+            queue_name: Delivery queue name
+
+        Returns:
+            PGMQ message IDs
+        """
+        payloads = [
+            {"task": "deliver_email", "email": message.model_dump(mode="json")}
+            for message in messages
+        ]
+        return pgmq_client.enqueue_batch(queue_name, payloads)
+
+    def process_batch(
+        self,
+        pgmq_client: PGMQClient,
+        queue_name: str = EMAIL_DELIVERY_QUEUE,
+        vt: int = 30
+    ) -> Dict[str, int]:
+        """Read one batch from the delivery queue and send it.
+
+        Delivered messages are archived together; failed ones are retried
+        or moved to the dead-letter queue by the PGMQ retry policy.
+
+        Args:
+            pgmq_client: PGMQ client
+            queue_name: Delivery queue name
+            vt: Visibility timeout in seconds
+
+        Returns:
+            Counts of read, sent and failed messages
+        """
+        queued = pgmq_client.dequeue_batch(queue_name, self.batch_size, vt=vt)
+        if not queued:
+            return {"read": 0, "sent": 0, "failed": 0}
+
+        delivered: List[int] = []
+        failed: List[PGMQMessage] = []
+        errors: Dict[int, str] = {}
+
+        for queued_message in queued:
+            try:
+                email = EmailMessage.model_validate(queued_message.message["email"])
+            except Exception as e:
+                errors[queued_message.msg_id] = f"Invalid email payload: {e}"
+                failed.append(queued_message)
+                continue
+
+            if self.send(email):
+                delivered.append(queued_message.msg_id)
+            else:
+                errors[queued_message.msg_id] = f"Delivery to {email.to.email} failed"
+                failed.append(queued_message)
+
+        pgmq_client.archive_batch(queue_name, delivered)
+
+        for queued_message in failed:
+            self._handle_failure(pgmq_client, queue_name, queued_message, errors[queued_message.msg_id])
+
+        return {"read": len(queued), "sent": len(delivered), "failed": len(failed)}
+
+    @staticmethod
+    def _handle_failure(
+        pgmq_client: PGMQClient,
+        queue_name: str,
+        queued_message: PGMQMessage,
+        error: str
+    ) -> None:
+        payload: Dict[str, Any] = queued_message.message
+        if payload.get("retry_count", 0) >= pgmq_client.max_retries:
+            pgmq_client.move_to_dlq(queue_name, queued_message.msg_id, payload, error)
+        else:
+            pgmq_client.retry_message(queue_name, queued_message.msg_id, payload)
+
+    def run_worker(
+        self,
+        pgmq_client: PGMQClient,
+        queue_name: str = EMAIL_DELIVERY_QUEUE,
+        vt: int = 30,
+        idle_sleep: float = 1.0
+    ) -> None:
+        """Consume the delivery queue until interrupted.
+
+        Args:
+            pgmq_client: PGMQ client
+            queue_name: Delivery queue name
+            vt: Visibility timeout in seconds
+            idle_sleep: Seconds to wait when the queue is empty
+        """
+        logger.info(f"Starting email delivery worker for queue '{queue_name}'")
+
+        try:
+            while True:
+                counts = self.process_batch(pgmq_client, queue_name, vt=vt)
+                if counts["read"]:
+                    logger.info(
+                        f"Email batch processed: {counts['sent']} sent, {counts['failed']} failed"
+                    )
+                else:
+                    time.sleep(idle_sleep)
+        except KeyboardInterrupt:
+            logger.info("Email delivery worker stopped by user")
+        finally:
+            if self.smtp_client.pool is not None:
+                self.smtp_client.pool.close()
@@ -3,6 +3,7 @@ import logging
 from typing import Optional, Dict, Any
 
 from app.infrastructure.email.smtp_client import BillionMailSMTPClient
+from app.infrastructure.email.smtp_pool import get_smtp_pool
 from app.infrastructure.email.templates import TemplateManager
 from app.infrastructure.email.models import EmailMessage, EmailRecipient
 from app.infrastructure.messaging.pgmq_client import PGMQClient
@@ -36,13 +37,14 @@ class NotificationEmailService:
         self.from_email = from_email or settings.SMTP_USER
         self.from_name = from_name
 
-        # Initialize SMTP client
+        # Initialize SMTP client on the shared connection pool
         self.smtp_client = BillionMailSMTPClient(
             host=settings.SMTP_HOST,
             port=settings.SMTP_PORT,
             user=settings.SMTP_USER,
             password=settings.SMTP_PASSWORD,
-            use_tls=settings.SMTP_TLS
+            use_tls=settings.SMTP_TLS,
+            pool=get_smtp_pool(settings)
         )
 
         # Initialize template manager
@@ -0,0 +1,90 @@
+"""Per-provider send rate limiting for outbound email."""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class ProviderRateLimiter:
+    """Token-bucket rate limiter keyed by email provider.
+
+    Each provider gets its own bucket refilled at ``rate`` messages per
+    second up to ``burst`` tokens, so a slow provider quota (e.g. SES
+    sandbox at 1 msg/s) does not throttle the others.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        default_rate: float = 10.0,
+        default_burst: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            limits: Mapping of provider name to (messages per second, burst size)
+            default_rate: Rate for providers without an explicit limit
+            default_burst: Burst size for providers without an explicit limit
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.limits = dict(limits or {})
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _limit_for(self, provider: str) -> Tuple[float, int]:
+        return self.limits.get(provider, (self.default_rate, self.default_burst))
+
+    def _reserve(self, provider: str, tokens: float) -> float:
+        """Take tokens from the bucket and return seconds to wait for them."""
+        rate, burst = self._limit_for(provider)
+        if rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = self._clock()
+            available, updated_at = self._buckets.get(provider, (float(burst), now))
+            available = min(float(burst), available + (now - updated_at) * rate)
+            available -= tokens
+            self._buckets[provider] = (available, now)
+
+        return 0.0 if available >= 0 else -available / rate
+
+    def try_acquire(self, provider: str, tokens: float = 1.0) -> bool:
+        """Take tokens without waiting.
+
+        Args:
+            provider: Provider name (smtp, sendgrid, aws_ses, ...)
+            tokens: Number of messages about to be sent
+
+        Returns:
+            bool: True if tokens were available, False otherwise
+        """
+        rate, _ = self._limit_for(provider)
+        if rate <= 0:
+            return True
+
+        wait = self._reserve(provider, tokens)
+        if wait > 0:
+            # Give the tokens back; caller decided not to wait
+            with self._lock:
+                available, updated_at = self._buckets[provider]
+                self._buckets[provider] = (available + tokens, updated_at)
+            return False
+        return True
+
+    def acquire(self, provider: str, tokens: float = 1.0) -> None:
+        """Take tokens, sleeping until the provider's bucket allows it.
+
+        Args:
+            provider: Provider name (smtp, sendgrid, aws_ses, ...)
+            tokens: Number of messages about to be sent
+        """
+        wait = self._reserve(provider, tokens)
+        if wait > 0:
+            self._sleep(wait)
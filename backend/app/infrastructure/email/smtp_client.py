@@ -8,6 +8,7 @@ from email import encoders
 from typing import Optional
 
 from app.infrastructure.email.models import EmailMessage
+from app.infrastructure.email.smtp_pool import SMTPConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,8 @@ class BillionMailSMTPClient:
 
     Handles connection, authentication, and email delivery through
     Billion Mail SMTP server with support for TLS, attachments,
-    and HTML emails.
+    and HTML emails. When given an SMTPConnectionPool, messages reuse
+    pooled authenticated connections instead of connecting per message.
     """
 
     def __init__(
@@ -26,7 +28,8 @@ class BillionMailSMTPClient:
         port: int,
         user: str,
         password: str,
-        use_tls: bool = True
+        use_tls: bool = True,
+        pool: Optional[SMTPConnectionPool] = None
     ):
         """Initialize Billion Mail SMTP client.
 
@@ -36,12 +39,14 @@ class BillionMailSMTPClient:
             user: SMTP authentication username
             password: SMTP authentication password
             use_tls: Whether to use STARTTLS encryption
+            pool: Optional connection pool shared across messages
         """
         self.host = host
         self.port = port
         self.user = user
         self.password = password
         self.use_tls = use_tls
+        self.pool = pool
 
     def send(self, message: EmailMessage) -> bool:
         """Send email via Billion Mail SMTP.
@@ -56,6 +61,11 @@ class BillionMailSMTPClient:
             # Create MIME message
             mime_msg = self._create_mime_message(message)
 
+            if self.pool is not None:
+                self.pool.send_message(mime_msg)
+                logger.info(f"Email sent successfully to {message.to.email}")
+                return True
+
             # Connect to SMTP server and send
             with smtplib.SMTP(self.host, self.port) as server:
                 if self.use_tls:
@@ -0,0 +1,281 @@
+"""Pool of persistent, authenticated SMTP connections."""
+import smtplib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledConnection:
+    """SMTP connection with bookkeeping used by the pool."""
+
+    __slots__ = ("server", "created_at", "last_used_at", "messages_sent")
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+        self.messages_sent = 0
+
+
+class SMTPConnectionPool:
+    """Thread-safe pool of persistent SMTP connections.
+
+    Connections are opened, upgraded with STARTTLS and authenticated once,
+    then reused across messages. Idle connections are health-checked with
+    NOOP before reuse and transparently replaced when the server has closed
+    them. Connections are recycled after a configurable number of messages
+    since many MTAs cap messages per session.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        max_size: int = 4,
+        max_idle_seconds: float = 30.0,
+        max_messages_per_connection: int = 100,
+        timeout: float = 30.0
+    ):
+        """Initialize SMTP connection pool.
+
+        Args:
+            host: SMTP server hostname
+            port: SMTP server port
+            user: SMTP authentication username
+            password: SMTP authentication password
+            use_tls: Whether to use STARTTLS encryption
+            max_size: Maximum number of open connections
+            max_idle_seconds: Idle time after which a connection is checked with NOOP
+            max_messages_per_connection: Messages after which a connection is recycled
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+
+        self._idle: List[_PooledConnection] = []
+        self._open_count = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _connect(self) -> _PooledConnection:
+        """Open, secure and authenticate a new SMTP connection."""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            self._close_server(server)
+            raise
+        logger.debug(f"Opened SMTP connection to {self.host}:{self.port}")
+        return _PooledConnection(server)
+
+    @staticmethod
+    def _close_server(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _is_healthy(self, connection: _PooledConnection) -> bool:
+        """Check connection liveness, using NOOP only after idling."""
+        if connection.messages_sent >= self.max_messages_per_connection:
+            return False
+        if time.monotonic() - connection.last_used_at < self.max_idle_seconds:
+            return True
+        try:
+            status, _ = connection.server.noop()
+            return status == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    def _discard(self, connection: _PooledConnection) -> None:
+        self._close_server(connection.server)
+        with self._condition:
+            self._open_count -= 1
+            self._condition.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> _PooledConnection:
+        """Check out a healthy connection, opening one if the pool has room.
+
+        Args:
+            timeout: Seconds to wait for a free connection (None waits forever)
+
+        Returns:
+            Pooled connection; must be returned with release()
+
+        Raises:
+            RuntimeError: If the pool is closed or no connection became free
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("SMTP connection pool is closed")
+
+                connection = self._idle.pop() if self._idle else None
+                if connection is None and self._open_count < self.max_size:
+                    self._open_count += 1
+                    reserve = True
+                elif connection is None:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise RuntimeError("Timed out waiting for SMTP connection")
+                    self._condition.wait(remaining)
+                    continue
+                else:
+                    reserve = False
+
+            if reserve:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._condition:
+                        self._open_count -= 1
+                        self._condition.notify()
+                    raise
+
+            if self._is_healthy(connection):
+                return connection
+
+            logger.debug("Replacing stale SMTP connection")
+            self._discard(connection)
+
+    def release(self, connection: _PooledConnection, broken: bool = False) -> None:
+        """Return a connection to the pool.
+
+        Args:
+            connection: Connection obtained from acquire()
+            broken: Close the connection instead of reusing it
+        """
+        if broken or self._closed:
+            self._discard(connection)
+            return
+
+        connection.last_used_at = time.monotonic()
+        with self._condition:
+            self._idle.append(connection)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[smtplib.SMTP]:
+        """Context manager yielding an authenticated smtplib.SMTP instance."""
+        pooled = self.acquire(timeout)
+        broken = False
+        try:
+            yield pooled.server
+        except (smtplib.SMTPServerDisconnected, OSError):
+            broken = True
+            raise
+        finally:
+            self.release(pooled, broken=broken)
+
+    def send_message(
+        self,
+        message: Message,
+        from_addr: Optional[str] = None,
+        to_addrs: Optional[List[str]] = None
+    ) -> None:
+        """Send a MIME message over a pooled connection.
+
+        A message interrupted by a dropped connection is retried once on a
+        fresh connection; other SMTP errors propagate to the caller.
+
+        Args:
+            message: MIME message to send
+            from_addr: Envelope sender (defaults to the From header)
+            to_addrs: Envelope recipients (defaults to To/Cc/Bcc headers)
+
+        Raises:
+            smtplib.SMTPException: If the server rejects the message
+        """
+        for attempt in (1, 2):
+            pooled = self.acquire(self.timeout)
+            try:
+                pooled.server.send_message(message, from_addr=from_addr, to_addrs=to_addrs)
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                self.release(pooled, broken=True)
+                if attempt == 2:
+                    raise
+                logger.warning(f"SMTP connection dropped, reconnecting: {e}")
+                continue
+            except smtplib.SMTPRecipientsRefused:
+                # Session is still usable after a per-recipient refusal
+                self.release(pooled)
+                raise
+            except Exception:
+                self.release(pooled, broken=True)
+                raise
+
+            pooled.messages_sent += 1
+            self.release(pooled)
+            return
+
+    def close(self) -> None:
+        """Close all idle connections and refuse further checkouts."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open_count -= len(idle)
+            self._condition.notify_all()
+
+        for connection in idle:
+            self._close_server(connection.server)
+
+    def __enter__(self) -> "SMTPConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_pools: Dict[Tuple[str, int, str, bool], SMTPConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(settings) -> SMTPConnectionPool:
+    """Get process-wide connection pool for the configured SMTP server.
+
+    Args:
+        settings: Application settings with SMTP configuration
+
+    Returns:
+        Shared SMTPConnectionPool (one per host, port, user and TLS mode)
+    """
+    key = (settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_USER, settings.SMTP_TLS)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = SMTPConnectionPool(
+                host=settings.SMTP_HOST,
+                port=settings.SMTP_PORT,
+                user=settings.SMTP_USER,
+                password=settings.SMTP_PASSWORD,
+                use_tls=settings.SMTP_TLS,
+                max_size=settings.SMTP_POOL_SIZE,
+                max_idle_seconds=settings.SMTP_POOL_MAX_IDLE_SECONDS,
+                max_messages_per_connection=settings.SMTP_POOL_MAX_MESSAGES_PER_CONNECTION
+            )
+            _pools[key] = pool
+        return pool
@@ -1,31 +1,67 @@
 """Email template rendering using Jinja2."""
 import os
-from typing import Dict, Any
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+import threading
+from typing import Dict, Any, Optional
+from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+_shared_env: Optional[Environment] = None
+_compiled: Dict[str, Template] = {}
+_lock = threading.Lock()
+
+
+def _get_environment() -> Environment:
+    """Return the process-wide Jinja2 environment for email templates.
+
+    Templates ship with the application, so filesystem freshness checks
+    (auto_reload) are disabled and compiled templates live for the process.
+    """
+    global _shared_env
+    if _shared_env is None:
+        with _lock:
+            if _shared_env is None:
+                _shared_env = Environment(
+                    loader=FileSystemLoader(TEMPLATES_DIR),
+                    autoescape=True,
+                    trim_blocks=True,
+                    lstrip_blocks=True,
+                    auto_reload=False
+                )
+    return _shared_env
 
 
 class TemplateManager:
     """Manager for email template rendering using Jinja2.
 
     Provides methods to render HTML and plain text email templates
-    with dynamic context data.
+    with dynamic context data. Compiled templates are cached per process
+    and shared by all TemplateManager instances.
     """
 
     def __init__(self):
-        """Initialize TemplateManager with Jinja2 environment."""
-        # Get templates directory path relative to this file
-        templates_dir = os.path.join(
-            os.path.dirname(__file__),
-            "templates"
-        )
-
-        # Create Jinja2 environment
-        self.env = Environment(
-            loader=FileSystemLoader(templates_dir),
-            autoescape=True,
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        """Initialize TemplateManager with the shared Jinja2 environment."""
+        self.env = _get_environment()
+
+    def _get_template(self, template_file: str) -> Template:
+        """Return compiled template, compiling it on first use."""
+        template = _compiled.get(template_file)
+        if template is None:
+            template = self.env.get_template(template_file)
+            _compiled[template_file] = template
+        return template
+
+    def precompile(self) -> int:
+        """Compile every bundled template ahead of the first send.
+
+        Returns:
+            Number of templates compiled
+        """
+        count = 0
+        for template_file in self.env.list_templates(extensions=["html", "txt"]):
+            self._get_template(template_file)
+            count += 1
+        return count
 
     def render(self, template_name: str, context: Dict[str, Any]) -> str:
         """Render HTML email template.
@@ -40,8 +76,7 @@ class TemplateManager:
         Raises:
             TemplateNotFound: If template doesn't exist
         """
-        template_file = f"{template_name}.html"
-        template = self.env.get_template(template_file)
+        template = self._get_template(f"{template_name}.html")
         return template.render(**context)
 
     def render_text(self, template_name: str, context: Dict[str, Any]) -> str:
@@ -57,6 +92,5 @@ class TemplateManager:
         Raises:
             TemplateNotFound: If template doesn't exist
         """
-        template_file = f"{template_name}.txt"
-        template = self.env.get_template(template_file)
+        template = self._get_template(f"{template_name}.txt")
         return template.render(**context)
@@ -0,0 +1,187 @@
+"""Tenant email templates compiled once, sandboxed and cached per version.
+
+EmailTemplate rows hold {{variable}} placeholders edited by tenant admins.
+They are compiled with a sandboxed Jinja2 environment (no access to unsafe
+attributes or callables) and kept in an LRU keyed by
+(organization_id, (template_code, version, updated_at)); updated_at covers
+changes that do not bump the content version (header, footer, sender).
+
+Values are HTML-escaped in the HTML body. A placeholder without a value is
+left in the output as {{name}}, as the original renderer did.
+
+The branding header and footer ("chrome") around the body are built once per
+template and branding snapshot and reused for every recipient.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from jinja2 import TemplateError, Undefined
+from jinja2.sandbox import SandboxedEnvironment
+from markupsafe import escape
+
+from app.infrastructure.search.search_cache import SearchResultCache
+
+COMPILED_TEMPLATE_TTL_SECONDS = 3600
+
+
+class _KeepPlaceholder(Undefined):
+    """Undefined variables render as their {{name}} placeholder."""
+
+    def __str__(self) -> str:
+        return "{{%s}}" % self._undefined_name
+
+
+def _environment(autoescape: bool) -> SandboxedEnvironment:
+    return SandboxedEnvironment(
+        undefined=_KeepPlaceholder,
+        autoescape=autoescape,
+        keep_trailing_newline=True
+    )
+
+
+_text_env = _environment(autoescape=False)
+_html_env = _environment(autoescape=True)
+
+
+@dataclass(frozen=True)
+class TemplateChrome:
+    """Branding header and footer HTML around a template body."""
+
+    header: Optional[str] = None
+    footer: Optional[str] = None
+
+    def wrap(self, body_html: str) -> str:
+        """Full HTML: header, body and footer joined by newlines."""
+        return "\n".join(part for part in (self.header, body_html, self.footer) if part)
+
+
+def template_fingerprint(template: Any) -> Hashable:
+    """Cache key of a template row: code, content version and last update."""
+    return template.template_code, template.version, template.updated_at
+
+
+class CompiledEmailTemplate:
+    """
+    One EmailTemplate compiled for repeated rendering.
+
+    Holds only plain values; safe to share between requests and threads.
+    """
+
+    def __init__(self, template: Any):
+        """
+        Compile subject, HTML body and text body of a template row.
+
+        Args:
+            template: EmailTemplate (or row with the same attributes)
+
+        Raises:
+            ValueError: If the template does not compile
+        """
+        self.template_id = template.id
+        self.organization_id = template.organization_id
+        self.template_code = template.template_code
+        self.version = template.version
+        self.fingerprint = template_fingerprint(template)
+        self.from_name = template.from_name
+        self.from_email = template.from_email
+        self.reply_to_email = template.reply_to_email
+        self.required_variables = tuple(template.get_required_variables())
+
+        self._include_header = template.include_header
+        self._include_footer = template.include_footer
+        self._custom_header_html = template.custom_header_html
+        self._custom_footer_html = template.custom_footer_html
+
+        try:
+            self._subject = _text_env.from_string(template.subject or "")
+            self._body_html = _html_env.from_string(template.body_html or "")
+            self._body_text = _text_env.from_string(template.body_text) if template.body_text else None
+        except TemplateError as e:
+            raise ValueError(f"Template '{template.template_code}' does not compile: {e}")
+
+        self._chrome: Optional[Tuple[Any, TemplateChrome]] = None
+        self._chrome_lock = threading.Lock()
+
+    def missing_variables(self, context: Dict[str, Any]) -> List[str]:
+        """Required variables absent from context, in definition order."""
+        return [name for name in self.required_variables if name not in context]
+
+    def render(self, context: Dict[str, Any], chrome: Optional[TemplateChrome] = None) -> Dict[str, Optional[str]]:
+        """
+        Render for one recipient.
+
+        Args:
+            context: Template variables
+            chrome: Branding header/footer to wrap the HTML body in (None = body only)
+
+        Returns:
+            Dictionary with 'subject', 'body_html', 'body_text' (None without a text body)
+
+        Raises:
+            ValueError: If rendering fails (e.g. a sandbox violation)
+        """
+        try:
+            body_html = self._body_html.render(context)
+            return {
+                "subject": self._subject.render(context),
+                "body_html": chrome.wrap(body_html) if chrome is not None else body_html,
+                "body_text": self._body_text.render(context) if self._body_text is not None else None,
+            }
+        except TemplateError as e:
+            raise ValueError(f"Template '{self.template_code}' failed to render: {e}")
+
+    def chrome(self, branding: Any = None) -> TemplateChrome:
+        """
+        Header and footer for this template with a branding, built once per branding object.
+
+        Mirrors EmailTemplate.get_full_html: the template's custom header and
+        footer win; otherwise the branding logo, footer text and support email.
+
+        Args:
+            branding: OrganizationBranding (e.g. from the tenant config snapshot) or None
+
+        Returns:
+            TemplateChrome
+        """
+        cached = self._chrome
+        if cached is not None and cached[0] is branding:
+            return cached[1]
+
+        header = footer = None
+        if self._include_header:
+            if self._custom_header_html:
+                header = self._custom_header_html
+            elif branding is not None and branding.logo_email_url:
+                header = (
+                    f'<div style="text-align:center;padding:20px;"><img src="{escape(branding.logo_email_url)}" '
+                    f'alt="Logo" style="max-height:60px;"/></div>'
+                )
+
+        if self._include_footer:
+            if self._custom_footer_html:
+                footer = self._custom_footer_html
+            elif branding is not None:
+                footer_parts = []
+                if branding.email_footer_text:
+                    footer_parts.append(f'<p style="color:#666;font-size:12px;">{escape(branding.email_footer_text)}</p>')
+                if branding.support_email:
+                    support_email = escape(branding.support_email)
+                    footer_parts.append(
+                        f'<p style="color:#666;font-size:12px;">Support: '
+                        f'<a href="mailto:{support_email}">{support_email}</a></p>'
+                    )
+                if footer_parts:
+                    footer = (
+                        '<div style="border-top:1px solid #ddd;margin-top:30px;padding-top:20px;text-align:center;">'
+                        f'{"".join(footer_parts)}</div>'
+                    )
+
+        chrome = TemplateChrome(header=header, footer=footer)
+        with self._chrome_lock:
+            self._chrome = (branding, chrome)
+        return chrome
+
+
+# Process-wide cache shared by EmailTemplateService instances (one per request)
+compiled_template_cache = SearchResultCache(max_entries=2_000)
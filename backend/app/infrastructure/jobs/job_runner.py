@@ -8,18 +8,20 @@ Usage:
     pg_cron schedules jobs that call HTTP endpoints:
     - POST /api/v1/jobs/track-usage (runs every 6 hours)
     - POST /api/v1/jobs/check-trial-expirations (runs daily)
+    - POST /api/v1/jobs/snapshot-platform-metrics (runs daily)
 """
 import logging
-from datetime import datetime, timezone
-from typing import List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, func
 
 from app.infrastructure.persistence.database import SessionLocal
 from app.application.use_cases.billing.track_usage_use_case import TrackUsageUseCase
 from app.application.use_cases.billing.handle_trial_expiration_use_case import (
     HandleTrialExpirationUseCase,
 )
+from app.infrastructure.repositories.platform_metrics_repository import PlatformMetricsRepository
 from app.models.subscription import SubscriptionModel
 from app.domain.entities.subscription import SubscriptionStatus
 
@@ -50,8 +52,10 @@ def track_usage_job() -> JobResult:
     Track usage for all active organizations
 
     Runs every 6 hours via pg_cron.
-    Calculates current resource usage (users, plants, storage) for each
-    organization and updates the subscription_usage table.
+    Snapshots resource usage (users, plants, storage) of every trial/active
+    organization with a few set-based statements (see
+    TrackUsageUseCase.track_all), detects limit and threshold crossings in
+    SQL and queues follow-up notifications, all in one transaction.
 
     Returns:
         JobResult with processed count and any errors
@@ -60,49 +64,24 @@ def track_usage_job() -> JobResult:
     try:
         logger.info("Starting usage tracking job")
 
-        # Get all organizations with active or trial subscriptions
-        subscriptions = (
-            db.query(SubscriptionModel)
-            .filter(
-                SubscriptionModel.status.in_(
-                    [SubscriptionStatus.TRIAL.value, SubscriptionStatus.ACTIVE.value]
-                )
-            )
-            .all()
-        )
-
-        processed = 0
-        errors = 0
-        error_details = []
-
-        for subscription in subscriptions:
-            try:
-                use_case = TrackUsageUseCase(db)
-                use_case.execute(organization_id=subscription.organization_id)
-                processed += 1
-                logger.debug(
-                    f"Tracked usage for organization {subscription.organization_id}"
-                )
-            except Exception as e:
-                errors += 1
-                error_msg = f"Org {subscription.organization_id}: {str(e)}"
-                error_details.append(error_msg)
-                logger.error(f"Failed to track usage for org {subscription.organization_id}: {e}")
-
+        summary = TrackUsageUseCase(db).execute()
         db.commit()
 
-        result = JobResult(
-            success=errors == 0,
-            message=f"Tracked usage for {processed} organizations ({errors} errors)",
-            processed_count=processed,
-            error_count=errors,
-            details={"errors": error_details} if error_details else {},
-        )
-
         logger.info(
-            f"Usage tracking job completed: {processed} processed, {errors} errors"
+            f"Usage tracking job completed: {summary['tracked_count']} processed, "
+            f"{summary['at_limit_count']} at limit"
+        )
+        return JobResult(
+            success=True,
+            message=f"Tracked usage for {summary['tracked_count']} organizations",
+            processed_count=summary["tracked_count"],
+            details={
+                "measured_at": summary["measured_at"],
+                "at_limit_count": summary["at_limit_count"],
+                "warning_count": summary["warning_count"],
+                "notifications_queued": summary["notifications_queued"],
+            },
         )
-        return result
 
     except Exception as e:
         logger.error(f"Usage tracking job failed: {e}", exc_info=True)
@@ -119,8 +98,9 @@ def check_trial_expirations_job() -> JobResult:
     Check for expired trials and handle them
 
     Runs daily via pg_cron.
-    Finds all trials that have ended and suspends them if not converted.
-    Can trigger email notifications (if configured).
+    Suspends all unconverted trials that have ended with one UPDATE and
+    queues trial expired / expiring soon notifications in the same
+    transaction.
 
     Returns:
         JobResult with processed count and any errors
@@ -129,57 +109,71 @@ def check_trial_expirations_job() -> JobResult:
     try:
         logger.info("Starting trial expiration check job")
 
-        # Get all trial subscriptions that have ended
-        now = datetime.now(timezone.utc)
-        expired_trials = (
-            db.query(SubscriptionModel)
-            .filter(
-                and_(
-                    SubscriptionModel.status == SubscriptionStatus.TRIAL.value,
-                    SubscriptionModel.trial_ends_at < now,
-                    SubscriptionModel.trial_converted == False,
-                )
-            )
-            .all()
+        summary = HandleTrialExpirationUseCase(db).execute()
+        db.commit()
+
+        logger.info(
+            f"Trial expiration job completed: {summary['expired_count']} expired, "
+            f"{summary['warning_count']} warnings"
+        )
+        return JobResult(
+            success=True,
+            message=f"Handled {summary['expired_count']} expired trials",
+            processed_count=summary["expired_count"],
+            details={
+                "expired_org_ids": summary["expired_org_ids"],
+                "warning_count": summary["warning_count"],
+            },
         )
 
-        processed = 0
-        errors = 0
-        error_details = []
-
-        for subscription in expired_trials:
-            try:
-                use_case = HandleTrialExpirationUseCase(db)
-                use_case.execute(organization_id=subscription.organization_id)
-                processed += 1
-                logger.info(
-                    f"Handled trial expiration for organization {subscription.organization_id}"
-                )
-            except Exception as e:
-                errors += 1
-                error_msg = f"Org {subscription.organization_id}: {str(e)}"
-                error_details.append(error_msg)
-                logger.error(
-                    f"Failed to handle trial expiration for org {subscription.organization_id}: {e}"
-                )
+    except Exception as e:
+        logger.error(f"Trial expiration job failed: {e}", exc_info=True)
+        db.rollback()
+        return JobResult(
+            success=False, message=f"Job failed: {str(e)}", error_count=1
+        )
+    finally:
+        db.close()
 
-        db.commit()
 
-        result = JobResult(
-            success=errors == 0,
-            message=f"Handled {processed} expired trials ({errors} errors)",
-            processed_count=processed,
-            error_count=errors,
-            details={"errors": error_details} if error_details else {},
-        )
+def snapshot_platform_metrics_job(backfill_days: int = 365) -> JobResult:
+    """
+    Write the daily platform metrics snapshot
+
+    Runs daily via pg_cron.
+    Recomputes every day from the last stored snapshot through today in one
+    upsert, so missed runs are filled in. On the first run the series is
+    backfilled for backfill_days.
+
+    Args:
+        backfill_days: Days to backfill when no snapshot exists yet
+
+    Returns:
+        JobResult with the number of days written
+    """
+    db = SessionLocal()
+    try:
+        logger.info("Starting platform metrics snapshot job")
+
+        repository = PlatformMetricsRepository(db)
+        today = datetime.now(timezone.utc).date()
+        start_date = repository.get_latest_snapshot_date() or (today - timedelta(days=backfill_days))
+
+        written = repository.refresh_daily(start_date, today)
+        db.commit()
 
         logger.info(
-            f"Trial expiration job completed: {processed} processed, {errors} errors"
+            f"Platform metrics snapshot job completed: {written} days written ({start_date} to {today})"
+        )
+        return JobResult(
+            success=True,
+            message=f"Wrote platform metrics for {written} days",
+            processed_count=written,
+            details={"start_date": start_date.isoformat(), "end_date": today.isoformat()},
         )
-        return result
 
     except Exception as e:
-        logger.error(f"Trial expiration job failed: {e}", exc_info=True)
+        logger.error(f"Platform metrics snapshot job failed: {e}", exc_info=True)
         db.rollback()
         return JobResult(
             success=False, message=f"Job failed: {str(e)}", error_count=1
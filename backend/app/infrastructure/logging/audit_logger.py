@@ -2,15 +2,18 @@
 Audit Logger for Platform Admin Actions
 
 Provides structured logging of all admin actions to database for
-security auditing, compliance, and accountability.
+security auditing, compliance, and accountability. Actions are handed to
+an audit sink (see audit_sink) and written in batches, off the request's
+transaction.
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc
 import logging
 
 from app.models.admin_audit_log import AdminAuditLogModel
+from app.infrastructure.logging.audit_sink import AuditEvent, get_audit_sink
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +32,16 @@ class AuditLogger:
     Audit logs are immutable and retained for compliance.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, sink=None):
         """
         Initialize audit logger
 
         Args:
             db: SQLAlchemy database session
+            sink: Audit sink (default: process-wide sink from settings)
         """
         self.db = db
+        self.sink = sink or get_audit_sink()
 
     def log_action(
         self,
@@ -44,20 +49,28 @@ class AuditLogger:
         action: str,
         target_type: str,
         target_id: Optional[int] = None,
-        details: Optional[Dict[str, Any]] = None
-    ) -> AdminAuditLogModel:
+        details: Optional[Dict[str, Any]] = None,
+        organization_id: Optional[int] = None
+    ) -> Optional[AuditEvent]:
         """
         Log an admin action to database
 
+        The event is handed to the audit sink; this method never commits
+        the caller's session. With the in-memory sink the entry is written
+        within AUDIT_FLUSH_INTERVAL_SECONDS; with the pgmq sink it is sent
+        to the queue within that interval, for the audit worker to write.
+
         Args:
             admin_user_id: ID of admin user performing action
             action: Action performed (e.g., "suspend_subscription", "extend_trial")
             target_type: Type of resource (e.g., "organization", "subscription", "user")
             target_id: ID of affected resource (optional)
             details: Additional context as JSON (optional)
+            organization_id: Organization concerned (hash chain key); defaults to
+                target_id for organization targets
 
         Returns:
-            AdminAuditLogModel: Created audit log entry
+            AuditEvent: Queued audit event (None if it could not be queued)
 
         Example:
             ```python
@@ -75,29 +88,29 @@ class AuditLogger:
             ```
         """
         try:
-            audit_log = AdminAuditLogModel(
+            if organization_id is None and target_type == "organization":
+                organization_id = target_id
+
+            event = AuditEvent(
                 admin_user_id=admin_user_id,
                 action=action,
                 target_type=target_type,
                 target_id=target_id,
+                organization_id=organization_id,
                 details=details or {}
             )
-
-            self.db.add(audit_log)
-            self.db.commit()
-            self.db.refresh(audit_log)
+            self.sink.emit(event, self.db)
 
             logger.info(
-                f"Audit log created: action={action}, "
+                f"Audit log queued: action={action}, "
                 f"admin_user_id={admin_user_id}, "
                 f"target={target_type}:{target_id}"
             )
 
-            return audit_log
+            return event
 
         except Exception as e:
-            logger.error(f"Failed to create audit log: {e}", exc_info=True)
-            self.db.rollback()
+            logger.error(f"Failed to queue audit log: {e}", exc_info=True)
             # Don't raise - audit logging should never break the operation
             return None
 
@@ -140,6 +153,7 @@ class AuditLogger:
             ```
         """
         try:
+            self.sink.flush()
             query = self.db.query(AdminAuditLogModel)
 
             # Apply filters
@@ -158,7 +172,7 @@ class AuditLogger:
             # Get total count before pagination
             total_count = query.count()
 
-            # Apply pagination and ordering
+            # Apply pagination and ordering (served by the (filter, created_at) indexes)
             logs = query.order_by(desc(AdminAuditLogModel.created_at)) \
                        .limit(limit) \
                        .offset(offset) \
@@ -226,6 +240,7 @@ class AuditLogger:
             List of audit log entries in reverse chronological order
         """
         try:
+            self.sink.flush()
             logs = self.db.query(AdminAuditLogModel) \
                          .filter(and_(
                              AdminAuditLogModel.target_type == target_type,
@@ -264,7 +279,6 @@ class AuditLogger:
             Count of matching actions
         """
         try:
-            from datetime import timedelta
             cutoff_date = datetime.utcnow() - timedelta(days=days)
 
             query = self.db.query(AdminAuditLogModel) \
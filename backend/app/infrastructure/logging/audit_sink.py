@@ -0,0 +1,444 @@
+"""
+Admin audit sinks - buffered, batched writes of admin audit events.
+
+AuditLogger hands events to a sink instead of committing one row per
+action on the request path. Sinks write events with one multi-row INSERT
+per batch, in their own transaction, optionally extending a hash chain per
+organization: entry_hash = sha256(prev_hash + event), so any edited,
+inserted or deleted entry breaks verification.
+
+Backends:
+- InMemoryAuditSink: per-process buffer flushed by a background thread
+  every AUDIT_FLUSH_INTERVAL_SECONDS or AUDIT_BATCH_SIZE events
+- PgmqAuditSink: buffered the same way; each flush sends the batch to the
+  admin_audit_events queue with one pgmq.send_batch, and the audit log
+  worker writes it
+"""
+import atexit
+import hashlib
+import json
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.models.admin_audit_log import AdminAuditChainHead, AdminAuditLogModel
+
+logger = logging.getLogger(__name__)
+
+AUDIT_QUEUE = "admin_audit_events"
+GENESIS_HASH = "0" * 64
+PLATFORM_CHAIN_KEY = 0
+
+
+def _utc_iso(value: datetime) -> str:
+    """ISO timestamp in UTC (naive values are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+@dataclass
+class AuditEvent:
+    """Admin action awaiting persistence."""
+
+    admin_user_id: int
+    action: str
+    target_type: str
+    target_id: Optional[int] = None
+    organization_id: Optional[int] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def __post_init__(self):
+        # Store details exactly as they will read back from the JSON column
+        self.details = json.loads(json.dumps(self.details or {}, default=str))
+
+    @property
+    def chain_key(self) -> int:
+        return self.organization_id if self.organization_id is not None else PLATFORM_CHAIN_KEY
+
+    def to_message(self) -> Dict[str, Any]:
+        """Serialize for a queue message."""
+        return {
+            "admin_user_id": self.admin_user_id,
+            "action": self.action,
+            "target_type": self.target_type,
+            "target_id": self.target_id,
+            "organization_id": self.organization_id,
+            "details": self.details,
+            "created_at": _utc_iso(self.created_at),
+        }
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "AuditEvent":
+        """Deserialize a queue message."""
+        values = dict(message)
+        values["created_at"] = datetime.fromisoformat(values["created_at"])
+        return cls(**values)
+
+
+def audit_entry_hash(prev_hash: str, entry) -> str:
+    """
+    Hash of an audit entry chained to its predecessor.
+
+    Args:
+        prev_hash: entry_hash of the previous entry in the chain
+        entry: AuditEvent or AdminAuditLogModel
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {
+            "admin_user_id": entry.admin_user_id,
+            "action": entry.action,
+            "target_type": entry.target_type,
+            "target_id": entry.target_id,
+            "organization_id": entry.organization_id,
+            "details": entry.details or {},
+            "created_at": _utc_iso(entry.created_at),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256((prev_hash + payload).encode()).hexdigest()
+
+
+def write_audit_batch(db: Session, events: List[AuditEvent], hash_chain: bool = True) -> int:
+    """
+    Insert audit events with one multi-row INSERT and commit.
+
+    With hash_chain, the chain heads of the batch are locked (in key order)
+    and each event is linked to the previous entry of its organization.
+
+    Args:
+        db: Session owned by the sink (committed here)
+        events: Events in emission order
+        hash_chain: Extend the per-organization hash chains
+
+    Returns:
+        Number of events written
+    """
+    if not events:
+        return 0
+
+    rows = [
+        {
+            "admin_user_id": event.admin_user_id,
+            "action": event.action,
+            "target_type": event.target_type,
+            "target_id": event.target_id,
+            "organization_id": event.organization_id,
+            "details": event.details,
+            "created_at": event.created_at,
+        }
+        for event in events
+    ]
+
+    if hash_chain:
+        chain_keys = sorted({event.chain_key for event in events})
+        heads = {
+            head.chain_key: head
+            for head in db.query(AdminAuditChainHead)
+            .filter(AdminAuditChainHead.chain_key.in_(chain_keys))
+            .order_by(AdminAuditChainHead.chain_key)
+            .with_for_update()
+        }
+        for chain_key in chain_keys:
+            if chain_key not in heads:
+                heads[chain_key] = AdminAuditChainHead(chain_key=chain_key, last_hash=GENESIS_HASH)
+                db.add(heads[chain_key])
+
+        for row, event in zip(rows, events):
+            head = heads[event.chain_key]
+            row["prev_hash"] = head.last_hash
+            row["entry_hash"] = audit_entry_hash(head.last_hash, event)
+            head.last_hash = row["entry_hash"]
+
+    db.execute(insert(AdminAuditLogModel), rows)
+    db.commit()
+    return len(rows)
+
+
+def verify_audit_chain(db: Session, organization_id: Optional[int] = None) -> Optional[int]:
+    """
+    Verify the hash chain of one organization (None = platform-wide chain).
+
+    Verification starts at the oldest retained entry, so dropping expired
+    partitions does not break it.
+
+    Args:
+        db: Database session
+        organization_id: Chain to verify
+
+    Returns:
+        ID of the first entry that does not match its chain, or None if intact
+    """
+    query = db.query(AdminAuditLogModel).filter(AdminAuditLogModel.entry_hash.isnot(None))
+    if organization_id is None:
+        query = query.filter(AdminAuditLogModel.organization_id.is_(None))
+    else:
+        query = query.filter(AdminAuditLogModel.organization_id == organization_id)
+
+    previous_hash = None
+    for entry in query.order_by(AdminAuditLogModel.id).yield_per(1000):
+        if previous_hash is not None and entry.prev_hash != previous_hash:
+            return entry.id
+        if audit_entry_hash(entry.prev_hash, entry) != entry.entry_hash:
+            return entry.id
+        previous_hash = entry.entry_hash
+    return None
+
+
+class InMemoryAuditSink:
+    """
+    Per-process audit buffer flushed in batches by a background thread.
+
+    Failed batches stay buffered and are retried on the next flush. If the
+    buffer exceeds max_buffered events (database unavailable), the oldest
+    events are dropped and an error is logged.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        hash_chain: bool = True,
+        max_buffered: int = 100_000
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            session_factory: Creates the sessions batches are written with
+            batch_size: Events per INSERT; a full batch wakes the flusher early
+            flush_interval: Seconds between background flushes
+            hash_chain: Extend the per-organization hash chains
+            max_buffered: Buffered events kept while writes fail
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.hash_chain = hash_chain
+        self.max_buffered = max_buffered
+        self.dropped = 0
+        self._buffer: Deque[AuditEvent] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def emit(self, event: AuditEvent, db: Optional[Session] = None) -> None:
+        """
+        Buffer an event (the caller's session is not used).
+
+        Args:
+            event: Audit event
+            db: Ignored; events are written in the sink's own transaction
+        """
+        with self._lock:
+            self._buffer.append(event)
+            overflow = len(self._buffer) - self.max_buffered
+            for _ in range(max(overflow, 0)):
+                self._buffer.popleft()
+                self.dropped += 1
+            buffered = len(self._buffer)
+
+        if overflow > 0:
+            logger.error(f"Audit buffer full, dropped {overflow} oldest events ({self.dropped} total)")
+        if buffered >= self.batch_size:
+            self._wakeup.set()
+        self.start()
+
+    def flush(self) -> int:
+        """
+        Write all buffered events in batches of batch_size.
+
+        Returns:
+            Number of events written
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                if not batch:
+                    return written
+
+                db = self.session_factory()
+                try:
+                    written += self._write_batch(db, batch)
+                except Exception as e:
+                    db.rollback()
+                    with self._lock:
+                        self._buffer.extendleft(reversed(batch))
+                    logger.error(f"Failed to write {len(batch)} audit events, will retry: {e}", exc_info=True)
+                    return written
+                finally:
+                    db.close()
+
+    def _write_batch(self, db: Session, batch: List[AuditEvent]) -> int:
+        """Persist one batch on db and commit."""
+        return write_audit_batch(db, batch, self.hash_chain)
+
+    def pending(self) -> int:
+        """Number of buffered events."""
+        with self._lock:
+            return len(self._buffer)
+
+    def start(self) -> None:
+        """Start the background flush thread (idempotent)."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Stop the flush thread and write remaining events."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval * 5)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+class PgmqAuditSink(InMemoryAuditSink):
+    """
+    Per-process audit buffer flushed to PGMQ by a background thread.
+
+    Emitting costs no database work on the request path (callers emit after
+    committing the audited change). Each flush sends up to batch_size events
+    with one pgmq.send_batch on the sink's own session; run_audit_log_worker
+    writes them to the audit log, extending the hash chains there.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffered: int = 100_000
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            session_factory: Creates the sessions batches are queued with
+            batch_size: Events per pgmq.send_batch; a full batch wakes the flusher early
+            flush_interval: Seconds between background flushes
+            max_buffered: Buffered events kept while sends fail
+        """
+        super().__init__(
+            session_factory,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            hash_chain=False,
+            max_buffered=max_buffered
+        )
+
+    def _write_batch(self, db: Session, batch: List[AuditEvent]) -> int:
+        """Queue one batch with a single pgmq.send_batch and commit."""
+        db.execute(
+            text(
+                "SELECT pgmq.send_batch(:queue, "
+                "ARRAY(SELECT jsonb_array_elements(CAST(:messages AS jsonb))))"
+            ),
+            {"queue": AUDIT_QUEUE, "messages": json.dumps([event.to_message() for event in batch])}
+        )
+        db.commit()
+        return len(batch)
+
+
+def drain_audit_queue(
+    pgmq_client,
+    db: Session,
+    batch_size: int = 500,
+    vt: int = 30,
+    hash_chain: bool = True
+) -> int:
+    """
+    Write one batch of queued audit events and archive their messages.
+
+    If the write fails the messages are not archived and are redelivered
+    after the visibility timeout.
+
+    Args:
+        pgmq_client: PGMQClient instance
+        db: Session used for the write (committed)
+        batch_size: Maximum messages per batch
+        vt: Visibility timeout in seconds
+        hash_chain: Extend the per-organization hash chains
+
+    Returns:
+        Number of events written
+    """
+    messages = pgmq_client.dequeue_batch(AUDIT_QUEUE, batch_size, vt=vt)
+    if not messages:
+        return 0
+
+    written = write_audit_batch(
+        db, [AuditEvent.from_message(message.message) for message in messages], hash_chain
+    )
+    pgmq_client.archive_batch(AUDIT_QUEUE, [message.msg_id for message in messages])
+    return written
+
+
+def create_audit_sink(settings):
+    """
+    Create the sink selected by settings.AUDIT_SINK_BACKEND.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        InMemoryAuditSink or PgmqAuditSink
+    """
+    from app.core.database import SessionLocal
+
+    if settings.AUDIT_SINK_BACKEND == "pgmq":
+        return PgmqAuditSink(
+            SessionLocal,
+            batch_size=settings.AUDIT_BATCH_SIZE,
+            flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        )
+
+    return InMemoryAuditSink(
+        SessionLocal,
+        batch_size=settings.AUDIT_BATCH_SIZE,
+        flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        hash_chain=settings.AUDIT_HASH_CHAIN_ENABLED
+    )
+
+
+_audit_sink = None
+_audit_sink_lock = threading.Lock()
+
+
+def get_audit_sink():
+    """Process-wide audit sink (created from settings on first use)."""
+    global _audit_sink
+    if _audit_sink is None:
+        with _audit_sink_lock:
+            if _audit_sink is None:
+                from app.core.config import settings
+
+                _audit_sink = create_audit_sink(settings)
+    return _audit_sink
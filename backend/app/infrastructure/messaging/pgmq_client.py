@@ -13,7 +13,7 @@ Features:
 """
 
 import logging
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, List
 from dataclasses import dataclass
 from tembo_pgmq_python import PGMQueue, Message
 
@@ -129,6 +129,94 @@ class PGMQClient:
         logger.debug(f"Dequeued message {message.msg_id} from queue '{queue_name}'")
         return message
 
+    def enqueue_batch(self, queue_name: str, messages: List[Dict[str, Any]]) -> List[int]:
+        """
+        Add several messages to queue in one round trip
+
+        Args:
+            queue_name: Name of the queue
+            messages: Message payloads as dictionaries
+
+        Returns:
+            Message IDs assigned by PGMQ, in input order
+        """
+        if not messages:
+            return []
+
+        for message in messages:
+            if "retry_count" not in message:
+                message["retry_count"] = 0
+
+        msg_ids = self.queue.send_batch(queue_name, messages)
+
+        logger.debug(f"Enqueued {len(msg_ids)} messages to queue '{queue_name}'")
+        return msg_ids
+
+    def dequeue_batch(
+        self,
+        queue_name: str,
+        batch_size: int,
+        vt: int = 30
+    ) -> List[PGMQMessage]:
+        """
+        Read up to batch_size messages from queue with visibility timeout
+
+        Args:
+            queue_name: Name of the queue
+            batch_size: Maximum number of messages to read
+            vt: Visibility timeout in seconds (default 30)
+
+        Returns:
+            List of PGMQMessage (empty if queue is empty)
+        """
+        raw_messages = self.queue.read_batch(queue_name, vt=vt, batch_size=batch_size) or []
+
+        messages = [
+            PGMQMessage(
+                msg_id=raw_message.msg_id,
+                message=raw_message.message,
+                vt=vt,
+                read_count=getattr(raw_message, 'read_count', 0)
+            )
+            for raw_message in raw_messages
+        ]
+
+        logger.debug(f"Dequeued {len(messages)} messages from queue '{queue_name}'")
+        return messages
+
+    def archive_batch(self, queue_name: str, msg_ids: List[int]) -> List[int]:
+        """
+        Archive several messages (mark as completed) in one round trip
+
+        Args:
+            queue_name: Name of the queue
+            msg_ids: Message IDs to archive
+
+        Returns:
+            IDs of archived messages
+        """
+        if not msg_ids:
+            return []
+
+        result = self.queue.archive_batch(queue_name, msg_ids)
+        logger.debug(f"Archived {len(msg_ids)} messages from queue '{queue_name}'")
+        return result
+
+    def set_visibility_timeout(self, queue_name: str, msg_id: int, vt: int) -> None:
+        """
+        Make a read message visible again after vt seconds
+
+        Used to put back a message that cannot be handled yet without
+        waiting for the visibility timeout it was read with.
+
+        Args:
+            queue_name: Name of the queue
+            msg_id: Message ID
+            vt: Seconds until the message is visible again
+        """
+        self.queue.set_vt(queue_name, msg_id, vt)
+        logger.debug(f"Message {msg_id} in queue '{queue_name}' visible again in {vt}s")
+
     def archive(self, queue_name: str, msg_id: int) -> bool:
         """
         Archive message (mark as completed)
@@ -202,6 +202,170 @@ def run_user_task_worker():
         raise
 
 
+def run_stripe_webhook_worker(batch_size: int = 20):
+    """
+    Worker process applying Stripe webhook events from the stripe_webhooks queue
+
+    Events deferred behind an earlier event of the same customer, or failed,
+    stay in the queue and are redelivered after the visibility timeout.
+
+    Args:
+        batch_size: Messages read per poll
+    """
+    import time
+    from app.core.database import SessionLocal
+    from app.application.services.stripe_webhook_service import StripeWebhookService
+
+    client = get_pgmq_client()
+    logger.info("Starting Stripe webhook worker")
+
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                service = StripeWebhookService(db, max_attempts=client.max_retries)
+                outcomes = service.process_queue_batch(
+                    client, batch_size=batch_size, vt=settings.PGMQ_VISIBILITY_TIMEOUT
+                )
+            finally:
+                db.close()
+
+            if outcomes:
+                logger.info(f"Stripe webhook batch: {outcomes}")
+            else:
+                time.sleep(1)
+
+    except KeyboardInterrupt:
+        logger.info("Worker stopped by user")
+    except Exception as e:
+        logger.error(f"Worker error: {e}", exc_info=True)
+        raise
+
+
+def run_recall_report_worker(batch_size: int = 1):
+    """
+    Worker process generating recall reports from the recall_reports queue
+
+    Progress is committed on the job row while a report runs, so clients can
+    poll GET /api/v1/traceability/recall-reports/jobs/{job_id}.
+
+    Args:
+        batch_size: Jobs read per poll
+    """
+    import time
+    from app.core.database import SessionLocal
+    from app.application.services.traceability_service import RecallReportService
+
+    client = get_pgmq_client()
+    logger.info("Starting recall report worker")
+
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                outcomes = RecallReportService(db).process_queue_batch(
+                    client, batch_size=batch_size, vt=settings.PGMQ_VISIBILITY_TIMEOUT * 10
+                )
+            finally:
+                db.close()
+
+            if outcomes:
+                logger.info(f"Recall report batch: {outcomes}")
+            else:
+                time.sleep(1)
+
+    except KeyboardInterrupt:
+        logger.info("Worker stopped by user")
+    except Exception as e:
+        logger.error(f"Worker error: {e}", exc_info=True)
+        raise
+
+
+def run_report_execution_worker(batch_size: int = 1):
+    """
+    Worker process running report executions from the report_executions queue
+
+    Exports stream from a server-side cursor into MinIO, so a worker's memory
+    does not grow with the report size. Progress is committed on the
+    execution row; GET /api/v1/executions/{execution_id} polls it.
+
+    Args:
+        batch_size: Executions read per poll
+    """
+    import time
+    from app.core.database import SessionLocal
+    from app.application.services.report_execution_runner import ReportExecutionRunner
+
+    client = get_pgmq_client()
+    logger.info("Starting report execution worker")
+
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                outcomes = ReportExecutionRunner(db, stream_session_factory=SessionLocal).process_queue_batch(
+                    client, batch_size=batch_size, vt=settings.PGMQ_VISIBILITY_TIMEOUT * 60
+                )
+            finally:
+                db.close()
+
+            if outcomes:
+                logger.info(f"Report execution batch: {outcomes}")
+            else:
+                time.sleep(1)
+
+    except KeyboardInterrupt:
+        logger.info("Worker stopped by user")
+    except Exception as e:
+        logger.error(f"Worker error: {e}", exc_info=True)
+        raise
+
+
+def run_audit_log_worker(batch_size: int = None):
+    """
+    Worker process writing admin audit events from the admin_audit_events queue
+
+    Used when AUDIT_SINK_BACKEND is "pgmq". Each batch is one multi-row
+    INSERT; events of a failed batch are redelivered after the visibility
+    timeout.
+
+    Args:
+        batch_size: Messages read per poll (default: AUDIT_BATCH_SIZE)
+    """
+    import time
+    from app.core.database import SessionLocal
+    from app.infrastructure.logging.audit_sink import drain_audit_queue
+
+    client = get_pgmq_client()
+    batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+    logger.info("Starting audit log worker")
+
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                written = drain_audit_queue(
+                    client, db, batch_size=batch_size, vt=settings.PGMQ_VISIBILITY_TIMEOUT,
+                    hash_chain=settings.AUDIT_HASH_CHAIN_ENABLED
+                )
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Audit batch failed, will be redelivered: {e}", exc_info=True)
+                written = 0
+            finally:
+                db.close()
+
+            if written:
+                logger.info(f"Audit log batch: {written} events written")
+            else:
+                time.sleep(settings.AUDIT_FLUSH_INTERVAL_SECONDS)
+
+    except KeyboardInterrupt:
+        logger.info("Worker stopped by user")
+    except Exception as e:
+        logger.error(f"Worker error: {e}", exc_info=True)
+        raise
+
 if __name__ == "__main__":
     # Run worker when executed directly
     run_user_task_worker()
@@ -9,7 +9,6 @@ Supports multiple email providers:
 Configuration via environment variables.
 """
 import logging
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Optional, Dict, Any
@@ -17,6 +16,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import os
 
+from app.infrastructure.email.smtp_pool import SMTPConnectionPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +43,7 @@ class EmailService:
     - SMTP (Gmail, SendGrid, Mailgun, custom)
     - Development mode (logs to console)
     - Template rendering
+    - Persistent pooled SMTP connections (one TLS handshake/login per connection)
     """
 
     def __init__(
@@ -54,6 +56,7 @@ class EmailService:
         from_name: Optional[str] = None,
         use_tls: bool = True,
         development_mode: bool = False,
+        pool: Optional[SMTPConnectionPool] = None,
     ):
         """
         Initialize email service
@@ -67,6 +70,7 @@ class EmailService:
             from_name: Default 'from' name
             use_tls: Use TLS encryption (default: True)
             development_mode: Log emails instead of sending (default: False)
+            pool: SMTP connection pool (created from the SMTP settings if omitted)
         """
         self.smtp_host = smtp_host or os.getenv("SMTP_HOST")
         self.smtp_port = smtp_port or int(os.getenv("SMTP_PORT", "587"))
@@ -83,6 +87,15 @@ class EmailService:
             logger.warning(
                 "Email service in DEVELOPMENT MODE - emails will be logged, not sent"
             )
+            self.pool = pool
+        else:
+            self.pool = pool or SMTPConnectionPool(
+                host=self.smtp_host,
+                port=self.smtp_port,
+                user=self.smtp_username or "",
+                password=self.smtp_password or "",
+                use_tls=self.use_tls,
+            )
 
     def send(self, message: EmailMessage) -> bool:
         """
@@ -128,17 +141,9 @@ class EmailService:
             part2 = MIMEText(message.html_body, "html")
             msg.attach(part2)
 
-            # Connect to SMTP server and send
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-
-                if self.smtp_username and self.smtp_password:
-                    server.login(self.smtp_username, self.smtp_password)
-
-                # Send to all recipients (to, cc, bcc)
-                recipients = message.to + (message.cc or []) + (message.bcc or [])
-                server.sendmail(self.from_address, recipients, msg.as_string())
+            # Send to all recipients (to, cc, bcc) over a pooled connection
+            recipients = message.to + (message.cc or []) + (message.bcc or [])
+            self.pool.send_message(msg, from_addr=self.from_address, to_addrs=recipients)
 
             logger.info(f"Email sent successfully to {', '.join(message.to)}")
             return True
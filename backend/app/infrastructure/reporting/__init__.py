@@ -0,0 +1,4 @@
+"""Report export infrastructure (streamed CSV, XLSX and PDF writers)."""
+from .export_writers import CONTENT_TYPES, ReportExportWriter, create_export_writer
+
+__all__ = ["CONTENT_TYPES", "ReportExportWriter", "create_export_writer"]
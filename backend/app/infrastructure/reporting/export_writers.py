@@ -0,0 +1,309 @@
+"""
+Report export writers - CSV, XLSX and PDF written row chunk by row chunk.
+
+Every writer appends to a binary file object as rows arrive and keeps only
+per-file bookkeeping in memory (sheet names, PDF object offsets), so memory
+stays flat however many rows a report has. The formats are produced
+directly, without spreadsheet/PDF libraries that build documents in memory:
+
+- CSV: UTF-8, header row first
+- XLSX: minimal SpreadsheetML package; rows are streamed into the sheet XML
+  inside the zip, starting a new sheet every XLSX_MAX_ROWS_PER_SHEET rows
+- PDF: landscape A4 pages of fixed-width Courier text, one content stream
+  per page
+"""
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, BinaryIO, List, Sequence
+from xml.sax.saxutils import escape
+
+
+CONTENT_TYPES = {
+    "CSV": "text/csv",
+    "XLSX": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "PDF": "application/pdf",
+}
+
+# Excel's limit is 1,048,576 rows per sheet, header row included
+XLSX_MAX_ROWS_PER_SHEET = 1_000_000
+
+# XML 1.0 does not allow most control characters
+_XML_INVALID_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _text(value: Any) -> str:
+    """Format a result value as text."""
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class ReportExportWriter:
+    """Base class: write_rows() any number of times, then close()."""
+
+    def __init__(self, fileobj: BinaryIO, columns: List[str]):
+        self.fileobj = fileobj
+        self.columns = list(columns)
+        self.rows_written = 0
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Append a chunk of rows (values in column order)."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finish the file; the file object itself is left open."""
+        raise NotImplementedError
+
+
+class CsvExportWriter(ReportExportWriter):
+    """CSV export"""
+
+    def __init__(self, fileobj: BinaryIO, columns: List[str]):
+        super().__init__(fileobj, columns)
+        self._stream = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._stream)
+        self._writer.writerow(self.columns)
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        self._writer.writerows([_text(value) for value in row] for row in rows)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        self._stream.flush()
+        self._stream.detach()
+
+
+class XlsxExportWriter(ReportExportWriter):
+    """XLSX export with inline strings (no shared string table to hold in memory)"""
+
+    def __init__(self, fileobj: BinaryIO, columns: List[str]):
+        super().__init__(fileobj, columns)
+        self._zip = zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheet = None
+        self._sheet_count = 0
+        self._sheet_rows = 0
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        for row in rows:
+            if self._sheet is None or self._sheet_rows >= XLSX_MAX_ROWS_PER_SHEET:
+                self._start_sheet()
+            self._write_row(row)
+            self.rows_written += 1
+
+    def close(self) -> None:
+        if self._sheet is None:
+            self._start_sheet()
+        self._end_sheet()
+
+        sheets = range(1, self._sheet_count + 1)
+        self._zip.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for n in sheets
+            )
+            + '</Types>'
+        ))
+        self._zip.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ))
+        self._zip.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(f'<sheet name="Report {n}" sheetId="{n}" r:id="rId{n}"/>' for n in sheets)
+            + '</sheets></workbook>'
+        ))
+        self._zip.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{n}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{n}.xml"/>'
+                for n in sheets
+            )
+            + '</Relationships>'
+        ))
+        self._zip.close()
+
+    def _start_sheet(self) -> None:
+        if self._sheet is not None:
+            self._end_sheet()
+        self._sheet_count += 1
+        self._sheet = self._zip.open(f"xl/worksheets/sheet{self._sheet_count}.xml", "w", force_zip64=True)
+        self._sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        )
+        self._sheet_rows = 0
+        self._write_row(self.columns)
+
+    def _end_sheet(self) -> None:
+        self._sheet.write(b"</sheetData></worksheet>")
+        self._sheet.close()
+
+    def _write_row(self, row: Sequence[Any]) -> None:
+        cells = []
+        for value in row:
+            if isinstance(value, bool) or value is None:
+                text = "" if value is None else str(value).upper()
+                cells.append(f'<c t="inlineStr"><is><t>{text}</t></is></c>')
+            elif isinstance(value, (int, float, Decimal)):
+                cells.append(f'<c><v>{value}</v></c>')
+            else:
+                text = escape(_XML_INVALID_CHARS.sub("", _text(value)))
+                cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+        self._sheet.write(f'<row>{"".join(cells)}</row>'.encode("utf-8"))
+        self._sheet_rows += 1
+
+
+class PdfExportWriter(ReportExportWriter):
+    """PDF export as a fixed-width text table, header repeated on every page"""
+
+    PAGE_WIDTH = 842
+    PAGE_HEIGHT = 595
+    MARGIN = 28
+    FONT_SIZE = 7
+    LINE_HEIGHT = 9
+    # Courier advance width is 0.6 em
+    CHARS_PER_LINE = int((PAGE_WIDTH - 2 * MARGIN) / (FONT_SIZE * 0.6))
+    LINES_PER_PAGE = int((PAGE_HEIGHT - 2 * MARGIN) / LINE_HEIGHT) - 2
+
+    # Fixed object numbers; pages and their content streams follow
+    _CATALOG = 1
+    _PAGES = 2
+    _FONT = 3
+
+    def __init__(self, fileobj: BinaryIO, columns: List[str]):
+        super().__init__(fileobj, columns)
+        self._start = fileobj.tell()
+        self._offsets = {}
+        self._page_ids: List[int] = []
+        self._next_id = 4
+        self._lines: List[str] = []
+        self._width = max(6, min(30, self.CHARS_PER_LINE // max(1, len(self.columns)) - 1))
+
+        self._write(b"%PDF-1.4\n")
+        self._object(self._FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>")
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        for row in rows:
+            self._lines.append(self._format(row))
+            if len(self._lines) >= self.LINES_PER_PAGE:
+                self._flush_page()
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        if self._lines or not self._page_ids:
+            self._flush_page()
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._object(
+            self._PAGES,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode("latin-1")
+        )
+        self._object(self._CATALOG, f"<< /Type /Catalog /Pages {self._PAGES} 0 R >>".encode("latin-1"))
+
+        xref_offset = self._position()
+        size = self._next_id
+        self._write(f"xref\n0 {size}\n0000000000 65535 f \n".encode("latin-1"))
+        for object_id in range(1, size):
+            self._write(f"{self._offsets[object_id]:010d} 00000 n \n".encode("latin-1"))
+        self._write(
+            f"trailer\n<< /Size {size} /Root {self._CATALOG} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+            .encode("latin-1")
+        )
+
+    def _format(self, row: Sequence[Any]) -> str:
+        cells = []
+        for value in row:
+            text = _text(value).replace("\n", " ")
+            if len(text) > self._width:
+                text = text[:self._width - 1] + "~"
+            cells.append(text.ljust(self._width))
+        return " ".join(cells)[:self.CHARS_PER_LINE]
+
+    def _flush_page(self) -> None:
+        header = self._format(self.columns)
+        lines = [header, "-" * len(header)] + self._lines
+        self._lines = []
+
+        stream = [
+            f"BT /F1 {self.FONT_SIZE} Tf {self.LINE_HEIGHT} TL "
+            f"{self.MARGIN} {self.PAGE_HEIGHT - self.MARGIN} Td"
+        ]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            stream.append(f"({escaped}) Tj T*")
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1", errors="replace")
+
+        content_id = self._allocate()
+        self._object(content_id, b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+        page_id = self._allocate()
+        self._object(page_id, (
+            f"<< /Type /Page /Parent {self._PAGES} 0 R /MediaBox [0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {self._FONT} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("latin-1"))
+        self._page_ids.append(page_id)
+
+    def _allocate(self) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def _object(self, object_id: int, body: bytes) -> None:
+        self._offsets[object_id] = self._position()
+        self._write(b"%d 0 obj\n" % object_id + body + b"\nendobj\n")
+
+    def _position(self) -> int:
+        return self.fileobj.tell() - self._start
+
+    def _write(self, data: bytes) -> None:
+        self.fileobj.write(data)
+
+
+_WRITERS = {
+    "CSV": CsvExportWriter,
+    "XLSX": XlsxExportWriter,
+    "PDF": PdfExportWriter,
+}
+
+
+def create_export_writer(export_format: str, fileobj: BinaryIO, columns: List[str]) -> ReportExportWriter:
+    """
+    Create the writer for an export format.
+
+    Args:
+        export_format: CSV, XLSX or PDF
+        fileobj: Binary file object to write to
+        columns: Column names (header row)
+
+    Returns:
+        ReportExportWriter
+
+    Raises:
+        ValueError: If the format has no file writer
+    """
+    if export_format not in _WRITERS:
+        raise ValueError(f"Unsupported export format '{export_format}'. Must be one of {list(_WRITERS)}")
+    return _WRITERS[export_format](fileobj, columns)
@@ -1,7 +1,7 @@
 """
 Repository for White-Label Branding (Organization Branding, Email Templates)
 """
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc
 
@@ -213,6 +213,21 @@ class EmailTemplateRepository:
             )
         ).first()
 
+    def get_fingerprint_by_code(self, organization_id: int, template_code: str) -> Optional[Tuple[str, int, Any]]:
+        """Get (template_code, version, updated_at) of an active template without loading its bodies"""
+        row = self.db.query(
+            EmailTemplate.template_code,
+            EmailTemplate.version,
+            EmailTemplate.updated_at
+        ).filter(
+            and_(
+                EmailTemplate.organization_id == organization_id,
+                EmailTemplate.template_code == template_code,
+                EmailTemplate.is_active == True
+            )
+        ).first()
+        return tuple(row) if row is not None else None
+
     def list_by_organization(self, organization_id: int, skip: int = 0, limit: int = 100,
                             template_type: Optional[str] = None,
                             active_only: bool = True) -> List[EmailTemplate]:
@@ -12,14 +12,21 @@ All repositories are RLS-aware with automatic context from database session.
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_, func, and_
+from sqlalchemy import or_, func, and_, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime, date, timedelta
 import logging
 
-from app.models.logistics import Shipment, ShipmentItem, BarcodeLabel, QRCodeScan
+from app.models.logistics import Shipment, ShipmentItem, BarcodeLabel, QRCodeScan, ScanResolution
+from app.infrastructure.cache.barcode_resolution_cache import barcode_resolution_cache
 
 logger = logging.getLogger(__name__)
 
+SCAN_COLUMNS = frozenset(column.key for column in QRCodeScan.__table__.columns) - {"id", "created_at"}
+
+# A scan resent by a device's offline queue matches an existing row on these
+SCAN_DEDUP_COLUMNS = ["organization_id", "device_id", "scan_code", "scan_timestamp"]
+
 
 class ShipmentRepository:
     """
@@ -655,6 +662,7 @@ class BarcodeLabelRepository:
         self._db.add(db_label)
         self._db.commit()
         self._db.refresh(db_label)
+        barcode_resolution_cache.discard(db_label.organization_id, db_label.barcode_value)
         logger.info(f"Created barcode label for {db_label.entity_type}/{db_label.entity_id}")
         return db_label
 
@@ -698,21 +706,45 @@ class BarcodeLabelRepository:
 
         return query.all()
 
-    def get_by_value(self, barcode_value: str) -> Optional[Any]:
+    def get_by_value(self, barcode_value: str, organization_id: Optional[int] = None) -> Optional[Any]:
         """
         Get barcode label by barcode value.
 
         Args:
             barcode_value: Barcode value to search for
+            organization_id: Optional organization filter (RLS applies otherwise)
 
         Returns:
             BarcodeLabel entity or None if not found
         """
-        return (
+        query = self._db.query(BarcodeLabel).filter(BarcodeLabel.barcode_value == barcode_value)
+        if organization_id is not None:
+            query = query.filter(BarcodeLabel.organization_id == organization_id)
+        return query.order_by(BarcodeLabel.id).first()
+
+    def get_by_values(self, organization_id: int, barcode_values: List[str]) -> Dict[str, Any]:
+        """
+        Get barcode labels for many barcode values in one query.
+
+        Args:
+            organization_id: Organization ID
+            barcode_values: Barcode values to search for
+
+        Returns:
+            Dictionary of barcode value to BarcodeLabel entity (oldest label
+            per value, like get_by_value); unknown values are omitted
+        """
+        if not barcode_values:
+            return {}
+
+        labels = (
             self._db.query(BarcodeLabel)
-            .filter(BarcodeLabel.barcode_value == barcode_value)
-            .first()
+            .filter(BarcodeLabel.organization_id == organization_id)
+            .filter(BarcodeLabel.barcode_value.in_(set(barcode_values)))
+            .order_by(BarcodeLabel.id.desc())
+            .all()
         )
+        return {label.barcode_value: label for label in labels}
 
     def mark_generated(
         self,
@@ -817,6 +849,7 @@ class BarcodeLabelRepository:
         db_label.updated_at = datetime.utcnow()
         self._db.commit()
         self._db.refresh(db_label)
+        barcode_resolution_cache.discard(db_label.organization_id, db_label.barcode_value)
         logger.info(f"Updated barcode label: {label_id}")
         return db_label
 
@@ -843,35 +876,53 @@ class QRCodeScanRepository:
         Record a new QR code scan.
 
         Args:
-            scan_data: Dictionary with scan attributes
+            scan_data: Dictionary with scan attributes (QRCodeScan columns)
 
         Returns:
             Created QRCodeScan entity
         """
-        db_scan = QRCodeScan(
-            organization_id=scan_data["organization_id"],
-            plant_id=scan_data["plant_id"],
-            scanned_by=scan_data["scanned_by"],
-            scan_type=scan_data["scan_type"],
-            scan_value=scan_data["scan_value"],
-            entity_type=scan_data.get("entity_type"),
-            entity_id=scan_data.get("entity_id"),
-            resolution_status=scan_data.get("resolution_status", "not_found"),
-            operation_type=scan_data.get("operation_type"),
-            location=scan_data.get("location"),
-            device_id=scan_data.get("device_id"),
-            device_type=scan_data.get("device_type"),
-            latitude=scan_data.get("latitude"),
-            longitude=scan_data.get("longitude"),
-            metadata=scan_data.get("metadata"),
-        )
+        db_scan = QRCodeScan(**{
+            column: value for column, value in scan_data.items() if column in SCAN_COLUMNS
+        })
 
         self._db.add(db_scan)
         self._db.commit()
         self._db.refresh(db_scan)
-        logger.info(f"Recorded scan: {db_scan.scan_value} by user {db_scan.scanned_by}")
+        logger.info(f"Recorded scan: {db_scan.scan_code} by user {db_scan.scanned_by_user_id}")
         return db_scan
 
+    def create_batch(self, scans: List[dict]) -> int:
+        """
+        Record many scans with one multi-row INSERT and commit.
+
+        Used for handheld devices syncing their offline queue: a scan that
+        was already recorded (same organization, device, code and timestamp)
+        is skipped, so a device can resend a batch after a lost response.
+
+        Args:
+            scans: Dictionaries with scan attributes (QRCodeScan columns);
+                scan_timestamp is required
+
+        Returns:
+            Number of scans inserted (duplicates excluded)
+        """
+        if not scans:
+            return 0
+
+        rows = [
+            {column: value for column, value in scan.items() if column in SCAN_COLUMNS}
+            for scan in scans
+        ]
+        result = self._db.execute(
+            pg_insert(QRCodeScan)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=SCAN_DEDUP_COLUMNS)
+        )
+        self._db.commit()
+
+        logger.info(f"Recorded {result.rowcount} of {len(rows)} batched scans")
+        return result.rowcount
+
     def get_by_id(self, scan_id: int) -> Optional[Any]:
         """
         Retrieve scan by ID.
@@ -1007,7 +1058,10 @@ class QRCodeScanRepository:
         end_time: datetime,
     ) -> Dict[str, Any]:
         """
-        Get scan analytics for time period.
+        Get scan analytics for time period in one grouped pass.
+
+        All breakdowns come from a single GROUPING SETS query over the
+        period; GROUPING() tells which breakdown each row belongs to.
 
         Args:
             org_id: Organization ID
@@ -1019,67 +1073,61 @@ class QRCodeScanRepository:
             - total_scans: Total number of scans
             - resolved_scans: Number of successfully resolved scans
             - not_found_scans: Number of scans not resolved
+            - scans_by_resolution: Dictionary of scan counts by scan_resolution
             - scans_by_user: Dictionary of scan counts by user_id
-            - scans_by_operation: Dictionary of scan counts by operation_type
+            - scans_by_operation: Dictionary of scan counts by operation_context
             - scans_by_entity_type: Dictionary of scan counts by entity_type
-        """
-        base_query = (
-            self._db.query(QRCodeScan)
-            .filter(QRCodeScan.organization_id == org_id)
-            .filter(QRCodeScan.scanned_at >= start_time)
-            .filter(QRCodeScan.scanned_at <= end_time)
-        )
-
-        # Total scans
-        total_scans = base_query.count()
-
-        # Scans by resolution status
-        resolved_scans = base_query.filter(QRCodeScan.resolution_status == "resolved").count()
-        not_found_scans = base_query.filter(QRCodeScan.resolution_status == "not_found").count()
+            - scans_by_device: Dictionary of scan counts by device_id
+            - scans_by_day: Dictionary of scan counts by ISO date
+        """
+        dimensions = {
+            "scans_by_resolution": QRCodeScan.scan_resolution,
+            "scans_by_user": QRCodeScan.scanned_by_user_id,
+            "scans_by_operation": QRCodeScan.operation_context,
+            "scans_by_entity_type": QRCodeScan.entity_type,
+            "scans_by_device": QRCodeScan.device_id,
+            "scans_by_day": func.date_trunc(literal_column("'day'"), QRCodeScan.scan_timestamp),
+        }
+        expressions = list(dimensions.values())
 
-        # Scans by user
-        scans_by_user = {}
-        user_stats = (
-            base_query.with_entities(
-                QRCodeScan.scanned_by, func.count(QRCodeScan.id).label("count")
-            )
-            .group_by(QRCodeScan.scanned_by)
-            .all()
-        )
-        for user_id, count in user_stats:
-            scans_by_user[user_id] = count
-
-        # Scans by operation type
-        scans_by_operation = {}
-        operation_stats = (
-            base_query.filter(QRCodeScan.operation_type.isnot(None))
-            .with_entities(
-                QRCodeScan.operation_type, func.count(QRCodeScan.id).label("count")
+        rows = (
+            self._db.query(
+                func.grouping(*expressions).label("grouping_id"),
+                *[expression.label(name) for name, expression in dimensions.items()],
+                func.count().label("scan_count"),
             )
-            .group_by(QRCodeScan.operation_type)
-            .all()
-        )
-        for operation, count in operation_stats:
-            scans_by_operation[operation] = count
-
-        # Scans by entity type
-        scans_by_entity_type = {}
-        entity_stats = (
-            base_query.filter(QRCodeScan.entity_type.isnot(None))
-            .with_entities(
-                QRCodeScan.entity_type, func.count(QRCodeScan.id).label("count")
-            )
-            .group_by(QRCodeScan.entity_type)
+            .filter(QRCodeScan.organization_id == org_id)
+            .filter(QRCodeScan.scan_timestamp >= start_time)
+            .filter(QRCodeScan.scan_timestamp <= end_time)
+            .group_by(func.grouping_sets(text("()"), *expressions))
             .all()
         )
-        for entity_type, count in entity_stats:
-            scans_by_entity_type[entity_type] = count
 
-        return {
-            "total_scans": total_scans,
-            "resolved_scans": resolved_scans,
-            "not_found_scans": not_found_scans,
-            "scans_by_user": scans_by_user,
-            "scans_by_operation": scans_by_operation,
-            "scans_by_entity_type": scans_by_entity_type,
+        # GROUPING() sets bit (n - 1 - i) when dimension i is aggregated away:
+        # the total row has all bits set, breakdown i has only its bit clear
+        all_bits = (1 << len(dimensions)) - 1
+        breakdown_by_grouping_id = {
+            all_bits & ~(1 << (len(dimensions) - 1 - index)): name
+            for index, name in enumerate(dimensions)
         }
+
+        analytics: Dict[str, Any] = {"total_scans": 0}
+        analytics.update({name: {} for name in dimensions})
+        for row in rows:
+            if row.grouping_id == all_bits:
+                analytics["total_scans"] = row.scan_count
+                continue
+
+            name = breakdown_by_grouping_id[row.grouping_id]
+            key = getattr(row, name)
+            if key is None:
+                continue
+            if isinstance(key, ScanResolution):
+                key = key.value
+            elif isinstance(key, datetime):
+                key = key.date().isoformat()
+            analytics[name][key] = row.scan_count
+
+        analytics["resolved_scans"] = analytics["scans_by_resolution"].get(ScanResolution.SUCCESS.value, 0)
+        analytics["not_found_scans"] = analytics["scans_by_resolution"].get(ScanResolution.NOT_FOUND.value, 0)
+        return analytics
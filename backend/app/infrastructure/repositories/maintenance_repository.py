@@ -2,10 +2,10 @@
 Repository for Maintenance Management domain.
 Implements data access layer for PM schedules, PM work orders, and downtime events.
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, case, func, literal_column, or_
 from app.models.maintenance import PMSchedule, PMWorkOrder, DowntimeEvent
 from app.domain.entities.maintenance import (
     PMScheduleDomain, PMWorkOrderDomain, DowntimeEventDomain,
@@ -13,6 +13,10 @@ from app.domain.entities.maintenance import (
 )
 
 
+# date_trunc units accepted for reliability trend buckets
+RELIABILITY_BUCKETS = ("hour", "day", "week", "month")
+
+
 class MaintenanceRepository:
     """Repository for maintenance operations"""
 
@@ -301,62 +305,171 @@ class MaintenanceRepository:
         return downtime_event
 
     # MTBF/MTTR Calculations
-    def calculate_mtbf_mttr(
+    def get_downtime_rollup(
         self,
         organization_id: int,
         plant_id: int,
-        machine_id: int,
         start_date: datetime,
-        end_date: datetime
-    ) -> MTBFMTTRMetrics:
+        end_date: datetime,
+        machine_ids: Optional[List[int]] = None,
+        bucket: Optional[str] = None
+    ) -> List[dict]:
         """
-        Calculate MTBF/MTTR metrics for a machine within a date range.
+        Aggregate downtime per (machine, category) in a single grouped query.
 
-        Uses breakdown downtime events for failure counting and repair time.
-        Operating time = total time - all downtime.
+        Each row carries:
+        - event_count: completed events started in the period
+        - downtime_minutes: duration of those completed events
+        - clipped_downtime_minutes: overlap of every event with the period,
+          ongoing events counted up to end_date
+
+        Args:
+            organization_id: Organization ID for RLS
+            plant_id: Plant ID for RLS
+            start_date: Start of period
+            end_date: End of period
+            machine_ids: Optional machine filter (all machines if None)
+            bucket: Optional date_trunc unit (hour, day, week, month); rows are
+                then also grouped by the bucket of the event start
+
+        Returns:
+            List of dicts with machine_id, category, bucket and the aggregates
+
+        Raises:
+            ValueError: If bucket is not supported
         """
-        # Get all breakdown events in the period
-        breakdown_events = self.db.query(DowntimeEvent).filter(
+        if bucket is not None and bucket not in RELIABILITY_BUCKETS:
+            raise ValueError(f"Unsupported bucket '{bucket}', expected one of {RELIABILITY_BUCKETS}")
+
+        completed_in_period = and_(
+            DowntimeEvent.started_at >= start_date,
+            DowntimeEvent.ended_at.isnot(None)
+        )
+        duration_minutes = func.extract('epoch', DowntimeEvent.ended_at - DowntimeEvent.started_at) / 60.0
+        clipped_minutes = func.extract(
+            'epoch',
+            func.least(func.coalesce(DowntimeEvent.ended_at, end_date), end_date)
+            - func.greatest(DowntimeEvent.started_at, start_date)
+        ) / 60.0
+
+        select_columns = [DowntimeEvent.machine_id, DowntimeEvent.category]
+        group_columns = list(select_columns)
+        bucket_column = None
+        if bucket is not None:
+            bucket_column = func.date_trunc(
+                bucket, func.greatest(DowntimeEvent.started_at, start_date)
+            ).label("bucket")
+            select_columns.append(bucket_column)
+            # Group by the output name so the bound parameters are not repeated
+            group_columns.append(literal_column("bucket"))
+
+        query = self.db.query(
+            *select_columns,
+            func.count(case((completed_in_period, 1))).label("event_count"),
+            func.coalesce(func.sum(case((completed_in_period, duration_minutes))), 0.0).label("downtime_minutes"),
+            func.coalesce(func.sum(clipped_minutes), 0.0).label("clipped_downtime_minutes")
+        ).filter(
             and_(
                 DowntimeEvent.organization_id == organization_id,
                 DowntimeEvent.plant_id == plant_id,
-                DowntimeEvent.machine_id == machine_id,
-                DowntimeEvent.category == DowntimeCategory.BREAKDOWN,
-                DowntimeEvent.started_at >= start_date,
                 DowntimeEvent.started_at <= end_date,
-                DowntimeEvent.ended_at.isnot(None)  # Only completed events
+                or_(DowntimeEvent.ended_at.is_(None), DowntimeEvent.ended_at > start_date)
             )
-        ).all()
+        )
 
-        # Calculate total repair time and number of failures
-        number_of_failures = len(breakdown_events)
-        total_repair_time = 0.0
+        if machine_ids is not None:
+            query = query.filter(DowntimeEvent.machine_id.in_(machine_ids))
 
-        for event in breakdown_events:
-            if event.ended_at:
-                duration = (event.ended_at - event.started_at).total_seconds() / 60.0
-                total_repair_time += duration
+        rows = query.group_by(*group_columns).all()
 
-        # Calculate total time in period (minutes)
-        total_time_in_period = (end_date - start_date).total_seconds() / 60.0
+        return [
+            {
+                "machine_id": row.machine_id,
+                "category": row.category,
+                "bucket": row.bucket if bucket_column is not None else None,
+                "event_count": int(row.event_count or 0),
+                "downtime_minutes": float(row.downtime_minutes or 0.0),
+                "clipped_downtime_minutes": max(0.0, float(row.clipped_downtime_minutes or 0.0)),
+            }
+            for row in rows
+        ]
 
-        # Get all downtime (all categories) to calculate operating time
-        all_downtime_events = self.db.query(DowntimeEvent).filter(
+    def get_pm_compliance_counts(
+        self,
+        organization_id: int,
+        plant_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        machine_ids: Optional[List[int]] = None
+    ) -> Dict[int, tuple]:
+        """
+        Count scheduled and completed PM work orders per machine in one query.
+
+        Returns:
+            Dict of machine_id -> (scheduled_count, completed_count)
+        """
+        query = self.db.query(
+            PMWorkOrder.machine_id,
+            func.count(PMWorkOrder.id).label("scheduled"),
+            func.count(case((PMWorkOrder.status == PMStatus.COMPLETED, 1))).label("completed")
+        ).filter(
             and_(
-                DowntimeEvent.organization_id == organization_id,
-                DowntimeEvent.plant_id == plant_id,
-                DowntimeEvent.machine_id == machine_id,
-                DowntimeEvent.started_at >= start_date,
-                DowntimeEvent.started_at <= end_date,
-                DowntimeEvent.ended_at.isnot(None)
+                PMWorkOrder.organization_id == organization_id,
+                PMWorkOrder.plant_id == plant_id,
+                PMWorkOrder.scheduled_date >= start_date,
+                PMWorkOrder.scheduled_date <= end_date
             )
-        ).all()
+        )
 
-        total_downtime = 0.0
-        for event in all_downtime_events:
-            if event.ended_at:
-                duration = (event.ended_at - event.started_at).total_seconds() / 60.0
-                total_downtime += duration
+        if machine_ids is not None:
+            query = query.filter(PMWorkOrder.machine_id.in_(machine_ids))
+
+        rows = query.group_by(PMWorkOrder.machine_id).all()
+        return {row.machine_id: (int(row.scheduled), int(row.completed)) for row in rows}
+
+    @staticmethod
+    def _summarize_rollup(rollup: List[dict]) -> Dict[int, dict]:
+        """Collapse per-category rollup rows into failure/repair/downtime per machine."""
+        summary: Dict[int, dict] = {}
+        for row in rollup:
+            machine = summary.setdefault(row["machine_id"], {
+                "failures": 0,
+                "repair_minutes": 0.0,
+                "downtime_minutes": 0.0,
+                "clipped_downtime_minutes": 0.0,
+            })
+            if row["category"] == DowntimeCategory.BREAKDOWN:
+                machine["failures"] += row["event_count"]
+                machine["repair_minutes"] += row["downtime_minutes"]
+            machine["downtime_minutes"] += row["downtime_minutes"]
+            machine["clipped_downtime_minutes"] += row["clipped_downtime_minutes"]
+        return summary
+
+    def calculate_mtbf_mttr(
+        self,
+        organization_id: int,
+        plant_id: int,
+        machine_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> MTBFMTTRMetrics:
+        """
+        Calculate MTBF/MTTR metrics for a machine within a date range.
+
+        Uses breakdown downtime events for failure counting and repair time.
+        Operating time = total time - all downtime.
+        """
+        rollup = self.get_downtime_rollup(
+            organization_id, plant_id, start_date, end_date, machine_ids=[machine_id]
+        )
+        summary = self._summarize_rollup(rollup).get(machine_id, {})
+
+        number_of_failures = summary.get("failures", 0)
+        total_repair_time = summary.get("repair_minutes", 0.0)
+        total_downtime = summary.get("downtime_minutes", 0.0)
+
+        # Calculate total time in period (minutes)
+        total_time_in_period = (end_date - start_date).total_seconds() / 60.0
 
         # Operating time = total time - downtime
         total_operating_time = max(0.0, total_time_in_period - total_downtime)
@@ -431,49 +544,19 @@ class MaintenanceRepository:
         pm_compliance_sum = 0.0
         machines_with_metrics = 0
 
-        for machine in machines:
-            # Calculate downtime from downtime events (all categories)
-            all_downtime_events = self.db.query(DowntimeEvent).filter(
-                and_(
-                    DowntimeEvent.organization_id == organization_id,
-                    DowntimeEvent.plant_id == plant_id,
-                    DowntimeEvent.machine_id == machine.id,
-                    DowntimeEvent.started_at >= start_date,
-                    DowntimeEvent.started_at <= end_date,
-                    DowntimeEvent.ended_at.isnot(None)
-                )
-            ).all()
-
-            total_downtime_minutes = 0.0
-            for event in all_downtime_events:
-                if event.ended_at:
-                    duration = (event.ended_at - event.started_at).total_seconds() / 60.0
-                    total_downtime_minutes += duration
-
-            total_downtime_hours_machine = total_downtime_minutes / 60.0
-
-            # Calculate breakdown-specific metrics (failures and repair time)
-            breakdown_events = self.db.query(DowntimeEvent).filter(
-                and_(
-                    DowntimeEvent.organization_id == organization_id,
-                    DowntimeEvent.plant_id == plant_id,
-                    DowntimeEvent.machine_id == machine.id,
-                    DowntimeEvent.category == DowntimeCategory.BREAKDOWN,
-                    DowntimeEvent.started_at >= start_date,
-                    DowntimeEvent.started_at <= end_date,
-                    DowntimeEvent.ended_at.isnot(None)
-                )
-            ).all()
-
-            number_of_failures = len(breakdown_events)
-            total_repair_minutes = 0.0
-
-            for event in breakdown_events:
-                if event.ended_at:
-                    duration = (event.ended_at - event.started_at).total_seconds() / 60.0
-                    total_repair_minutes += duration
+        machine_ids = [machine.id for machine in machines]
+        downtime_by_machine = self._summarize_rollup(self.get_downtime_rollup(
+            organization_id, plant_id, start_date, end_date, machine_ids=machine_ids
+        ))
+        pm_counts = self.get_pm_compliance_counts(
+            organization_id, plant_id, start_date, end_date, machine_ids=machine_ids
+        )
 
-            total_repair_hours = total_repair_minutes / 60.0
+        for machine in machines:
+            downtime = downtime_by_machine.get(machine.id, {})
+            total_downtime_hours_machine = downtime.get("downtime_minutes", 0.0) / 60.0
+            number_of_failures = downtime.get("failures", 0)
+            total_repair_hours = downtime.get("repair_minutes", 0.0) / 60.0
 
             # Calculate operating time
             total_operating_hours = max(0.0, total_time_hours - total_downtime_hours_machine)
@@ -493,18 +576,7 @@ class MaintenanceRepository:
                 availability_percent = 0.0
 
             # Calculate PM compliance
-            scheduled_pms = self.db.query(PMWorkOrder).filter(
-                and_(
-                    PMWorkOrder.organization_id == organization_id,
-                    PMWorkOrder.plant_id == plant_id,
-                    PMWorkOrder.machine_id == machine.id,
-                    PMWorkOrder.scheduled_date >= start_date,
-                    PMWorkOrder.scheduled_date <= end_date
-                )
-            ).all()
-
-            scheduled_pm_count = len(scheduled_pms)
-            completed_pm_count = len([pm for pm in scheduled_pms if pm.status == PMStatus.COMPLETED])
+            scheduled_pm_count, completed_pm_count = pm_counts.get(machine.id, (0, 0))
 
             if scheduled_pm_count > 0:
                 pm_compliance_percent = (completed_pm_count / scheduled_pm_count) * 100
@@ -261,6 +261,10 @@ class MaterialRepository:
         org_id: int,
         plant_id: Optional[int] = None,
         limit: int = 20,
+        category_id: Optional[int] = None,
+        procurement_type: Optional[str] = None,
+        mrp_type: Optional[str] = None,
+        is_active: Optional[bool] = None,
     ) -> List[Material]:
         """
         Full-text search for materials using pg_search (BM25) or LIKE fallback.
@@ -268,11 +272,18 @@ class MaterialRepository:
         In production: Uses ParadeDB pg_search with BM25 ranking.
         In tests: Uses LIKE queries as fallback.
 
+        Filters are applied in SQL before the limit, so a filtered search
+        still returns up to limit matches.
+
         Args:
             query: Search query string
             org_id: Organization ID
             plant_id: Optional plant ID filter
             limit: Maximum results to return
+            category_id: Optional material category filter
+            procurement_type: Optional procurement type filter (PURCHASE, MANUFACTURE, BOTH)
+            mrp_type: Optional MRP type filter (MRP, REORDER)
+            is_active: Optional active flag filter
 
         Returns:
             List of Material entities (sorted by relevance if pg_search enabled)
@@ -293,6 +304,14 @@ class MaterialRepository:
 
         if plant_id is not None:
             db_query = db_query.filter(Material.plant_id == plant_id)
+        if category_id is not None:
+            db_query = db_query.filter(Material.material_category_id == category_id)
+        if procurement_type is not None:
+            db_query = db_query.filter(Material.procurement_type == ProcurementType(procurement_type))
+        if mrp_type is not None:
+            db_query = db_query.filter(Material.mrp_type == MRPType(mrp_type))
+        if is_active is not None:
+            db_query = db_query.filter(Material.is_active == is_active)
 
         if self._use_pg_search:
             # Production: Use pg_search BM25 (requires ParadeDB extension)
@@ -0,0 +1,246 @@
+"""
+PlatformMetricsRepository - Platform-wide KPIs and the daily metrics series.
+
+- Live KPIs: one statement, one scan per table, FILTER aggregates
+- Daily series: platform_metrics_daily, filled by an idempotent upsert over a
+  date range (generate_series + LATERAL aggregates)
+- Reads: stored rows by range; days not yet snapshotted are computed live
+"""
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import logging
+
+from app.config.pricing import PRICING_TIERS
+
+
+logger = logging.getLogger(__name__)
+
+
+SERIES_COLUMNS = (
+    "metric_date",
+    "mrr_cents",
+    "active_subscriptions",
+    "trial_subscriptions",
+    "total_organizations",
+    "signups",
+    "new_subscriptions",
+    "trial_conversions",
+    "churned_subscriptions",
+)
+
+# Monthly price per (tier, billing cycle); subscriptions without a billing
+# cycle are priced monthly
+_PRICED_SUBSCRIPTIONS = (
+    "subscriptions s LEFT JOIN prices pr "
+    "ON pr.tier = s.tier AND pr.billing_cycle = COALESCE(s.billing_cycle, 'monthly')"
+)
+
+_KPI_SQL = """
+    {prices},
+    latest_usage AS (
+        SELECT DISTINCT ON (organization_id) storage_used_gb
+        FROM subscription_usage
+        ORDER BY organization_id, measured_at DESC
+    )
+    SELECT
+        o.total_organizations,
+        o.active_organizations,
+        s.active_subscriptions,
+        s.trial_subscriptions,
+        s.cancelled_subscriptions,
+        s.mrr_cents,
+        u.total_users,
+        p.total_plants,
+        st.storage_used_gb
+    FROM (
+        SELECT
+            count(*) AS total_organizations,
+            count(*) FILTER (WHERE is_active) AS active_organizations
+        FROM organizations
+    ) o
+    CROSS JOIN (
+        SELECT
+            count(*) FILTER (WHERE s.status = 'active') AS active_subscriptions,
+            count(*) FILTER (WHERE s.status = 'trial') AS trial_subscriptions,
+            count(*) FILTER (WHERE s.status = 'cancelled') AS cancelled_subscriptions,
+            COALESCE(sum(pr.monthly_cents) FILTER (WHERE s.status = 'active'), 0) AS mrr_cents
+        FROM {priced}
+    ) s
+    CROSS JOIN (SELECT count(*) AS total_users FROM users) u
+    CROSS JOIN (SELECT count(*) AS total_plants FROM plants) p
+    CROSS JOIN (SELECT COALESCE(sum(storage_used_gb), 0) AS storage_used_gb FROM latest_usage) st
+"""
+
+# Day d covers [d, d + 1). State columns are "as of end of day"; for past
+# days they are derived from the current status, so rows written by the
+# daily job are more accurate than a backfill.
+_DAILY_CTES = """
+    {prices},
+    days AS (
+        SELECT d::date AS metric_date
+        FROM generate_series(CAST(:start_date AS date), CAST(:end_date AS date), interval '1 day') AS d
+    )
+"""
+
+_DAILY_SELECT = """
+    SELECT
+        days.metric_date,
+        subs.mrr_cents,
+        subs.active_subscriptions,
+        subs.trial_subscriptions,
+        orgs.total_organizations,
+        orgs.signups,
+        subs.new_subscriptions,
+        subs.trial_conversions,
+        subs.churned_subscriptions
+    FROM days
+    CROSS JOIN LATERAL (
+        SELECT
+            COALESCE(sum(pr.monthly_cents) FILTER (
+                WHERE s.status = 'active' AND s.created_at < days.metric_date + 1
+            ), 0) AS mrr_cents,
+            count(*) FILTER (
+                WHERE s.status = 'active' AND s.created_at < days.metric_date + 1
+            ) AS active_subscriptions,
+            count(*) FILTER (
+                WHERE s.status = 'trial' AND s.created_at < days.metric_date + 1
+            ) AS trial_subscriptions,
+            count(*) FILTER (
+                WHERE s.status = 'active'
+                  AND s.created_at >= days.metric_date AND s.created_at < days.metric_date + 1
+            ) AS new_subscriptions,
+            count(*) FILTER (
+                WHERE s.trial_converted
+                  AND s.updated_at >= days.metric_date AND s.updated_at < days.metric_date + 1
+            ) AS trial_conversions,
+            count(*) FILTER (
+                WHERE s.cancelled_at >= days.metric_date AND s.cancelled_at < days.metric_date + 1
+            ) AS churned_subscriptions
+        FROM {priced}
+    ) subs
+    CROSS JOIN LATERAL (
+        SELECT
+            count(*) FILTER (WHERE created_at < days.metric_date + 1) AS total_organizations,
+            count(*) FILTER (
+                WHERE created_at >= days.metric_date AND created_at < days.metric_date + 1
+            ) AS signups
+        FROM organizations
+    ) orgs
+"""
+
+
+def _prices_cte() -> Tuple[str, Dict[str, Any]]:
+    """Build the prices CTE (tier, billing_cycle, monthly_cents) from PRICING_TIERS."""
+    rows = []
+    params: Dict[str, Any] = {}
+    for index, (tier, pricing) in enumerate(PRICING_TIERS.items()):
+        rows.append(f"(:tier_{index}, 'monthly', :monthly_{index})")
+        rows.append(f"(:tier_{index}, 'annual', :annual_{index})")
+        params[f"tier_{index}"] = tier.value
+        params[f"monthly_{index}"] = pricing["monthly_price_cents"]
+        params[f"annual_{index}"] = pricing["annual_price_cents"] // 12
+
+    return "WITH prices(tier, billing_cycle, monthly_cents) AS (VALUES " + ", ".join(rows) + ")", params
+
+
+class PlatformMetricsRepository:
+    """
+    Repository for platform-wide metrics.
+
+    Statements are raw SQL: they aggregate several tables in a single round
+    trip, which the ORM query API cannot express without extra queries.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize repository with database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self._db = db
+
+    def get_kpis(self) -> Dict[str, Any]:
+        """
+        Compute live platform KPIs in one statement.
+
+        Returns:
+            Dict with organization, subscription, user, plant, storage counts
+            and mrr_cents
+        """
+        prices, params = _prices_cte()
+        row = self._db.execute(
+            text(_KPI_SQL.format(prices=prices, priced=_PRICED_SUBSCRIPTIONS)), params
+        ).mappings().one()
+        return dict(row)
+
+    def refresh_daily(self, start_date: date, end_date: date) -> int:
+        """
+        Upsert the daily series for [start_date, end_date] in one statement.
+
+        Args:
+            start_date: First day to (re)compute
+            end_date: Last day to (re)compute
+
+        Returns:
+            Number of days written
+        """
+        prices, params = _prices_cte()
+        columns = ", ".join(SERIES_COLUMNS)
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in SERIES_COLUMNS[1:])
+
+        result = self._db.execute(
+            text(
+                _DAILY_CTES.format(prices=prices)
+                + f"    INSERT INTO platform_metrics_daily ({columns})"
+                + _DAILY_SELECT.format(priced=_PRICED_SUBSCRIPTIONS)
+                + f"    ON CONFLICT (metric_date) DO UPDATE SET {updates}, computed_at = now()"
+            ),
+            {**params, "start_date": start_date, "end_date": end_date}
+        )
+        return result.rowcount
+
+    def get_latest_snapshot_date(self) -> Optional[date]:
+        """Return the most recent stored metric_date, or None."""
+        return self._db.execute(text("SELECT max(metric_date) FROM platform_metrics_daily")).scalar()
+
+    def get_daily_series(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """
+        Read the daily series for [start_date, end_date], ordered by date.
+
+        Days after the last stored snapshot (typically today) are computed
+        live so the series is always current.
+
+        Args:
+            start_date: First day
+            end_date: Last day
+
+        Returns:
+            List of dicts keyed by SERIES_COLUMNS
+        """
+        stored = self._db.execute(
+            text(
+                f"SELECT {', '.join(SERIES_COLUMNS)} FROM platform_metrics_daily "
+                "WHERE metric_date BETWEEN :start_date AND :end_date ORDER BY metric_date"
+            ),
+            {"start_date": start_date, "end_date": end_date}
+        ).mappings().all()
+
+        series = [dict(row) for row in stored]
+        live_start = series[-1]["metric_date"] + timedelta(days=1) if series else start_date
+
+        if live_start <= end_date:
+            prices, params = _prices_cte()
+            live = self._db.execute(
+                text(
+                    _DAILY_CTES.format(prices=prices)
+                    + _DAILY_SELECT.format(priced=_PRICED_SUBSCRIPTIONS)
+                    + "    ORDER BY days.metric_date"
+                ),
+                {**params, "start_date": live_start, "end_date": end_date}
+            ).mappings().all()
+            series.extend(dict(row) for row in live)
+
+        return series
@@ -1,10 +1,10 @@
 """
 Repository for Project Management (Documents, Milestones, RDA, BOM)
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, desc
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 from app.models.project_management import (
     ProjectDocument,
@@ -12,6 +12,7 @@ from app.models.project_management import (
     RDADrawing,
     ProjectBOM
 )
+from app.models.project import Project
 from app.application.dtos.project_management_dto import (
     ProjectDocumentCreateDTO,
     ProjectDocumentUpdateDTO,
@@ -195,6 +196,29 @@ class ProjectMilestoneRepository:
 
         return query.order_by(ProjectMilestone.display_order, ProjectMilestone.planned_date).offset(skip).limit(limit).all()
 
+    def get_schedule_rows(self, project_id: int) -> List:
+        """Get ID, code, name, dates and dependencies of all active milestones of a project"""
+        return self.db.query(
+            ProjectMilestone.id,
+            ProjectMilestone.milestone_code,
+            ProjectMilestone.milestone_name,
+            ProjectMilestone.planned_date,
+            ProjectMilestone.actual_date,
+            ProjectMilestone.dependencies,
+        ).filter(
+            and_(
+                ProjectMilestone.project_id == project_id,
+                ProjectMilestone.is_active == True
+            )
+        ).all()
+
+    def get_project_window(self, project_id: int) -> Tuple[Optional[date], Optional[date]]:
+        """Get a project's planned start and end dates"""
+        row = self.db.query(Project.planned_start_date, Project.planned_end_date).filter(
+            Project.id == project_id
+        ).first()
+        return (row.planned_start_date, row.planned_end_date) if row else (None, None)
+
     def update(self, milestone_id: int, dto: ProjectMilestoneUpdateDTO) -> Optional[ProjectMilestone]:
         """Update milestone"""
         milestone = self.get_by_id(milestone_id)
@@ -3,8 +3,9 @@ Repository for Reporting and Dashboards
 """
 from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, text
 from datetime import datetime, timezone
+import json
 
 from app.models.reporting import Report, ReportExecution, Dashboard
 from app.application.dtos.reporting_dto import (
@@ -62,6 +63,20 @@ class ReportRepository:
             )
         ).first()
 
+    def list_by_ids_or_codes(self, organization_id: int, report_ids: List[int],
+                             report_codes: List[str]) -> List[Report]:
+        """Get active reports of an organization by ID or code in one query"""
+        if not report_ids and not report_codes:
+            return []
+
+        return self.db.query(Report).filter(
+            and_(
+                Report.organization_id == organization_id,
+                Report.is_active == True,
+                or_(Report.id.in_(report_ids), Report.report_code.in_(report_codes))
+            )
+        ).all()
+
     def list(self, organization_id: int, skip: int = 0, limit: int = 100,
             report_type: Optional[str] = None, category: Optional[str] = None,
             include_system_reports: bool = True, user_id: Optional[int] = None) -> List[Report]:
@@ -181,6 +196,18 @@ class ReportRepository:
             self.db.commit()
 
 
+# Outcomes of ReportExecutionRepository.claim besides the current status
+CLAIMED = 'claimed'
+TENANT_BUSY = 'busy'
+
+# Advisory lock class serializing claims of one organization's executions
+_CLAIM_LOCK_CLASS = 7301
+
+
+class ExecutionClaimLost(Exception):
+    """The execution was claimed by another worker (this worker was judged dead)."""
+
+
 class ReportExecutionRepository:
     """Repository for ReportExecution operations"""
 
@@ -189,8 +216,13 @@ class ReportExecutionRepository:
 
     def create(self, report_id: int, organization_id: int, trigger_type: str,
               triggered_by: Optional[int] = None, parameters: Optional[dict] = None,
-              export_format: Optional[str] = None) -> ReportExecution:
-        """Create a new report execution"""
+              export_format: Optional[str] = None, queue: Optional[str] = None) -> ReportExecution:
+        """
+        Create a new report execution.
+
+        With queue, the execution id is sent to that PGMQ queue in the same
+        transaction, so a worker never sees an uncommitted execution.
+        """
         execution = ReportExecution(
             organization_id=organization_id,
             report_id=report_id,
@@ -201,6 +233,12 @@ class ReportExecutionRepository:
             export_format=export_format,
         )
         self.db.add(execution)
+        if queue:
+            self.db.flush()
+            self.db.execute(
+                text("SELECT pgmq.send(:queue, CAST(:message AS jsonb))"),
+                {"queue": queue, "message": json.dumps({"execution_id": execution.id})}
+            )
         self.db.commit()
         self.db.refresh(execution)
         return execution
@@ -231,10 +269,11 @@ class ReportExecutionRepository:
 
         return query.order_by(desc(ReportExecution.started_at)).offset(skip).limit(limit).all()
 
-    def update_status(self, execution_id: int, status: str, error_message: Optional[str] = None) -> Optional[ReportExecution]:
-        """Update execution status"""
+    def update_status(self, execution_id: int, status: str, error_message: Optional[str] = None,
+                      claim_token: Optional[str] = None) -> Optional[ReportExecution]:
+        """Update execution status (only while claim_token, if given, still owns it)"""
         execution = self.get_by_id(execution_id)
-        if not execution:
+        if not execution or (claim_token is not None and execution.claim_token != claim_token):
             return None
 
         execution.execution_status = status
@@ -250,10 +289,11 @@ class ReportExecutionRepository:
 
     def update_result(self, execution_id: int, result_count: int, result_data: Optional[dict] = None,
                      result_file_path: Optional[str] = None, execution_time_ms: Optional[int] = None,
-                     rows_processed: Optional[int] = None) -> Optional[ReportExecution]:
-        """Update execution results"""
+                     rows_processed: Optional[int] = None,
+                     claim_token: Optional[str] = None) -> Optional[ReportExecution]:
+        """Update execution results (only while claim_token, if given, still owns it)"""
         execution = self.get_by_id(execution_id)
-        if not execution:
+        if not execution or (claim_token is not None and execution.claim_token != claim_token):
             return None
 
         execution.result_count = result_count
@@ -261,6 +301,7 @@ class ReportExecutionRepository:
         execution.result_file_path = result_file_path
         execution.execution_time_ms = execution_time_ms
         execution.rows_processed = rows_processed
+        execution.progress_percent = 100
         execution.execution_status = 'COMPLETED'
         execution.completed_at = datetime.now(timezone.utc)
 
@@ -268,6 +309,181 @@ class ReportExecutionRepository:
         self.db.refresh(execution)
         return execution
 
+    def claim(self, execution_id: int, max_running: int, stale_after_seconds: int = 600,
+              claim_token: Optional[str] = None) -> str:
+        """
+        Move an execution to RUNNING unless its organization is at capacity.
+
+        Pending executions are claimed, and so are RUNNING executions whose
+        worker stopped reporting (no claim or progress commit for
+        stale_after_seconds), so a redelivered message takes over from a dead
+        worker. Stale executions do not count towards max_running; a stale
+        execution whose cancellation was requested is cancelled instead.
+
+        Claims of one organization are serialized with a transaction-level
+        advisory lock, so concurrent workers cannot both pass the count. The
+        claim stores claim_token; progress and results are only written while
+        it still matches, so a worker whose execution was taken over stops.
+
+        Args:
+            execution_id: Execution ID
+            max_running: Maximum RUNNING executions per organization
+            stale_after_seconds: Silence after which a RUNNING execution's
+                worker is considered dead; must exceed the longest gap between
+                heartbeats (the export statement timeout)
+            claim_token: Identifies this claim (e.g. a UUID)
+
+        Returns:
+            CLAIMED, TENANT_BUSY, 'missing', or the current status if the
+            execution can no longer be claimed
+        """
+        organization_id = self.db.execute(
+            text("SELECT organization_id FROM report_executions WHERE id = :id"),
+            {"id": execution_id}
+        ).scalar()
+        if organization_id is None:
+            return 'missing'
+
+        self.db.execute(
+            text("SELECT pg_advisory_xact_lock(:lock_class, :organization_id)"),
+            {"lock_class": _CLAIM_LOCK_CLASS, "organization_id": organization_id}
+        )
+        params = {
+            "id": execution_id,
+            "organization_id": organization_id,
+            "max_running": max_running,
+            "stale_after": stale_after_seconds,
+            "claim_token": claim_token,
+        }
+
+        self.db.execute(
+            text("""
+                UPDATE report_executions
+                SET execution_status = 'CANCELLED', completed_at = now()
+                WHERE id = :id
+                  AND execution_status = 'RUNNING'
+                  AND cancel_requested
+                  AND COALESCE(heartbeat_at, started_at) < now() - make_interval(secs => :stale_after)
+            """),
+            params
+        )
+        claimed = self.db.execute(
+            text("""
+                UPDATE report_executions
+                SET execution_status = 'RUNNING', started_at = now(), heartbeat_at = now(),
+                    claim_token = :claim_token, progress_percent = 0, rows_processed = NULL
+                WHERE id = :id
+                  AND NOT cancel_requested
+                  AND (
+                      execution_status = 'PENDING'
+                      OR (
+                          execution_status = 'RUNNING'
+                          AND COALESCE(heartbeat_at, started_at) < now() - make_interval(secs => :stale_after)
+                      )
+                  )
+                  AND (
+                      SELECT count(*) FROM report_executions
+                      WHERE organization_id = :organization_id
+                        AND execution_status = 'RUNNING'
+                        AND COALESCE(heartbeat_at, started_at) >= now() - make_interval(secs => :stale_after)
+                  ) < :max_running
+                RETURNING id
+            """),
+            params
+        ).scalar()
+
+        status = None
+        if not claimed:
+            status = self.db.execute(
+                text("""
+                    SELECT CASE
+                        WHEN execution_status = 'RUNNING'
+                             AND COALESCE(heartbeat_at, started_at) < now() - make_interval(secs => :stale_after)
+                        THEN 'STALE'
+                        ELSE execution_status
+                    END
+                    FROM report_executions WHERE id = :id
+                """),
+                params
+            ).scalar()
+        self.db.commit()
+
+        if claimed:
+            return CLAIMED
+        return TENANT_BUSY if status in ('PENDING', 'STALE') else status
+
+    def heartbeat(self, execution_id: int, claim_token: Optional[str] = None) -> bool:
+        """
+        Commit a heartbeat of the worker running an execution.
+
+        Returns:
+            True if cancellation was requested meanwhile
+
+        Raises:
+            ExecutionClaimLost: If another claim has taken the execution over
+        """
+        return self.record_progress(execution_id, None, None, claim_token=claim_token)
+
+    def record_progress(self, execution_id: int, rows_processed: Optional[int], progress_percent: Optional[int],
+                        estimated_rows: Optional[int] = None, claim_token: Optional[str] = None) -> bool:
+        """
+        Commit the progress of a running execution and its worker's heartbeat.
+
+        Only written while the execution is RUNNING under claim_token (if
+        given); None values keep the stored progress.
+
+        Returns:
+            True if cancellation was requested meanwhile
+
+        Raises:
+            ExecutionClaimLost: If another claim has taken the execution over
+        """
+        updated = self.db.execute(
+            text("""
+                UPDATE report_executions
+                SET rows_processed = COALESCE(:rows_processed, rows_processed),
+                    progress_percent = COALESCE(:progress_percent, progress_percent),
+                    heartbeat_at = now(),
+                    estimated_rows = COALESCE(:estimated_rows, estimated_rows)
+                WHERE id = :id
+                  AND (CAST(:claim_token AS varchar) IS NULL
+                       OR (claim_token = :claim_token AND execution_status = 'RUNNING'))
+                RETURNING cancel_requested
+            """),
+            {
+                "id": execution_id,
+                "rows_processed": rows_processed,
+                "progress_percent": progress_percent,
+                "estimated_rows": estimated_rows,
+                "claim_token": claim_token,
+            }
+        ).first()
+        self.db.commit()
+        if updated is None:
+            raise ExecutionClaimLost(f"Report execution {execution_id} is no longer owned by this worker")
+        return bool(updated[0])
+
+    def request_cancel(self, execution_id: int) -> Optional[ReportExecution]:
+        """
+        Cancel a pending execution, or flag a running one for its worker.
+
+        Finished executions are returned unchanged.
+        """
+        execution = self.get_by_id(execution_id)
+        if not execution:
+            return None
+
+        if execution.execution_status == 'PENDING':
+            execution.execution_status = 'CANCELLED'
+            execution.cancel_requested = True
+            execution.completed_at = datetime.now(timezone.utc)
+        elif execution.execution_status == 'RUNNING':
+            execution.cancel_requested = True
+
+        self.db.commit()
+        self.db.refresh(execution)
+        return execution
+
     def count_by_report(self, report_id: int) -> int:
         """Count executions for a report"""
         return self.db.query(func.count(ReportExecution.id)).filter(
@@ -3,12 +3,28 @@ Scheduling Repository
 
 Provides data access methods for work orders, lanes, and scheduling operations.
 """
-from typing import List, Optional
-from datetime import datetime, date
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime, date, time, timedelta
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
-from app.models.work_order import WorkOrder, OrderStatus
+from sqlalchemy import and_, or_, func, select, exists, table, column
+from app.domain.entities.lane import LaneAssignmentStatus
+from app.models.work_order import WorkOrder, WorkOrderOperation, WorkCenter, OrderStatus
 from app.models.lane import Lane, LaneAssignment
+from app.models.machine import Machine
+from app.infrastructure.repositories.lane_repository import CAPACITY_STATUSES
+
+
+# Worker assignments (migration 020). Read through Core: the ManpowerAllocation
+# ORM model does not import (it targets a Base module that does not exist).
+manpower_allocation = table(
+    "manpower_allocation",
+    column("id"),
+    column("user_id"),
+    column("work_order_id"),
+    column("operation_id"),
+    column("allocated_at"),
+    column("released_at"),
+)
 
 
 class SchedulingRepository:
@@ -82,6 +98,120 @@ class SchedulingRepository:
 
         return query.all()
 
+    def iter_gantt_rows(
+        self,
+        organization_id: int,
+        plant_id: Optional[int] = None,
+        window_start: Optional[date] = None,
+        window_end: Optional[date] = None,
+        lane_ids: Optional[List[int]] = None,
+        include_completed: bool = False,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        chunk_size: int = 1000
+    ) -> Iterator:
+        """
+        Stream one row per work order operation for a Gantt board, in one query.
+
+        Work orders are those planned to overlap the window (start_date_planned
+        set), ordered by planned start then ID; skip/limit page through work
+        orders, not rows. Each row carries the work order, one operation
+        (NULL columns for a work order without operations, so it still gets a
+        row) and the work order's first non-cancelled lane assignment. Rows of
+        a work order are consecutive, ordered by operation_number.
+
+        Args:
+            organization_id: Organization (RLS enforced at database level too)
+            plant_id: Filter by plant
+            window_start: Work orders planned to end on or after this date
+            window_end: Work orders planned to start on or before this date
+            lane_ids: Only work orders assigned to one of these lanes
+            include_completed: Include completed and cancelled work orders
+            skip: Work orders to skip (viewport offset)
+            limit: Maximum work orders (viewport size)
+            chunk_size: Rows fetched per round trip from the server-side cursor
+
+        Returns:
+            Iterator of rows
+        """
+        active_assignment = LaneAssignment.status != LaneAssignmentStatus.CANCELLED
+        planned_end = func.coalesce(WorkOrder.end_date_planned, WorkOrder.start_date_planned)
+
+        page = select(
+            WorkOrder.id.label("work_order_id"),
+            WorkOrder.work_order_number,
+            WorkOrder.order_status,
+            WorkOrder.start_date_planned,
+            WorkOrder.end_date_planned,
+            WorkOrder.planned_quantity,
+            WorkOrder.actual_quantity,
+        ).where(
+            WorkOrder.organization_id == organization_id,
+            WorkOrder.start_date_planned.isnot(None)
+        )
+        if plant_id:
+            page = page.where(WorkOrder.plant_id == plant_id)
+        if window_start:
+            page = page.where(planned_end >= datetime.combine(window_start, time.min))
+        if window_end:
+            page = page.where(WorkOrder.start_date_planned < datetime.combine(window_end + timedelta(days=1), time.min))
+        if not include_completed:
+            page = page.where(WorkOrder.order_status.in_([
+                OrderStatus.PLANNED, OrderStatus.RELEASED, OrderStatus.IN_PROGRESS, OrderStatus.PAUSED
+            ]))
+        if lane_ids:
+            page = page.where(exists().where(
+                LaneAssignment.work_order_id == WorkOrder.id,
+                LaneAssignment.lane_id.in_(lane_ids),
+                active_assignment
+            ))
+        page = page.order_by(WorkOrder.start_date_planned, WorkOrder.id).offset(skip)
+        if limit is not None:
+            page = page.limit(limit)
+        page = page.cte("gantt_work_orders")
+
+        # First assignment per work order of the page (DISTINCT ON)
+        assignment_query = select(
+            LaneAssignment.work_order_id, LaneAssignment.lane_id, Lane.lane_code
+        ).join(Lane, Lane.id == LaneAssignment.lane_id).where(
+            LaneAssignment.work_order_id.in_(select(page.c.work_order_id)),
+            active_assignment
+        )
+        if lane_ids:
+            assignment_query = assignment_query.where(LaneAssignment.lane_id.in_(lane_ids))
+        assignment = assignment_query.distinct(LaneAssignment.work_order_id).order_by(
+            LaneAssignment.work_order_id, LaneAssignment.scheduled_start, LaneAssignment.id
+        ).subquery("gantt_lane")
+
+        query = select(
+            page,
+            WorkOrderOperation.id.label("operation_id"),
+            WorkOrderOperation.operation_number,
+            WorkOrderOperation.operation_name,
+            WorkOrderOperation.work_center_id,
+            WorkCenter.work_center_code,
+            WorkOrderOperation.setup_time_minutes,
+            WorkOrderOperation.run_time_per_unit_minutes,
+            WorkOrderOperation.status.label("operation_status"),
+            WorkOrderOperation.actual_setup_time,
+            WorkOrderOperation.actual_run_time,
+            WorkOrderOperation.scheduling_mode,
+            WorkOrderOperation.predecessor_operation_id,
+            WorkOrderOperation.can_start_at_percentage,
+            assignment.c.lane_id,
+            assignment.c.lane_code,
+        ).select_from(page).outerjoin(
+            WorkOrderOperation, WorkOrderOperation.work_order_id == page.c.work_order_id
+        ).outerjoin(
+            WorkCenter, WorkCenter.id == WorkOrderOperation.work_center_id
+        ).outerjoin(
+            assignment, assignment.c.work_order_id == page.c.work_order_id
+        ).order_by(
+            page.c.start_date_planned, page.c.work_order_id, WorkOrderOperation.operation_number
+        )
+
+        return iter(self.db.execute(query.execution_options(yield_per=chunk_size)))
+
     def get_lanes(
         self,
         plant_id: Optional[int] = None,
@@ -137,68 +267,112 @@ class SchedulingRepository:
 
         return query.all()
 
-    def detect_lane_conflicts(
+    def get_lane_bookings(
         self,
         plant_id: int,
         start_date: date,
-        end_date: date
-    ) -> List[dict]:
+        end_date: date,
+        lane_ids: Optional[List[int]] = None
+    ) -> List:
         """
-        Detect lane conflicts (multiple work orders assigned to same lane at same time).
+        Get capacity-consuming lane assignments overlapping a period, in one query.
 
         Args:
             plant_id: Plant ID
             start_date: Period start
-            end_date: Period end
+            end_date: Period end (inclusive)
+            lane_ids: Only these lanes
 
         Returns:
-            List of conflicts with lane_id, work_order_ids, overlap dates
+            Rows with assignment_id, lane_id, lane_code, capacity_per_day,
+            work_order_id, work_order_number, scheduled_start, scheduled_end
+            (inclusive) and allocated_capacity
         """
-        # Query for overlapping lane assignments
-        assignments = self.db.query(LaneAssignment).join(Lane).filter(
-            and_(
-                Lane.plant_id == plant_id,
-                LaneAssignment.start_date <= end_date,
-                LaneAssignment.end_date >= start_date
-            )
+        query = select(
+            LaneAssignment.id.label("assignment_id"),
+            LaneAssignment.lane_id,
+            Lane.lane_code,
+            Lane.capacity_per_day,
+            LaneAssignment.work_order_id,
+            WorkOrder.work_order_number,
+            LaneAssignment.scheduled_start,
+            LaneAssignment.scheduled_end,
+            LaneAssignment.allocated_capacity,
+        ).join(
+            Lane, Lane.id == LaneAssignment.lane_id
+        ).outerjoin(
+            WorkOrder, WorkOrder.id == LaneAssignment.work_order_id
+        ).where(
+            Lane.plant_id == plant_id,
+            LaneAssignment.status.in_(CAPACITY_STATUSES),
+            LaneAssignment.scheduled_start <= end_date,
+            LaneAssignment.scheduled_end >= start_date
+        )
+        if lane_ids:
+            query = query.where(LaneAssignment.lane_id.in_(lane_ids))
+
+        return self.db.execute(query).all()
+
+    def get_work_center_machine_counts(self, plant_id: int) -> Dict[int, int]:
+        """
+        Count active machines per work center of a plant.
+
+        Args:
+            plant_id: Plant ID
+
+        Returns:
+            Dict of work_center_id -> active machine count
+        """
+        rows = self.db.execute(
+            select(Machine.work_center_id, func.count(Machine.id)).where(
+                Machine.plant_id == plant_id,
+                Machine.is_active.is_(True)
+            ).group_by(Machine.work_center_id)
         ).all()
+        return {work_center_id: count for work_center_id, count in rows}
 
-        # Group by lane and find overlaps
-        lane_assignments = {}
-        for assignment in assignments:
-            lane_id = assignment.lane_id
-            if lane_id not in lane_assignments:
-                lane_assignments[lane_id] = []
-            lane_assignments[lane_id].append(assignment)
-
-        # Detect conflicts
-        conflicts = []
-        for lane_id, assignments_list in lane_assignments.items():
-            # Check each pair for overlap
-            for i, a1 in enumerate(assignments_list):
-                for a2 in assignments_list[i+1:]:
-                    # Check if they overlap
-                    if self._assignments_overlap(a1, a2):
-                        conflicts.append({
-                            'lane_id': lane_id,
-                            'lane_code': a1.lane.lane_code if a1.lane else None,
-                            'work_order_1_id': a1.work_order_id,
-                            'work_order_1_number': a1.work_order.work_order_number if a1.work_order else None,
-                            'work_order_2_id': a2.work_order_id,
-                            'work_order_2_number': a2.work_order.work_order_number if a2.work_order else None,
-                            'overlap_start': max(a1.start_date, a2.start_date),
-                            'overlap_end': min(a1.end_date, a2.end_date)
-                        })
-
-        return conflicts
-
-    def _assignments_overlap(self, a1: LaneAssignment, a2: LaneAssignment) -> bool:
+    def get_operator_bookings(
+        self,
+        plant_id: int,
+        start_date: date,
+        end_date: date
+    ) -> List:
         """
-        Check if two lane assignments overlap in time.
+        Get operator allocations active during a period, in one query.
+
+        An allocation books its operator from allocated_at until released_at;
+        unreleased allocations run to the end of the period.
 
-        Two intervals overlap if: (start1 <= end2) AND (end1 >= start2)
+        Args:
+            plant_id: Plant ID (of the allocated work order)
+            start_date: Period start
+            end_date: Period end (inclusive)
+
+        Returns:
+            Rows with allocation_id, user_id, work_order_id,
+            work_order_number, operation_id, allocated_at and released_at
         """
-        return (a1.start_date <= a2.end_date) and (a1.end_date >= a2.start_date)
+        allocation = manpower_allocation
+        period_start = datetime.combine(start_date, time.min)
+        period_end = datetime.combine(end_date + timedelta(days=1), time.min)
+
+        query = select(
+            allocation.c.id.label("allocation_id"),
+            allocation.c.user_id,
+            allocation.c.work_order_id,
+            WorkOrder.work_order_number,
+            allocation.c.operation_id,
+            allocation.c.allocated_at,
+            allocation.c.released_at,
+        ).join(
+            WorkOrder, WorkOrder.id == allocation.c.work_order_id
+        ).where(
+            WorkOrder.plant_id == plant_id,
+            allocation.c.allocated_at < period_end,
+            or_(allocation.c.released_at.is_(None), allocation.c.released_at > period_start)
+        )
+
+        return self.db.execute(query).all()
 
     def get_work_order_dependencies(
         self,
@@ -0,0 +1,226 @@
+"""
+TenantDirectoryRepository - Read model for the platform admin tenant directory.
+
+Answers the organization list and organization stats with one statement each:
+- Latest usage snapshot and last activity via LATERAL joins
+- Total count as an uncorrelated scalar subquery (evaluated once)
+- Keyset paging on organization id
+- Search over name, code and subdomain backed by pg_trgm GIN indexes
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, desc, func, or_, select, true
+from sqlalchemy.orm import Session
+import logging
+
+from app.models.organization import Organization
+from app.models.subscription import SubscriptionModel, SubscriptionUsageModel
+from app.infrastructure.persistence.models import UserModel
+
+
+logger = logging.getLogger(__name__)
+
+
+class TenantDirectoryRepository:
+    """
+    Repository for set-based tenant directory reads.
+
+    Read-only; all enrichment happens in SQL so a page costs one round trip.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize repository with database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self._db = db
+
+    @staticmethod
+    def _latest_usage():
+        """LATERAL subquery with the newest usage snapshot per organization."""
+        return select(
+            SubscriptionUsageModel.current_users,
+            SubscriptionUsageModel.current_plants,
+            SubscriptionUsageModel.storage_used_gb
+        ).where(
+            SubscriptionUsageModel.organization_id == Organization.id
+        ).order_by(
+            desc(SubscriptionUsageModel.measured_at)
+        ).limit(1).lateral("latest_usage")
+
+    @staticmethod
+    def _last_activity():
+        """LATERAL subquery with the last user update per organization."""
+        return select(
+            func.max(UserModel.updated_at).label("last_active_at")
+        ).where(
+            UserModel.organization_id == Organization.id
+        ).lateral("last_activity")
+
+    @staticmethod
+    def _filters(
+        search: Optional[str],
+        status: Optional[str],
+        tier: Optional[str],
+        fuzzy: bool
+    ) -> List:
+        filters = []
+
+        if search:
+            search_pattern = f"%{search}%"
+            conditions = [
+                Organization.org_name.ilike(search_pattern),
+                Organization.org_code.ilike(search_pattern),
+                Organization.subdomain.ilike(search_pattern)
+            ]
+            if fuzzy:
+                # pg_trgm similarity operator, tolerant to typos
+                conditions.append(Organization.org_name.op("%")(search))
+            filters.append(or_(*conditions))
+
+        if status and status != "all":
+            filters.append(Organization.is_active == (status == "active"))
+
+        if tier:
+            filters.append(SubscriptionModel.tier == tier)
+
+        return filters
+
+    def list_page(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        tier: Optional[str] = None,
+        limit: int = 50,
+        after_id: Optional[int] = None,
+        offset: int = 0,
+        fuzzy: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Fetch one page of organizations with subscription, usage and activity.
+
+        Args:
+            search: Search by name, subdomain, or org_code
+            status: Filter by active status ("active", "inactive", "all")
+            tier: Filter by subscription tier
+            limit: Results per page
+            after_id: Keyset cursor - return organizations with id > after_id
+            offset: Offset paging (ignored when after_id is given)
+            fuzzy: Also match names by trigram similarity
+
+        Returns:
+            tuple: (organizations list, total count, has_more)
+        """
+        filters = self._filters(search, status, tier, fuzzy)
+
+        # Uncorrelated, so PostgreSQL evaluates it once per statement
+        total_count = select(func.count(Organization.id)).select_from(Organization).join(
+            SubscriptionModel, Organization.id == SubscriptionModel.organization_id
+        ).where(and_(true(), *filters)).correlate(None).scalar_subquery()
+
+        usage = self._latest_usage()
+        activity = self._last_activity()
+
+        stmt = select(
+            Organization.id,
+            Organization.org_code,
+            Organization.org_name,
+            Organization.subdomain,
+            Organization.is_active,
+            Organization.created_at,
+            SubscriptionModel.tier,
+            SubscriptionModel.status,
+            usage.c.current_users,
+            usage.c.current_plants,
+            usage.c.storage_used_gb,
+            activity.c.last_active_at,
+            total_count.label("total_count")
+        ).select_from(Organization).join(
+            SubscriptionModel, Organization.id == SubscriptionModel.organization_id
+        ).outerjoin(usage, true()).outerjoin(activity, true()).where(and_(true(), *filters))
+
+        if after_id is not None:
+            stmt = stmt.where(Organization.id > after_id)
+        elif offset:
+            stmt = stmt.offset(offset)
+
+        # One extra row tells whether another page exists
+        rows = self._db.execute(stmt.order_by(Organization.id).limit(limit + 1)).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        if rows:
+            total = rows[0].total_count
+        else:
+            total = self._db.execute(select(total_count)).scalar() or 0
+
+        organizations = [
+            {
+                "id": row.id,
+                "org_code": row.org_code,
+                "org_name": row.org_name,
+                "subdomain": row.subdomain,
+                "is_active": row.is_active,
+                "subscription_tier": row.tier or "unknown",
+                "subscription_status": row.status or "unknown",
+                "user_count": row.current_users or 0,
+                "plant_count": row.current_plants or 0,
+                "storage_used_gb": float(row.storage_used_gb) if row.storage_used_gb is not None else 0.0,
+                "last_active_at": row.last_active_at,
+                "created_at": row.created_at
+            }
+            for row in rows
+        ]
+
+        return organizations, total, has_more
+
+    def get_stats(self, organization_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Fetch usage, last activity and entity counts for one organization.
+
+        Args:
+            organization_id: Organization ID
+
+        Returns:
+            Dict of stats, or None if the organization does not exist
+        """
+        from app.models.work_order import WorkOrder
+        from app.models.material import Material
+        from app.models.machine import Machine
+
+        def count_of(model):
+            return select(func.count(model.id)).where(
+                model.organization_id == Organization.id
+            ).scalar_subquery()
+
+        usage = self._latest_usage()
+        activity = self._last_activity()
+
+        row = self._db.execute(
+            select(
+                usage.c.current_users,
+                usage.c.current_plants,
+                usage.c.storage_used_gb,
+                activity.c.last_active_at,
+                count_of(WorkOrder).label("work_orders"),
+                count_of(Material).label("materials"),
+                count_of(Machine).label("machines")
+            ).select_from(Organization).outerjoin(usage, true()).outerjoin(activity, true()).where(
+                Organization.id == organization_id
+            )
+        ).first()
+
+        if row is None:
+            return None
+
+        return {
+            "user_count": row.current_users or 0,
+            "plant_count": row.current_plants or 0,
+            "storage_used_gb": float(row.storage_used_gb) if row.storage_used_gb is not None else 0.0,
+            "last_active_at": row.last_active_at,
+            "work_orders": row.work_orders or 0,
+            "materials": row.materials or 0,
+            "machines": row.machines or 0
+        }
@@ -3,7 +3,7 @@ Repository for Traceability (Lot/Batch, Serial Numbers, Links, Genealogy)
 """
 from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, func, asc
+from sqlalchemy import and_, or_, desc, func, asc, text
 from datetime import datetime, timezone, date
 
 from app.models.traceability import (
@@ -72,6 +72,17 @@ class LotBatchRepository:
             )
         ).first()
 
+    def list_by_lot_numbers(self, organization_id: int, lot_numbers: List[str]) -> List[LotBatch]:
+        """Get lot batches for many lot numbers in one query"""
+        if not lot_numbers:
+            return []
+        return self.db.query(LotBatch).filter(
+            and_(
+                LotBatch.organization_id == organization_id,
+                LotBatch.lot_number.in_(set(lot_numbers))
+            )
+        ).all()
+
     def list_by_organization(self, organization_id: int, skip: int = 0, limit: int = 100,
                             material_id: Optional[int] = None, quality_status: Optional[str] = None,
                             active_only: bool = True) -> List[LotBatch]:
@@ -475,3 +486,139 @@ class GenealogyRecordRepository:
         return self.db.query(GenealogyRecord).filter(
             GenealogyRecord.work_order_id == work_order_id
         ).order_by(GenealogyRecord.operation_timestamp).all()
+
+
+# Genealogy walk over traceability_links from the seed lots (:lot_ids).
+# Downstream follows parent -> child, upstream child -> parent. Nodes are
+# (lot_id, serial_id) pairs; UNION drops duplicate paths of equal depth and
+# :max_depth bounds the walk (also on cyclic data).
+_GENEALOGY_WALK = """
+    WITH RECURSIVE walk(lot_id, serial_id, depth) AS (
+        SELECT seed.lot_id, NULL::integer, 0
+        FROM unnest(CAST(:lot_ids AS integer[])) AS seed(lot_id)
+      UNION
+        SELECT l.{to_side}_lot_id, l.{to_side}_serial_id, w.depth + 1
+        FROM walk w
+        JOIN traceability_links l
+          ON l.organization_id = :org_id
+         AND (l.{from_side}_lot_id = w.lot_id OR l.{from_side}_serial_id = w.serial_id)
+        WHERE w.depth < :max_depth
+    ),
+    scope AS (
+        SELECT lot_id, serial_id, MIN(depth) AS depth
+        FROM walk
+        GROUP BY lot_id, serial_id
+    )
+"""
+
+_DOWNSTREAM_IMPACT_SQL = _GENEALOGY_WALK.format(from_side="parent", to_side="child") + """,
+    consumption AS (
+        SELECT l.work_order_id, SUM(COALESCE(l.quantity_used, 0)) AS quantity
+        FROM traceability_links l
+        JOIN scope s ON s.lot_id = l.parent_lot_id
+        WHERE l.organization_id = :org_id AND l.work_order_id IS NOT NULL
+        GROUP BY l.work_order_id
+    ),
+    serials AS (
+        SELECT sn.id, sn.serial_number, sn.status, sn.shipment_id,
+               sn.custom_attributes ->> 'customer_name' AS customer_name,
+               sn.custom_attributes ->> 'customer_email' AS customer_email
+        FROM serial_numbers sn
+        JOIN scope s ON s.serial_id = sn.id
+        WHERE sn.organization_id = :org_id
+      UNION
+        SELECT sn.id, sn.serial_number, sn.status, sn.shipment_id,
+               sn.custom_attributes ->> 'customer_name',
+               sn.custom_attributes ->> 'customer_email'
+        FROM serial_numbers sn
+        JOIN scope s ON s.lot_id = sn.lot_batch_id
+        WHERE sn.organization_id = :org_id
+      UNION
+        SELECT sn.id, sn.serial_number, sn.status, sn.shipment_id,
+               sn.custom_attributes ->> 'customer_name',
+               sn.custom_attributes ->> 'customer_email'
+        FROM serial_numbers sn
+        JOIN consumption c ON c.work_order_id = sn.work_order_id
+        WHERE sn.organization_id = :org_id
+    ),
+    shipped AS (
+        SELECT shipment_id,
+               COUNT(*) AS quantity,
+               array_agg(serial_number ORDER BY serial_number) AS serial_numbers,
+               (array_agg(customer_name ORDER BY id) FILTER (WHERE customer_name IS NOT NULL))[1] AS customer_name,
+               (array_agg(customer_email ORDER BY id) FILTER (WHERE customer_name IS NOT NULL))[1] AS customer_email
+        FROM serials
+        WHERE status = 'SHIPPED' AND shipment_id IS NOT NULL
+        GROUP BY shipment_id
+    )
+    SELECT 'work_order' AS kind, wo.id, wo.work_order_number AS code, CAST(wo.order_status AS text) AS status,
+           wo.end_date_actual AS event_date, c.quantity, NULL::integer AS depth, NULL::integer AS material_id,
+           NULL::text[] AS serial_numbers, NULL AS customer_name, NULL AS customer_email, NULL AS destination
+    FROM consumption c
+    JOIN work_order wo ON wo.id = c.work_order_id
+  UNION ALL
+    SELECT 'shipment', sh.id, sh.shipment_number, CAST(sh.shipment_status AS text),
+           sh.actual_ship_date, sp.quantity, NULL, NULL,
+           sp.serial_numbers, sp.customer_name, sp.customer_email, sh.destination_location
+    FROM shipped sp
+    JOIN shipment sh ON sh.id = sp.shipment_id
+  UNION ALL
+    SELECT 'lot', lb.id, lb.lot_number, lb.quality_status,
+           NULL, lb.initial_quantity, s.depth, lb.material_id,
+           NULL, NULL, NULL, NULL
+    FROM scope s
+    JOIN lot_batches lb ON lb.id = s.lot_id
+    WHERE :include_lots AND s.depth > 0
+  UNION ALL
+    SELECT 'serials', NULL, NULL, NULL, NULL, COUNT(*), NULL, NULL, NULL, NULL, NULL, NULL
+    FROM serials
+"""
+
+_UPSTREAM_LOTS_SQL = _GENEALOGY_WALK.format(from_side="child", to_side="parent") + """
+    SELECT lb.id, lb.lot_number, lb.material_id, s.depth
+    FROM scope s
+    JOIN lot_batches lb ON lb.id = s.lot_id
+    WHERE s.depth > 0
+    ORDER BY s.depth, lb.lot_number
+"""
+
+
+class RecallTraceRepository:
+    """
+    Repository for set-based recall genealogy queries.
+
+    The genealogy is walked by PostgreSQL with a recursive CTE, so a recall
+    over thousands of lots costs one statement per direction regardless of
+    the number of lots or levels.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_downstream_impact(self, organization_id: int, lot_ids: List[int],
+                              max_depth: int, include_lots: bool = True) -> list:
+        """
+        Trace everything downstream of the seed lots in one statement.
+
+        Returns rows tagged by kind:
+        - work_order: work orders that consumed an affected lot (quantity = consumed)
+        - shipment: shipments of affected serials (quantity = serial count)
+        - lot: downstream lots with their depth (only if include_lots)
+        - serials: a single row whose quantity is the affected serial count
+        """
+        return self.db.execute(
+            text(_DOWNSTREAM_IMPACT_SQL),
+            {
+                "org_id": organization_id,
+                "lot_ids": list(lot_ids),
+                "max_depth": max_depth,
+                "include_lots": include_lots,
+            }
+        ).fetchall()
+
+    def get_upstream_lots(self, organization_id: int, lot_ids: List[int], max_depth: int) -> list:
+        """Trace the source lots of the seed lots (where-from), nearest first"""
+        return self.db.execute(
+            text(_UPSTREAM_LOTS_SQL),
+            {"org_id": organization_id, "lot_ids": list(lot_ids), "max_depth": max_depth}
+        ).fetchall()
@@ -0,0 +1,263 @@
+"""
+UsageSnapshotRepository - Set-based usage tracking for all tenants.
+
+- Snapshot: one INSERT ... SELECT counts users, plants and storage for every
+  trial/active subscription with GROUP BY aggregates, upserted on
+  (organization_id, measured_at) so a rerun of the same slot overwrites it
+- Limits: limit and threshold crossings of a snapshot computed in SQL
+  (base limits + active add-ons, compared with the previous snapshot)
+- Trials: expired trials suspended with one UPDATE ... RETURNING
+- Notifications: follow-ups sent to the billing_notifications queue with one
+  pgmq.send_batch in the caller's transaction
+"""
+from datetime import datetime
+from typing import Any, Dict, List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import json
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+BILLING_NOTIFICATIONS_QUEUE = "billing_notifications"
+
+# Limit levels returned by find_limit_crossings
+LEVEL_WARNING = 1
+LEVEL_EXCEEDED = 2
+
+_SNAPSHOT_SQL = """
+    WITH tracked AS (
+        SELECT organization_id
+        FROM subscriptions
+        WHERE status IN ('trial', 'active')
+    ),
+    users_per_org AS (
+        SELECT organization_id, count(*) AS users
+        FROM users
+        WHERE is_active
+        GROUP BY organization_id
+    ),
+    plants_per_org AS (
+        SELECT organization_id, count(*) AS plants
+        FROM plants
+        WHERE is_active
+        GROUP BY organization_id
+    ),
+    storage_per_org AS (
+        SELECT organization_id, sum(file_size) AS storage_bytes
+        FROM file_uploads
+        GROUP BY organization_id
+    )
+    INSERT INTO subscription_usage
+        (organization_id, current_users, current_plants, storage_used_gb, measured_at)
+    SELECT
+        t.organization_id,
+        COALESCE(u.users, 0),
+        COALESCE(p.plants, 0),
+        round(COALESCE(st.storage_bytes, 0) / 1073741824.0, 2),
+        :snapshot_at
+    FROM tracked t
+    LEFT JOIN users_per_org u ON u.organization_id = t.organization_id
+    LEFT JOIN plants_per_org p ON p.organization_id = t.organization_id
+    LEFT JOIN storage_per_org st ON st.organization_id = t.organization_id
+    ON CONFLICT (organization_id, measured_at) DO UPDATE SET
+        current_users = EXCLUDED.current_users,
+        current_plants = EXCLUDED.current_plants,
+        storage_used_gb = EXCLUDED.storage_used_gb
+"""
+
+# NULL limits are unlimited, and stay NULL when add-ons are added.
+# Storage is compared in whole GB, like UsageTrackingService.
+_LIMIT_CROSSINGS_SQL = """
+    WITH addons AS (
+        SELECT
+            subscription_id,
+            COALESCE(sum(quantity) FILTER (WHERE add_on_type = 'extra_users'), 0) AS extra_users,
+            COALESCE(sum(quantity) FILTER (WHERE add_on_type = 'extra_plants'), 0) AS extra_plants,
+            COALESCE(sum(quantity) FILTER (WHERE add_on_type = 'extra_storage_gb'), 0) AS extra_storage_gb
+        FROM subscription_add_ons
+        WHERE removed_at IS NULL
+        GROUP BY subscription_id
+    ),
+    limits AS (
+        SELECT
+            s.organization_id,
+            s.max_users + COALESCE(a.extra_users, 0) AS max_users,
+            s.max_plants + COALESCE(a.extra_plants, 0) AS max_plants,
+            s.storage_limit_gb + COALESCE(a.extra_storage_gb, 0) AS storage_limit_gb
+        FROM subscriptions s
+        LEFT JOIN addons a ON a.subscription_id = s.id
+        WHERE s.status IN ('trial', 'active')
+    ),
+    resources AS (
+        SELECT m.organization_id, r.resource, r.current_value, r.previous_value, r.limit_value
+        FROM subscription_usage m
+        JOIN limits l ON l.organization_id = m.organization_id
+        LEFT JOIN LATERAL (
+            SELECT p.current_users, p.current_plants, p.storage_used_gb
+            FROM subscription_usage p
+            WHERE p.organization_id = m.organization_id AND p.measured_at < m.measured_at
+            ORDER BY p.measured_at DESC
+            LIMIT 1
+        ) prev ON TRUE
+        CROSS JOIN LATERAL (VALUES
+            ('users', m.current_users::numeric, prev.current_users::numeric, l.max_users::numeric),
+            ('plants', m.current_plants::numeric, prev.current_plants::numeric, l.max_plants::numeric),
+            ('storage', floor(m.storage_used_gb), floor(prev.storage_used_gb), l.storage_limit_gb::numeric)
+        ) AS r(resource, current_value, previous_value, limit_value)
+        WHERE m.measured_at = :snapshot_at
+          AND r.limit_value IS NOT NULL
+          AND r.current_value > 0
+          AND r.current_value >= r.limit_value * :threshold
+    ),
+    levels AS (
+        SELECT
+            organization_id,
+            resource,
+            current_value,
+            limit_value,
+            CASE WHEN current_value > limit_value THEN 2 ELSE 1 END AS level,
+            CASE
+                WHEN previous_value > limit_value THEN 2
+                WHEN previous_value > 0 AND previous_value >= limit_value * :threshold THEN 1
+                ELSE 0
+            END AS previous_level
+        FROM resources
+    )
+    SELECT
+        organization_id,
+        resource,
+        current_value::integer AS current_value,
+        limit_value::integer AS limit_value,
+        level,
+        level > previous_level AS escalated
+    FROM levels
+    ORDER BY organization_id, resource
+"""
+
+_SUSPEND_EXPIRED_TRIALS_SQL = """
+    UPDATE subscriptions
+    SET status = 'suspended', updated_at = now()
+    WHERE status = 'trial'
+      AND trial_converted = false
+      AND trial_ends_at <= :now
+    RETURNING organization_id, billing_email, trial_ends_at
+"""
+
+_EXPIRING_TRIALS_SQL = """
+    SELECT organization_id, billing_email, trial_ends_at
+    FROM subscriptions
+    WHERE status = 'trial'
+      AND trial_converted = false
+      AND trial_ends_at > :now
+      AND trial_ends_at <= :warning_until
+    ORDER BY organization_id
+"""
+
+
+class UsageSnapshotRepository:
+    """
+    Repository for set-based usage snapshots and trial lifecycle updates.
+
+    Statements are raw SQL: each covers every tenant in a single round trip,
+    so the scheduled jobs run a fixed number of statements regardless of the
+    number of organizations. Nothing is committed here.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize repository with database session.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self._db = db
+
+    def snapshot_usage(self, snapshot_at: datetime) -> int:
+        """
+        Upsert usage of every trial/active organization in one statement.
+
+        Args:
+            snapshot_at: measured_at of the snapshot (the job's time slot)
+
+        Returns:
+            Number of organizations snapshotted
+        """
+        result = self._db.execute(text(_SNAPSHOT_SQL), {"snapshot_at": snapshot_at})
+        return result.rowcount
+
+    def find_limit_crossings(self, snapshot_at: datetime, threshold: float) -> List[Dict[str, Any]]:
+        """
+        Find resources at or over the warning threshold in a snapshot.
+
+        Args:
+            snapshot_at: measured_at of the snapshot
+            threshold: Fraction of a limit that raises a warning (e.g. 0.9)
+
+        Returns:
+            Dicts with organization_id, resource (users, plants, storage),
+            current_value, limit_value, level (LEVEL_WARNING or
+            LEVEL_EXCEEDED) and escalated (level is higher than in the
+            previous snapshot), ordered by organization
+        """
+        rows = self._db.execute(
+            text(_LIMIT_CROSSINGS_SQL), {"snapshot_at": snapshot_at, "threshold": threshold}
+        ).mappings().all()
+        return [dict(row) for row in rows]
+
+    def suspend_expired_trials(self, now: datetime) -> List[Dict[str, Any]]:
+        """
+        Suspend all unconverted trials that ended by now in one statement.
+
+        Args:
+            now: Current time
+
+        Returns:
+            Dicts with organization_id, billing_email and trial_ends_at
+        """
+        rows = self._db.execute(text(_SUSPEND_EXPIRED_TRIALS_SQL), {"now": now}).mappings().all()
+        return [dict(row) for row in rows]
+
+    def find_expiring_trials(self, now: datetime, warning_until: datetime) -> List[Dict[str, Any]]:
+        """
+        Find unconverted trials ending in (now, warning_until].
+
+        Args:
+            now: Current time
+            warning_until: End of the warning window
+
+        Returns:
+            Dicts with organization_id, billing_email and trial_ends_at
+        """
+        rows = self._db.execute(
+            text(_EXPIRING_TRIALS_SQL), {"now": now, "warning_until": warning_until}
+        ).mappings().all()
+        return [dict(row) for row in rows]
+
+    def enqueue_notifications(self, messages: List[Dict[str, Any]]) -> int:
+        """
+        Send notification messages to the billing_notifications queue.
+
+        All messages are sent with one pgmq.send_batch on the caller's
+        session, so they are committed (or rolled back) with the changes
+        that caused them.
+
+        Args:
+            messages: JSON-serializable messages, each with a "type" key
+
+        Returns:
+            Number of messages queued
+        """
+        if not messages:
+            return 0
+
+        self._db.execute(
+            text(
+                "SELECT pgmq.send_batch(:queue, "
+                "ARRAY(SELECT jsonb_array_elements(CAST(:messages AS jsonb))))"
+            ),
+            {"queue": BILLING_NOTIFICATIONS_QUEUE, "messages": json.dumps(messages, default=str)}
+        )
+        return len(messages)
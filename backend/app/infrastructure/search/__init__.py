@@ -3,7 +3,27 @@ Search infrastructure package.
 
 Provides full-text search capabilities using ParadeDB pg_search (BM25).
 """
-from app.infrastructure.search.pg_search_service import PgSearchService, SearchResult
+from app.infrastructure.search.pg_search_service import (
+    EntityHit,
+    FacetCount,
+    MaterialFilters,
+    MaterialPage,
+    PgSearchService,
+    SearchFacets,
+    SearchResult,
+)
+from app.infrastructure.search.search_cache import SearchResultCache, search_result_cache
 from app.infrastructure.search.search_config import SearchConfig
 
-__all__ = ["PgSearchService", "SearchResult", "SearchConfig"]
+__all__ = [
+    "PgSearchService",
+    "SearchResult",
+    "SearchFacets",
+    "FacetCount",
+    "MaterialFilters",
+    "MaterialPage",
+    "EntityHit",
+    "SearchConfig",
+    "SearchResultCache",
+    "search_result_cache",
+]
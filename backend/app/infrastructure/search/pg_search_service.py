@@ -3,16 +3,34 @@ PgSearchService - ParadeDB BM25 full-text search service.
 
 Provides BM25-ranked search using pg_search extension with fallback to LIKE.
 Implements infrastructure layer for search operations.
+
+Features:
+- Hits hydrated from the ranked result set itself (no per-hit queries)
+- Snippets with highlighted terms
+- Facet counts (procurement type, plant, category) in one GROUPING SETS query
+- Filtered, sorted, keyset-paginated material queries with exact totals and
+  per-facet counts, every predicate in SQL
+- Statements built once per query shape and reused (compiled query cache)
+- Multi-entity search (materials, work orders, lots) in one UNION ALL query
+- Prefix type-ahead suggestions
+- Short-TTL per-tenant result cache
 """
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import ProgrammingError
-from sqlalchemy import text, or_
+from sqlalchemy import text, or_, and_, select, func, desc, bindparam, tuple_, Float, Integer, String
+import base64
+import binascii
+import json
 import logging
+import re
 
+from app.infrastructure.search.search_cache import SearchResultCache, search_result_cache
 from app.infrastructure.search.search_config import SearchConfig
-from app.models.material import Material
+from app.models.material import Material, MRPType, ProcurementType
 
 
 logger = logging.getLogger(__name__)
@@ -43,15 +61,24 @@ class SearchResult:
     is_active: bool
     score: Optional[float] = None
     """BM25 relevance score (None if fallback mode)."""
+    highlights: Optional[Dict[str, str]] = None
+    """Snippets per field with matched terms wrapped in highlight tags."""
 
     @classmethod
-    def from_material(cls, material: Material, score: Optional[float] = None) -> "SearchResult":
+    def from_material(
+        cls,
+        material: Material,
+        score: Optional[float] = None,
+        highlights: Optional[Dict[str, str]] = None,
+    ) -> "SearchResult":
         """
-        Create SearchResult from Material entity.
+        Create SearchResult from Material entity or a result row with the
+        same columns.
 
         Args:
-            material: Material entity
+            material: Material entity or row
             score: Optional BM25 score
+            highlights: Optional snippets per field
 
         Returns:
             SearchResult instance
@@ -73,9 +100,347 @@ class SearchResult:
             lead_time_days=material.lead_time_days or 0,
             is_active=material.is_active,
             score=score,
+            highlights=highlights,
         )
 
 
+@dataclass
+class FacetCount:
+    """Number of matching materials for one facet value."""
+
+    value: object
+    count: int
+
+
+@dataclass
+class SearchFacets:
+    """Facet counts for a material search."""
+
+    total: int = 0
+    procurement_type: List[FacetCount] = field(default_factory=list)
+    plant_id: List[FacetCount] = field(default_factory=list)
+    material_category_id: List[FacetCount] = field(default_factory=list)
+    mrp_type: List[FacetCount] = field(default_factory=list)
+    is_active: List[FacetCount] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class MaterialFilters:
+    """
+    Filters for a material query, applied in SQL.
+
+    List filters match any of their values; empty means no filter.
+    """
+
+    plant_id: Optional[int] = None
+    material_category_id: Tuple[int, ...] = ()
+    procurement_type: Tuple[str, ...] = ()
+    mrp_type: Tuple[str, ...] = ()
+    is_active: Optional[bool] = None
+
+    def __post_init__(self):
+        """Normalize list filters to sorted tuples and validate enum values."""
+        for name, enum_type in (
+            ("material_category_id", None),
+            ("procurement_type", ProcurementType),
+            ("mrp_type", MRPType),
+        ):
+            values = set(getattr(self, name) or ())
+            if enum_type is not None:
+                try:
+                    values = {enum_type(value).value for value in values}
+                except ValueError:
+                    raise ValueError(f"Invalid {name} filter: {sorted(map(str, values))}")
+            object.__setattr__(self, name, tuple(sorted(values)))
+
+    def shape(self) -> Tuple[str, ...]:
+        """Names of the filters that are set (the query shape)."""
+        return tuple(name for name in MATERIAL_FILTER_FIELDS if self._is_set(name))
+
+    def params(self) -> Dict[str, object]:
+        """Bind parameters for the filters that are set."""
+        params = {}
+        for name in self.shape():
+            value = getattr(self, name)
+            if name == "procurement_type":
+                value = [ProcurementType(v) for v in value]
+            elif name == "mrp_type":
+                value = [MRPType(v) for v in value]
+            elif isinstance(value, tuple):
+                value = list(value)
+            params[name] = value
+        return params
+
+    def _is_set(self, name: str) -> bool:
+        value = getattr(self, name)
+        return value != () and value is not None
+
+
+@dataclass
+class MaterialPage:
+    """One keyset page of a material query."""
+
+    items: List[SearchResult] = field(default_factory=list)
+    total: Optional[int] = None
+    """Matches across all pages (None when counts were not requested)."""
+    facets: Optional[SearchFacets] = None
+    next_cursor: Optional[str] = None
+    """Opaque cursor for the next page (None on the last page)."""
+
+
+@dataclass
+class EntityHit:
+    """Lightweight hit for multi-entity search and type-ahead."""
+
+    entity: str
+    """Entity type: materials, work_orders or lots."""
+    id: int
+    code: str
+    title: Optional[str]
+    plant_id: Optional[int]
+    score: Optional[float] = None
+
+
+# Columns needed by SearchResult, selected once with the ranking
+MATERIAL_RESULT_COLUMNS = (
+    Material.id,
+    Material.organization_id,
+    Material.plant_id,
+    Material.material_number,
+    Material.material_name,
+    Material.description,
+    Material.material_category_id,
+    Material.base_uom_id,
+    Material.procurement_type,
+    Material.mrp_type,
+    Material.safety_stock,
+    Material.reorder_point,
+    Material.lot_size,
+    Material.lead_time_days,
+    Material.is_active,
+)
+
+FACET_FIELDS = ("procurement_type", "plant_id", "material_category_id")
+
+MATERIAL_FILTER_FIELDS = ("plant_id", "material_category_id", "procurement_type", "mrp_type", "is_active")
+
+MATERIAL_FACET_FIELDS = ("procurement_type", "mrp_type", "plant_id", "material_category_id", "is_active")
+
+# Every sort is keyed on (value, id) for keyset paging. "relevance" is the
+# BM25 score, or the material number in LIKE fallback mode.
+MATERIAL_SORTS = ("relevance", "material_number", "material_name", "newest")
+
+SEARCH_ENTITIES = ("materials", "work_orders", "lots")
+
+# Per-entity branches of the multi-entity query; :pattern is an escaped
+# ILIKE pattern, :prefix ranks code prefix matches first
+_ENTITY_SQL = {
+    "materials_like": """
+        (SELECT 'materials' AS entity, m.id, m.material_number AS code, m.material_name AS title,
+                m.plant_id, NULL::float AS score
+         FROM material m
+         WHERE m.organization_id = :org_id
+           AND (:plant_id IS NULL OR m.plant_id = :plant_id)
+           AND (m.material_number ILIKE :pattern ESCAPE '\\' OR m.material_name ILIKE :pattern ESCAPE '\\')
+         ORDER BY (m.material_number ILIKE :prefix ESCAPE '\\') DESC, m.material_number
+         LIMIT :entity_limit)
+    """,
+    "materials_bm25": """
+        (SELECT 'materials' AS entity, m.id, m.material_number AS code, m.material_name AS title,
+                m.plant_id, paradedb.score(m.id)::float AS score
+         FROM material m
+         WHERE m.id @@@ paradedb.parse(:query)
+           AND m.organization_id = :org_id
+           AND (:plant_id IS NULL OR m.plant_id = :plant_id)
+         ORDER BY score DESC
+         LIMIT :entity_limit)
+    """,
+    "work_orders": """
+        (SELECT 'work_orders' AS entity, wo.id, wo.work_order_number AS code, m.material_name AS title,
+                wo.plant_id, NULL::float AS score
+         FROM work_order wo
+         LEFT JOIN material m ON m.id = wo.material_id
+         WHERE wo.organization_id = :org_id
+           AND (:plant_id IS NULL OR wo.plant_id = :plant_id)
+           AND wo.work_order_number ILIKE :pattern ESCAPE '\\'
+         ORDER BY (wo.work_order_number ILIKE :prefix ESCAPE '\\') DESC, wo.work_order_number
+         LIMIT :entity_limit)
+    """,
+    "lots": """
+        (SELECT 'lots' AS entity, lb.id, lb.lot_number AS code, m.material_name AS title,
+                lb.plant_id, NULL::float AS score
+         FROM lot_batches lb
+         LEFT JOIN material m ON m.id = lb.material_id
+         WHERE lb.organization_id = :org_id
+           AND (:plant_id IS NULL OR lb.plant_id = :plant_id)
+           AND (lb.lot_number ILIKE :pattern ESCAPE '\\' OR lb.supplier_lot_number ILIKE :pattern ESCAPE '\\')
+         ORDER BY (lb.lot_number ILIKE :prefix ESCAPE '\\') DESC, lb.lot_number
+         LIMIT :entity_limit)
+    """,
+}
+
+
+def escape_like(query: str) -> str:
+    """Escape LIKE special characters (backslash first to prevent escape bypass)."""
+    return query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def highlight_text(
+    value: Optional[str],
+    query: str,
+    start_tag: str,
+    end_tag: str,
+    max_chars: int,
+) -> Optional[str]:
+    """
+    Build a snippet of value around the first match with every term highlighted.
+
+    Used in LIKE fallback mode, mirroring paradedb.snippet output.
+
+    Args:
+        value: Field text
+        query: Search query (whitespace-separated terms)
+        start_tag: Tag before each match
+        end_tag: Tag after each match
+        max_chars: Maximum snippet length (before tags)
+
+    Returns:
+        Highlighted snippet, or None if no term matches
+    """
+    terms = [term for term in query.split() if term]
+    if not value or not terms:
+        return None
+
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    first = pattern.search(value)
+    if first is None:
+        return None
+
+    # Window of max_chars starting a little before the first match
+    start = max(0, min(first.start() - max_chars // 4, len(value) - max_chars))
+    window = value[start:start + max_chars]
+
+    return pattern.sub(lambda match: f"{start_tag}{match.group(0)}{end_tag}", window)
+
+
+def _material_match(use_pg_search: bool):
+    """Match predicate on :query (BM25) or :pattern (ILIKE)."""
+    if use_pg_search:
+        return Material.id.op("@@@")(func.paradedb.parse(bindparam("query", type_=String)))
+    pattern = bindparam("pattern")
+    return or_(
+        Material.material_number.ilike(pattern, escape='\\'),
+        Material.material_name.ilike(pattern, escape='\\'),
+        Material.description.ilike(pattern, escape='\\'),
+    )
+
+
+def _material_filter_predicates(shape: Tuple[str, ...]) -> Dict[str, object]:
+    """Predicate per set filter, bound by name (lists expand at execution)."""
+    predicates = {}
+    for name in shape:
+        column = getattr(Material, name)
+        if name in ("plant_id", "is_active"):
+            predicates[name] = column == bindparam(name)
+        else:
+            predicates[name] = column.in_(bindparam(name, expanding=True))
+    return predicates
+
+
+def _material_sort_key(use_pg_search: bool, sort: str):
+    """(sort expression, descending) for a sort name."""
+    if sort == "relevance":
+        if use_pg_search:
+            return func.paradedb.score(Material.id, type_=Float), True
+        return Material.material_number, False
+    if sort == "newest":
+        return Material.created_at, True
+    return getattr(Material, sort), False
+
+
+@lru_cache(maxsize=256)
+def _material_page_statement(use_pg_search: bool, sort: str, shape: Tuple[str, ...], after: bool):
+    """
+    Page query for one query shape.
+
+    Values are bind parameters, so one statement serves every query of the
+    shape: it is built once here, compiled once by SQLAlchemy's compiled
+    cache, and the database sees identical SQL text.
+    """
+    key, descending = _material_sort_key(use_pg_search, sort)
+    ranked = select(*MATERIAL_RESULT_COLUMNS, key.label("sort_key")).where(
+        Material.organization_id == bindparam("org_id"),
+        _material_match(use_pg_search),
+        *_material_filter_predicates(shape).values(),
+    )
+    if use_pg_search and sort == "relevance":
+        # Score each match once; the keyset condition then compares plain values
+        ranked = ranked.cte("ranked").prefix_with("MATERIALIZED")
+    else:
+        ranked = ranked.subquery("ranked")
+
+    position = tuple_(ranked.c.sort_key, ranked.c.id)
+    stmt = select(ranked)
+    if after:
+        bound = tuple_(bindparam("after_key", type_=key.type), bindparam("after_id", type_=Integer))
+        stmt = stmt.where(position < bound if descending else position > bound)
+
+    order = [ranked.c.sort_key, ranked.c.id]
+    if descending:
+        order = [desc(column) for column in order]
+    return stmt.order_by(*order).limit(bindparam("page_size", type_=Integer))
+
+
+@lru_cache(maxsize=256)
+def _material_facet_statement(use_pg_search: bool, shape: Tuple[str, ...]):
+    """
+    Total and facet counts for one query shape, in one GROUPING SETS query.
+
+    Each facet is counted with every filter except its own, so the counts
+    show what selecting another value of that facet would return.
+    """
+    predicates = _material_filter_predicates(shape)
+
+    def count_where(names):
+        conditions = [predicates[name] for name in names]
+        return func.count().filter(and_(*conditions)) if conditions else func.count()
+
+    columns = [getattr(Material, name) for name in MATERIAL_FACET_FIELDS]
+    return select(
+        *columns,
+        *[func.grouping(column).label(f"{name}_grouping") for name, column in zip(MATERIAL_FACET_FIELDS, columns)],
+        *[count_where(n for n in predicates if n != name).label(f"{name}_count") for name in MATERIAL_FACET_FIELDS],
+        count_where(predicates).label("count"),
+    ).where(
+        Material.organization_id == bindparam("org_id"),
+        _material_match(use_pg_search),
+    ).group_by(
+        func.grouping_sets(*columns, text("()"))
+    )
+
+
+def _encode_cursor(sort: str, key, material_id: int) -> str:
+    """Opaque keyset cursor for the row after which the next page starts."""
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps([sort, key, material_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[object, int]:
+    """(sort key, material ID) from a cursor; ValueError if invalid or for another sort."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, key, material_id = json.loads(raw)
+        if cursor_sort == "newest":
+            key = datetime.fromisoformat(key)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError("Invalid search cursor")
+    if cursor_sort != sort or not isinstance(material_id, int):
+        raise ValueError("Search cursor does not match the requested sort")
+    return key, material_id
+
+
 class PgSearchService:
     """
     Full-text search service using ParadeDB pg_search (BM25).
@@ -84,17 +449,25 @@ class PgSearchService:
     Handles search index management and query execution.
     """
 
-    def __init__(self, db: Session, config: Optional[SearchConfig] = None):
+    def __init__(
+        self,
+        db: Session,
+        config: Optional[SearchConfig] = None,
+        cache: Optional[SearchResultCache] = None,
+    ):
         """
         Initialize search service.
 
         Args:
             db: SQLAlchemy database session
             config: Search configuration (default: fallback mode)
+            cache: Result cache (default: process-wide cache, used only when
+                config.cache_ttl_seconds > 0)
         """
         self._db = db
         self._config = config or SearchConfig()
         self._use_pg_search = self._config.use_pg_search
+        self._cache = cache or search_result_cache
 
     def search_materials(
         self,
@@ -102,6 +475,7 @@ class PgSearchService:
         organization_id: int,
         plant_id: Optional[int] = None,
         limit: Optional[int] = None,
+        highlight: bool = False,
     ) -> List[SearchResult]:
         """
         Search materials using BM25 ranking or LIKE fallback.
@@ -111,6 +485,7 @@ class PgSearchService:
             organization_id: Organization ID for RLS
             plant_id: Optional plant ID filter
             limit: Maximum results (default from config)
+            highlight: Include snippets with highlighted terms
 
         Returns:
             List of SearchResult with BM25 scores (if available)
@@ -129,33 +504,301 @@ class PgSearchService:
         # Validate limit
         validated_limit = self._config.validate_limit(limit)
 
+        cache_key = ("materials", self._use_pg_search, query, plant_id, validated_limit, highlight)
+        cached = self._cache_get(organization_id, cache_key)
+        if cached is not None:
+            return cached
+
         # Execute search based on configuration
         if self._use_pg_search:
-            return self._search_with_pg_search(
-                query, organization_id, plant_id, validated_limit
+            results = self._search_with_pg_search(
+                query, organization_id, plant_id, validated_limit, highlight
             )
         else:
-            return self._search_with_like_fallback(
-                query, organization_id, plant_id, validated_limit
+            results = self._search_with_like_fallback(
+                query, organization_id, plant_id, validated_limit, highlight
             )
 
+        self._cache_set(organization_id, cache_key, results)
+        return results
+
+    def facet_materials(
+        self,
+        query: str,
+        organization_id: int,
+        plant_id: Optional[int] = None,
+    ) -> SearchFacets:
+        """
+        Count matching materials per procurement type, plant and category.
+
+        All facets come from one GROUPING SETS query over the matches.
+
+        Args:
+            query: Search query string
+            organization_id: Organization ID for RLS
+            plant_id: Optional plant ID filter
+
+        Returns:
+            SearchFacets with counts ordered by count descending
+        """
+        if not query or not query.strip():
+            return SearchFacets()
+
+        query = query.strip()
+
+        cache_key = ("facets", self._use_pg_search, query, plant_id)
+        cached = self._cache_get(organization_id, cache_key)
+        if cached is not None:
+            return cached
+
+        columns = [getattr(Material, name) for name in FACET_FIELDS]
+        stmt = select(
+            *columns,
+            *[func.grouping(column).label(f"{name}_grouping") for name, column in zip(FACET_FIELDS, columns)],
+            func.count().label("count"),
+        ).where(
+            *self._material_filters(query, organization_id, plant_id)
+        ).group_by(
+            # Empty set () yields the total
+            func.grouping_sets(*columns, text("()"))
+        )
+
+        facets = SearchFacets()
+        for row in self._db.execute(stmt).fetchall():
+            grouped = [name for name in FACET_FIELDS if getattr(row, f"{name}_grouping") == 0]
+            if not grouped:
+                facets.total = row.count
+                continue
+            value = getattr(row, grouped[0])
+            getattr(facets, grouped[0]).append(
+                FacetCount(value=getattr(value, "value", value), count=row.count)
+            )
+
+        for name in FACET_FIELDS:
+            getattr(facets, name).sort(key=lambda facet: facet.count, reverse=True)
+
+        self._cache_set(organization_id, cache_key, facets)
+        return facets
+
+    def query_materials(
+        self,
+        query: str,
+        organization_id: int,
+        filters: Optional[MaterialFilters] = None,
+        sort: str = "relevance",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_counts: bool = True,
+    ) -> MaterialPage:
+        """
+        Filtered, sorted material search with keyset pagination.
+
+        Filters, sort and page boundary are all part of the SQL, so every page
+        is full (up to limit) however selective the filters are. Pages are
+        keyed on (sort value, id): the next page starts after the last row
+        instead of skipping an OFFSET, so deep pages cost the same as the first.
+
+        Args:
+            query: Search query string
+            organization_id: Organization ID for RLS
+            filters: Plant, category, procurement type, MRP type and active filters
+            sort: One of MATERIAL_SORTS
+            limit: Page size (default from config)
+            cursor: next_cursor of the previous page (None for the first page)
+            with_counts: Include total and facet counts
+
+        Returns:
+            MaterialPage with items, total, facets and the next cursor
+
+        Raises:
+            ValueError: On an unknown sort or an invalid cursor
+        """
+        if sort not in MATERIAL_SORTS:
+            raise ValueError(f"Unsupported sort '{sort}'; expected one of {list(MATERIAL_SORTS)}")
+        after = _decode_cursor(cursor, sort) if cursor else None
+
+        if not query or not query.strip():
+            return MaterialPage(total=0 if with_counts else None, facets=SearchFacets() if with_counts else None)
+
+        query = query.strip()
+        filters = filters or MaterialFilters()
+        limit = self._config.validate_limit(limit)
+
+        cache_key = ("page", self._use_pg_search, query, filters, sort, limit, cursor)
+        page = self._cache_get(organization_id, cache_key)
+        if page is None:
+            page = self._material_page(query, organization_id, filters, sort, limit, after, cursor)
+            self._cache_set(organization_id, cache_key, page)
+
+        if with_counts:
+            facets = self._material_page_facets(query, organization_id, filters)
+            page = MaterialPage(items=page.items, total=facets.total, facets=facets, next_cursor=page.next_cursor)
+        return page
+
+    def search_all(
+        self,
+        query: str,
+        organization_id: int,
+        plant_id: Optional[int] = None,
+        entities: Sequence[str] = SEARCH_ENTITIES,
+        limit_per_entity: int = 5,
+    ) -> Dict[str, List[EntityHit]]:
+        """
+        Search materials, work orders and lots in one UNION ALL query.
+
+        Materials use BM25 when enabled; work orders and lots match on their
+        numbers (trigram-indexed ILIKE). Each entity is limited separately.
+
+        Args:
+            query: Search query string
+            organization_id: Organization ID for RLS
+            plant_id: Optional plant ID filter
+            entities: Entities to search (subset of SEARCH_ENTITIES)
+            limit_per_entity: Maximum hits per entity
+
+        Returns:
+            Dict of entity -> hits (every requested entity present)
+        """
+        unknown = set(entities) - set(SEARCH_ENTITIES)
+        if unknown:
+            raise ValueError(f"Unsupported search entities: {sorted(unknown)}")
+
+        if not query or not query.strip() or not entities or limit_per_entity <= 0:
+            return {entity: [] for entity in entities}
+
+        query = query.strip()
+        limit_per_entity = self._config.validate_limit(limit_per_entity)
+
+        cache_key = ("all", self._use_pg_search, query, plant_id, tuple(entities), limit_per_entity)
+        cached = self._cache_get(organization_id, cache_key)
+        if cached is not None:
+            return cached
+
+        branches = []
+        for entity in entities:
+            if entity == "materials":
+                entity = "materials_bm25" if self._use_pg_search else "materials_like"
+            branches.append(_ENTITY_SQL[entity])
+
+        escaped = escape_like(query)
+        rows = self._db.execute(
+            text(" UNION ALL ".join(branches)),
+            {
+                "query": query,
+                "pattern": f"%{escaped}%",
+                "prefix": f"{escaped}%",
+                "org_id": organization_id,
+                "plant_id": plant_id,
+                "entity_limit": limit_per_entity,
+            },
+        ).fetchall()
+
+        hits: Dict[str, List[EntityHit]] = {entity: [] for entity in entities}
+        for row in rows:
+            hits[row.entity].append(EntityHit(
+                entity=row.entity,
+                id=row.id,
+                code=row.code,
+                title=row.title,
+                plant_id=row.plant_id,
+                score=float(row.score) if row.score is not None else None,
+            ))
+
+        self._cache_set(organization_id, cache_key, hits)
+        return hits
+
+    def suggest_materials(
+        self,
+        prefix: str,
+        organization_id: int,
+        plant_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[EntityHit]:
+        """
+        Type-ahead: materials whose number or name starts with prefix.
+
+        Prefix matches on lower(material_number) / lower(material_name) are
+        served by text_pattern_ops indexes, so latency does not grow with
+        catalog size.
+
+        Args:
+            prefix: Typed prefix
+            organization_id: Organization ID for RLS
+            plant_id: Optional plant ID filter
+            limit: Maximum suggestions (default: config.suggest_limit)
+
+        Returns:
+            List of EntityHit ordered by material number
+        """
+        if not prefix or not prefix.strip():
+            return []
+
+        prefix = prefix.strip()
+        limit = min(limit or self._config.suggest_limit, self._config.max_limit)
+
+        cache_key = ("suggest", prefix.lower(), plant_id, limit)
+        cached = self._cache_get(organization_id, cache_key)
+        if cached is not None:
+            return cached
+
+        pattern = f"{escape_like(prefix.lower())}%"
+        stmt = select(
+            Material.id, Material.material_number, Material.material_name, Material.plant_id
+        ).where(
+            Material.organization_id == organization_id,
+            or_(
+                func.lower(Material.material_number).like(pattern, escape='\\'),
+                func.lower(Material.material_name).like(pattern, escape='\\'),
+            ),
+        )
+        if plant_id is not None:
+            stmt = stmt.where(Material.plant_id == plant_id)
+
+        rows = self._db.execute(stmt.order_by(Material.material_number).limit(limit)).fetchall()
+
+        suggestions = [
+            EntityHit(
+                entity="materials",
+                id=row.id,
+                code=row.material_number,
+                title=row.material_name,
+                plant_id=row.plant_id,
+            )
+            for row in rows
+        ]
+
+        self._cache_set(organization_id, cache_key, suggestions)
+        return suggestions
+
+    def invalidate_cache(self, organization_id: Optional[int] = None) -> None:
+        """
+        Drop cached search results (e.g. after bulk material changes).
+
+        Args:
+            organization_id: Tenant to invalidate (None = all tenants)
+        """
+        self._cache.invalidate(organization_id)
+
     def _search_with_pg_search(
         self,
         query: str,
         organization_id: int,
         plant_id: Optional[int],
         limit: int,
+        highlight: bool = False,
     ) -> List[SearchResult]:
         """
         Execute BM25 search using pg_search extension.
 
-        Uses ParadeDB BM25 index for relevance ranking.
+        Uses ParadeDB BM25 index for relevance ranking. Results are built from
+        the ranked rows themselves; no per-hit lookups.
 
         Args:
             query: Search query
             organization_id: Organization ID
             plant_id: Optional plant filter
             limit: Maximum results
+            highlight: Include paradedb.snippet output
 
         Returns:
             List of SearchResult with BM25 scores
@@ -163,38 +806,48 @@ class PgSearchService:
         Raises:
             ProgrammingError: If pg_search index not available
         """
-        # Build pg_search query using ParadeDB syntax
-        # SELECT * FROM material WHERE material @@@ 'query' ORDER BY paradedb.score(id) DESC
-
-        sql_query = text("""
-            SELECT
-                m.*,
-                paradedb.score(m.id) as paradedb_score
-            FROM material m
-            WHERE m.materials_search_idx @@@ :query
-                AND m.organization_id = :org_id
-                AND (:plant_id IS NULL OR m.plant_id = :plant_id)
-            ORDER BY paradedb_score DESC
-            LIMIT :limit
-        """)
+        # SELECT <columns>, paradedb.score(id) FROM material
+        # WHERE id @@@ paradedb.parse('query') ORDER BY score DESC LIMIT n
+        score = func.paradedb.score(Material.id).label("paradedb_score")
+        snippets = []
+        if highlight:
+            snippets = [
+                func.paradedb.snippet(
+                    Material.material_name,
+                    self._config.highlight_start_tag,
+                    self._config.highlight_end_tag,
+                    self._config.snippet_max_chars,
+                ).label("material_name_snippet"),
+                func.paradedb.snippet(
+                    Material.description,
+                    self._config.highlight_start_tag,
+                    self._config.highlight_end_tag,
+                    self._config.snippet_max_chars,
+                ).label("description_snippet"),
+            ]
 
-        params = {
-            "query": query,
-            "org_id": organization_id,
-            "plant_id": plant_id,
-            "limit": limit,
-        }
+        stmt = select(*MATERIAL_RESULT_COLUMNS, score, *snippets).where(
+            *self._material_filters(query, organization_id, plant_id)
+        ).order_by(desc(score)).limit(limit)
 
         try:
-            result = self._db.execute(sql_query, params)
-            rows = result.fetchall()
+            rows = self._db.execute(stmt).fetchall()
 
             results = []
             for row in rows:
-                material = self._db.query(Material).filter(Material.id == row.id).first()
-                if material:
-                    score = float(row.paradedb_score) if hasattr(row, 'paradedb_score') else None
-                    results.append(SearchResult.from_material(material, score=score))
+                highlights = None
+                if highlight:
+                    highlights = {
+                        name: getattr(row, f"{name}_snippet")
+                        for name in ("material_name", "description")
+                        if getattr(row, f"{name}_snippet", None)
+                    }
+                score_value = getattr(row, "paradedb_score", None)
+                results.append(SearchResult.from_material(
+                    row,
+                    score=float(score_value) if score_value is not None else None,
+                    highlights=highlights,
+                ))
 
             logger.info(
                 f"pg_search query '{query}' returned {len(results)} results "
@@ -212,6 +865,7 @@ class PgSearchService:
         organization_id: int,
         plant_id: Optional[int],
         limit: int,
+        highlight: bool = False,
     ) -> List[SearchResult]:
         """
         Execute fallback search using LIKE queries.
@@ -223,14 +877,11 @@ class PgSearchService:
             organization_id: Organization ID
             plant_id: Optional plant filter
             limit: Maximum results
+            highlight: Include snippets (computed in Python)
 
         Returns:
             List of SearchResult without BM25 scores
         """
-        # Escape LIKE special characters to prevent SQL injection
-        query_escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
-        search_pattern = f"%{query_escaped}%"
-
         # Build LIKE query
         db_query = self._db.query(Material).filter(
             Material.organization_id == organization_id
@@ -240,17 +891,16 @@ class PgSearchService:
             db_query = db_query.filter(Material.plant_id == plant_id)
 
         # Search across multiple fields
-        db_query = db_query.filter(
-            or_(
-                Material.material_number.ilike(search_pattern, escape='\\'),
-                Material.material_name.ilike(search_pattern, escape='\\'),
-                Material.description.ilike(search_pattern, escape='\\'),
-            )
-        )
+        db_query = db_query.filter(self._like_predicate(query))
 
         materials = db_query.limit(limit).all()
 
-        results = [SearchResult.from_material(m, score=None) for m in materials]
+        results = [
+            SearchResult.from_material(
+                m, score=None, highlights=self._highlights(m, query) if highlight else None
+            )
+            for m in materials
+        ]
 
         logger.info(
             f"LIKE fallback query '{query}' returned {len(results)} results "
@@ -258,3 +908,125 @@ class PgSearchService:
         )
 
         return results
+
+    def _material_page(
+        self,
+        query: str,
+        organization_id: int,
+        filters: MaterialFilters,
+        sort: str,
+        limit: int,
+        after: Optional[Tuple[object, int]],
+        cursor: Optional[str],
+    ) -> MaterialPage:
+        """Fetch one page (limit + 1 rows, the extra one only signals a next page)."""
+        stmt = _material_page_statement(self._use_pg_search, sort, filters.shape(), after is not None)
+        params = {
+            **self._match_params(query),
+            **filters.params(),
+            "org_id": organization_id,
+            "page_size": limit + 1,
+        }
+        if after is not None:
+            params["after_key"], params["after_id"] = after
+
+        rows = self._db.execute(stmt, params).fetchall()
+        scored = self._use_pg_search and sort == "relevance"
+        items = [
+            SearchResult.from_material(row, score=float(row.sort_key) if scored else None)
+            for row in rows[:limit]
+        ]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = _encode_cursor(sort, last.sort_key, last.id)
+
+        logger.info(
+            f"Material query '{query}' returned {len(items)} results "
+            f"(org={organization_id}, filters={filters.shape()}, sort={sort}, after={cursor is not None})"
+        )
+        return MaterialPage(items=items, next_cursor=next_cursor)
+
+    def _material_page_facets(self, query: str, organization_id: int, filters: MaterialFilters) -> SearchFacets:
+        """Total and facet counts of a material query, shared by all its pages."""
+        cache_key = ("page_facets", self._use_pg_search, query, filters)
+        cached = self._cache_get(organization_id, cache_key)
+        if cached is not None:
+            return cached
+
+        stmt = _material_facet_statement(self._use_pg_search, filters.shape())
+        params = {**self._match_params(query), **filters.params(), "org_id": organization_id}
+
+        facets = SearchFacets()
+        for row in self._db.execute(stmt, params).fetchall():
+            grouped = [name for name in MATERIAL_FACET_FIELDS if getattr(row, f"{name}_grouping") == 0]
+            if not grouped:
+                facets.total = row.count
+                continue
+            name = grouped[0]
+            count = getattr(row, f"{name}_count")
+            if count:
+                value = getattr(row, name)
+                getattr(facets, name).append(FacetCount(value=getattr(value, "value", value), count=count))
+
+        for name in MATERIAL_FACET_FIELDS:
+            getattr(facets, name).sort(key=lambda facet: facet.count, reverse=True)
+
+        self._cache_set(organization_id, cache_key, facets)
+        return facets
+
+    def _match_params(self, query: str) -> Dict[str, str]:
+        """Bind parameters of the match predicate."""
+        if self._use_pg_search:
+            return {"query": query}
+        return {"pattern": f"%{escape_like(query)}%"}
+
+    def _material_filters(self, query: str, organization_id: int, plant_id: Optional[int]) -> list:
+        """Tenant, plant and match predicates shared by search and facets."""
+        filters = [Material.organization_id == organization_id]
+        if plant_id is not None:
+            filters.append(Material.plant_id == plant_id)
+
+        if self._use_pg_search:
+            filters.append(Material.id.op("@@@")(func.paradedb.parse(query)))
+        else:
+            filters.append(self._like_predicate(query))
+        return filters
+
+    @staticmethod
+    def _like_predicate(query: str):
+        """ILIKE over number, name and description with escaped wildcards."""
+        # Escape LIKE special characters to prevent SQL injection
+        search_pattern = f"%{escape_like(query)}%"
+        return or_(
+            Material.material_number.ilike(search_pattern, escape='\\'),
+            Material.material_name.ilike(search_pattern, escape='\\'),
+            Material.description.ilike(search_pattern, escape='\\'),
+        )
+
+    def _highlights(self, material: Material, query: str) -> Dict[str, str]:
+        """Snippets for name and description in LIKE fallback mode."""
+        highlights = {}
+        for name in ("material_name", "description"):
+            snippet = highlight_text(
+                getattr(material, name, None),
+                query,
+                self._config.highlight_start_tag,
+                self._config.highlight_end_tag,
+                self._config.snippet_max_chars,
+            )
+            if snippet:
+                highlights[name] = snippet
+        return highlights
+
+    def _cache_get(self, organization_id: int, key):
+        """Cached value for key, or None when caching is disabled or missed."""
+        if self._config.cache_ttl_seconds <= 0:
+            return None
+        return self._cache.get(organization_id, key)
+
+    def _cache_set(self, organization_id: int, key, value) -> None:
+        """Cache value for the configured TTL (no-op when disabled)."""
+        if self._config.cache_ttl_seconds > 0:
+            self._cache.set(organization_id, key, value, self._config.cache_ttl_seconds)
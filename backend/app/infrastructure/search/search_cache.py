@@ -0,0 +1,107 @@
+"""
+Search result cache - short-TTL, per-tenant, in-process.
+
+Type-ahead issues the same queries many times within seconds; serving
+repeats from memory avoids a database round trip per keystroke. Entries are
+partitioned by organization so a tenant can be invalidated on its own.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+
+class SearchResultCache:
+    """
+    LRU cache of search results with per-entry TTL.
+
+    Thread-safe; bounded by max_entries across all tenants.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum cached queries (least recently used evicted)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, organization_id: int, key: Hashable) -> Optional[Any]:
+        """
+        Get cached value.
+
+        Args:
+            organization_id: Tenant owning the entry
+            key: Query key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        cache_key = (organization_id, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[cache_key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, organization_id: int, key: Hashable, value: Any, ttl_seconds: float) -> None:
+        """
+        Cache value for ttl_seconds.
+
+        Args:
+            organization_id: Tenant owning the entry
+            key: Query key
+            value: Value to cache
+            ttl_seconds: Time to live
+        """
+        cache_key = (organization_id, key)
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, organization_id: int, key: Hashable) -> None:
+        """
+        Drop one cached entry (no-op if missing).
+
+        Args:
+            organization_id: Tenant owning the entry
+            key: Query key
+        """
+        with self._lock:
+            self._entries.pop((organization_id, key), None)
+
+    def invalidate(self, organization_id: Optional[int] = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            organization_id: Tenant to invalidate (None = all tenants)
+        """
+        with self._lock:
+            if organization_id is None:
+                self._entries.clear()
+                return
+            for cache_key in [k for k in self._entries if k[0] == organization_id]:
+                del self._entries[cache_key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry count and hit/miss counters."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Process-wide cache shared by PgSearchService instances (one per request)
+search_result_cache = SearchResultCache()
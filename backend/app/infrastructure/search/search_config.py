@@ -36,6 +36,21 @@ class SearchConfig:
     fuzzy_distance: int = 2
     """Maximum edit distance for fuzzy matching (default: 2)."""
 
+    highlight_start_tag: str = "<b>"
+    """Tag inserted before each matched term in snippets."""
+
+    highlight_end_tag: str = "</b>"
+    """Tag inserted after each matched term in snippets."""
+
+    snippet_max_chars: int = 150
+    """Maximum snippet length in characters."""
+
+    cache_ttl_seconds: int = 0
+    """Per-tenant result cache TTL in seconds (default: 0, disabled; ~30 in production)."""
+
+    suggest_limit: int = 10
+    """Default maximum type-ahead suggestions."""
+
     def validate_limit(self, limit: Optional[int]) -> int:
         """
         Validate and normalize limit parameter.
@@ -7,6 +7,8 @@ from app.presentation.middleware import (
     RequestIDMiddleware,
     RateLimitMiddleware,
 )
+from app.presentation.middleware.rate_limit_middleware import SubscriptionTierCache
+from app.infrastructure.cache.rate_limit_store import create_rate_limit_store
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -22,7 +24,11 @@ app.add_middleware(CORSMiddleware,
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.add_middleware(RateLimitMiddleware)
+app.add_middleware(
+    RateLimitMiddleware,
+    store=create_rate_limit_store(settings),
+    tier_cache=SubscriptionTierCache(ttl_seconds=settings.RATE_LIMIT_TIER_CACHE_SECONDS)
+)
 app.add_middleware(AuthMiddleware)
 app.add_middleware(RequestIDMiddleware)
 
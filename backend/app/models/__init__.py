@@ -106,6 +106,7 @@ from app.models.traceability import (
     SerialNumber,
     TraceabilityLink,
     GenealogyRecord,
+    RecallReportJob,
     SourceType,
     QualityStatusType,
     SerialStatus,
@@ -138,9 +139,10 @@ from app.models.subscription import (
     SubscriptionModel,
     SubscriptionUsageModel,
     InvoiceModel,
-    SubscriptionAddOnModel
+    SubscriptionAddOnModel,
+    StripeWebhookEventModel
 )
-from app.models.admin_audit_log import AdminAuditLogModel
+from app.models.admin_audit_log import AdminAuditLogModel, AdminAuditChainHead
 
 __all__ = [
     "User",
@@ -233,6 +235,7 @@ __all__ = [
     "SerialNumber",
     "TraceabilityLink",
     "GenealogyRecord",
+    "RecallReportJob",
     "SourceType",
     "QualityStatusType",
     "SerialStatus",
@@ -260,5 +263,7 @@ __all__ = [
     "SubscriptionUsageModel",
     "InvoiceModel",
     "SubscriptionAddOnModel",
-    "AdminAuditLogModel"
+    "StripeWebhookEventModel",
+    "AdminAuditLogModel",
+    "AdminAuditChainHead"
 ]
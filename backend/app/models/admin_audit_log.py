@@ -20,13 +20,19 @@ class AdminAuditLogModel(Base):
 
     Business Rules:
     - Immutable records (no updates/deletes after creation)
-    - Retained indefinitely for compliance
-    - Indexed for fast querying by admin, organization, action
+    - Partitioned by created_at (TimescaleDB hypertable, primary key
+      (id, created_at) in the database) and dropped after the retention period
+    - Indexed for fast querying by admin, target, action
+    - Hash-chained per organization when written by the audit sink:
+      entry_hash = sha256(prev_hash + event), so edits or deletions are evident
     """
     __tablename__ = "admin_audit_logs"
 
     id = Column(Integer, primary_key=True)
 
+    # Organization the action concerns (chain key; NULL = platform-wide)
+    organization_id = Column(Integer, nullable=True)
+
     # Admin performing action
     admin_user_id = Column(Integer, nullable=False, index=True)
 
@@ -41,12 +47,17 @@ class AdminAuditLogModel(Base):
     # Timestamp (immutable)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
 
+    # Hash chain (tamper evidence)
+    prev_hash = Column(String(64), nullable=True)
+    entry_hash = Column(String(64), nullable=True)
+
     __table_args__ = (
-        Index('idx_audit_admin_user', 'admin_user_id'),
-        Index('idx_audit_action', 'action'),
-        Index('idx_audit_target', 'target_type', 'target_id'),
+        # Filters of get_logs / get_resource_history, newest first
+        Index('idx_audit_target_created', 'target_type', 'target_id', 'created_at'),
+        Index('idx_audit_admin_created', 'admin_user_id', 'created_at'),
+        Index('idx_audit_action_created', 'action', 'created_at'),
         Index('idx_audit_created', 'created_at'),
-        Index('idx_audit_admin_action', 'admin_user_id', 'action'),  # Composite for user activity
+        Index('idx_audit_org_chain', 'organization_id', 'id'),  # Chain verification
     )
 
     def __repr__(self):
@@ -54,3 +65,21 @@ class AdminAuditLogModel(Base):
             f"<AdminAuditLog(admin_user_id={self.admin_user_id}, "
             f"action='{self.action}', target={self.target_type}:{self.target_id})>"
         )
+
+
+class AdminAuditChainHead(Base):
+    """
+    Last hash of each admin audit hash chain.
+
+    One row per organization (chain_key 0 = platform-wide actions). Writers
+    lock the row while appending, so each chain is extended by one writer at
+    a time.
+    """
+    __tablename__ = "admin_audit_chain_heads"
+
+    chain_key = Column(Integer, primary_key=True, autoincrement=False)
+    last_hash = Column(String(64), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<AdminAuditChainHead(chain_key={self.chain_key}, last_hash='{self.last_hash[:12]}')>"
@@ -142,3 +142,70 @@ class CostLayer(Base):
 
     def __repr__(self):
         return f"<CostLayer(material_id={self.material_id}, batch='{self.batch_number}', remaining={self.quantity_remaining}, cost={self.unit_cost})>"
+
+
+class CostLayerConsumption(Base):
+    """
+    Cost Layer Consumption entity - ledger of quantities issued from cost layers.
+
+    One row per layer touched by an issue, written by CostLayerEngine.
+    Rows are never deleted: reversing an issue returns the quantity to the
+    layer and stamps reversed_at, keeping the ledger auditable.
+    """
+    __tablename__ = "cost_layer_consumption"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, nullable=False, index=True)
+    plant_id = Column(Integer, nullable=False, index=True)
+    cost_layer_id = Column(Integer, ForeignKey('cost_layer.id', ondelete='CASCADE'), nullable=False, index=True)
+    material_id = Column(Integer, ForeignKey('material.id', ondelete='CASCADE'), nullable=False)
+    storage_location_id = Column(Integer, ForeignKey('storage_location.id', ondelete='CASCADE'), nullable=False)
+    costing_method = Column(Enum(CostingMethod), nullable=False)
+    quantity = Column(Numeric(15, 3), nullable=False)
+    unit_cost = Column(Numeric(15, 2), nullable=False)
+    issue_reference = Column(String(100), nullable=False)
+    consumed_at = Column(DateTime(timezone=True), nullable=False)
+    reversed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Constraints and indexes
+    __table_args__ = (
+        CheckConstraint('quantity > 0', name='chk_consumption_quantity_positive'),
+
+        # Reversal looks up the open rows of an issue
+        Index('idx_cost_layer_consumption_reference', 'issue_reference', 'reversed_at'),
+        Index('idx_cost_layer_consumption_material', 'material_id', 'consumed_at'),
+    )
+
+    def __repr__(self):
+        return f"<CostLayerConsumption(layer_id={self.cost_layer_id}, quantity={self.quantity}, reference='{self.issue_reference}')>"
+
+
+class MaterialLocationCost(Base):
+    """
+    Material Location Cost entity - moving average cost per material and location.
+
+    Maintained incrementally by CostLayerEngine: receipts (and reversed issues)
+    blend their cost into average_cost, issues only reduce quantity_on_hand.
+    """
+    __tablename__ = "material_location_cost"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, nullable=False, index=True)
+    plant_id = Column(Integer, nullable=False, index=True)
+    material_id = Column(Integer, ForeignKey('material.id', ondelete='CASCADE'), nullable=False)
+    storage_location_id = Column(Integer, ForeignKey('storage_location.id', ondelete='CASCADE'), nullable=False)
+    quantity_on_hand = Column(Numeric(15, 3), nullable=False, default=0)
+    average_cost = Column(Numeric(15, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Constraints and indexes
+    __table_args__ = (
+        CheckConstraint('quantity_on_hand >= 0', name='chk_location_cost_quantity_non_negative'),
+        CheckConstraint('average_cost >= 0', name='chk_location_cost_average_non_negative'),
+        UniqueConstraint('material_id', 'storage_location_id', name='uq_location_cost_material_location'),
+        Index('idx_material_location_cost_org_plant', 'organization_id', 'plant_id'),
+    )
+
+    def __repr__(self):
+        return f"<MaterialLocationCost(material_id={self.material_id}, location={self.storage_location_id}, avg={self.average_cost})>"
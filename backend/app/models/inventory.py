@@ -186,6 +186,7 @@ class InventoryTransaction(Base):
     transaction_date = Column(DateTime(timezone=True), nullable=False, index=True)
     posted_by_user_id = Column(Integer, nullable=False)
     notes = Column(String(500))
+    posting_id = Column(Integer, ForeignKey('inventory_posting.id', ondelete='SET NULL'), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
@@ -200,7 +201,42 @@ class InventoryTransaction(Base):
         Index('idx_transaction_date', 'transaction_date'),
         Index('idx_transaction_type', 'transaction_type'),
         Index('idx_transaction_date_type', 'transaction_date', 'transaction_type'),
+        Index('idx_transaction_posting', 'posting_id'),
     )
 
     def __repr__(self):
         return f"<InventoryTransaction(type='{self.transaction_type}', material_id={self.material_id}, qty={self.quantity}, date={self.transaction_date})>"
+
+
+class InventoryPosting(Base):
+    """
+    Inventory Posting entity - one batch of movements posted together.
+
+    Supports multi-tenant isolation via organization_id and plant_id (RLS).
+    Groups the transactions written by InventoryPostingService in a single
+    database transaction. idempotency_key (unique per organization) lets a
+    scanner retry a posting: the stored transactions are returned instead of
+    being posted twice. request_hash detects a key reused for other lines.
+    """
+    __tablename__ = "inventory_posting"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, nullable=False, index=True)
+    plant_id = Column(Integer, nullable=False, index=True)
+    idempotency_key = Column(String(100), nullable=True)
+    request_hash = Column(String(64), nullable=False)
+    transaction_reference = Column(String(100), nullable=False)
+    line_count = Column(Integer, nullable=False)
+    posted_by_user_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Relationships
+    transactions = relationship("InventoryTransaction", order_by="InventoryTransaction.id")
+
+    __table_args__ = (
+        UniqueConstraint('organization_id', 'idempotency_key', name='uq_inventory_posting_idempotency_key'),
+        Index('idx_inventory_posting_org_plant', 'organization_id', 'plant_id'),
+    )
+
+    def __repr__(self):
+        return f"<InventoryPosting(id={self.id}, reference='{self.transaction_reference}', lines={self.line_count})>"
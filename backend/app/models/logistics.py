@@ -389,6 +389,8 @@ class QRCodeScan(Base):
         Index('idx_qr_scan_entity', 'entity_type', 'entity_id'),
         Index('idx_qr_scan_user', 'scanned_by_user_id'),
         Index('idx_qr_scan_timestamp_org', 'scan_timestamp', 'organization_id', 'plant_id'),  # Time-series optimization
+        # Offline queue resends are skipped (see QRCodeScanRepository.create_batch)
+        Index('uq_qr_scan_device_code_timestamp', 'organization_id', 'device_id', 'scan_code', 'scan_timestamp', unique=True),
     )
 
     def resolve_entity(self) -> Optional[dict]:
@@ -1,7 +1,7 @@
 """
 Reporting and Dashboard models
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Text, Index, UniqueConstraint, CheckConstraint
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -77,12 +77,13 @@ class Report(Base):
     category = Column(String(100), nullable=True)
 
     # Report definition
-    # Structure: {
+    # Structure (compiled by app.application.services.report_query_engine): {
     #   "data_source": "production_logs|work_orders|ncr|etc",
-    #   "columns": [...],
-    #   "filters": [...],
-    #   "aggregations": [...],
-    #   "joins": [...]
+    #   "dimensions": [...],
+    #   "measures": [{"column": ..., "aggregation": ..., "alias": ...}],
+    #   "filters": [{"column": ..., "operator": ..., "value": ...}],
+    #   "time_grain": "day", "time_range": {"start": ..., "end": ...},
+    #   "sort": [...], "limit": ...
     # }
     query_definition = Column(JSONB, nullable=False)
 
@@ -211,6 +212,13 @@ class ReportExecution(Base):
     execution_time_ms = Column(Integer, nullable=True)
     rows_processed = Column(Integer, nullable=True)
 
+    # Background execution progress (written by the report execution worker)
+    progress_percent = Column(Integer, nullable=False, default=0, server_default='0')
+    estimated_rows = Column(BigInteger, nullable=True)  # Planner estimate used for progress
+    cancel_requested = Column(Boolean, nullable=False, default=False, server_default='false')
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Last claim or progress commit of the worker
+    claim_token = Column(String(36), nullable=True)  # Claim of the worker owning a RUNNING execution
+
     # Error handling
     error_message = Column(Text, nullable=True)
     error_stack_trace = Column(Text, nullable=True)
@@ -229,6 +237,7 @@ class ReportExecution(Base):
         Index('idx_report_executions_status', 'execution_status'),
         Index('idx_report_executions_started', 'started_at'),
         Index('idx_report_executions_trigger', 'trigger_type'),
+        Index('idx_report_executions_org_status', 'organization_id', 'execution_status'),
         CheckConstraint(
             "execution_status IN ('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', 'CANCELLED')",
             name='chk_execution_status_valid'
@@ -301,7 +310,8 @@ class Dashboard(Base):
     #   "widget_1": {
     #     "title": "OEE",
     #     "type": "kpi_card",
-    #     "data_source": "report_id|custom_query",
+    #     "data_source": report_id|"REPORT_CODE",
+    #     "query": {...},  // inline report query definition (instead of data_source)
     #     "refresh_interval": 300,  // seconds
     #     "config": {...}
     #   }
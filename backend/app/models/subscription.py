@@ -6,9 +6,11 @@ Maps to database tables:
 - subscription_usage
 - invoices
 - subscription_add_ons
+- stripe_webhook_events
+- platform_metrics_daily
 """
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Numeric,
+    Column, Integer, BigInteger, String, Boolean, Date, DateTime, Numeric, Text, JSON,
     ForeignKey, UniqueConstraint, Index, CheckConstraint
 )
 from sqlalchemy.orm import relationship
@@ -95,7 +97,8 @@ class SubscriptionUsageModel(Base):
     """
     Subscription usage tracking - Monitors resource consumption
 
-    Updated periodically (e.g., every 6 hours via pg_cron)
+    Updated periodically (e.g., every 6 hours via pg_cron): one row per
+    organization per snapshot slot (measured_at)
     Used to enforce subscription limits
     """
     __tablename__ = "subscription_usage"
@@ -118,6 +121,7 @@ class SubscriptionUsageModel(Base):
     __table_args__ = (
         Index('idx_subscription_usage_org_id', 'organization_id'),
         Index('idx_subscription_usage_measured_at', 'measured_at'),
+        UniqueConstraint('organization_id', 'measured_at', name='uq_subscription_usage_org_measured_at'),
     )
 
     def __repr__(self):
@@ -226,3 +230,79 @@ class SubscriptionAddOnModel(Base):
     def __repr__(self):
         status = "active" if self.removed_at is None else "removed"
         return f"<AddOn(type='{self.add_on_type}', qty={self.quantity}, status='{status}')>"
+
+
+class StripeWebhookEventModel(Base):
+    """
+    Stripe webhook event inbox - Durable record of every received event
+
+    Business Rules:
+    - One row per Stripe event (UNIQUE event_id) - retries are deduplicated
+    - Events are acknowledged once persisted and processed asynchronously
+    - Events for the same Stripe customer are applied in Stripe creation order
+    - status: received, processed, ignored, failed (retryable), dead (retries exhausted)
+    """
+    __tablename__ = "stripe_webhook_events"
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(String(255), unique=True, nullable=False, index=True)
+    event_type = Column(String(100), nullable=False, index=True)
+    stripe_customer_id = Column(String(255), nullable=True, index=True)
+    stripe_created_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Raw event as received (after signature verification)
+    payload = Column(JSON, nullable=False)
+
+    # Processing state
+    status = Column(String(20), default='received', nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    result_message = Column(Text, nullable=True)
+
+    # Timestamps
+    received_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('received', 'processed', 'ignored', 'failed', 'dead')",
+            name="check_webhook_event_status"
+        ),
+        Index('idx_webhook_events_customer_order', 'stripe_customer_id', 'stripe_created_at'),
+        Index('idx_webhook_events_status', 'status', 'received_at'),
+    )
+
+    def __repr__(self):
+        return f"<StripeWebhookEvent(event_id='{self.event_id}', type='{self.event_type}', status='{self.status}')>"
+
+
+class PlatformMetricsDailyModel(Base):
+    """
+    Platform metrics daily snapshot - MRR, signups, conversions and churn per day
+
+    Business Rules:
+    - One row per calendar day (UTC), written by the snapshot-platform-metrics job
+    - The current day is rewritten on every run; past days are final
+    - MRR is stored in cents, priced from PRICING_TIERS (annual billed / 12)
+    - Growth and MRR charts read this series instead of rescanning subscriptions
+    """
+    __tablename__ = "platform_metrics_daily"
+
+    metric_date = Column(Date, primary_key=True)
+
+    # Subscription state at end of day
+    mrr_cents = Column(BigInteger, default=0, nullable=False)
+    active_subscriptions = Column(Integer, default=0, nullable=False)
+    trial_subscriptions = Column(Integer, default=0, nullable=False)
+    total_organizations = Column(Integer, default=0, nullable=False)
+
+    # Flows during the day
+    signups = Column(Integer, default=0, nullable=False)
+    new_subscriptions = Column(Integer, default=0, nullable=False)
+    trial_conversions = Column(Integer, default=0, nullable=False)
+    churned_subscriptions = Column(Integer, default=0, nullable=False)
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<PlatformMetricsDaily(date='{self.metric_date}', mrr_cents={self.mrr_cents})>"
@@ -497,3 +497,50 @@ class GenealogyRecord(Base):
 
     def __repr__(self):
         return f"<GenealogyRecord(id={self.id}, {self.entity_type}:{self.entity_identifier}, op='{self.operation_type}')>"
+
+
+class RecallReportJob(Base):
+    """
+    Recall Report Job model.
+
+    Background recall report generation: the request is queued to PGMQ
+    (recall_reports) and a worker records progress and the finished report.
+    """
+    __tablename__ = 'recall_report_jobs'
+
+    id = Column(Integer, primary_key=True)
+    organization_id = Column(Integer, nullable=False, index=True)
+    requested_by = Column(Integer, nullable=False)
+
+    # RecallReportRequest as submitted
+    request = Column(JSONB, nullable=False)
+
+    # Progress
+    status = Column(String(20), nullable=False, default='QUEUED')  # QUEUED, RUNNING, COMPLETED, FAILED
+    progress_percent = Column(Integer, nullable=False, default=0)
+    stage = Column(String(100), nullable=True)
+
+    # Outcome
+    report = Column(JSONB, nullable=True)  # RecallReportResponse
+    error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Table constraints
+    __table_args__ = (
+        Index('idx_recall_report_jobs_org_created', 'organization_id', 'created_at'),
+        CheckConstraint(
+            "status IN ('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED')",
+            name='chk_recall_report_job_status_valid'
+        ),
+        CheckConstraint(
+            "progress_percent BETWEEN 0 AND 100",
+            name='chk_recall_report_job_progress_valid'
+        ),
+    )
+
+    def __repr__(self):
+        return f"<RecallReportJob(id={self.id}, status='{self.status}', progress={self.progress_percent})>"
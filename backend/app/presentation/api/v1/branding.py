@@ -16,11 +16,16 @@ from app.application.dtos.branding_dto import (
     EmailTemplateResponse,
     EmailRenderRequest,
     EmailRenderResponse,
+    EmailBulkRenderRequest,
+    EmailBulkRenderResponse,
+    EmailBulkSendResponse,
 )
 from app.application.services.branding_service import (
     BrandingService,
     EmailTemplateService,
 )
+from app.infrastructure.messaging.pgmq_client import PGMQClient
+from app.infrastructure.messaging.pgmq_tasks import get_pgmq_client
 
 router = APIRouter(prefix="/branding", tags=["branding"])
 
@@ -312,6 +317,37 @@ def render_email_template(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/email-templates/render-bulk", response_model=EmailBulkRenderResponse)
+def render_email_template_bulk(
+    render_request: EmailBulkRenderRequest,
+    organization_id: int = Query(..., gt=0),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Render one email template for many recipients; failing recipients are listed in errors"""
+    service = EmailTemplateService(db)
+    try:
+        return service.render_bulk(organization_id, render_request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/email-templates/send-bulk", response_model=EmailBulkSendResponse, status_code=status.HTTP_202_ACCEPTED)
+def send_email_template_bulk(
+    send_request: EmailBulkRenderRequest,
+    organization_id: int = Query(..., gt=0),
+    db: Session = Depends(get_db),
+    pgmq_client: PGMQClient = Depends(get_pgmq_client),
+    current_user: dict = Depends(get_current_user)
+):
+    """Render one email template for many recipients and queue the emails for delivery"""
+    service = EmailTemplateService(db)
+    try:
+        return service.send_bulk(organization_id, send_request, pgmq_client)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.post("/email-templates/{template_id}/preview", response_model=Dict[str, str])
 def preview_email_template(
     template_id: int,
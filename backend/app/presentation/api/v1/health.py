@@ -5,6 +5,7 @@ Provides three types of health checks:
 1. /health - Simple ping (always returns 200 if service is running)
 2. /health/ready - Readiness probe (checks dependencies: database, MinIO, etc.)
 3. /health/live - Liveness probe (checks if application is alive)
+4. /health/rate-limits - Allowed/rejected request counters of this worker
 
 These endpoints are used by orchestration systems (Kubernetes, Docker Swarm, ECS)
 to determine service health and when to route traffic or restart containers.
@@ -165,6 +166,25 @@ async def liveness_check():
     }
 
 
+@router.get("/rate-limits", response_model=Dict[str, Any])
+async def rate_limit_metrics_check():
+    """
+    Rate limiter counters for this worker process.
+
+    Counts allowed and rejected requests per limit scope (ip_general,
+    ip_mutation, <tier>_general, <tier>_mutation, <tier>_route).
+
+    Returns:
+        dict: Counters per scope with timestamp
+    """
+    from app.presentation.middleware.rate_limit_middleware import rate_limit_metrics
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "scopes": rate_limit_metrics.snapshot()
+    }
+
+
 @router.get("/startup", response_model=Dict[str, Any])
 async def startup_check():
     """
@@ -5,10 +5,11 @@ Provides RESTful API for material transactions:
 - POST /api/v1/materials/{material_id}/receive - Goods receipt
 - POST /api/v1/materials/{material_id}/issue - Goods issue
 - POST /api/v1/materials/{material_id}/adjust - Inventory adjustment
+- POST /api/v1/materials/inventory-postings - Batched receipts, issues and transfers
 - GET /api/v1/materials/{material_id}/transactions - Transaction history
 - GET /api/v1/materials/{material_id}/inventory - Inventory balances
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, date
@@ -29,16 +30,25 @@ from app.application.use_cases.inventory import (
 from app.application.use_cases.inventory.receive_material import ReceiveMaterialDTO
 from app.application.use_cases.inventory.issue_material import IssueMaterialDTO
 from app.application.use_cases.inventory.adjust_inventory import AdjustInventoryDTO
+from app.application.services.inventory_posting_service import (
+    InventoryPostingService,
+    MovementType,
+    PostingLine
+)
 from app.presentation.schemas.inventory import (
     ReceiveMaterialRequest,
     IssueMaterialRequest,
     AdjustInventoryRequest,
+    InventoryPostingRequest,
+    InventoryPostingResponse,
+    PostedTransactionResponse,
     MaterialTransactionResponse,
     InventoryBalanceResponse,
     TransactionHistoryResponse,
     InventorySummaryResponse
 )
 from app.core.exceptions import (
+    ConflictException,
     EntityNotFoundException,
     ValidationException,
     InsufficientInventoryException,
@@ -78,6 +88,11 @@ def get_adjust_inventory_use_case(db: Session = Depends(get_db)) -> AdjustInvent
     return AdjustInventoryUseCase(db)
 
 
+def get_inventory_posting_service(db: Session = Depends(get_db)) -> InventoryPostingService:
+    """Dependency injection for InventoryPostingService."""
+    return InventoryPostingService(db)
+
+
 # ============================================================================
 # Material Transaction Endpoints
 # ============================================================================
@@ -333,6 +348,101 @@ def adjust_inventory(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.post("/inventory-postings", response_model=InventoryPostingResponse, status_code=status.HTTP_201_CREATED)
+def post_inventory(
+    request_data: InventoryPostingRequest,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=100),
+    service: InventoryPostingService = Depends(get_inventory_posting_service),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Post a batch of receipts, issues and transfers in one transaction.
+
+    ## Business Flow
+    1. Validates all materials, locations and costs with one query each
+    2. Locks the affected inventory records in a fixed order
+    3. Validates sufficient available quantity for the net change of each batch
+    4. Creates all transactions (transfers create TRANSFER_OUT and TRANSFER_IN)
+    5. Applies all inventory quantity changes and commits once
+
+    Either every line is posted or none is. Backflushing a work order posts
+    all its components in one request.
+
+    ## Idempotency
+    Send an idempotency key (body `idempotency_key` or `Idempotency-Key`
+    header) to make scanner retries safe: repeating a posting returns the
+    original transactions with `replayed: true` and status 200. Reusing a
+    key for different lines returns 409.
+
+    ## Permissions
+    - Requires: `materials.issue` permission
+    """
+    try:
+        # Get user context for RLS
+        user_context = get_user_context(request)
+        organization_id = user_context.get("organization_id")
+        plant_id = user_context.get("plant_id")
+        user_id = user_context.get("id")
+
+        # Set RLS context
+        _set_rls_context(db, organization_id, plant_id)
+
+        lines = [
+            PostingLine(
+                movement_type=MovementType(line.movement_type.value),
+                material_id=line.material_id,
+                storage_location_id=line.storage_location_id,
+                to_storage_location_id=line.to_storage_location_id,
+                quantity=line.quantity,
+                batch_number=line.batch_number,
+                unit_cost=line.unit_cost,
+                notes=line.notes
+            )
+            for line in request_data.lines
+        ]
+
+        result = service.post(
+            organization_id=organization_id,
+            plant_id=plant_id,
+            user_id=user_id,
+            lines=lines,
+            transaction_reference=request_data.transaction_reference,
+            idempotency_key=request_data.idempotency_key or idempotency_key,
+            transaction_date=request_data.transaction_date
+        )
+
+        if result.replayed:
+            response.status_code = status.HTTP_200_OK
+
+        return InventoryPostingResponse(
+            posting_id=result.posting_id,
+            replayed=result.replayed,
+            transactions=[PostedTransactionResponse.model_validate(t) for t in result.transactions]
+        )
+
+    except InsufficientInventoryException as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": e.message,
+                "material_code": e.material_code,
+                "requested": e.requested,
+                "available": e.available
+            }
+        )
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.message)
+    except ConflictException as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 @router.get("/{material_id}/transactions", response_model=TransactionHistoryResponse)
 def get_material_transactions(
     material_id: int,
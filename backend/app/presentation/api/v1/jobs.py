@@ -15,6 +15,7 @@ from app.infrastructure.persistence.database import get_db
 from app.infrastructure.jobs.job_runner import (
     track_usage_job,
     check_trial_expirations_job,
+    snapshot_platform_metrics_job,
     get_job_stats,
     JobResult,
 )
@@ -156,6 +157,50 @@ async def run_trial_expiration_job(
     }
 
 
+@router.post("/snapshot-platform-metrics")
+async def run_platform_metrics_snapshot_job(
+    authorized: bool = Depends(verify_internal_api_key),
+):
+    """
+    Execute platform metrics snapshot job
+
+    Writes daily MRR, signups, trial conversions and churn to
+    platform_metrics_daily for the platform admin growth and MRR charts.
+    Called by pg_cron daily shortly after midnight UTC.
+
+    **Cron Schedule**: `5 0 * * *` (daily at 00:05 UTC)
+
+    **pg_cron Command**:
+    ```sql
+    SELECT cron.schedule(
+        'snapshot-platform-metrics',
+        '5 0 * * *',
+        $$
+        SELECT net.http_post(
+            url := 'http://backend:8000/api/v1/jobs/snapshot-platform-metrics',
+            headers := '{"Content-Type": "application/json", "X-API-Key": "your-internal-api-key"}'
+        );
+        $$
+    );
+    ```
+
+    Returns:
+        JobResultResponse with execution summary
+    """
+    logger.info("Platform metrics snapshot job triggered via API")
+
+    result = snapshot_platform_metrics_job()
+
+    return {
+        "success": result.success,
+        "message": result.message,
+        "processed_count": result.processed_count,
+        "error_count": result.error_count,
+        "details": result.details,
+        "executed_at": result.executed_at.isoformat(),
+    }
+
+
 @router.get("/stats")
 async def get_job_statistics(
     db: Session = Depends(get_db),
@@ -190,7 +235,7 @@ async def trigger_all_jobs(
     logger.info("Manually triggering all jobs")
 
     usage_result = track_usage_job()
-    trial_result = check_trial_expiration_job()
+    trial_result = check_trial_expirations_job()
 
     return {
         "usage_tracking": {
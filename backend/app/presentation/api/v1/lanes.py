@@ -4,7 +4,7 @@ Handles production lane scheduling and capacity management
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 from app.core.database import get_db
@@ -17,15 +17,28 @@ from app.application.dtos.lane_dto import (
     LaneAssignmentUpdateRequest,
     LaneAssignmentResponse,
     LaneAssignmentListResponse,
-    LaneCapacityResponse
+    LaneCapacityResponse,
+    LaneCapacityCalendarResponse,
+    LaneCapacityHeatmapResponse,
+    LaneOverbookingResponse,
+    LaneSuggestionRequest,
+    LaneSuggestionResponse
 )
 from app.infrastructure.repositories.lane_repository import LaneRepository
+from app.application.services.lane_capacity_service import LaneCapacityService
+from app.application.services.schedule_conflict_service import ScheduleConflictService
 from app.domain.entities.lane import LaneAssignmentStatus
 
 
 router = APIRouter(prefix="/lanes", tags=["lanes"])
 
 
+def _with_conflicts(assignment, db: Session) -> LaneAssignmentResponse:
+    """Re-check the assignment's lane so planners see overloads as they schedule."""
+    conflicts = ScheduleConflictService(db).check_lane_assignment(assignment)
+    return LaneAssignmentResponse.model_validate(assignment).model_copy(update={"conflicts": conflicts})
+
+
 # ========================
 # Lane Endpoints
 # ========================
@@ -83,6 +96,92 @@ def list_lanes(
     )
 
 
+@router.get("/capacity/calendar", response_model=LaneCapacityCalendarResponse)
+def get_capacity_calendar(
+    plant_id: int = Query(..., gt=0),
+    start_date: date = Query(..., description="First day"),
+    end_date: date = Query(..., description="Last day (inclusive)"),
+    lane_ids: Optional[List[int]] = Query(None, description="Restrict to these lanes"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get allocated, available capacity and utilization per lane per day
+
+    Args:
+        plant_id: Plant ID
+        start_date: First day
+        end_date: Last day (inclusive, at most 366 days)
+        lane_ids: Optional lanes to restrict to
+        db: Database session
+
+    Returns:
+        Daily capacity of each active lane
+
+    Raises:
+        400: If the date range is invalid
+    """
+    try:
+        return LaneCapacityService(db).get_calendar(plant_id, start_date, end_date, lane_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/capacity/heatmap", response_model=LaneCapacityHeatmapResponse)
+def get_capacity_heatmap(
+    plant_id: int = Query(..., gt=0),
+    start_date: date = Query(..., description="First day"),
+    end_date: date = Query(..., description="Last day (inclusive)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the lane calendar heatmap (utilization rate per lane per day)
+
+    Args:
+        plant_id: Plant ID
+        start_date: First day
+        end_date: Last day (inclusive, at most 366 days)
+        db: Database session
+
+    Returns:
+        Dates and one utilization row per active lane
+
+    Raises:
+        400: If the date range is invalid
+    """
+    try:
+        return LaneCapacityService(db).get_heatmap(plant_id, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/capacity/overbookings", response_model=List[LaneOverbookingResponse])
+def get_overbookings(
+    plant_id: int = Query(..., gt=0),
+    start_date: date = Query(..., description="First day"),
+    end_date: date = Query(..., description="Last day (inclusive)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Find periods where lane allocations exceed lane capacity
+
+    Args:
+        plant_id: Plant ID
+        start_date: First day
+        end_date: Last day (inclusive, at most 366 days)
+        db: Database session
+
+    Returns:
+        Overbooked periods per lane
+
+    Raises:
+        400: If the date range is invalid
+    """
+    try:
+        return LaneCapacityService(db).find_overbookings(plant_id, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{lane_id}", response_model=LaneResponse)
 def get_lane(lane_id: int, db: Session = Depends(get_db)):
     """
@@ -194,7 +293,7 @@ def create_assignment(
         db: Database session
 
     Returns:
-        Created assignment
+        Created assignment, with the lane overloads it is part of
 
     Raises:
         400: If validation fails (lane not found, capacity exceeded, etc.)
@@ -202,7 +301,31 @@ def create_assignment(
     repo = LaneRepository(db)
     try:
         assignment = repo.create_assignment(dto)
-        return assignment
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _with_conflicts(assignment, db)
+
+
+@router.post("/assignments/suggest-lane", response_model=List[LaneSuggestionResponse])
+def suggest_lane(
+    request: LaneSuggestionRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Suggest lanes for a new assignment, best fit first
+
+    Args:
+        request: Plant, window, capacity and optional eligible lanes
+        db: Database session
+
+    Returns:
+        Lanes with enough capacity on every day of the window
+
+    Raises:
+        400: If the date range is invalid
+    """
+    try:
+        return LaneCapacityService(db).suggest_lanes(request)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -286,7 +409,7 @@ def update_assignment(
         db: Database session
 
     Returns:
-        Updated assignment
+        Updated assignment, with the lane overloads it is part of
 
     Raises:
         404: If assignment not found
@@ -298,7 +421,7 @@ def update_assignment(
             status_code=404,
             detail=f"Assignment {assignment_id} not found"
         )
-    return assignment
+    return _with_conflicts(assignment, db)
 
 
 @router.delete("/assignments/{assignment_id}", status_code=204)
@@ -35,6 +35,8 @@ from app.application.dtos.logistics_dto import (
     BarcodeLabelListResponse,
     BarcodeGenerateRequestDTO,
     QRCodeScanCreateDTO,
+    QRCodeScanBatchCreateDTO,
+    QRCodeScanBatchResponse,
     QRCodeScanResponse,
     QRCodeScanListResponse,
     ScanLookupResponse,
@@ -1284,7 +1286,7 @@ def record_scan(
         logger.info(f"Recording scan: {scan_data.scan_code} (user: {user_id})")
 
         # Lookup barcode to resolve entity
-        label = label_repo.get_by_value(scan_data.scan_code)
+        label = label_repo.get_by_value(scan_data.scan_code, organization_id=org_id)
 
         if label:
             scan_resolution = ScanResolution.SUCCESS
@@ -1331,6 +1333,72 @@ def record_scan(
         )
 
 
+@router.post(
+    "/scan/batch",
+    response_model=QRCodeScanBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Sync offline scan queue",
+    description="Record a batch of scans captured offline by a handheld device.",
+    responses={
+        201: {"description": "Scans recorded successfully"},
+        400: {"model": ValidationErrorResponse, "description": "Validation error"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+def record_scan_batch(
+    batch: QRCodeScanBatchCreateDTO,
+    service: LogisticsService = Depends(get_logistics_service),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Record a batch of scans from a handheld device's offline queue.
+
+    **Request Body:**
+    - scans: Up to 1000 scans, each with the fields of POST /scan plus
+      scan_timestamp (capture time on the device)
+
+    **Business Rules:**
+    - Codes are resolved to entities like POST /scan
+    - All scans are written in one transaction
+    - A scan already recorded (same device_id, scan_code and scan_timestamp)
+      is skipped, so the device can resend a batch after a lost response
+
+    **Returns:**
+    Counts of received, recorded, duplicate, resolved and not found scans.
+    """
+    try:
+        org_id = current_user.organization_id
+        user_id = current_user.id
+
+        logger.info(f"Recording {len(batch.scans)} batched scans (user: {user_id})")
+
+        result = service.ingest_scans(
+            org_id=org_id,
+            plant_id=current_user.plant_id,
+            scanned_by_user_id=user_id,
+            scans=[
+                {
+                    **scan.model_dump(exclude={"barcode_type"}),
+                    "barcode_type": scan.barcode_type.value if scan.barcode_type else None,
+                }
+                for scan in batch.scans
+            ],
+        )
+
+        return QRCodeScanBatchResponse(**result)
+
+    except ValueError as e:
+        logger.error(f"Validation error recording scan batch: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to record scan batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to record scan batch"
+        )
+
+
 @router.post(
     "/scan/lookup",
     response_model=ScanLookupResponse,
@@ -1371,7 +1439,7 @@ def lookup_barcode(
         logger.info(f"Looking up barcode: {scan_code}")
 
         # Lookup via service
-        entity = service.lookup_barcode(scan_code)
+        entity = service.lookup_barcode(scan_code, org_id=current_user.organization_id)
 
         if entity:
             # Get scan history for this code
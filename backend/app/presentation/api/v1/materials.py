@@ -22,6 +22,7 @@ from app.application.dtos.material_dto import (
     MaterialResponse,
     MaterialListResponse,
     MaterialSearchResult,
+    MaterialSearchPageResponse,
     ErrorResponse,
     ValidationErrorResponse,
     NotFoundErrorResponse,
@@ -29,6 +30,7 @@ from app.application.dtos.material_dto import (
     BarcodeResponse,
 )
 from app.models.material import Material, ProcurementType, MRPType
+from app.infrastructure.search.pg_search_service import MATERIAL_SORTS, MaterialFilters, PgSearchService
 from app.infrastructure.security.dependencies import get_user_context
 
 
@@ -43,6 +45,11 @@ def get_material_repository(db: Session = Depends(get_db)) -> MaterialRepository
     return MaterialRepository(db, use_pg_search=False)
 
 
+def get_search_service(db: Session = Depends(get_db)) -> PgSearchService:
+    """Dependency injection for PgSearchService"""
+    return PgSearchService(db)
+
+
 def map_material_to_response(material: Material) -> MaterialResponse:
     """Map Material entity to MaterialResponse DTO"""
     return MaterialResponse(
@@ -387,6 +394,10 @@ def list_materials(
 def search_materials(
     q: str = Query("", description="Search query string"),
     limit: int = Query(20, ge=1, le=100, description="Maximum results to return"),
+    category_id: Optional[int] = Query(None, description="Filter by material category"),
+    procurement_type: Optional[ProcurementType] = Query(None, description="Filter by procurement type"),
+    mrp_type: Optional[MRPType] = Query(None, description="Filter by MRP type"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
     repository: MaterialRepository = Depends(get_material_repository),
     user_context: dict = Depends(get_user_context),
 ):
@@ -395,6 +406,7 @@ def search_materials(
 
     Searches material_number, material_name, and description fields.
     Results are ranked by relevance (BM25) when pg_search is enabled.
+    Filters are applied in the query, so up to limit matching materials are returned.
     """
     try:
         logger.info(f"Searching materials: query='{q}', limit={limit}")
@@ -408,6 +420,10 @@ def search_materials(
             org_id=org_id,
             plant_id=plant_id,
             limit=limit,
+            category_id=category_id,
+            procurement_type=procurement_type.value if procurement_type else None,
+            mrp_type=mrp_type.value if mrp_type else None,
+            is_active=is_active,
         )
 
         # Map to response DTOs
@@ -421,6 +437,70 @@ def search_materials(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to search materials")
 
 
+@router.get(
+    "/search/page",
+    response_model=MaterialSearchPageResponse,
+    summary="Search materials with filters, facets and keyset pagination",
+    description=(
+        "Filtered, sorted material search. Returns full pages, the exact total, facet counts "
+        "and a cursor for the next page."
+    ),
+    responses={
+        200: {"description": "Search page retrieved successfully"},
+        400: {"model": ErrorResponse, "description": "Invalid sort or cursor"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    tags=["Materials"],
+)
+def search_materials_page(
+    q: str = Query("", description="Search query string"),
+    category_id: List[int] = Query([], description="Filter by material categories (any of)"),
+    procurement_type: List[ProcurementType] = Query([], description="Filter by procurement types (any of)"),
+    mrp_type: List[MRPType] = Query([], description="Filter by MRP types (any of)"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    sort: str = Query("relevance", description=f"Sort order: {', '.join(MATERIAL_SORTS)}"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    with_counts: bool = Query(True, description="Include total and facet counts"),
+    search_service: PgSearchService = Depends(get_search_service),
+    user_context: dict = Depends(get_user_context),
+):
+    """
+    Search materials one page at a time.
+
+    - **category_id / procurement_type / mrp_type**: repeat to match any of several values
+    - **sort**: relevance (BM25 score), material_number, material_name or newest
+    - **cursor**: pass next_cursor from the previous response to get the next page
+
+    Facet counts for a field ignore that field's own filter, so they show what
+    selecting another value would return.
+    """
+    try:
+        filters = MaterialFilters(
+            plant_id=user_context.get("plant_id"),
+            material_category_id=tuple(category_id),
+            procurement_type=tuple(value.value for value in procurement_type),
+            mrp_type=tuple(value.value for value in mrp_type),
+            is_active=is_active,
+        )
+        return search_service.query_materials(
+            query=q,
+            organization_id=user_context.get("organization_id"),
+            filters=filters,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            with_counts=with_counts,
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to search materials: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to search materials")
+
+
 @router.post(
     "/{material_id}/barcode",
     response_model=BarcodeResponse,
@@ -22,6 +22,7 @@ from app.infrastructure.security.admin_required import (
 )
 from app.domain.entities.user import User
 from app.application.services.platform_admin_service import PlatformAdminService
+from app.application.services.stripe_webhook_service import StripeWebhookService
 from app.infrastructure.logging.audit_logger import AuditLogger
 from app.presentation.schemas.platform_admin import (
     # Organization
@@ -50,6 +51,7 @@ from app.presentation.schemas.platform_admin import (
     AuditLogFilter,
     AuditLogResponse,
     AuditLogEntry,
+    WebhookReplayRequest,
     # General
     AdminActionResponse,
     OrganizationStatusFilter,
@@ -89,6 +91,8 @@ async def list_organizations(
     tier: Optional[str] = Query(None, description="Filter by subscription tier"),
     limit: int = Query(50, ge=1, le=200, description="Results per page"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
+    after_id: Optional[int] = Query(None, ge=0, description="Keyset cursor (next_after_id of the previous page)"),
+    fuzzy: bool = Query(False, description="Also match names by trigram similarity"),
     admin_user: User = Depends(require_platform_admin),
     db: Session = Depends(get_db),
     admin_service: PlatformAdminService = Depends(get_admin_service)
@@ -102,7 +106,7 @@ async def list_organizations(
     - Search by name, org_code, or subdomain
     - Filter by active status
     - Filter by subscription tier
-    - Pagination support
+    - Pagination support (offset, or keyset via after_id for deep pages)
 
     **Audit Logged**: Yes
 
@@ -112,6 +116,8 @@ async def list_organizations(
         tier: Filter by subscription tier
         limit: Results per page (1-200)
         offset: Pagination offset
+        after_id: Keyset cursor; takes precedence over offset
+        fuzzy: Enable trigram similarity matching for search
         admin_user: Authenticated admin user
         db: Database session
         admin_service: Admin service
@@ -129,7 +135,8 @@ async def list_organizations(
                 "status": status.value,
                 "tier": tier,
                 "limit": limit,
-                "offset": offset
+                "offset": offset,
+                "after_id": after_id
             },
             db=db
         )
@@ -139,7 +146,9 @@ async def list_organizations(
             status=status.value if status != OrganizationStatusFilter.ALL else None,
             tier=tier,
             limit=limit,
-            offset=offset
+            offset=offset,
+            after_id=after_id,
+            fuzzy=fuzzy
         )
 
         return OrganizationListResponse(
@@ -147,7 +156,8 @@ async def list_organizations(
             total_count=total_count,
             has_more=has_more,
             limit=limit,
-            offset=offset
+            offset=offset,
+            next_after_id=organizations[-1]["id"] if has_more and organizations else None
         )
 
     except Exception as e:
@@ -1003,3 +1013,70 @@ async def get_audit_logs(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get audit logs"
         )
+
+
+@router.post("/webhooks/stripe/replay", response_model=AdminActionResponse)
+async def replay_stripe_webhooks(
+    request: WebhookReplayRequest,
+    admin_user: User = Depends(require_platform_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Replay stored Stripe webhook events.
+
+    **Admin Access Required**: Platform administrators only
+
+    Selected events are reset and re-enqueued for the webhook worker.
+    Handlers are idempotent, so replaying processed events is safe.
+
+    **Audit Logged**: Yes (with reason)
+
+    Args:
+        request: Replay selection and reason
+        admin_user: Authenticated admin user
+        db: Database session
+
+    Returns:
+        AdminActionResponse with replayed event IDs
+
+    Raises:
+        HTTPException 400: No selection criteria given
+    """
+    if not (request.event_ids or request.statuses or request.since):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide event_ids, statuses or since"
+        )
+
+    try:
+        with AdminActionLogger(
+            admin_user=admin_user,
+            action="replay_stripe_webhooks",
+            target_type="stripe_webhook_event",
+            details={
+                "event_ids": request.event_ids,
+                "statuses": request.statuses,
+                "since": request.since.isoformat() if request.since else None,
+                "reason": request.reason
+            },
+            db=db
+        ):
+            replayed = StripeWebhookService(db).replay(
+                event_ids=request.event_ids,
+                statuses=request.statuses,
+                since=request.since,
+                limit=request.limit
+            )
+
+        return AdminActionResponse(
+            success=True,
+            message=f"Replayed {len(replayed)} webhook events",
+            details={"event_ids": replayed}
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to replay webhooks: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to replay webhook events"
+        )
@@ -30,6 +30,8 @@ from app.application.dtos.project_management_dto import (
     ProjectBOMResponse,
     DocumentVersionCreateDTO,
     MilestoneProgressUpdateDTO,
+    MilestoneScheduleResponse,
+    MilestoneScheduleWhatIfDTO,
 )
 
 router = APIRouter()
@@ -235,13 +237,49 @@ async def get_critical_path_milestones(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get critical path milestones"""
+    """Get critical path milestones (zero float, computed by CPM from milestone dependencies)"""
     service = ProjectMilestoneService(db)
 
-    milestones = service.get_critical_path(project_id)
+    try:
+        milestones = service.get_critical_path(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     return [ProjectMilestoneResponse.from_orm(m) for m in milestones]
 
 
+@router.get("/projects/{project_id}/milestones/schedule", response_model=List[MilestoneScheduleResponse],
+           tags=["project-milestones"])
+async def get_milestone_schedule(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get earliest/latest dates, total and free float of every milestone"""
+    service = ProjectMilestoneService(db)
+
+    try:
+        return service.get_schedule(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/projects/{project_id}/milestones/schedule/what-if", response_model=List[MilestoneScheduleResponse],
+            tags=["project-milestones"])
+async def what_if_milestone_schedule(
+    project_id: int,
+    dto: MilestoneScheduleWhatIfDTO,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Recompute the milestone schedule with changed durations (nothing is saved)"""
+    service = ProjectMilestoneService(db)
+
+    try:
+        return service.get_schedule(project_id, dto.durations)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/milestones/{milestone_id}", response_model=ProjectMilestoneResponse, tags=["project-milestones"])
 async def get_project_milestone(
     milestone_id: int,
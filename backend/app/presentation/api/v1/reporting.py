@@ -159,10 +159,12 @@ async def execute_report(
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Execute a report.
+    Queue a report execution.
 
-    **Returns:** 202 Accepted with execution details
-    **Note:** Large reports are executed asynchronously
+    **Returns:** 202 Accepted with the PENDING execution; poll
+    GET /executions/{execution_id} for progress and results
+    **Note:** CSV, XLSX and PDF exports are streamed to object storage
+    (result_file_path); other executions store their rows in result_data
     """
     service = ReportingService(db)
     user_id = current_user.get("id")
@@ -210,6 +212,29 @@ async def get_execution(
     return ReportExecutionResponse.from_orm(execution)
 
 
+@router.post("/executions/{execution_id}/cancel", response_model=ReportExecutionResponse, tags=["reports"])
+async def cancel_execution(
+    execution_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Cancel a report execution.
+
+    Pending executions are cancelled immediately; running ones stop at the
+    next chunk (cancel_requested is set until the worker does).
+    """
+    service = ReportingService(db)
+
+    try:
+        execution = service.cancel_execution(execution_id)
+        if not execution:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Execution not found")
+        return ReportExecutionResponse.from_orm(execution)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 # ========== Dashboard Endpoints ==========
 
 @router.post("/dashboards", response_model=DashboardResponse, status_code=status.HTTP_201_CREATED, tags=["dashboards"])
@@ -386,11 +411,16 @@ async def calculate_kpi(
     - DOWNTIME: Machine downtime
     - YIELD: Production yield
     - THROUGHPUT: Production throughput
+
+    The trend is the percent change from the previous period of the same
+    length. **breakdown_by** (plant, line, machine, shift, product) adds one
+    breakdown group per value of that dimension.
     """
     service = KPIService(db)
+    organization_id = current_user.get("organization_id")
 
     try:
-        result = service.calculate_kpi(request)
+        result = service.calculate_kpi(request, organization_id)
         return KPICalculationResponse(**result)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
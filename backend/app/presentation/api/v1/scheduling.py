@@ -3,15 +3,18 @@ Scheduling API Endpoints
 
 Provides RESTful API for Gantt chart visualization and schedule management:
 - GET /api/v1/scheduling/gantt - Get Gantt chart data
+- GET /api/v1/scheduling/gantt/stream - Stream a page of Gantt tasks (NDJSON)
 - GET /api/v1/scheduling/conflicts - Detect scheduling conflicts
 - POST /api/v1/scheduling/validate - Validate schedule constraints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import date
 
 from app.core.database import get_db
+from app.application.services.gantt_projection_service import DEFAULT_PAGE_SIZE, GanttProjectionService
 from app.infrastructure.security.dependencies import get_current_user, get_user_context, _set_rls_context
 from app.application.use_cases.scheduling import (
     GetGanttChartUseCase,
@@ -69,6 +72,8 @@ def get_gantt_chart(
     end_date: Optional[date] = Query(None, description="Filter by end date"),
     lane_ids: Optional[str] = Query(None, description="Comma-separated lane IDs"),
     include_completed: bool = Query(False, description="Include completed work orders"),
+    skip: int = Query(0, ge=0, description="Work orders to skip (viewport offset)"),
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Maximum work orders (viewport size)"),
     request: Request = None,
     use_case: GetGanttChartUseCase = Depends(get_gantt_chart_use_case),
     current_user: dict = Depends(get_current_user),
@@ -78,26 +83,28 @@ def get_gantt_chart(
     Get Gantt chart data for visual scheduling.
 
     ## Business Flow
-    1. Queries work orders matching filters (plant, date range, lanes, status)
-    2. For each work order, generates operation schedule using domain service
-    3. Aggregates all tasks into single Gantt chart
-    4. Detects lane conflicts (multiple WOs on same lane at same time)
-    5. Calculates critical path (longest sequence of dependent operations)
+    1. Projects all tasks of the matching work orders (plant, date range,
+       lanes, status) from one query, scheduling operations and computing
+       progress in the same pass
+    2. Detects lane, machine and operator conflicts
+    3. Runs the critical path method over the operation network: total and
+       free float per task against work order due dates
 
     ## Features
     - **Operation-level scheduling**: Shows individual operations within work orders
     - **Lane visualization**: Displays lane assignments for capacity planning
     - **Dependency tracking**: Shows predecessor relationships between operations
     - **Conflict detection**: Highlights overlapping lane assignments
-    - **Critical path**: Identifies bottleneck operations
+    - **Critical path**: Identifies zero-float operations, with slack for the rest
     - **Progress tracking**: Shows completion percentage for each task
 
     ## Query Parameters
     - **plant_id**: Filter by plant (optional)
-    - **start_date**: Show work orders starting >= this date
-    - **end_date**: Show work orders ending <= this date
+    - **start_date**: Show work orders planned to end on or after this date
+    - **end_date**: Show work orders planned to start on or before this date
     - **lane_ids**: Filter by specific lanes (comma-separated, e.g., "1,2,3")
     - **include_completed**: Include completed work orders (default: false)
+    - **skip** / **limit**: Page of work orders (ordered by planned start)
 
     ## Response Structure
     ```json
@@ -113,7 +120,9 @@ def get_gantt_chart(
           "dependencies": [122],
           "progress_percent": 0.0,
           "status": "PLANNED",
-          "is_critical_path": false
+          "is_critical_path": false,
+          "total_float_hours": 6.5,
+          "free_float_hours": 0.0
         }
       ],
       "conflicts": [...],
@@ -125,8 +134,8 @@ def get_gantt_chart(
     ## Business Rules
     - Work orders filtered by RLS (organization_id from JWT)
     - Only active lanes shown unless explicitly requested
-    - Critical path calculated using longest duration sequence
-    - Conflicts detected for overlapping lane assignments
+    - Critical path: tasks with zero or negative total float (CPM)
+    - Conflicts detected for overloaded lanes, work centers and operators
 
     ## Permissions
     - Requires: `scheduling.view` permission
@@ -158,7 +167,9 @@ def get_gantt_chart(
             end_date=end_date,
             lane_ids=lane_ids_list,
             include_completed=include_completed,
-            organization_id=organization_id
+            organization_id=organization_id,
+            skip=skip,
+            limit=limit
         )
 
         # Execute use case
@@ -182,7 +193,12 @@ def get_gantt_chart(
                     progress_percent=task.progress_percent,
                     status=task.status,
                     is_critical_path=task.is_critical_path,
-                    scheduling_mode=task.scheduling_mode
+                    scheduling_mode=task.scheduling_mode,
+                    work_center_id=task.work_center_id,
+                    work_center_code=task.work_center_code,
+                    due_date=task.due_date,
+                    total_float_hours=task.total_float_hours,
+                    free_float_hours=task.free_float_hours
                 )
                 for task in result.tasks
             ],
@@ -199,6 +215,74 @@ def get_gantt_chart(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.get("/gantt/stream")
+def stream_gantt_chart(
+    plant_id: Optional[int] = Query(None, description="Filter by plant ID"),
+    start_date: Optional[date] = Query(None, description="Window start date"),
+    end_date: Optional[date] = Query(None, description="Window end date"),
+    lane_ids: Optional[str] = Query(None, description="Comma-separated lane IDs"),
+    include_completed: bool = Query(False, description="Include completed work orders"),
+    skip: int = Query(0, ge=0, description="Work orders to skip (viewport offset)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=5000, description="Work orders per page (viewport size)"),
+    request: Request = None,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream one page of Gantt tasks as newline-delimited JSON.
+
+    For large boards: tasks are sent as each work order is projected, so the
+    client renders the viewport while the rest of the page arrives, and
+    fetches the next page (skip = next_skip) while scrolling.
+
+    ## Response (application/x-ndjson)
+    ```
+    {"type": "task", "work_order_id": 123, "operation_id": 7, "start_date": "...", ...}
+    ...
+    {"type": "end", "work_orders": 200, "next_skip": 200}
+    ```
+    next_skip is null on the last page. Conflicts and the critical path are
+    not included; use GET /gantt or /conflicts for those.
+
+    ## Permissions
+    - Requires: `scheduling.view` permission
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Start date must be before or equal to end date"
+        )
+
+    lane_ids_list = None
+    if lane_ids:
+        try:
+            lane_ids_list = [int(lid) for lid in lane_ids.split(",")]
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid lane_ids format. Use comma-separated integers (e.g., '1,2,3')"
+            )
+
+    user_context = get_user_context(request)
+    organization_id = user_context.get("organization_id")
+    _set_rls_context(db, organization_id, user_context.get("plant_id"))
+
+    service = GanttProjectionService(db)
+    return StreamingResponse(
+        service.iter_ndjson(
+            organization_id=organization_id,
+            plant_id=plant_id,
+            start_date=start_date,
+            end_date=end_date,
+            lane_ids=lane_ids_list,
+            include_completed=include_completed,
+            skip=skip,
+            limit=limit
+        ),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.get("/conflicts", response_model=ConflictsListResponse)
 def get_conflicts(
     plant_id: int = Query(..., description="Plant ID"),
@@ -213,13 +297,15 @@ def get_conflicts(
     Detect scheduling conflicts for a given period.
 
     ## Business Flow
-    1. Queries all lane assignments in the specified period
-    2. Detects overlapping assignments (lane overload)
-    3. Validates dependency constraints
-    4. Returns list of conflicts with severity and details
+    1. Loads lane assignments, planned operations and operator allocations in the period
+       (one query each)
+    2. Sweeps each resource's bookings in time order (O(n log n)) to find overloads
+    3. Returns list of conflicts with severity and details
 
     ## Conflict Types
-    - **LANE_OVERLOAD**: Multiple work orders assigned to same lane at same time
+    - **LANE_OVERLOAD**: Concurrent assignments allocate more than the lane's daily capacity
+    - **MACHINE_OVERLOAD**: More concurrent operations on a work center than active machines
+    - **OPERATOR_DOUBLE_BOOKING**: An operator allocated to overlapping jobs
     - **DEPENDENCY_VIOLATION**: Successor starts before predecessor completes
     - **CAPACITY_EXCEEDED**: Lane utilization exceeds 100%
 
@@ -245,14 +331,17 @@ def get_conflicts(
         {
           "conflict_type": "LANE_OVERLOAD",
           "severity": "HIGH",
-          "description": "Lane LINE-01 has overlapping assignments",
+          "description": "Lane LINE-01 is allocated 150 of 100 daily capacity from 2024-11-15 to 2024-11-16",
           "affected_work_orders": [123, 124],
           "affected_lanes": [5],
           "details": {
-            "work_order_1": "WO-00123",
-            "work_order_2": "WO-00124",
-            "overlap_start": "2024-11-15T10:00:00Z",
-            "overlap_end": "2024-11-15T16:00:00Z"
+            "work_orders": ["WO-00123", "WO-00124"],
+            "capacity": 100.0,
+            "peak_load": 150.0,
+            "overlap_start": "2024-11-15",
+            "overlap_end": "2024-11-16",
+            "lane_code": "LINE-01",
+            "assignment_ids": [41, 42]
           }
         }
       ],
@@ -276,7 +365,8 @@ def get_conflicts(
         dto = DetectConflictsDTO(
             plant_id=plant_id,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            organization_id=organization_id
         )
 
         # Execute use case
@@ -301,6 +391,8 @@ def get_conflicts(
             date_range_end=end_date
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -2,8 +2,10 @@
 API endpoints for Traceability module (Lot/Serial tracking, Genealogy)
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import logging
 
 from app.core.database import get_db
 from app.infrastructure.security.dependencies import get_current_user
@@ -26,6 +28,7 @@ from app.application.dtos.traceability_dto import (
     GenealogyTreeResponse,
     RecallReportRequest,
     RecallReportResponse,
+    RecallReportJobResponse,
 )
 from app.application.services.traceability_service import (
     LotBatchService,
@@ -33,8 +36,11 @@ from app.application.services.traceability_service import (
     TraceabilityLinkService,
     GenealogyService,
     RecallReportService,
+    iter_recall_report_csv,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/traceability", tags=["traceability"])
 
 
@@ -480,10 +486,106 @@ def generate_recall_report(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         # Log the error for debugging
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Error generating recall report: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate recall report: {str(e)}"
         )
+
+
+def _recall_csv_response(report: RecallReportResponse) -> StreamingResponse:
+    """Stream a recall report as a CSV attachment"""
+    return StreamingResponse(
+        iter_recall_report_csv(report),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{report.report_id}.csv"'}
+    )
+
+
+def _job_response(job) -> RecallReportJobResponse:
+    """Map a RecallReportJob row to its response DTO"""
+    return RecallReportJobResponse(
+        job_id=job.id,
+        status=job.status,
+        progress_percent=job.progress_percent,
+        stage=job.stage,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        report=job.report
+    )
+
+
+@router.post("/recall-reports/export")
+def export_recall_report(
+    request: RecallReportRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Generate a recall report and stream it as CSV.
+
+    One row per work order, shipment, customer and traced lot, each tagged
+    with its section. For very large recalls prefer the background job.
+    """
+    service = RecallReportService(db)
+    try:
+        report = service.generate_recall_report(
+            request, current_user.get("id", 0), current_user.get("organization_id", 0)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _recall_csv_response(report)
+
+
+@router.post("/recall-reports/jobs", response_model=RecallReportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_recall_report_job(
+    request: RecallReportRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Queue a recall report for background generation.
+
+    Poll GET /recall-reports/jobs/{job_id} for progress; the finished report
+    is included in the job and can be downloaded from .../export.
+    """
+    service = RecallReportService(db)
+    job = service.enqueue_report_job(
+        request, current_user.get("id", 0), current_user.get("organization_id", 0)
+    )
+    return _job_response(job)
+
+
+@router.get("/recall-reports/jobs/{job_id}", response_model=RecallReportJobResponse)
+def get_recall_report_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get status, progress and (when completed) the report of a recall report job"""
+    service = RecallReportService(db)
+    job = service.get_job(job_id, current_user.get("organization_id", 0))
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Recall report job {job_id} not found")
+    return _job_response(job)
+
+
+@router.get("/recall-reports/jobs/{job_id}/export")
+def export_recall_report_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream the report of a completed recall report job as CSV"""
+    service = RecallReportService(db)
+    job = service.get_job(job_id, current_user.get("organization_id", 0))
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Recall report job {job_id} not found")
+    if job.status != 'COMPLETED':
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Recall report job {job_id} is {job.status}"
+        )
+    return _recall_csv_response(RecallReportResponse(**job.report))
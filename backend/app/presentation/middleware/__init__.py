@@ -4,7 +4,7 @@ Middleware components for FastAPI application
 Exports:
 - AuthMiddleware: JWT authentication and RLS context
 - RequestIDMiddleware: Request ID generation and tracking
-- RateLimitMiddleware: Rate limiting enforcement
+- RateLimitMiddleware: Rate limiting enforcement (pure ASGI, GCRA)
 """
 
 from app.presentation.middleware.auth_middleware import AuthMiddleware
@@ -1,182 +1,267 @@
 """
 Rate Limit Middleware
 
-Enforces rate limiting per client IP with separate limits for mutations.
+Enforces rate limits per tenant (authenticated) or client IP (anonymous),
+with separate limits for mutations and expensive routes.
 Single Responsibility: Rate limiting and request throttling.
 
 Optimizations:
-- Periodic cleanup of expired client data
-- Memory-efficient deque storage
-- Fast path for under-limit requests
+- Pure ASGI middleware (no BaseHTTPMiddleware request/response wrapping)
+- GCRA state is one timestamp per key (O(1) memory per client)
+- Shared PostgreSQL/Redis stores keep limits exact across workers
+- Subscription tiers cached per organization
 """
 
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable, Awaitable, Dict, List
-from collections import defaultdict, deque
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Callable, Awaitable, Dict, List, Optional, Tuple
+from collections import defaultdict
+import asyncio
+import logging
+import threading
 import time
 
+from app.config.pricing import get_api_rate_limits
+from app.domain.entities.subscription import SubscriptionTier
+from app.infrastructure.cache.rate_limit_store import (
+    InMemoryRateLimitStore,
+    RateLimit,
+    RateLimitDecision,
+    RateLimitStore,
+)
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+logger = logging.getLogger(__name__)
+
+
+class RateLimitMetrics:
+    """Thread-safe counters of allowed and rejected requests per limit scope."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def record(self, scope: str, allowed: bool) -> None:
+        with self._lock:
+            self._counts[(scope, "allowed" if allowed else "rejected")] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Return {scope: {"allowed": n, "rejected": n}}."""
+        with self._lock:
+            result: Dict[str, Dict[str, int]] = {}
+            for (scope, outcome), count in self._counts.items():
+                result.setdefault(scope, {"allowed": 0, "rejected": 0})[outcome] = count
+            return result
+
+
+# Process-wide metrics, exposed by the health router
+rate_limit_metrics = RateLimitMetrics()
+
+
+class SubscriptionTierCache:
+    """
+    Organization -> subscription tier lookup with a TTL.
+
+    Lookups run in a worker thread; unknown organizations fall back to the
+    trial tier (Starter).
+    """
+
+    def __init__(self, ttl_seconds: int = 300, loader: Optional[Callable[[int], Optional[str]]] = None):
+        self.ttl_seconds = ttl_seconds
+        self._loader = loader or self._load_tier
+        self._tiers: Dict[int, Tuple[SubscriptionTier, float]] = {}
+
+    async def get(self, organization_id: int) -> SubscriptionTier:
+        cached = self._tiers.get(organization_id)
+        now = time.monotonic()
+        if cached and cached[1] > now:
+            return cached[0]
+
+        try:
+            tier_value = await asyncio.to_thread(self._loader, organization_id)
+            tier = SubscriptionTier(tier_value) if tier_value else SubscriptionTier.STARTER
+        except Exception as e:
+            logger.warning(f"Tier lookup failed for org {organization_id}: {e}")
+            tier = cached[0] if cached else SubscriptionTier.STARTER
+
+        self._tiers[organization_id] = (tier, now + self.ttl_seconds)
+        return tier
+
+    @staticmethod
+    def _load_tier(organization_id: int) -> Optional[str]:
+        from sqlalchemy import text
+        from app.core.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return db.execute(
+                text("SELECT tier FROM subscriptions WHERE organization_id = :org_id"),
+                {"org_id": organization_id}
+            ).scalar()
+        finally:
+            db.close()
+
+
+class RateLimitMiddleware:
     """
     Rate Limit Middleware
 
     Responsibilities:
-    - Enforce general rate limit (100 req/min)
-    - Enforce mutation rate limit (10 req/min for POST/PUT/PATCH/DELETE)
-    - Track limits per client IP
-    - Return 429 Too Many Requests when limit exceeded
-    - Include Retry-After header in 429 responses
+    - Anonymous clients: general limit (100 req/min) and mutation limit
+      (10 req/min for POST/PUT/PATCH/DELETE) per client IP
+    - Authenticated clients: per-tenant limits from the subscription tier,
+      including per-route limits for expensive endpoints
+    - Return 429 Too Many Requests with Retry-After when a limit is exceeded
+    - Count allowed/rejected requests per scope
 
     Performance:
-    - O(1) amortized for request tracking
-    - O(n) cleanup where n = requests in window
-    - Periodic memory cleanup for inactive IPs
+    - O(1) state and work per request and limit
+    - Stricter limits are checked first
     """
 
-    # Rate limits
+    # Anonymous (per-IP) rate limits
     GENERAL_LIMIT = 100  # requests per minute
     MUTATION_LIMIT = 10  # requests per minute for mutations
     WINDOW_SIZE = 60  # seconds (1 minute)
-    CLEANUP_INTERVAL = 300  # Clean inactive IPs every 5 minutes
 
     # Mutation methods
     MUTATION_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
 
-    def __init__(self, app):
-        super().__init__(app)
-        # Track requests per IP: {ip: deque([timestamp1, timestamp2, ...])}
-        self.general_requests: Dict[str, deque] = defaultdict(deque)
-        self.mutation_requests: Dict[str, deque] = defaultdict(deque)
-        self.last_cleanup = time.time()
-
-    def _clean_old_requests(self, request_queue: deque, current_time: float) -> None:
-        """Remove requests outside the time window"""
-        cutoff_time = current_time - self.WINDOW_SIZE
-
-        while request_queue and request_queue[0] < cutoff_time:
-            request_queue.popleft()
-
-    def _is_rate_limited(
+    def __init__(
         self,
-        client_ip: str,
-        is_mutation: bool,
-        current_time: float
-    ) -> tuple[bool, int]:
-        """
-        Check if client is rate limited
-
-        Returns:
-            (is_limited, retry_after_seconds)
-        """
-        # Choose appropriate request queue and limit
-        if is_mutation:
-            request_queue = self.mutation_requests[client_ip]
-            limit = self.MUTATION_LIMIT
-        else:
-            request_queue = self.general_requests[client_ip]
-            limit = self.GENERAL_LIMIT
-
-        # Clean old requests outside time window
-        self._clean_old_requests(request_queue, current_time)
-
-        # Check if limit exceeded
-        if len(request_queue) >= limit:
-            # Calculate retry after (time until oldest request expires)
-            oldest_request = request_queue[0]
-            retry_after = int(oldest_request + self.WINDOW_SIZE - current_time) + 1
-            return True, retry_after
-
-        return False, 0
-
-    def _record_request(self, client_ip: str, is_mutation: bool, current_time: float) -> None:
-        """Record request timestamp for rate limiting"""
-        # Record in general queue
-        self.general_requests[client_ip].append(current_time)
-
-        # Also record in mutation queue if applicable
-        if is_mutation:
-            self.mutation_requests[client_ip].append(current_time)
-
-    def _cleanup_inactive_ips(self, current_time: float) -> None:
-        """
-        Remove IPs with no recent activity to prevent memory bloat
-
-        Optimization: Periodic cleanup reduces memory usage for long-running servers
-        """
-        if current_time - self.last_cleanup < self.CLEANUP_INTERVAL:
+        app: ASGIApp,
+        store: Optional[RateLimitStore] = None,
+        tier_cache: Optional[SubscriptionTierCache] = None,
+        metrics: Optional[RateLimitMetrics] = None
+    ):
+        self.app = app
+        self.store = store or InMemoryRateLimitStore()
+        self.tier_cache = tier_cache or SubscriptionTierCache()
+        self.metrics = metrics or rate_limit_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
             return
 
-        cutoff_time = current_time - self.WINDOW_SIZE
+        client = scope.get("client")
+        user = scope.get("state", {}).get("user")
 
-        # Remove IPs with no requests in the window
-        inactive_ips = [
-            ip for ip, queue in self.general_requests.items()
-            if not queue or queue[-1] < cutoff_time
-        ]
+        rejection = await self.check(
+            client_ip=client[0] if client else "unknown",
+            method=scope["method"],
+            path=scope["path"],
+            user=user
+        )
 
-        for ip in inactive_ips:
-            del self.general_requests[ip]
-            if ip in self.mutation_requests:
-                del self.mutation_requests[ip]
+        if rejection is not None:
+            await rejection(scope, receive, send)
+            return
 
-        self.last_cleanup = current_time
+        await self.app(scope, receive, send)
 
     async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
         """
-        Process request through rate limit middleware
-
-        Flow:
-        1. Periodic cleanup (optimization)
-        2. Get client IP
-        3. Check if request is mutation
-        4. Check general rate limit
-        5. Check mutation rate limit (if applicable)
-        6. Record request if not rate limited
-        7. Call next middleware or return 429
+        Apply rate limits to a Request and call the next handler.
+
+        Request-level entry point for callers that already hold a Request
+        (middleware chains composed by hand, tests).
+        """
+        user = getattr(request.state, "user", None)
+        rejection = await self.check(
+            client_ip=request.client.host if request.client else "unknown",
+            method=request.method,
+            path=request.url.path,
+            user=user
+        )
+        if rejection is not None:
+            return rejection
+        return await call_next(request)
+
+    async def check(
+        self,
+        client_ip: str,
+        method: str,
+        path: str,
+        user: Optional[dict] = None
+    ) -> Optional[JSONResponse]:
         """
-        # Get client IP and current time
-        client_ip = request.client.host if request.client else "unknown"
-        current_time = time.time()
+        Consume the request from every applicable limit.
 
-        # Periodic cleanup of inactive IPs (optimization)
-        self._cleanup_inactive_ips(current_time)
+        Returns:
+            429 JSONResponse if a limit is exceeded, otherwise None
+        """
+        is_mutation = method in self.MUTATION_METHODS
+        limits = await self._limits_for(client_ip, path, is_mutation, user)
 
-        # Determine if this is a mutation request
-        is_mutation = request.method in self.MUTATION_METHODS
+        for key, scope_name, rate, message in limits:
+            decision = await self.store.hit(key, rate)
+            self.metrics.record(scope_name, decision.allowed)
+            if not decision.allowed:
+                return self._too_many_requests(decision, message)
 
-        # Check general rate limit
-        is_limited, retry_after = self._is_rate_limited(
-            client_ip,
-            is_mutation=False,
-            current_time=current_time
-        )
+        return None
 
-        if is_limited:
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Too many requests. Please try again later."},
-                headers={"Retry-After": str(retry_after)}
-            )
+    async def _limits_for(
+        self,
+        client_ip: str,
+        path: str,
+        is_mutation: bool,
+        user: Optional[dict]
+    ) -> List[Tuple[str, str, RateLimit, str]]:
+        """Build (key, metrics scope, limit, message) tuples, strictest first."""
+        organization_id = user.get("organization_id") if isinstance(user, dict) else None
+
+        if organization_id is None:
+            limits = []
+            if is_mutation:
+                limits.append((
+                    f"ip:{client_ip}:mutation", "ip_mutation",
+                    RateLimit(self.MUTATION_LIMIT, self.WINDOW_SIZE),
+                    "Too many mutation requests. Please try again later."
+                ))
+            limits.append((
+                f"ip:{client_ip}", "ip_general",
+                RateLimit(self.GENERAL_LIMIT, self.WINDOW_SIZE),
+                "Too many requests. Please try again later."
+            ))
+            return limits
+
+        tier = await self.tier_cache.get(organization_id)
+        tier_limits = get_api_rate_limits(tier)
+        limits = []
+
+        for prefix, per_minute in tier_limits["routes"].items():
+            if path.startswith(prefix):
+                limits.append((
+                    f"org:{organization_id}:route:{prefix}", f"{tier.value}_route",
+                    RateLimit(per_minute, self.WINDOW_SIZE),
+                    "Too many requests to this endpoint. Please try again later."
+                ))
+                break
 
-        # Check mutation rate limit if applicable
         if is_mutation:
-            is_limited, retry_after = self._is_rate_limited(
-                client_ip,
-                is_mutation=True,
-                current_time=current_time
-            )
-
-            if is_limited:
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Too many mutation requests. Please try again later."},
-                    headers={"Retry-After": str(retry_after)}
-                )
-
-        # Record request
-        self._record_request(client_ip, is_mutation, current_time)
-
-        # Call next middleware
-        return await call_next(request)
+            limits.append((
+                f"org:{organization_id}:mutation", f"{tier.value}_mutation",
+                RateLimit(tier_limits["mutations_per_minute"], self.WINDOW_SIZE),
+                "Too many mutation requests. Please try again later."
+            ))
+
+        limits.append((
+            f"org:{organization_id}", f"{tier.value}_general",
+            RateLimit(tier_limits["requests_per_minute"], self.WINDOW_SIZE),
+            "Too many requests. Please try again later."
+        ))
+        return limits
+
+    @staticmethod
+    def _too_many_requests(decision: RateLimitDecision, message: str) -> JSONResponse:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": message},
+            headers={
+                "Retry-After": str(decision.retry_after),
+                "X-RateLimit-Limit": str(decision.limit),
+                "X-RateLimit-Remaining": "0"
+            }
+        )
@@ -108,6 +108,60 @@ class AdjustInventoryRequest(BaseModel):
         }
 
 
+class MovementTypeEnum(str, Enum):
+    """Posting line movement type enumeration."""
+    RECEIPT = "RECEIPT"
+    ISSUE = "ISSUE"
+    TRANSFER = "TRANSFER"
+
+
+class InventoryPostingLineRequest(BaseModel):
+    """One movement of an inventory posting."""
+
+    movement_type: MovementTypeEnum = Field(..., description="RECEIPT, ISSUE or TRANSFER")
+    material_id: int = Field(..., description="Material ID")
+    storage_location_id: int = Field(..., description="Storage location ID (source for issues and transfers)")
+    to_storage_location_id: Optional[int] = Field(None, description="Target storage location ID (transfers only)")
+    quantity: Decimal = Field(..., gt=0, description="Quantity to move (must be positive)")
+    batch_number: str = Field(..., min_length=1, max_length=50, description="Batch/lot number")
+    unit_cost: Optional[Decimal] = Field(None, ge=0, description="Unit cost (uses material average or standard cost if not provided)")
+    notes: Optional[str] = Field(None, max_length=500, description="Additional notes")
+
+
+class InventoryPostingRequest(BaseModel):
+    """Request schema for a batched inventory posting (all lines or none are posted)."""
+
+    transaction_reference: str = Field(..., min_length=1, max_length=100, description="Reference (e.g., WO-00123)")
+    idempotency_key: Optional[str] = Field(None, min_length=1, max_length=100, description="Client key; a retry with the same key returns the original posting")
+    transaction_date: Optional[datetime] = Field(None, description="Transaction date (defaults to now)")
+    lines: List[InventoryPostingLineRequest] = Field(..., min_length=1, max_length=500, description="Movements to post")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "transaction_reference": "WO-00123",
+                "idempotency_key": "scanner-7-000481",
+                "lines": [
+                    {
+                        "movement_type": "ISSUE",
+                        "material_id": 567,
+                        "storage_location_id": 1,
+                        "quantity": 4.0,
+                        "batch_number": "BATCH-2024-001"
+                    },
+                    {
+                        "movement_type": "TRANSFER",
+                        "material_id": 568,
+                        "storage_location_id": 1,
+                        "to_storage_location_id": 2,
+                        "quantity": 10.0,
+                        "batch_number": "BATCH-2024-007"
+                    }
+                ]
+            }
+        }
+
+
 # ============================================================================
 # Response Schemas
 # ============================================================================
@@ -162,6 +216,31 @@ class MaterialTransactionResponse(BaseModel):
         }
 
 
+class PostedTransactionResponse(BaseModel):
+    """Transaction created by an inventory posting."""
+
+    id: int
+    material_id: int
+    storage_location_id: int
+    transaction_type: TransactionTypeEnum
+    batch_number: str
+    quantity: float
+    unit_cost: float
+    total_value: float
+    transaction_date: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class InventoryPostingResponse(BaseModel):
+    """Response schema for a batched inventory posting."""
+
+    posting_id: int
+    replayed: bool = Field(..., description="True if an earlier posting with the same idempotency key was returned")
+    transactions: List[PostedTransactionResponse]
+
+
 class InventoryBalanceResponse(BaseModel):
     """Response schema for inventory balance."""
 
@@ -232,6 +232,48 @@ class FPYResponse(BaseModel):
         }
 
 
+class ReliabilityFigures(BaseModel):
+    """MTBF/MTTR/availability figures shared by machine, plant and trend rows."""
+
+    mtbf_hours: Optional[float] = Field(None, description="Mean time between failures (None without failures)")
+    mttr_hours: float = Field(..., description="Mean time to repair")
+    total_failures: int
+    total_downtime_hours: float = Field(..., description="Downtime clipped to the period")
+    total_repair_hours: float
+    total_operating_hours: float
+    availability_percent: float
+
+
+class MachineReliabilityResponse(ReliabilityFigures):
+    """Response schema for machine-level reliability."""
+
+    machine_id: int
+    machine_code: str
+    machine_name: str
+
+
+class PlantReliabilityResponse(ReliabilityFigures):
+    """Response schema for plant-level reliability."""
+
+    machine_count: int
+
+
+class ReliabilityTrendPoint(ReliabilityFigures):
+    """Plant-level reliability for one time bucket."""
+
+    bucket: datetime
+
+
+class ReliabilityResponse(BaseModel):
+    """Response schema for fleet reliability metrics."""
+
+    period_start: datetime
+    period_end: datetime
+    machine_metrics: List[MachineReliabilityResponse]
+    plant_aggregate: PlantReliabilityResponse
+    trend: List[ReliabilityTrendPoint] = []
+
+
 class KPIDashboardResponse(BaseModel):
     """Response schema for consolidated KPI dashboard."""
 
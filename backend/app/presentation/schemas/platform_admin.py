@@ -81,6 +81,7 @@ class OrganizationListResponse(BaseModel):
     has_more: bool
     limit: int
     offset: int
+    next_after_id: Optional[int] = None  # Keyset cursor for the next page
 
 
 class OrganizationDetailResponse(BaseModel):
@@ -330,6 +331,15 @@ class AuditLogResponse(BaseModel):
     offset: int
 
 
+class WebhookReplayRequest(BaseModel):
+    """Request to replay stored Stripe webhook events"""
+    event_ids: Optional[List[str]] = Field(None, description="Specific Stripe event IDs")
+    statuses: Optional[List[str]] = Field(None, description="Replay events in these statuses, e.g. failed, dead")
+    since: Optional[datetime] = Field(None, description="Only events received at or after this time")
+    limit: int = Field(500, ge=1, le=5000)
+    reason: str = Field(..., min_length=10, max_length=500, description="Reason for replay")
+
+
 # ============================================================================
 # GENERAL RESPONSE SCHEMAS
 # ============================================================================
@@ -14,6 +14,8 @@ class ConflictTypeEnum(str, Enum):
     LANE_OVERLOAD = "LANE_OVERLOAD"
     DEPENDENCY_VIOLATION = "DEPENDENCY_VIOLATION"
     CAPACITY_EXCEEDED = "CAPACITY_EXCEEDED"
+    MACHINE_OVERLOAD = "MACHINE_OVERLOAD"
+    OPERATOR_DOUBLE_BOOKING = "OPERATOR_DOUBLE_BOOKING"
 
 
 class SeverityEnum(str, Enum):
@@ -89,6 +91,11 @@ class GanttTaskResponse(BaseModel):
     status: str
     is_critical_path: bool = False
     scheduling_mode: Optional[str] = None
+    work_center_id: Optional[int] = None
+    work_center_code: Optional[str] = None
+    due_date: Optional[datetime] = None
+    total_float_hours: Optional[float] = Field(None, description="Hours the task can slip before its work order misses its due date (or, without one, the board finish); negative when already late")
+    free_float_hours: Optional[float] = Field(None, description="Hours the task can slip without delaying its successor")
 
     class Config:
         json_schema_extra = {
@@ -127,14 +134,17 @@ class ConflictResponse(BaseModel):
             "example": {
                 "conflict_type": "LANE_OVERLOAD",
                 "severity": "HIGH",
-                "description": "Lane LINE-01 has overlapping assignments",
+                "description": "Lane LINE-01 is allocated 150 of 100 daily capacity from 2024-11-15 to 2024-11-16",
                 "affected_work_orders": [123, 124],
                 "affected_lanes": [5],
                 "details": {
-                    "work_order_1": "WO-00123",
-                    "work_order_2": "WO-00124",
-                    "overlap_start": "2024-11-15T10:00:00Z",
-                    "overlap_end": "2024-11-15T16:00:00Z"
+                    "work_orders": ["WO-00123", "WO-00124"],
+                    "capacity": 100.0,
+                    "peak_load": 150.0,
+                    "overlap_start": "2024-11-15",
+                    "overlap_end": "2024-11-16",
+                    "lane_code": "LINE-01",
+                    "assignment_ids": [41, 42]
                 }
             }
         }
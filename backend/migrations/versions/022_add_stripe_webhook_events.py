@@ -0,0 +1,94 @@
+"""Add Stripe webhook event inbox and processing queue
+
+Revision ID: 022
+Revises: 021
+Create Date: 2025-11-14
+
+Creates the durable inbox for Stripe webhooks:
+
+Tables:
+- stripe_webhook_events: One row per Stripe event (UNIQUE event_id)
+
+Queues:
+- stripe_webhooks (pgmq): event ids awaiting asynchronous processing
+
+The webhook endpoint persists the verified event and enqueues its id in the
+same transaction, then acknowledges Stripe. Workers apply events per
+customer in Stripe creation order and record the outcome on the row.
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '022'
+down_revision = '021'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating stripe_webhook_events inbox...")
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS stripe_webhook_events (
+            id SERIAL PRIMARY KEY,
+            event_id VARCHAR(255) NOT NULL UNIQUE,
+            event_type VARCHAR(100) NOT NULL,
+            stripe_customer_id VARCHAR(255),
+            stripe_created_at TIMESTAMP WITH TIME ZONE,
+            payload JSONB NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'received',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            result_message TEXT,
+            received_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            processed_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT check_webhook_event_status
+                CHECK (status IN ('received', 'processed', 'ignored', 'failed', 'dead'))
+        );
+
+        COMMENT ON TABLE stripe_webhook_events IS
+            'Inbox of verified Stripe webhook events; event_id dedups Stripe retries.';
+    """))
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_webhook_events_event_type
+            ON stripe_webhook_events(event_type);
+
+        -- Per-customer ordering check: earlier pending events for a customer
+        CREATE INDEX IF NOT EXISTS idx_webhook_events_customer_order
+            ON stripe_webhook_events(stripe_customer_id, stripe_created_at);
+
+        -- Replay and monitoring by status
+        CREATE INDEX IF NOT EXISTS idx_webhook_events_status
+            ON stripe_webhook_events(status, received_at);
+    """))
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.create('stripe_webhooks');
+            END IF;
+        END $$;
+    """))
+
+    print("✅ stripe_webhook_events table and stripe_webhooks queue created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.drop_queue('stripe_webhooks');
+            END IF;
+        END $$;
+    """))
+    conn.execute(text("DROP TABLE IF EXISTS stripe_webhook_events CASCADE;"))
+
+    print("⚠️  stripe_webhook_events table dropped")
@@ -0,0 +1,41 @@
+"""Add covering index for fleet reliability rollups
+
+Revision ID: 023
+Revises: 022
+Create Date: 2025-11-15
+
+MaintenanceRepository.get_downtime_rollup aggregates every downtime event of
+a plant overlapping the period in one grouped query. This index covers the
+filter (organization, plant, started_at) and carries the grouped and summed
+columns so the rollup can be answered by an index-only scan.
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '023'
+down_revision = '022'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating downtime rollup index...")
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_downtime_event_rollup
+            ON downtime_event(organization_id, plant_id, started_at)
+            INCLUDE (machine_id, category, ended_at);
+    """))
+
+    print("✅ idx_downtime_event_rollup created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("DROP INDEX IF EXISTS idx_downtime_event_rollup;"))
+
+    print("⚠️  idx_downtime_event_rollup dropped")
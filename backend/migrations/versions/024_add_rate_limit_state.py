@@ -0,0 +1,45 @@
+"""Add shared rate limit state table
+
+Revision ID: 024
+Revises: 023
+Create Date: 2025-11-16
+
+Creates the UNLOGGED rate_limit_state table used by PostgresRateLimitStore
+(RATE_LIMIT_BACKEND=postgres) so all API workers share one GCRA state per
+client. Each key holds a single theoretical arrival time (epoch seconds).
+UNLOGGED is acceptable: losing the table on crash only resets limits.
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '024'
+down_revision = '023'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating rate_limit_state table...")
+
+    conn.execute(text("""
+        CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_state (
+            key VARCHAR(255) PRIMARY KEY,
+            tat DOUBLE PRECISION NOT NULL
+        );
+
+        -- Cleanup of refilled buckets
+        CREATE INDEX IF NOT EXISTS idx_rate_limit_state_tat ON rate_limit_state(tat);
+    """))
+
+    print("✅ rate_limit_state table created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("DROP TABLE IF EXISTS rate_limit_state;"))
+
+    print("⚠️  rate_limit_state table dropped")
@@ -0,0 +1,62 @@
+"""Add indexes for the platform admin tenant directory
+
+Revision ID: 025
+Revises: 024
+Create Date: 2025-11-17
+
+TenantDirectoryRepository reads each organization page with one query using
+LATERAL lookups for the latest usage snapshot and last user activity. These
+indexes make each lateral lookup a single index probe, and pg_trgm GIN
+indexes serve the ILIKE '%term%' / similarity search over name, code and
+subdomain without a sequential scan.
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '025'
+down_revision = '024'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating tenant directory indexes...")
+
+    conn.execute(text("""
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+        -- Trigram search over organization name, code and subdomain
+        CREATE INDEX IF NOT EXISTS idx_organizations_org_name_trgm
+            ON organizations USING gin (org_name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_organizations_org_code_trgm
+            ON organizations USING gin (org_code gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_organizations_subdomain_trgm
+            ON organizations USING gin (subdomain gin_trgm_ops);
+
+        -- Latest usage snapshot per organization
+        CREATE INDEX IF NOT EXISTS idx_subscription_usage_org_measured
+            ON subscription_usage(organization_id, measured_at DESC);
+
+        -- Last user activity per organization
+        CREATE INDEX IF NOT EXISTS idx_users_org_updated
+            ON users(organization_id, updated_at DESC);
+    """))
+
+    print("✅ Tenant directory indexes created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        DROP INDEX IF EXISTS idx_users_org_updated;
+        DROP INDEX IF EXISTS idx_subscription_usage_org_measured;
+        DROP INDEX IF EXISTS idx_organizations_subdomain_trgm;
+        DROP INDEX IF EXISTS idx_organizations_org_code_trgm;
+        DROP INDEX IF EXISTS idx_organizations_org_name_trgm;
+    """))
+
+    print("⚠️  Tenant directory indexes dropped")
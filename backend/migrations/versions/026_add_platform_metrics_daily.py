@@ -0,0 +1,51 @@
+"""Add platform metrics daily snapshot table
+
+Revision ID: 026
+Revises: 025
+Create Date: 2025-11-18
+
+Creates platform_metrics_daily, one row per day with MRR (cents), active and
+trial subscriptions, signups, new subscriptions, trial conversions and churn.
+Written by the snapshot-platform-metrics job (POST /api/v1/jobs/
+snapshot-platform-metrics, scheduled by pg_cron); read by the platform admin
+growth metrics and the MRR growth chart. The first job run backfills a year.
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '026'
+down_revision = '025'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating platform_metrics_daily table...")
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS platform_metrics_daily (
+            metric_date DATE PRIMARY KEY,
+            mrr_cents BIGINT NOT NULL DEFAULT 0,
+            active_subscriptions INTEGER NOT NULL DEFAULT 0,
+            trial_subscriptions INTEGER NOT NULL DEFAULT 0,
+            total_organizations INTEGER NOT NULL DEFAULT 0,
+            signups INTEGER NOT NULL DEFAULT 0,
+            new_subscriptions INTEGER NOT NULL DEFAULT 0,
+            trial_conversions INTEGER NOT NULL DEFAULT 0,
+            churned_subscriptions INTEGER NOT NULL DEFAULT 0,
+            computed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+    """))
+
+    print("✅ platform_metrics_daily table created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("DROP TABLE IF EXISTS platform_metrics_daily;"))
+
+    print("⚠️  platform_metrics_daily table dropped")
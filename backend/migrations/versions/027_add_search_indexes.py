@@ -0,0 +1,77 @@
+"""Add indexes for material type-ahead and multi-entity search
+
+Revision ID: 027
+Revises: 026
+Create Date: 2025-11-19
+
+- Prefix (text_pattern_ops) indexes on lower(material_number) and
+  lower(material_name) per organization serve PgSearchService type-ahead
+  with an index range scan regardless of catalog size.
+- pg_trgm GIN indexes serve the '%term%' matching of the LIKE fallback,
+  facets, and the work order / lot branches of multi-entity search.
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '027'
+down_revision = '026'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating search indexes...")
+
+    conn.execute(text("""
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+        -- Type-ahead prefix matching
+        CREATE INDEX IF NOT EXISTS idx_material_number_prefix
+            ON material (organization_id, lower(material_number) text_pattern_ops);
+        CREATE INDEX IF NOT EXISTS idx_material_name_prefix
+            ON material (organization_id, lower(material_name) text_pattern_ops);
+
+        -- Substring matching (LIKE fallback, facets)
+        CREATE INDEX IF NOT EXISTS idx_material_number_trgm
+            ON material USING gin (material_number gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_material_name_trgm
+            ON material USING gin (material_name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_material_description_trgm
+            ON material USING gin (description gin_trgm_ops);
+
+        -- Multi-entity search
+        CREATE INDEX IF NOT EXISTS idx_work_order_number_trgm
+            ON work_order USING gin (work_order_number gin_trgm_ops);
+    """))
+
+    # lot_batches is created by the traceability migration, which may not be applied
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF to_regclass('lot_batches') IS NOT NULL THEN
+                CREATE INDEX IF NOT EXISTS idx_lot_batches_lot_number_trgm
+                    ON lot_batches USING gin (lot_number gin_trgm_ops);
+            END IF;
+        END $$;
+    """))
+
+    print("✅ Search indexes created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        DROP INDEX IF EXISTS idx_lot_batches_lot_number_trgm;
+        DROP INDEX IF EXISTS idx_work_order_number_trgm;
+        DROP INDEX IF EXISTS idx_material_description_trgm;
+        DROP INDEX IF EXISTS idx_material_name_trgm;
+        DROP INDEX IF EXISTS idx_material_number_trgm;
+        DROP INDEX IF EXISTS idx_material_name_prefix;
+        DROP INDEX IF EXISTS idx_material_number_prefix;
+    """))
+
+    print("⚠️  Search indexes dropped")
@@ -0,0 +1,88 @@
+"""Add recall report jobs and genealogy trace index
+
+Revision ID: 028
+Revises: 027
+Create Date: 2025-11-20
+
+Tables:
+- recall_report_jobs: Background recall reports (request, progress, report)
+
+Queues:
+- recall_reports (pgmq): job ids awaiting a worker
+
+Indexes:
+- serial_numbers(work_order_id): serials produced by affected work orders,
+  joined by the recall impact query
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '028'
+down_revision = '027'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating recall_report_jobs table...")
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS recall_report_jobs (
+            id SERIAL PRIMARY KEY,
+            organization_id INTEGER NOT NULL,
+            requested_by INTEGER NOT NULL,
+            request JSONB NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'QUEUED',
+            progress_percent INTEGER NOT NULL DEFAULT 0,
+            stage VARCHAR(100),
+            report JSONB,
+            error TEXT,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            started_at TIMESTAMP WITH TIME ZONE,
+            completed_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT chk_recall_report_job_status_valid
+                CHECK (status IN ('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED')),
+            CONSTRAINT chk_recall_report_job_progress_valid
+                CHECK (progress_percent BETWEEN 0 AND 100)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_recall_report_jobs_org_created
+            ON recall_report_jobs(organization_id, created_at);
+    """))
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF to_regclass('serial_numbers') IS NOT NULL THEN
+                CREATE INDEX IF NOT EXISTS idx_serial_numbers_work_order
+                    ON serial_numbers(work_order_id)
+                    WHERE work_order_id IS NOT NULL;
+            END IF;
+
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.create('recall_reports');
+            END IF;
+        END $$;
+    """))
+
+    print("✅ recall_report_jobs table and recall_reports queue created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.drop_queue('recall_reports');
+            END IF;
+        END $$;
+    """))
+    conn.execute(text("DROP INDEX IF EXISTS idx_serial_numbers_work_order;"))
+    conn.execute(text("DROP TABLE IF EXISTS recall_report_jobs;"))
+
+    print("⚠️  recall_report_jobs table dropped")
@@ -0,0 +1,109 @@
+"""Add cost layer consumption ledger and moving average cost
+
+Revision ID: 029
+Revises: 028
+Create Date: 2025-11-21
+
+Tables:
+- cost_layer_consumption: One row per cost layer touched by an issue
+  (reversals stamp reversed_at, rows are never deleted)
+- material_location_cost: Moving average cost and on-hand quantity per
+  material and storage location
+
+Indexes:
+- cost_layer(material_id, storage_location_id, receipt_date) WHERE
+  quantity_remaining > 0: open layers scanned by the FIFO/LIFO allocation
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '029'
+down_revision = '028'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating cost_layer_consumption table...")
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS cost_layer_consumption (
+            id SERIAL PRIMARY KEY,
+            organization_id INTEGER NOT NULL,
+            plant_id INTEGER NOT NULL,
+            cost_layer_id INTEGER NOT NULL REFERENCES cost_layer(id) ON DELETE CASCADE,
+            material_id INTEGER NOT NULL REFERENCES material(id) ON DELETE CASCADE,
+            storage_location_id INTEGER NOT NULL REFERENCES storage_location(id) ON DELETE CASCADE,
+            costing_method costingmethod NOT NULL,
+            quantity NUMERIC(15, 3) NOT NULL,
+            unit_cost NUMERIC(15, 2) NOT NULL,
+            issue_reference VARCHAR(100) NOT NULL,
+            consumed_at TIMESTAMPTZ NOT NULL,
+            reversed_at TIMESTAMPTZ,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT chk_consumption_quantity_positive CHECK (quantity > 0)
+        );
+    """))
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_cost_layer_consumption_org_id
+            ON cost_layer_consumption(organization_id);
+        CREATE INDEX IF NOT EXISTS idx_cost_layer_consumption_plant_id
+            ON cost_layer_consumption(plant_id);
+        CREATE INDEX IF NOT EXISTS idx_cost_layer_consumption_layer
+            ON cost_layer_consumption(cost_layer_id);
+        CREATE INDEX IF NOT EXISTS idx_cost_layer_consumption_reference
+            ON cost_layer_consumption(issue_reference, reversed_at);
+        CREATE INDEX IF NOT EXISTS idx_cost_layer_consumption_material
+            ON cost_layer_consumption(material_id, consumed_at);
+    """))
+
+    print("✅ cost_layer_consumption table created")
+
+    print("Creating material_location_cost table...")
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS material_location_cost (
+            id SERIAL PRIMARY KEY,
+            organization_id INTEGER NOT NULL,
+            plant_id INTEGER NOT NULL,
+            material_id INTEGER NOT NULL REFERENCES material(id) ON DELETE CASCADE,
+            storage_location_id INTEGER NOT NULL REFERENCES storage_location(id) ON DELETE CASCADE,
+            quantity_on_hand NUMERIC(15, 3) NOT NULL DEFAULT 0,
+            average_cost NUMERIC(15, 2) NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ DEFAULT now(),
+            CONSTRAINT chk_location_cost_quantity_non_negative CHECK (quantity_on_hand >= 0),
+            CONSTRAINT chk_location_cost_average_non_negative CHECK (average_cost >= 0),
+            CONSTRAINT uq_location_cost_material_location UNIQUE (material_id, storage_location_id)
+        );
+    """))
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_material_location_cost_org_plant
+            ON material_location_cost(organization_id, plant_id);
+    """))
+
+    print("✅ material_location_cost table created")
+
+    print("Creating open cost layer index...")
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_cost_layer_open
+            ON cost_layer(material_id, storage_location_id, receipt_date)
+            WHERE quantity_remaining > 0;
+    """))
+
+    print("✅ idx_cost_layer_open created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("DROP INDEX IF EXISTS idx_cost_layer_open;"))
+    conn.execute(text("DROP TABLE IF EXISTS material_location_cost;"))
+    conn.execute(text("DROP TABLE IF EXISTS cost_layer_consumption;"))
+
+    print("⚠️  Cost layer consumption tables and index dropped")
@@ -0,0 +1,76 @@
+"""Add inventory postings with idempotency keys
+
+Revision ID: 030
+Revises: 029
+Create Date: 2025-11-22
+
+Tables:
+- inventory_posting: One batch of inventory movements posted in a single
+  transaction; idempotency_key is unique per organization so scanner
+  retries return the original posting
+
+Columns:
+- inventory_transaction.posting_id: Posting that created the transaction
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '030'
+down_revision = '029'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating inventory_posting table...")
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS inventory_posting (
+            id SERIAL PRIMARY KEY,
+            organization_id INTEGER NOT NULL,
+            plant_id INTEGER NOT NULL,
+            idempotency_key VARCHAR(100),
+            request_hash VARCHAR(64) NOT NULL,
+            transaction_reference VARCHAR(100) NOT NULL,
+            line_count INTEGER NOT NULL,
+            posted_by_user_id INTEGER NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_inventory_posting_idempotency_key UNIQUE (organization_id, idempotency_key)
+        );
+    """))
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_inventory_posting_org_plant
+            ON inventory_posting(organization_id, plant_id);
+    """))
+
+    print("✅ inventory_posting table created")
+
+    print("Linking inventory transactions to postings...")
+
+    conn.execute(text("""
+        ALTER TABLE inventory_transaction
+            ADD COLUMN IF NOT EXISTS posting_id INTEGER
+            REFERENCES inventory_posting(id) ON DELETE SET NULL;
+    """))
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_transaction_posting
+            ON inventory_transaction(posting_id)
+            WHERE posting_id IS NOT NULL;
+    """))
+
+    print("✅ inventory_transaction.posting_id added")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("DROP INDEX IF EXISTS idx_transaction_posting;"))
+    conn.execute(text("ALTER TABLE inventory_transaction DROP COLUMN IF EXISTS posting_id;"))
+    conn.execute(text("DROP TABLE IF EXISTS inventory_posting;"))
+
+    print("⚠️  inventory_posting table and inventory_transaction.posting_id dropped")
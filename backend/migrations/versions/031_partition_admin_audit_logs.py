@@ -0,0 +1,144 @@
+"""Partition admin audit logs, add hash chain and retention
+
+Revision ID: 031
+Revises: 030
+Create Date: 2025-11-23
+
+Tables:
+- admin_audit_logs: TimescaleDB hypertable on created_at (1 month chunks,
+  primary key becomes (id, created_at)); new columns organization_id,
+  prev_hash and entry_hash for the per-organization hash chain
+- admin_audit_chain_heads: Last hash of each chain, locked by writers
+
+Indexes (replacing single-column admin/action/target indexes):
+- (target_type, target_id, created_at DESC): resource history, target filters
+- (admin_user_id, created_at DESC): admin activity
+- (action, created_at DESC): action filters
+- (organization_id, id): chain verification
+
+Retention:
+- admin_audit_logs and audit_logs chunks older than 7 years are dropped
+
+Queues:
+- admin_audit_events (pgmq): audit events awaiting the audit log worker
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '031'
+down_revision = '030'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Adding hash chain columns to admin_audit_logs...")
+
+    conn.execute(text("""
+        ALTER TABLE admin_audit_logs
+            ADD COLUMN IF NOT EXISTS organization_id INTEGER,
+            ADD COLUMN IF NOT EXISTS prev_hash VARCHAR(64),
+            ADD COLUMN IF NOT EXISTS entry_hash VARCHAR(64);
+
+        CREATE TABLE IF NOT EXISTS admin_audit_chain_heads (
+            chain_key INTEGER PRIMARY KEY,
+            last_hash VARCHAR(64) NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+    """))
+
+    print("✅ Hash chain columns and admin_audit_chain_heads created")
+
+    print("Replacing admin_audit_logs indexes...")
+
+    conn.execute(text("""
+        DROP INDEX IF EXISTS idx_audit_admin_user;
+        DROP INDEX IF EXISTS idx_audit_action;
+        DROP INDEX IF EXISTS idx_audit_target;
+        DROP INDEX IF EXISTS idx_audit_admin_action;
+
+        CREATE INDEX IF NOT EXISTS idx_audit_target_created
+            ON admin_audit_logs(target_type, target_id, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_audit_admin_created
+            ON admin_audit_logs(admin_user_id, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_audit_action_created
+            ON admin_audit_logs(action, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_audit_org_chain
+            ON admin_audit_logs(organization_id, id)
+            WHERE entry_hash IS NOT NULL;
+    """))
+
+    print("✅ admin_audit_logs indexes replaced")
+
+    print("Converting admin_audit_logs to a hypertable...")
+
+    # Hypertable unique constraints must include the partitioning column
+    conn.execute(text("""
+        ALTER TABLE admin_audit_logs DROP CONSTRAINT IF EXISTS admin_audit_logs_pkey;
+        ALTER TABLE admin_audit_logs ADD PRIMARY KEY (id, created_at);
+
+        SELECT create_hypertable('admin_audit_logs', 'created_at',
+            chunk_time_interval => INTERVAL '1 month',
+            create_default_indexes => FALSE,
+            migrate_data => TRUE,
+            if_not_exists => TRUE
+        );
+
+        SELECT add_retention_policy('admin_audit_logs', INTERVAL '7 years', if_not_exists => TRUE);
+        SELECT add_retention_policy('audit_logs', INTERVAL '7 years', if_not_exists => TRUE);
+    """))
+
+    print("✅ admin_audit_logs partitioned by month, 7 year retention")
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.create('admin_audit_events');
+            END IF;
+        END $$;
+    """))
+
+    print("✅ admin_audit_events queue created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.drop_queue('admin_audit_events');
+            END IF;
+        END $$;
+    """))
+
+    # A hypertable cannot be converted back in place: retention stops and
+    # chunks stay, the hash chain columns and new indexes are dropped
+    conn.execute(text("""
+        SELECT remove_retention_policy('admin_audit_logs', if_exists => TRUE);
+        SELECT remove_retention_policy('audit_logs', if_exists => TRUE);
+
+        DROP INDEX IF EXISTS idx_audit_target_created;
+        DROP INDEX IF EXISTS idx_audit_admin_created;
+        DROP INDEX IF EXISTS idx_audit_action_created;
+        DROP INDEX IF EXISTS idx_audit_org_chain;
+
+        CREATE INDEX IF NOT EXISTS idx_audit_admin_user ON admin_audit_logs(admin_user_id);
+        CREATE INDEX IF NOT EXISTS idx_audit_action ON admin_audit_logs(action);
+        CREATE INDEX IF NOT EXISTS idx_audit_target ON admin_audit_logs(target_type, target_id);
+        CREATE INDEX IF NOT EXISTS idx_audit_admin_action ON admin_audit_logs(admin_user_id, action);
+
+        ALTER TABLE admin_audit_logs
+            DROP COLUMN IF EXISTS organization_id,
+            DROP COLUMN IF EXISTS prev_hash,
+            DROP COLUMN IF EXISTS entry_hash;
+
+        DROP TABLE IF EXISTS admin_audit_chain_heads;
+    """))
+
+    print("⚠️  Admin audit hash chain, retention and indexes removed")
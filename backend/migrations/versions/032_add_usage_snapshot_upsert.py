@@ -0,0 +1,74 @@
+"""Key usage snapshots by organization and slot, add billing notifications queue
+
+Revision ID: 032
+Revises: 031
+Create Date: 2025-11-24
+
+Constraints:
+- subscription_usage (organization_id, measured_at) unique: the usage job
+  upserts one row per organization per snapshot slot; the index also serves
+  the previous-snapshot lookup of limit crossing detection
+
+Queues:
+- billing_notifications (pgmq): usage limit and trial lifecycle follow-ups
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '032'
+down_revision = '031'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Adding unique snapshot key to subscription_usage...")
+
+    # Keep the latest row of any duplicated (organization_id, measured_at)
+    conn.execute(text("""
+        DELETE FROM subscription_usage a
+        USING subscription_usage b
+        WHERE a.organization_id = b.organization_id
+          AND a.measured_at = b.measured_at
+          AND a.id < b.id;
+
+        ALTER TABLE subscription_usage
+            ADD CONSTRAINT uq_subscription_usage_org_measured_at
+            UNIQUE (organization_id, measured_at);
+    """))
+
+    print("✅ uq_subscription_usage_org_measured_at added")
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.create('billing_notifications');
+            END IF;
+        END $$;
+    """))
+
+    print("✅ billing_notifications queue created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.drop_queue('billing_notifications');
+            END IF;
+        END $$;
+    """))
+
+    conn.execute(text("""
+        ALTER TABLE subscription_usage
+            DROP CONSTRAINT IF EXISTS uq_subscription_usage_org_measured_at;
+    """))
+
+    print("⚠️  subscription_usage snapshot key and billing_notifications queue removed")
@@ -0,0 +1,49 @@
+"""Deduplicate batched scans from handheld offline queues
+
+Revision ID: 033
+Revises: 032
+Create Date: 2025-11-25
+
+Indexes:
+- qr_code_scan (organization_id, device_id, scan_code, scan_timestamp)
+  unique: a batch resent by a device after a lost response is skipped by
+  INSERT ... ON CONFLICT DO NOTHING (scans without device_id never conflict)
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '033'
+down_revision = '032'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Adding scan dedup index to qr_code_scan...")
+
+    # Keep the first copy of scans already recorded twice
+    conn.execute(text("""
+        DELETE FROM qr_code_scan a
+        USING qr_code_scan b
+        WHERE a.organization_id = b.organization_id
+          AND a.device_id = b.device_id
+          AND a.scan_code = b.scan_code
+          AND a.scan_timestamp = b.scan_timestamp
+          AND a.id > b.id;
+
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_qr_scan_device_code_timestamp
+            ON qr_code_scan(organization_id, device_id, scan_code, scan_timestamp);
+    """))
+
+    print("✅ uq_qr_scan_device_code_timestamp created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("DROP INDEX IF EXISTS uq_qr_scan_device_code_timestamp;"))
+
+    print("⚠️  qr_code_scan dedup index dropped")
@@ -0,0 +1,79 @@
+"""Run report executions in background workers
+
+Revision ID: 034
+Revises: 033
+Create Date: 2025-11-26
+
+Columns:
+- report_executions.progress_percent: export progress written by the worker
+- report_executions.estimated_rows: planner row estimate behind the progress
+- report_executions.cancel_requested: checked by the worker after every chunk
+
+Indexes:
+- report_executions (organization_id, execution_status): per-tenant count of
+  running executions when a worker claims one
+
+Queues:
+- report_executions (pgmq): execution ids awaiting a worker
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '034'
+down_revision = '033'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Adding background execution columns to report_executions...")
+
+    conn.execute(text("""
+        ALTER TABLE report_executions
+            ADD COLUMN IF NOT EXISTS progress_percent INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS estimated_rows BIGINT,
+            ADD COLUMN IF NOT EXISTS cancel_requested BOOLEAN NOT NULL DEFAULT false;
+
+        CREATE INDEX IF NOT EXISTS idx_report_executions_org_status
+            ON report_executions(organization_id, execution_status);
+    """))
+
+    print("✅ report_executions progress and cancellation columns added")
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.create('report_executions');
+            END IF;
+        END $$;
+    """))
+
+    print("✅ report_executions queue created")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgmq') THEN
+                PERFORM pgmq.drop_queue('report_executions');
+            END IF;
+        END $$;
+    """))
+
+    conn.execute(text("""
+        DROP INDEX IF EXISTS idx_report_executions_org_status;
+
+        ALTER TABLE report_executions
+            DROP COLUMN IF EXISTS cancel_requested,
+            DROP COLUMN IF EXISTS estimated_rows,
+            DROP COLUMN IF EXISTS progress_percent;
+    """))
+
+    print("⚠️  report_executions background execution columns and queue removed")
@@ -0,0 +1,62 @@
+"""Notify tenant configuration changes
+
+Revision ID: 035
+Revises: 034
+Create Date: 2025-11-28
+
+Triggers:
+- organization_branding, system_settings: NOTIFY tenant_config with the
+  organization id after every insert, update or delete, so each worker's
+  TenantConfigCache drops that tenant's snapshot (delivered on commit;
+  repeated notifications in one transaction are collapsed)
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '035'
+down_revision = '034'
+branch_labels = None
+depends_on = None
+
+TABLES = ("organization_branding", "system_settings")
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Creating tenant configuration NOTIFY triggers...")
+
+    conn.execute(text("""
+        CREATE OR REPLACE FUNCTION notify_tenant_config_change()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_notify('tenant_config', OLD.organization_id::text);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM pg_notify('tenant_config', NEW.organization_id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    for table in TABLES:
+        conn.execute(text(f"""
+            DROP TRIGGER IF EXISTS trg_{table}_tenant_config ON {table};
+            CREATE TRIGGER trg_{table}_tenant_config
+                AFTER INSERT OR UPDATE OR DELETE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION notify_tenant_config_change();
+        """))
+
+    print("✅ tenant_config notifications enabled")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    for table in TABLES:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS trg_{table}_tenant_config ON {table};"))
+
+    conn.execute(text("DROP FUNCTION IF EXISTS notify_tenant_config_change();"))
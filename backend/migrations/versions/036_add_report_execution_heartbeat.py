@@ -0,0 +1,44 @@
+"""Heartbeat for running report executions
+
+Revision ID: 036
+Revises: 035
+Create Date: 2025-11-29
+
+Columns:
+- report_executions.heartbeat_at: set when a worker claims an execution and
+  on every progress commit; a RUNNING execution silent for longer than the
+  queue visibility timeout belongs to a dead worker and is claimed again
+  (and no longer counts towards the per-tenant concurrency cap)
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '036'
+down_revision = '035'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Adding heartbeat_at to report_executions...")
+
+    conn.execute(text("""
+        ALTER TABLE report_executions
+            ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ;
+    """))
+
+    print("✅ report_executions.heartbeat_at added")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        ALTER TABLE report_executions
+            DROP COLUMN IF EXISTS heartbeat_at;
+    """))
+
+    print("⚠️  report_executions.heartbeat_at removed")
@@ -0,0 +1,43 @@
+"""Claim token for running report executions
+
+Revision ID: 037
+Revises: 036
+Create Date: 2025-11-30
+
+Columns:
+- report_executions.claim_token: set by the worker that claims an
+  execution; progress and results are only written while it matches, so a
+  worker whose stale execution was taken over by another stops writing
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers
+revision = '037'
+down_revision = '036'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("Adding claim_token to report_executions...")
+
+    conn.execute(text("""
+        ALTER TABLE report_executions
+            ADD COLUMN IF NOT EXISTS claim_token VARCHAR(36);
+    """))
+
+    print("✅ report_executions.claim_token added")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        ALTER TABLE report_executions
+            DROP COLUMN IF EXISTS claim_token;
+    """))
+
+    print("⚠️  report_executions.claim_token removed")
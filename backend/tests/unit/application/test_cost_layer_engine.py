@@ -0,0 +1,185 @@
+"""
+Unit tests for CostLayerEngine.
+Phase 2: Material Management - Material Costing
+
+Tests set-based FIFO/LIFO issues, the consumption ledger and its reversal,
+the moving average cost and inventory valuation.
+"""
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.application.services.cost_layer_engine import CostLayerEngine, LayerIssueRequest
+from app.models.material import Material, MaterialCategory, UnitOfMeasure, ProcurementType, MRPType, DimensionType
+from app.models.inventory import StorageLocation, LocationType
+from app.models.costing import CostLayer, CostLayerConsumption, CostingMethod
+from app.models.currency import Currency as CurrencyModel
+
+
+@pytest.fixture
+def db_session():
+    """Create an in-memory SQLite session with USD, two materials and a location"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    session.add(CurrencyModel(code="USD", name="US Dollar", symbol="$", decimal_places=2))
+    uom = UnitOfMeasure(
+        uom_code="EA",
+        uom_name="Each",
+        dimension=DimensionType.QUANTITY,
+        is_base_unit=True,
+        conversion_factor=1.0
+    )
+    category = MaterialCategory(organization_id=1, category_code="RAW", category_name="Raw Materials")
+    session.add_all([uom, category])
+    session.flush()
+
+    for number in ("M001", "M002"):
+        session.add(Material(
+            organization_id=1,
+            plant_id=1,
+            material_number=number,
+            material_name=f"Material {number}",
+            material_category_id=category.id,
+            base_uom_id=uom.id,
+            procurement_type=ProcurementType.PURCHASE,
+            mrp_type=MRPType.MRP
+        ))
+    session.add(StorageLocation(
+        organization_id=1,
+        plant_id=1,
+        location_code="WH01",
+        location_name="Warehouse",
+        location_type=LocationType.WAREHOUSE
+    ))
+    session.commit()
+
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def engine(db_session):
+    """CostLayerEngine with three receipts of material 1 and one of material 2"""
+    engine = CostLayerEngine(db_session)
+    for material_id, batch, quantity, cost, day in [
+        (1, "B1", "100", "10.00", 1),
+        (1, "B2", "50", "12.00", 2),
+        (1, "B3", "30", "15.00", 3),
+        (2, "C1", "20", "5.00", 1),
+    ]:
+        engine.receive(
+            organization_id=1,
+            plant_id=1,
+            material_id=material_id,
+            storage_location_id=1,
+            batch_number=batch,
+            quantity=Decimal(quantity),
+            unit_cost=Decimal(cost),
+            currency_code="USD",
+            receipt_date=datetime(2025, 1, day, tzinfo=timezone.utc),
+            transaction_reference=f"PO-{batch}"
+        )
+    db_session.commit()
+    return engine
+
+
+def _remaining(db_session):
+    return {
+        layer.batch_number: layer.quantity_remaining
+        for layer in db_session.query(CostLayer).populate_existing()
+    }
+
+
+class TestCostLayerEngineIssue:
+    """Test batch FIFO/LIFO issues"""
+
+    def test_fifo_batch_issue_spans_layers_and_materials(self, engine, db_session):
+        results = engine.issue(1, 1, [
+            LayerIssueRequest(material_id=1, storage_location_id=1, quantity=Decimal("120")),
+            LayerIssueRequest(material_id=2, storage_location_id=1, quantity=Decimal("5")),
+        ], issue_reference="WO-1")
+
+        assert results[0]["total_cost"] == Decimal("1240.00")  # 100 * $10 + 20 * $12
+        assert results[0]["unit_cost"] == Decimal("10.33")
+        assert [b["batch_number"] for b in results[0]["batches_used"]] == ["B1", "B2"]
+        assert results[1]["total_cost"] == Decimal("25.00")
+        assert _remaining(db_session) == {
+            "B1": Decimal("0"), "B2": Decimal("30"), "B3": Decimal("30"), "C1": Decimal("15")
+        }
+
+    def test_lifo_issue_consumes_newest_first(self, engine, db_session):
+        results = engine.issue(1, 1, [
+            LayerIssueRequest(material_id=1, storage_location_id=1, quantity=Decimal("40")),
+        ], issue_reference="WO-2", costing_method=CostingMethod.LIFO)
+
+        assert results[0]["total_cost"] == Decimal("570.00")  # 30 * $15 + 10 * $12
+        assert [b["batch_number"] for b in results[0]["batches_used"]] == ["B3", "B2"]
+        assert _remaining(db_session)["B2"] == Decimal("40")
+
+    def test_shortage_consumes_nothing(self, engine, db_session):
+        with pytest.raises(ValueError, match="Insufficient inventory for material 2 at location 1"):
+            engine.issue(1, 1, [
+                LayerIssueRequest(material_id=1, storage_location_id=1, quantity=Decimal("10")),
+                LayerIssueRequest(material_id=2, storage_location_id=1, quantity=Decimal("21")),
+            ], issue_reference="WO-3")
+
+        assert _remaining(db_session)["B1"] == Decimal("100")
+        assert db_session.query(CostLayerConsumption).count() == 0
+
+    def test_invalid_requests_rejected(self, engine):
+        with pytest.raises(ValueError, match="Duplicate issue"):
+            engine.issue(1, 1, [
+                LayerIssueRequest(material_id=1, storage_location_id=1, quantity=Decimal("1")),
+                LayerIssueRequest(material_id=1, storage_location_id=1, quantity=Decimal("2")),
+            ], issue_reference="WO-4")
+        with pytest.raises(ValueError, match="FIFO or LIFO"):
+            engine.issue(1, 1, [], issue_reference="WO-4", costing_method=CostingMethod.STANDARD)
+
+
+class TestCostLayerEngineLedger:
+    """Test the consumption ledger, reversal and moving average"""
+
+    def test_issue_is_recorded_and_reversible(self, engine, db_session):
+        engine.issue(1, 1, [
+            LayerIssueRequest(material_id=1, storage_location_id=1, quantity=Decimal("120")),
+        ], issue_reference="WO-5")
+
+        ledger = db_session.query(CostLayerConsumption).order_by(CostLayerConsumption.id).all()
+        assert [(row.quantity, row.unit_cost) for row in ledger] == [
+            (Decimal("100"), Decimal("10.00")), (Decimal("20"), Decimal("12.00"))
+        ]
+
+        assert engine.reverse_issue("WO-5") == 2
+        assert engine.reverse_issue("WO-5") == 0
+        assert _remaining(db_session)["B1"] == Decimal("100")
+        assert _remaining(db_session)["B2"] == Decimal("50")
+        assert all(row.reversed_at is not None for row in ledger)
+
+    def test_moving_average_updated_incrementally(self, engine):
+        # (100 * 10 + 50 * 12 + 30 * 15) / 180
+        assert engine.get_average_cost(1, 1) == Decimal("11.39")
+
+        engine.issue(1, 1, [
+            LayerIssueRequest(material_id=1, storage_location_id=1, quantity=Decimal("80")),
+        ], issue_reference="WO-6")
+        assert engine.get_average_cost(1, 1) == Decimal("11.39")
+
+        engine.receive(1, 1, 1, 1, "B4", Decimal("100"), Decimal("20.00"), "USD",
+                       datetime(2025, 1, 4, tzinfo=timezone.utc), "PO-B4")
+        assert engine.get_average_cost(1, 1) == Decimal("15.70")  # (100 * 11.39 + 100 * 20) / 200
+
+    def test_valuation_aggregates_open_layers(self, engine):
+        engine.issue(1, 1, [
+            LayerIssueRequest(material_id=2, storage_location_id=1, quantity=Decimal("20")),
+        ], issue_reference="WO-7")
+
+        valuation = engine.valuate(organization_id=1)
+
+        assert len(valuation) == 1
+        assert valuation[0]["quantity"] == Decimal("180")
+        assert valuation[0]["total_value"] == Decimal("2050.00")
+        assert valuation[0]["unit_cost"] == Decimal("11.39")
@@ -0,0 +1,107 @@
+"""
+Unit tests for DashboardDataEngine
+
+Tests parallel widget loading:
+- Widgets run concurrently (dashboard time ~ slowest widget)
+- Identical widget queries share one execution and the tenant cache
+- Slow widgets time out without failing the dashboard
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.application.services import dashboard_data_engine
+from app.application.services.dashboard_data_engine import DashboardDataEngine, WidgetQuery
+from app.infrastructure.search.search_cache import SearchResultCache
+
+
+def _widget(source, refresh=60):
+    return WidgetQuery(
+        query_definition={"data_source": source, "measures": [{"column": "*", "aggregation": "count"}]},
+        refresh_interval_seconds=refresh
+    )
+
+
+@pytest.fixture
+def query_runs(monkeypatch):
+    """Fake ReportQueryEngine: sleeps per data source and records executions"""
+    runs = []
+    delays = {"slow": 0.5}
+    lock = threading.Lock()
+
+    class FakeEngine:
+        def __init__(self, db):
+            pass
+
+        def run(self, query_definition, organization_id, parameters):
+            source = query_definition["data_source"]
+            with lock:
+                runs.append((organization_id, source))
+            time.sleep(delays.get(source, 0.2))
+            if source == "broken":
+                raise ValueError("Report query is too expensive")
+            return {"rows": [{"count": 1}], "columns": ["count"]}
+
+    monkeypatch.setattr(dashboard_data_engine, "ReportQueryEngine", FakeEngine)
+    monkeypatch.setattr(dashboard_data_engine, "set_rls_context", lambda db, organization_id: None)
+    return runs
+
+
+@pytest.fixture
+def engine():
+    return DashboardDataEngine(
+        session_factory=MagicMock, cache=SearchResultCache(), executor=ThreadPoolExecutor(max_workers=12)
+    )
+
+
+def test_widgets_run_in_parallel(engine, query_runs):
+    """Twelve 0.2s widgets take about 0.2s, not 2.4s"""
+    widgets = {f"w{n}": _widget(f"source_{n}") for n in range(12)}
+
+    started = time.monotonic()
+    data = engine.load(1, widgets, deadline_seconds=5)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+    assert all(widget["status"] == "loaded" for widget in data.values())
+    assert len(query_runs) == 12
+
+
+def test_identical_queries_share_execution_and_cache(engine, query_runs):
+    """Duplicate widgets and concurrent users of a tenant run the query once"""
+    widgets = {"a": _widget("ncr"), "b": _widget("ncr")}
+
+    results = []
+    users = [threading.Thread(target=lambda: results.append(engine.load(1, widgets))) for _ in range(3)]
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+
+    assert query_runs == [(1, "ncr")]
+    assert all(result["a"]["data"] == result["b"]["data"] for result in results)
+
+    cached = engine.load(1, widgets)
+    assert cached["a"]["cached"] is True
+    assert query_runs == [(1, "ncr")]
+
+    engine.load(2, widgets)
+    assert query_runs == [(1, "ncr"), (2, "ncr")]
+
+
+def test_slow_widget_times_out_with_partial_results(engine, query_runs):
+    """Finished widgets are returned; the slow one fills the cache later"""
+    widgets = {"fast": _widget("ncr"), "slow": _widget("slow"), "bad": _widget("broken")}
+
+    data = engine.load(1, widgets, deadline_seconds=0.35)
+
+    assert data["fast"]["status"] == "loaded"
+    assert data["slow"] == {"status": "timeout", "data": None, "cached": False, "last_updated": None}
+    assert data["bad"]["status"] == "error"
+    assert "too expensive" in data["bad"]["error"]
+
+    time.sleep(0.3)
+    assert engine.load(1, widgets, deadline_seconds=0)["slow"]["cached"] is True
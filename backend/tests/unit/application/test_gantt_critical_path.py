@@ -0,0 +1,38 @@
+"""
+Unit tests for the Gantt board critical path
+
+Tests CPM over the board's operation network:
+- Float against each work order's due date, negative when late
+- Overlapping operations depend on part of their predecessor
+- Work orders with critical tasks form the critical path
+"""
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from app.application.use_cases.scheduling.get_gantt_chart import GanttChartTask, GetGanttChartUseCase
+
+
+def _task(work_order_id, operation_id, start_hour, hours, dependencies=(), mode="SEQUENTIAL", due_hour=None):
+    return GanttChartTask(
+        work_order_id=work_order_id, work_order_number=f"WO-{work_order_id}",
+        operation_id=operation_id, operation_name=None, operation_number=None,
+        start_date=datetime(2025, 3, 3, start_hour), end_date=datetime(2025, 3, 3, start_hour + hours),
+        duration_hours=hours, lane_id=None, lane_code=None, dependencies=list(dependencies),
+        progress_percent=0.0, status="PENDING", scheduling_mode=mode,
+        due_date=datetime(2025, 3, 3, due_hour) if due_hour is not None else None
+    )
+
+
+def test_gantt_float_against_due_dates():
+    tasks = [
+        _task(1, 11, 8, 2, due_hour=14),
+        _task(1, 12, 10, 2, [11], due_hour=14),
+        _task(2, 21, 8, 4, due_hour=11),
+        _task(2, 22, 10, 2, [21], mode="OVERLAP", due_hour=11),
+    ]
+
+    critical_path = GetGanttChartUseCase(MagicMock())._calculate_critical_path(tasks)
+
+    assert [task.total_float_hours for task in tasks] == [2.0, 2.0, -1.0, -1.0]
+    assert [task.is_critical_path for task in tasks] == [False, False, True, True]
+    assert critical_path == [2]
@@ -0,0 +1,122 @@
+"""
+Unit tests for GanttProjectionService
+
+Tests bulk Gantt projection from the single board query:
+- Operation times follow sequential / overlap / parallel scheduling
+- Progress from operation status and actual times, in the same pass
+- Work orders without operations become one task
+- NDJSON pages report where the next page starts
+"""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.application.services.gantt_projection_service import GanttProjectionService
+from app.models.work_order import OperationStatus, OrderStatus, SchedulingMode
+
+
+START = datetime(2025, 3, 3, 8, 0)
+
+
+def _row(work_order_id, operation_id=None, **overrides):
+    row = {
+        "work_order_id": work_order_id,
+        "work_order_number": f"WO-{work_order_id}",
+        "order_status": OrderStatus.RELEASED,
+        "start_date_planned": START,
+        "end_date_planned": datetime(2025, 3, 4, 8, 0),
+        "planned_quantity": 10.0,
+        "actual_quantity": 4.0,
+        "operation_id": operation_id,
+        "operation_number": operation_id,
+        "operation_name": f"Op {operation_id}",
+        "work_center_id": 1,
+        "work_center_code": "WC-1",
+        "setup_time_minutes": 30.0,
+        "run_time_per_unit_minutes": 3.0,
+        "operation_status": OperationStatus.PENDING,
+        "actual_setup_time": None,
+        "actual_run_time": None,
+        "scheduling_mode": SchedulingMode.SEQUENTIAL,
+        "predecessor_operation_id": None,
+        "can_start_at_percentage": 100.0,
+        "lane_id": 5,
+        "lane_code": "LANE-5",
+    }
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+@pytest.fixture
+def service():
+    service = GanttProjectionService(MagicMock())
+    service.repo = MagicMock()
+    return service
+
+
+def test_operations_scheduled_by_mode(service):
+    service.repo.iter_gantt_rows.return_value = iter([
+        _row(1, 11),
+        _row(1, 12, predecessor_operation_id=11),
+        _row(1, 13, predecessor_operation_id=12, scheduling_mode=SchedulingMode.OVERLAP,
+             can_start_at_percentage=50.0),
+        _row(1, 14, predecessor_operation_id=13, scheduling_mode=SchedulingMode.PARALLEL),
+    ])
+
+    (tasks,) = list(service.iter_work_order_tasks(organization_id=7))
+
+    # Each operation takes 30 + 3 x 10 = 60 minutes
+    starts = [task["start_date"] for task in tasks]
+    assert starts == [
+        START,
+        datetime(2025, 3, 3, 9, 0),
+        datetime(2025, 3, 3, 9, 30),
+        START,
+    ]
+    assert tasks[1]["end_date"] == datetime(2025, 3, 3, 10, 0)
+    assert tasks[2]["dependencies"] == [12]
+    assert tasks[0]["lane_code"] == "LANE-5"
+    assert tasks[0]["work_center_code"] == "WC-1"
+    assert tasks[2]["scheduling_mode"] == "OVERLAP"
+
+
+def test_progress_computed_in_same_pass(service):
+    service.repo.iter_gantt_rows.return_value = iter([
+        _row(1, 11, operation_status=OperationStatus.COMPLETED),
+        _row(1, 12, predecessor_operation_id=11, operation_status=OperationStatus.IN_PROGRESS,
+             actual_setup_time=30.0, actual_run_time=15.0),
+        _row(2, None, planned_quantity=8.0, actual_quantity=2.0),
+    ])
+
+    first, second = list(service.iter_work_order_tasks(organization_id=7))
+
+    assert [task["progress_percent"] for task in first] == [100.0, 75.0]
+    assert first[1]["status"] == "IN_PROGRESS"
+    assert len(second) == 1
+    assert second[0]["operation_id"] is None
+    assert second[0]["progress_percent"] == 25.0
+    assert second[0]["duration_hours"] == 24.0
+    assert second[0]["status"] == "RELEASED"
+
+
+def test_ndjson_page_reports_next_skip(service):
+    service.repo.iter_gantt_rows.return_value = iter([_row(1, 11), _row(1, 12), _row(2), _row(3)])
+
+    lines = [json.loads(line) for chunk in service.iter_ndjson(organization_id=7, skip=40, limit=2)
+             for line in chunk.splitlines()]
+
+    assert service.repo.iter_gantt_rows.call_args.kwargs["limit"] == 3
+    assert [line["type"] for line in lines] == ["task", "task", "task", "end"]
+    assert lines[-1] == {"type": "end", "work_orders": 2, "next_skip": 42}
+
+
+def test_ndjson_last_page(service):
+    service.repo.iter_gantt_rows.return_value = iter([_row(1)])
+
+    lines = [json.loads(line) for chunk in service.iter_ndjson(organization_id=7, limit=5)
+             for line in chunk.splitlines()]
+
+    assert lines[-1] == {"type": "end", "work_orders": 1, "next_skip": None}
@@ -0,0 +1,196 @@
+"""
+Unit tests for InventoryPostingService.
+Phase 2: Material Management - Inventory Tracking
+
+Tests batched receipts, issues and transfers: all-or-nothing posting,
+net availability checks, cost resolution and idempotent retries.
+"""
+import pytest
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.application.services.inventory_posting_service import (
+    InventoryPostingService,
+    MovementType,
+    PostingLine,
+)
+from app.core.exceptions import (
+    ConflictException,
+    EntityNotFoundException,
+    InsufficientInventoryException,
+    ValidationException,
+)
+from app.models.material import Material, MaterialCategory, UnitOfMeasure, ProcurementType, MRPType, DimensionType
+from app.models.inventory import (
+    Inventory,
+    InventoryPosting,
+    InventoryTransaction,
+    LocationType,
+    StorageLocation,
+    TransactionType,
+)
+from app.models.costing import MaterialCosting, CostingMethod
+from app.models.currency import Currency as CurrencyModel
+
+
+@pytest.fixture
+def db_session():
+    """In-memory SQLite session with two materials, two locations and stock of M001"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    session.add(CurrencyModel(code="USD", name="US Dollar", symbol="$", decimal_places=2))
+    uom = UnitOfMeasure(
+        uom_code="EA",
+        uom_name="Each",
+        dimension=DimensionType.QUANTITY,
+        is_base_unit=True,
+        conversion_factor=1.0
+    )
+    category = MaterialCategory(organization_id=1, category_code="RAW", category_name="Raw Materials")
+    session.add_all([uom, category])
+    session.flush()
+
+    for number in ("M001", "M002"):
+        session.add(Material(
+            organization_id=1,
+            plant_id=1,
+            material_number=number,
+            material_name=f"Material {number}",
+            material_category_id=category.id,
+            base_uom_id=uom.id,
+            procurement_type=ProcurementType.PURCHASE,
+            mrp_type=MRPType.MRP
+        ))
+    for code in ("WH01", "WH02"):
+        session.add(StorageLocation(
+            organization_id=1,
+            plant_id=1,
+            location_code=code,
+            location_name=f"Warehouse {code}",
+            location_type=LocationType.WAREHOUSE
+        ))
+    session.flush()
+
+    session.add(Inventory(
+        organization_id=1,
+        plant_id=1,
+        material_id=1,
+        storage_location_id=1,
+        batch_number="B1",
+        quantity_on_hand=100.0,
+        quantity_reserved=10.0,
+        unit_of_measure_id=uom.id
+    ))
+    session.add(MaterialCosting(
+        organization_id=1,
+        plant_id=1,
+        material_id=1,
+        costing_method=CostingMethod.WEIGHTED_AVERAGE,
+        currency_code="USD",
+        standard_cost=Decimal("9.00"),
+        current_average_cost=Decimal("10.00")
+    ))
+    session.commit()
+
+    yield session
+    session.close()
+
+
+def _line(movement_type, material_id=1, location_id=1, quantity="5", batch="B1", **values):
+    return PostingLine(
+        movement_type=movement_type,
+        material_id=material_id,
+        storage_location_id=location_id,
+        quantity=Decimal(quantity),
+        batch_number=batch,
+        **values
+    )
+
+
+def _on_hand(db_session):
+    return {
+        (row.material_id, row.storage_location_id, row.batch_number): row.quantity_on_hand
+        for row in db_session.query(Inventory).populate_existing()
+    }
+
+
+class TestInventoryPosting:
+    """Test batched posting of receipts, issues and transfers"""
+
+    def test_batch_posts_all_movements_in_one_transaction(self, db_session):
+        result = InventoryPostingService(db_session).post(1, 1, 42, [
+            _line(MovementType.ISSUE, quantity="30"),
+            _line(MovementType.TRANSFER, quantity="20", to_storage_location_id=2),
+            _line(MovementType.RECEIPT, material_id=2, quantity="7", batch="C1", unit_cost=Decimal("3.50")),
+        ], transaction_reference="WO-1")
+
+        types = [(t.transaction_type, t.quantity) for t in result.transactions]
+        assert types == [
+            (TransactionType.GOODS_ISSUE, -30.0),
+            (TransactionType.TRANSFER_OUT, -20.0),
+            (TransactionType.TRANSFER_IN, 20.0),
+            (TransactionType.GOODS_RECEIPT, 7.0),
+        ]
+        assert result.transactions[0].unit_cost == 10.0  # material average cost
+        assert result.transactions[3].total_value == 24.5
+        assert all(t.posting_id == result.posting_id for t in result.transactions)
+        assert _on_hand(db_session) == {(1, 1, "B1"): 50.0, (1, 2, "B1"): 20.0, (2, 1, "C1"): 7.0}
+
+    def test_shortage_rejects_whole_batch(self, db_session):
+        with pytest.raises(InsufficientInventoryException) as exc_info:
+            InventoryPostingService(db_session).post(1, 1, 42, [
+                _line(MovementType.RECEIPT, material_id=2, batch="C1", unit_cost=Decimal("1")),
+                _line(MovementType.ISSUE, quantity="60"),
+                _line(MovementType.ISSUE, quantity="31"),
+            ], transaction_reference="WO-2")
+
+        assert exc_info.value.material_code == "M001"
+        assert exc_info.value.available == 90.0  # on hand minus reserved
+        assert db_session.query(InventoryTransaction).count() == 0
+        assert _on_hand(db_session) == {(1, 1, "B1"): 100.0}
+
+    def test_receipt_in_same_batch_covers_issue(self, db_session):
+        InventoryPostingService(db_session).post(1, 1, 42, [
+            _line(MovementType.ISSUE, location_id=2, quantity="4"),
+            _line(MovementType.RECEIPT, location_id=2, quantity="4", unit_cost=Decimal("1")),
+        ], transaction_reference="WO-3")
+
+        assert db_session.query(InventoryTransaction).count() == 2
+
+    def test_unknown_entities_and_invalid_lines_rejected(self, db_session):
+        service = InventoryPostingService(db_session)
+        with pytest.raises(EntityNotFoundException):
+            service.post(1, 1, 42, [_line(MovementType.ISSUE, material_id=99)], "WO-4")
+        with pytest.raises(EntityNotFoundException):
+            service.post(1, 1, 42, [_line(MovementType.TRANSFER, to_storage_location_id=99)], "WO-4")
+        with pytest.raises(ValidationException, match="target storage location"):
+            service.post(1, 1, 42, [_line(MovementType.TRANSFER)], "WO-4")
+        with pytest.raises(ValidationException, match="Cannot determine cost for material 'M002'"):
+            service.post(1, 1, 42, [_line(MovementType.RECEIPT, material_id=2)], "WO-4")
+
+
+class TestInventoryPostingIdempotency:
+    """Test idempotent retries of postings"""
+
+    def test_retry_returns_original_posting(self, db_session):
+        service = InventoryPostingService(db_session)
+        lines = [_line(MovementType.ISSUE, quantity="10")]
+
+        first = service.post(1, 1, 42, lines, "WO-5", idempotency_key="scan-1")
+        retry = service.post(1, 1, 42, lines, "WO-5", idempotency_key="scan-1")
+
+        assert retry.replayed and not first.replayed
+        assert retry.posting_id == first.posting_id
+        assert [t.id for t in retry.transactions] == [t.id for t in first.transactions]
+        assert _on_hand(db_session)[(1, 1, "B1")] == 90.0
+        assert db_session.query(InventoryPosting).count() == 1
+
+    def test_key_reused_for_other_lines_conflicts(self, db_session):
+        service = InventoryPostingService(db_session)
+        service.post(1, 1, 42, [_line(MovementType.ISSUE)], "WO-6", idempotency_key="scan-2")
+
+        with pytest.raises(ConflictException):
+            service.post(1, 1, 42, [_line(MovementType.ISSUE, quantity="6")], "WO-6", idempotency_key="scan-2")
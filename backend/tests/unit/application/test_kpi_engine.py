@@ -0,0 +1,125 @@
+"""
+Unit tests for KPIEngine
+
+Tests the KPI registry fast path:
+- Current and previous period come from one statement (FILTER aggregates)
+- KPI values, trend and drill-down groups from the summed measures
+- Requests the KPI's sources cannot answer are rejected
+- Results are cached per tenant
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.application.services.kpi_engine import KPI_REGISTRY, KPIEngine, parse_kpi_period
+from app.infrastructure.search.search_cache import SearchResultCache
+
+
+PERIOD = (datetime(2025, 11, 1), datetime(2025, 11, 11))
+
+
+def _row(group_key=None, **measures):
+    return SimpleNamespace(group_key=group_key, _mapping={"group_key": group_key, **measures})
+
+
+def _sql(kpi_type, filters=None, breakdown_by=None):
+    statement = KPIEngine(MagicMock()).build_query(
+        KPI_REGISTRY[kpi_type], 7, PERIOD, filters or {}, breakdown_by
+    )
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_both_periods_in_one_statement():
+    sql = _sql("FPY", filters={"plant_id": [1, 2]}, breakdown_by="product")
+
+    assert sql.count("FILTER (WHERE") == 6
+    assert "inspection_log.inspected_at >= '2025-10-22 00:00:00'" in sql
+    assert "inspection_log.organization_id = 7" in sql
+    assert "GROUP BY work_order.material_id" in sql
+
+
+def test_multi_source_kpi_unions_sources():
+    sql = _sql("OEE", breakdown_by="machine")
+
+    assert sql.count("UNION ALL") == 2
+    assert "FROM production_logs" in sql
+    assert "FROM machine_status_history" in sql
+    assert sql.endswith("GROUP BY kpi_measures.group_key")
+
+
+def test_fpy_trend_and_breakdown():
+    rows = [
+        _row(10, inspected_current=100, inspected_previous=100,
+             passed_current=90, passed_previous=80, failed_current=10, failed_previous=20),
+        _row(11, inspected_current=100, inspected_previous=100,
+             passed_current=100, passed_previous=100, failed_current=0, failed_previous=0),
+    ]
+
+    result = KPIEngine.evaluate("FPY", KPI_REGISTRY["FPY"], rows, PERIOD, "product")
+
+    assert result["value"] == 95.0
+    assert result["previous_value"] == 90.0
+    assert result["trend"] == 5.56
+    assert result["breakdown"]["total_inspected"] == 200
+    groups = result["breakdown"]["groups"]
+    assert [group["product_id"] for group in groups] == [10, 11]
+    assert groups[0]["value"] == 90.0
+    assert groups[0]["trend"] == 12.5
+
+
+def test_oee_uses_machine_time_and_downtime():
+    rows = [_row(
+        produced_current=1000, produced_previous=0, scrapped_current=50, scrapped_previous=0,
+        downtime_minutes_current=2880, downtime_minutes_previous=0,
+        machine_count_current=2, machine_count_previous=2,
+    )]
+
+    result = KPIEngine.evaluate("OEE", KPI_REGISTRY["OEE"], rows, PERIOD)
+
+    # 2 machines x 10 days = 28800 planned minutes, 10% down, 95% good
+    assert result["breakdown"]["availability"] == 90.0
+    assert result["breakdown"]["quality"] == 95.0
+    assert result["value"] == 85.5
+    assert result["trend"] is None
+    assert result["unit"] == "%"
+
+
+@pytest.mark.parametrize("kpi_type,filters,breakdown_by", [
+    ("NPS", None, None),
+    ("FPY", None, "shift"),
+    ("OEE", {"product_id": 3}, None),
+    ("YIELD", {"customer_id": 3}, None),
+])
+def test_unsupported_requests_rejected(kpi_type, filters, breakdown_by):
+    with pytest.raises(ValueError):
+        KPIEngine.validate(kpi_type, filters, breakdown_by)
+
+
+def test_results_cached_per_tenant():
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [
+        _row(produced_current=10, produced_previous=5, scrapped_current=0, scrapped_previous=0)
+    ]
+    engine = KPIEngine(db, cache=SearchResultCache())
+
+    first = engine.calculate(1, "THROUGHPUT", PERIOD)
+    second = engine.calculate(1, "THROUGHPUT", PERIOD)
+    engine.calculate(2, "THROUGHPUT", PERIOD)
+
+    assert second is first
+    assert db.execute.call_count == 2
+    assert first["trend"] == 100.0
+
+
+def test_parse_period_includes_end_date():
+    start, end = parse_kpi_period({"start": "2025-11-01", "end": "2025-11-10"})
+    assert (start, end) == PERIOD
+
+    default_start, default_end = parse_kpi_period(None)
+    assert default_end - default_start == timedelta(days=30)
+
+    with pytest.raises(ValueError):
+        parse_kpi_period({"start": "2025-11-10", "end": "2025-11-01"})
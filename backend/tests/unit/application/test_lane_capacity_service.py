@@ -0,0 +1,121 @@
+"""
+Unit tests for LaneCapacityService
+
+Tests the lane capacity calendar and planning on top of it:
+- Daily allocation per lane from one query
+- Overbooked days grouped into periods
+- Best-fit lane suggestion
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from app.application.dtos.lane_dto import LaneSuggestionRequest
+from app.application.services.lane_capacity_service import LaneCapacityService
+
+
+LANES = {
+    1: SimpleNamespace(id=1, lane_code="L1", lane_name="Lane 1", capacity_per_day=Decimal("100")),
+    2: SimpleNamespace(id=2, lane_code="L2", lane_name="Lane 2", capacity_per_day=Decimal("50")),
+}
+
+
+@pytest.fixture
+def db_session():
+    """
+    Session whose lane/assignment join returns one row per (lane, capacity-
+    consuming assignment) for lanes L1 (capacity 100) and L2 (capacity 50),
+    like the outer join in LaneRepository.get_capacity_calendar
+    """
+    session = Mock()
+    session.assignments = []
+
+    def rows():
+        result = []
+        for lane_id, lane in LANES.items():
+            assigned = [a for a in session.assignments if a[0] == lane_id]
+            result.extend((lane, start, end, Decimal(capacity)) for _, start, end, capacity in assigned)
+            if not assigned:
+                result.append((lane, None, None, None))
+        return result
+
+    query = session.query.return_value
+    query.outerjoin.return_value = query
+    query.filter.return_value = query
+    query.order_by.return_value = query
+    query.all.side_effect = rows
+    return session
+
+
+def _assign(session, lane_id, start, end, capacity):
+    session.assignments.append((lane_id, start, end, capacity))
+
+
+class TestLaneCapacityCalendar:
+    """Test daily capacity per lane"""
+
+    def test_calendar_accumulates_overlapping_assignments(self, db_session):
+        _assign(db_session, 1, date(2025, 10, 30), date(2025, 11, 2), "40")
+        _assign(db_session, 1, date(2025, 11, 2), date(2025, 11, 9), "30")
+
+        calendar = LaneCapacityService(db_session).get_calendar(1, date(2025, 11, 1), date(2025, 11, 4))
+
+        assert db_session.query.call_count == 1
+        assert [lane.lane_code for lane in calendar.lanes] == ["L1", "L2"]
+        days = calendar.lanes[0].days
+        assert [day.allocated_capacity for day in days] == [40, 70, 30, 30]
+        assert [day.assignment_count for day in days] == [1, 2, 1, 1]
+        assert days[1].available_capacity == 30
+        assert days[1].utilization_rate == Decimal("70.00")
+        assert all(day.allocated_capacity == 0 for day in calendar.lanes[1].days)
+
+    def test_invalid_range_rejected(self, db_session):
+        service = LaneCapacityService(db_session)
+        with pytest.raises(ValueError):
+            service.get_calendar(1, date(2025, 11, 2), date(2025, 11, 1))
+        with pytest.raises(ValueError):
+            service.get_calendar(1, date(2025, 1, 1), date(2026, 1, 2))
+
+    def test_heatmap_rows_align_with_dates(self, db_session):
+        _assign(db_session, 2, date(2025, 11, 2), date(2025, 11, 2), "50")
+
+        heatmap = LaneCapacityService(db_session).get_heatmap(1, date(2025, 11, 1), date(2025, 11, 3))
+
+        assert heatmap.dates == [date(2025, 11, 1), date(2025, 11, 2), date(2025, 11, 3)]
+        assert heatmap.lanes[1].utilization_rates == [0, 100, 0]
+
+
+class TestLanePlanning:
+    """Test overbooking detection and best-fit suggestion"""
+
+    def test_overbooked_days_grouped_into_periods(self, db_session):
+        _assign(db_session, 2, date(2025, 11, 1), date(2025, 11, 5), "30")
+        _assign(db_session, 2, date(2025, 11, 2), date(2025, 11, 3), "40")
+        _assign(db_session, 2, date(2025, 11, 5), date(2025, 11, 5), "25")
+
+        overbookings = LaneCapacityService(db_session).find_overbookings(1, date(2025, 11, 1), date(2025, 11, 7))
+
+        assert [(o.start_date, o.end_date, o.peak_overbooked_capacity) for o in overbookings] == [
+            (date(2025, 11, 2), date(2025, 11, 3), 20),
+            (date(2025, 11, 5), date(2025, 11, 5), 5),
+        ]
+
+    def test_suggestion_prefers_tightest_fit(self, db_session):
+        _assign(db_session, 1, date(2025, 11, 3), date(2025, 11, 3), "75")
+        request = LaneSuggestionRequest(
+            plant_id=1,
+            scheduled_start=date(2025, 11, 1),
+            scheduled_end=date(2025, 11, 5),
+            allocated_capacity=Decimal("20")
+        )
+
+        suggestions = LaneCapacityService(db_session).suggest_lanes(request)
+
+        # L1 has 25 free on its tightest day (5 left), L2 has 50 (30 left)
+        assert [(s.lane_code, s.remaining_capacity) for s in suggestions] == [("L1", 5), ("L2", 30)]
+        assert suggestions[0].peak_utilization_rate == Decimal("95.00")
+
+        request.allocated_capacity = Decimal("60")
+        assert LaneCapacityService(db_session).suggest_lanes(request) == []
@@ -0,0 +1,73 @@
+"""
+Unit tests for LogisticsService scan processing
+
+Tests barcode resolution and batched scan ingestion:
+- Resolutions (including unknown codes) are served from the LRU cache
+- Offline queue batches resolve distinct codes with one query
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from app.application.services.logistics_service import LogisticsService
+from app.infrastructure.cache.barcode_resolution_cache import barcode_resolution_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    barcode_resolution_cache.invalidate()
+    yield
+    barcode_resolution_cache.invalidate()
+
+
+@pytest.fixture
+def label_repo():
+    repo = Mock()
+    repo.get_by_values.side_effect = lambda org_id, values: {
+        value: SimpleNamespace(id=9, entity_type="shipment_item", entity_id=100, barcode_type="CODE128")
+        for value in values
+        if value.startswith("SHIP")
+    }
+    return repo
+
+
+@pytest.fixture
+def service(label_repo):
+    return LogisticsService(Mock(), Mock(), label_repo, Mock())
+
+
+class TestBarcodeResolution:
+    """Test suite for cached barcode resolution"""
+
+    def test_lookup_cached_per_organization(self, service, label_repo):
+        assert service.lookup_barcode("SHIP-1", org_id=1)["entity_id"] == 100
+        assert service.lookup_barcode("SHIP-1", org_id=1)["label_id"] == 9
+        assert service.lookup_barcode("JUNK", org_id=1) is None
+        assert service.lookup_barcode("JUNK", org_id=1) is None
+        assert label_repo.get_by_values.call_count == 2
+
+        service.lookup_barcode("SHIP-1", org_id=2)
+        assert label_repo.get_by_values.call_count == 3
+
+
+class TestScanIngestion:
+    """Test suite for batched offline scan ingestion"""
+
+    def test_batch_resolves_distinct_codes_once(self, service, label_repo):
+        service._scan_repo.create_batch.return_value = 2
+        captured = datetime(2025, 11, 3, 8, 0)
+
+        result = service.ingest_scans(1, 10, 7, [
+            {"scan_code": "SHIP-1", "scan_timestamp": captured, "device_id": "D1"},
+            {"scan_code": "SHIP-1", "scan_timestamp": captured.replace(minute=1), "device_id": "D1"},
+            {"scan_code": "JUNK", "scan_timestamp": captured, "device_id": "D1"},
+        ])
+
+        label_repo.get_by_values.assert_called_once()
+        assert sorted(label_repo.get_by_values.call_args[0][1]) == ["JUNK", "SHIP-1"]
+        rows = service._scan_repo.create_batch.call_args[0][0]
+        assert [row["scan_resolution"] for row in rows] == ["SUCCESS", "SUCCESS", "NOT_FOUND"]
+        assert rows[0]["scan_timestamp"] == captured
+        assert rows[0]["entity_id"] == 100 and rows[2]["entity_id"] is None
+        assert result == {"received": 3, "recorded": 2, "duplicates": 1, "resolved": 2, "not_found": 1}
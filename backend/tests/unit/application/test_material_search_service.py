@@ -300,3 +300,36 @@ class TestMaterialSearchService:
             plant_id=None,
             limit=5
         )
+
+    def test_search_pushes_filters_into_repository_query(self):
+        """Test filters are passed to the repository instead of trimming its results"""
+        mock_repository = Mock()
+        mock_repository.search_materials.return_value = []
+        service = MaterialSearchService(mock_repository)
+
+        service.search(
+            query="steel",
+            organization_id=1,
+            filters={"category_id": 3, "procurement_type": "PURCHASE", "is_active": True},
+            limit=10
+        )
+
+        mock_repository.search_materials.assert_called_with(
+            query="steel",
+            org_id=1,
+            plant_id=None,
+            limit=10,
+            category_id=3,
+            procurement_type="PURCHASE",
+            is_active=True
+        )
+
+    def test_search_rejects_unknown_filter(self):
+        """Test unsupported filter keys raise ValueError"""
+        mock_repository = Mock()
+        service = MaterialSearchService(mock_repository)
+
+        with pytest.raises(ValueError):
+            service.search(query="steel", organization_id=1, filters={"color": "red"})
+
+        mock_repository.search_materials.assert_not_called()
@@ -0,0 +1,177 @@
+"""Unit tests for set-based recall report generation, export and background jobs."""
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.application.dtos.traceability_dto import RecallReportRequest
+from app.application.services.traceability_service import (
+    RecallReportService,
+    RECALL_REPORT_QUEUE,
+    iter_recall_report_csv,
+)
+from app.infrastructure.messaging.pgmq_client import PGMQMessage
+from app.infrastructure.repositories.traceability_repository import RecallTraceRepository
+
+
+def _impact_row(kind, **values):
+    row = dict(
+        kind=kind, id=None, code=None, status=None, event_date=None, quantity=None, depth=None,
+        material_id=None, serial_numbers=None, customer_name=None, customer_email=None, destination=None,
+    )
+    row.update(values)
+    return SimpleNamespace(**row)
+
+
+def _lot(lot_id, lot_number, material_id=7, quantity=10):
+    return SimpleNamespace(id=lot_id, lot_number=lot_number, material_id=material_id, initial_quantity=quantity)
+
+
+def _request(lot_numbers=("LOT-1", "LOT-2"), **overrides):
+    values = dict(material_id=7, lot_numbers=list(lot_numbers), reason="Contamination", severity="HIGH")
+    values.update(overrides)
+    return RecallReportRequest(**values)
+
+
+@pytest.fixture
+def db():
+    return MagicMock()
+
+
+@pytest.fixture
+def service(db):
+    service = RecallReportService(db)
+    service.lot_repo = MagicMock()
+    service.trace_repo = MagicMock()
+    service._validate_material = MagicMock(
+        return_value=SimpleNamespace(id=7, material_number="MAT-7", description="Resin", material_name="Resin")
+    )
+    service.lot_repo.list_by_lot_numbers.return_value = [_lot(1, "LOT-1"), _lot(2, "LOT-2")]
+    service.trace_repo.get_upstream_lots.return_value = [
+        SimpleNamespace(id=50, lot_number="SUP-1", material_id=3, depth=1)
+    ]
+    service.trace_repo.get_downstream_impact.return_value = [
+        _impact_row("work_order", id=11, code="WO-11", status="COMPLETED", quantity=Decimal("4.5")),
+        _impact_row("shipment", id=21, code="SH-21", quantity=2, serial_numbers=["S1", "S2"],
+                    customer_name="Acme", customer_email="qa@acme.test", destination="Dock 1"),
+        _impact_row("shipment", id=22, code="SH-22", quantity=1, serial_numbers=["S3"], destination="Globex"),
+        _impact_row("shipment", id=23, code="SH-23", quantity=3, serial_numbers=["S4", "S5", "S6"],
+                    customer_name="Acme", customer_email="qa@acme.test"),
+        _impact_row("lot", id=30, code="FG-30", depth=1, material_id=9),
+        _impact_row("serials", quantity=8),
+    ]
+    return service
+
+
+def test_lots_resolved_in_one_query(service):
+    lots = service._validate_lots(["LOT-2", "LOT-1", "LOT-2"], 7, 1)
+
+    service.lot_repo.list_by_lot_numbers.assert_called_once_with(1, ["LOT-2", "LOT-1", "LOT-2"])
+    assert [lot.lot_number for lot in lots] == ["LOT-2", "LOT-1"]
+
+
+def test_missing_and_foreign_lots_rejected(service):
+    with pytest.raises(ValueError, match="Lot 'LOT-3' not found"):
+        service._validate_lots(["LOT-1", "LOT-3"], 7, 1)
+    with pytest.raises(ValueError, match="2 lots not found"):
+        service._validate_lots(["LOT-3", "LOT-4"], 7, 1)
+    with pytest.raises(ValueError, match="does not belong to material 8"):
+        service._validate_lots(["LOT-1"], 8, 1)
+
+
+def test_report_aggregates_impact_rows(service):
+    stages = []
+
+    report = service.generate_recall_report(
+        _request(), user_id=5, organization_id=1, progress=lambda percent, stage: stages.append(percent)
+    )
+
+    service.trace_repo.get_downstream_impact.assert_called_once_with(1, [1, 2], 10, True)
+    assert report.total_quantity_affected == Decimal(20)
+    assert [wo.work_order_number for wo in report.affected_work_orders] == ["WO-11"]
+    assert report.affected_work_orders[0].quantity_consumed == Decimal("4.5")
+    assert report.affected_shipments[1].customer_name == "Globex"  # destination fallback
+    customers = {c.customer_name: c for c in report.affected_customers}
+    assert customers["Acme"].shipment_count == 2
+    assert customers["Acme"].total_quantity == Decimal(5)
+    assert report.downstream_impact.total_quantity_shipped == Decimal(6)
+    assert report.downstream_impact.total_affected_serials == 8
+    assert [lot.lot_number for lot in report.downstream_lots] == ["FG-30"]
+    assert [lot.lot_number for lot in report.upstream_lots] == ["SUP-1"]
+    assert stages == sorted(stages) and stages[-1] == 100
+
+
+def test_report_without_distribution_chain_skips_upstream(service):
+    report = service.generate_recall_report(
+        _request(include_distribution_chain=False, include_customer_details=False), 5, 1
+    )
+
+    service.trace_repo.get_upstream_lots.assert_not_called()
+    assert service.trace_repo.get_downstream_impact.call_args[0][3] is False
+    assert report.affected_customers == []
+    assert all(s.customer_name is None for s in report.affected_shipments)
+
+
+def test_csv_export_streams_sections_in_chunks(service):
+    report = service.generate_recall_report(_request(), 5, 1)
+
+    chunks = list(iter_recall_report_csv(report, chunk_rows=3))
+    lines = "".join(chunks).splitlines()
+
+    assert len(chunks) > 1
+    assert lines[0].startswith("section,")
+    sections = [line.split(",")[0] for line in lines[1:]]
+    assert sections.count("shipment") == 3
+    assert {"report", "work_order", "customer", "downstream_lot", "upstream_lot"} <= set(sections)
+
+
+def test_job_run_records_progress_and_report(service, db):
+    job = SimpleNamespace(
+        id=3, status="QUEUED", request=_request().model_dump(), requested_by=5, organization_id=1,
+        progress_percent=0, stage=None, report=None, error=None, started_at=None, completed_at=None,
+    )
+    db.query.return_value.filter.return_value.first.return_value = job
+
+    assert service.run_report_job(3) == "COMPLETED"
+    assert job.progress_percent == 100
+    assert job.report["downstream_impact"]["total_affected_shipments"] == 3
+    assert job.completed_at is not None
+
+
+def test_job_failure_is_recorded(service, db):
+    job = SimpleNamespace(
+        id=3, status="QUEUED", request=_request(lot_numbers=["LOT-9"]).model_dump(), requested_by=5,
+        organization_id=1, progress_percent=0, stage=None, report=None, error=None,
+        started_at=None, completed_at=None,
+    )
+    db.query.return_value.filter.return_value.first.return_value = job
+
+    assert service.run_report_job(3) == "FAILED"
+    assert "LOT-9" in job.error
+    db.rollback.assert_called_once()
+
+
+def test_queue_batch_archives_handled_jobs(service):
+    client = MagicMock()
+    client.dequeue_batch.return_value = [
+        PGMQMessage(msg_id=1, message={"job_id": 3}, vt=300)
+    ]
+    service.run_report_job = MagicMock(return_value="COMPLETED")
+
+    assert service.process_queue_batch(client) == {"COMPLETED": 1}
+    client.archive_batch.assert_called_once_with(RECALL_REPORT_QUEUE, [1])
+
+
+def test_trace_repository_walks_genealogy_in_database(db):
+    repo = RecallTraceRepository(db)
+
+    repo.get_downstream_impact(1, [1, 2], max_depth=6, include_lots=False)
+
+    sql, params = str(db.execute.call_args[0][0]), db.execute.call_args[0][1]
+    assert "WITH RECURSIVE walk" in sql
+    assert "l.parent_lot_id = w.lot_id" in sql
+    assert params == {"org_id": 1, "lot_ids": [1, 2], "max_depth": 6, "include_lots": False}
+
+    repo.get_upstream_lots(1, [1], max_depth=6)
+    assert "l.child_lot_id = w.lot_id" in str(db.execute.call_args[0][0])
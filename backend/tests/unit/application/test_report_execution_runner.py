@@ -0,0 +1,158 @@
+"""
+Unit tests for ReportExecutionRunner
+
+Tests background report execution:
+- Per-tenant concurrency cap (busy messages put back on the queue)
+- Chunked export to object storage with progress
+- Cancellation between chunks
+- Reclaiming executions of dead workers, and stopping the worker that lost its claim
+"""
+import os
+from types import SimpleNamespace
+from unittest.mock import ANY, MagicMock
+
+import pytest
+
+from app.application.services import report_execution_runner
+from app.application.services.report_execution_runner import REPORT_EXECUTION_QUEUE, ReportExecutionRunner
+from app.infrastructure.repositories.reporting_repository import CLAIMED, TENANT_BUSY, ExecutionClaimLost
+
+
+@pytest.fixture
+def execution():
+    report = SimpleNamespace(
+        organization_id=5, report_code="PROD_DAILY", query_definition={"data_source": "production_logs"}
+    )
+    return SimpleNamespace(id=42, export_format="CSV", parameters={"plant_id": 1}, report=report)
+
+
+@pytest.fixture
+def runner(execution, monkeypatch):
+    storage = MagicMock()
+    storage.build_object_path.side_effect = lambda *parts: "/".join(parts)
+    storage.uploaded = []
+    storage.upload_file.side_effect = lambda path, name, content_type: storage.uploaded.append(
+        (open(path, "rb").read(), name, content_type, path)
+    )
+
+    runner = ReportExecutionRunner(MagicMock(), stream_session_factory=MagicMock, storage=storage)
+    runner.execution_repo = MagicMock()
+    runner.execution_repo.claim.return_value = CLAIMED
+    runner.execution_repo.get_by_id.return_value = execution
+    runner.execution_repo.record_progress.return_value = False
+    runner.execution_repo.heartbeat.return_value = False
+
+    engine = MagicMock()
+    engine.stream.return_value = (
+        ["machine_id", "produced"], 4, iter([[(1, 10), (2, 20)], [(3, 30), (4, 40)]])
+    )
+    monkeypatch.setattr(report_execution_runner, "ReportQueryEngine", lambda db: engine)
+    return runner
+
+
+def test_export_streams_chunks_to_storage_with_progress(runner):
+    """Each chunk is written and its progress committed before the upload"""
+    runner.run_execution(42)
+
+    content, object_name, content_type, path = runner.storage.uploaded[0]
+    assert content.decode().splitlines() == ["machine_id,produced", "1,10", "2,20", "3,30", "4,40"]
+    assert object_name == "5/reports/42/PROD_DAILY.csv"
+    assert content_type == "text/csv"
+    assert not os.path.exists(path)
+
+    progress = [call.args for call in runner.execution_repo.record_progress.call_args_list]
+    assert progress == [(42, 0, 0), (42, 2, 50), (42, 4, 99)]
+
+    result = runner.execution_repo.update_result.call_args.kwargs
+    assert result["result_count"] == 4
+    assert result["result_file_path"] == object_name
+    assert "rows" not in result["result_data"]
+
+
+def test_cancel_request_stops_export(runner):
+    """A cancellation seen after a chunk stops the export without uploading"""
+    runner.execution_repo.record_progress.side_effect = [False, True]
+
+    runner.run_execution(42)
+
+    runner.execution_repo.update_status.assert_called_once_with(42, 'CANCELLED', claim_token=ANY)
+    runner.storage.upload_file.assert_not_called()
+    runner.execution_repo.update_result.assert_not_called()
+
+
+def test_failed_export_marks_execution_failed(runner):
+    """Query errors fail the execution instead of the worker"""
+    report_execution_runner.ReportQueryEngine(None).stream.side_effect = ValueError("Report export is too expensive")
+
+    runner.run_execution(42)
+
+    runner.execution_repo.update_status.assert_called_once_with(
+        42, 'FAILED', error_message="Report export is too expensive", claim_token=ANY
+    )
+
+
+def test_busy_tenant_message_put_back(runner):
+    """Messages of tenants at the cap become visible again instead of being archived"""
+    runner.execution_repo.claim.side_effect = [TENANT_BUSY, 'CANCELLED']
+    client = MagicMock()
+    client.dequeue_batch.return_value = [
+        SimpleNamespace(msg_id=1, message={"execution_id": 42}),
+        SimpleNamespace(msg_id=2, message={"execution_id": 43}),
+    ]
+
+    outcomes = runner.process_queue_batch(client)
+
+    assert outcomes == {TENANT_BUSY: 1, 'CANCELLED': 1}
+    client.set_visibility_timeout.assert_called_once_with(REPORT_EXECUTION_QUEUE, 1, 15)
+    client.archive_batch.assert_called_once_with(REPORT_EXECUTION_QUEUE, [2])
+
+
+def test_stale_threshold_exceeds_visibility_and_statement_timeouts(runner):
+    """A live export waiting on its first fetch is never judged stale"""
+    client = MagicMock()
+    client.dequeue_batch.return_value = [SimpleNamespace(msg_id=1, message={"execution_id": 42})]
+
+    outcomes = runner.process_queue_batch(client, vt=900)
+
+    assert outcomes == {'COMPLETED': 1}
+    (execution_id, max_running, stale_after, claim_token), _ = runner.execution_repo.claim.call_args
+    assert (execution_id, max_running) == (42, 2)
+    assert stale_after == 1800 + 300
+    # Every write of the run carries the token it claimed with
+    assert runner.execution_repo.update_result.call_args.kwargs["claim_token"] == claim_token
+    assert {call.kwargs["claim_token"] for call in runner.execution_repo.record_progress.call_args_list} == {claim_token}
+
+
+def test_heartbeat_before_query_and_upload(runner):
+    calls = []
+    runner.execution_repo.heartbeat.side_effect = lambda *a, **k: calls.append("heartbeat") or False
+    engine = report_execution_runner.ReportQueryEngine(None)
+    engine.stream.side_effect = lambda *a: calls.append("query") or engine.stream.return_value
+    runner.storage.upload_file.side_effect = lambda *a, **k: calls.append("upload")
+
+    runner.run_execution(42)
+
+    assert calls == ["heartbeat", "query", "heartbeat", "upload"]
+
+
+def test_lost_claim_stops_without_writing(runner):
+    """A worker whose execution was taken over stops at its next heartbeat"""
+    runner.execution_repo.record_progress.side_effect = [False, ExecutionClaimLost("taken over")]
+
+    assert runner.run_execution(42) == 'SUPERSEDED'
+
+    runner.storage.upload_file.assert_not_called()
+    runner.execution_repo.update_status.assert_not_called()
+    runner.execution_repo.update_result.assert_not_called()
+
+
+def test_execution_running_elsewhere_checked_again(runner):
+    """A redelivered message is kept while another worker still runs its execution"""
+    runner.execution_repo.claim.return_value = 'RUNNING'
+    client = MagicMock()
+    client.dequeue_batch.return_value = [SimpleNamespace(msg_id=1, message={"execution_id": 42})]
+
+    runner.process_queue_batch(client, vt=900)
+
+    client.set_visibility_timeout.assert_called_once_with(REPORT_EXECUTION_QUEUE, 1, 900)
+    client.archive_batch.assert_called_once_with(REPORT_EXECUTION_QUEUE, [])
@@ -0,0 +1,153 @@
+"""
+Unit tests for the report query engine
+
+Tests compilation of report definitions into aggregate SQL:
+- Whitelisted sources, columns, aggregations and operators
+- Organization scoping and index-friendly time ranges
+- Parameter binding
+- EXPLAIN cost guard and statement timeout
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.application.services.report_query_engine import ReportQueryCompiler, ReportQueryEngine
+
+
+DEFINITION = {
+    "data_source": "production_logs",
+    "dimensions": ["machine_id"],
+    "measures": [
+        {"column": "quantity_produced", "aggregation": "sum", "alias": "produced"},
+        {"column": "*", "aggregation": "count", "alias": "log_count"},
+    ],
+    "filters": [{"column": "plant_id", "operator": "eq", "value": {"param": "plant_id"}}],
+    "time_grain": "day",
+    "time_range": {"start": {"param": "start"}, "end": {"param": "end"}},
+    "sort": [{"column": "produced", "direction": "desc"}],
+}
+
+PARAMETERS = {"plant_id": 3, "start": "2025-11-01", "end": "2025-11-08"}
+
+
+def _sql(stmt):
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+class TestReportQueryCompiler:
+    """Tests for ReportQueryCompiler"""
+
+    def test_compiles_grouped_aggregate_scoped_to_organization(self):
+        """Dimensions, measures, grain and sort compile to one GROUP BY query"""
+        sql, params = _sql(ReportQueryCompiler().compile(DEFINITION, 7, PARAMETERS, row_limit=100))
+
+        assert "date_trunc('day', production_logs.timestamp) AS period" in sql
+        assert "sum(production_logs.quantity_produced) AS produced" in sql
+        assert "count(*) AS log_count" in sql
+        assert "GROUP BY date_trunc('day', production_logs.timestamp), production_logs.machine_id" in sql
+        assert "ORDER BY produced DESC" in sql
+        # Time range on the raw column keeps the timestamp index usable
+        assert "production_logs.timestamp >= %(timestamp_1)s" in sql
+        assert "production_logs.timestamp < %(timestamp_2)s" in sql
+
+        assert params["organization_id_1"] == 7
+        assert params["plant_id_1"] == 3
+        assert params["timestamp_1"] == datetime(2025, 11, 1)
+        assert params["param_1"] == 100
+
+    def test_values_are_bound_not_inlined(self):
+        """Filter values never reach the SQL text"""
+        definition = dict(DEFINITION, filters=[
+            {"column": "plant_id", "operator": "in", "value": ["1; DROP TABLE plants"]}
+        ])
+        sql, _ = _sql(ReportQueryCompiler().compile(definition, 1, PARAMETERS))
+
+        assert "DROP TABLE" not in sql
+
+    @pytest.mark.parametrize("change, message", [
+        ({"data_source": "users"}, "Invalid data_source"),
+        ({"dimensions": ["notes"]}, "Unknown dimension"),
+        ({"measures": [{"column": "organization_id", "aggregation": "sum"}]}, "Unknown measure"),
+        ({"measures": [{"column": "quantity_produced", "aggregation": "stddev"}]}, "Invalid aggregation"),
+        ({"filters": [{"column": "notes", "operator": "eq", "value": "x"}]}, "Unknown filter column"),
+        ({"filters": [{"column": "plant_id", "operator": "like", "value": "x"}]}, "Invalid filter operator"),
+        ({"time_grain": "fortnight"}, "Invalid time_grain"),
+        ({"time_range": None}, "requires a time_range"),
+        ({"sort": [{"column": "plant_id"}]}, "Sort column"),
+    ])
+    def test_validate_rejects_non_whitelisted_definitions(self, change, message):
+        """Anything outside the whitelists is rejected when the report is saved"""
+        with pytest.raises(ValueError, match=message):
+            ReportQueryCompiler().validate(dict(DEFINITION, **change))
+
+    def test_validate_accepts_parameter_references(self):
+        """Definitions are validated without execution parameters"""
+        ReportQueryCompiler().validate(DEFINITION)
+
+    def test_missing_parameter_rejected(self):
+        """Executing without a referenced parameter fails"""
+        with pytest.raises(ValueError, match="Missing report parameter 'plant_id'"):
+            ReportQueryCompiler().compile(DEFINITION, 1, {"start": "2025-11-01", "end": "2025-11-08"})
+
+
+class TestReportQueryEngine:
+    """Tests for ReportQueryEngine guards"""
+
+    def _db(self, cost, rows=()):
+        db = MagicMock()
+        explain = MagicMock()
+        explain.scalar.return_value = [{"Plan": {"Total Cost": cost}}]
+        result = MagicMock()
+        result.keys.return_value = ["period", "machine_id", "produced", "log_count"]
+        result.fetchall.return_value = list(rows)
+        db.execute.side_effect = [MagicMock(), explain, result]
+        return db
+
+    def test_runs_under_statement_timeout_and_returns_json_rows(self, monkeypatch):
+        """Timeout is set locally, the plan is checked, rows are JSON-ready"""
+        from decimal import Decimal
+        monkeypatch.setattr("app.application.services.report_query_engine.settings.REPORT_STATEMENT_TIMEOUT_MS", 5000)
+        db = self._db(120.5, rows=[(datetime(2025, 11, 1), 4, Decimal("12.500"), 3)])
+
+        result = ReportQueryEngine(db).run(DEFINITION, 1, PARAMETERS)
+
+        timeout_sql = str(db.execute.call_args_list[0].args[0])
+        assert "set_config('statement_timeout'" in timeout_sql
+        assert db.execute.call_args_list[0].args[1] == {"timeout": "5000"}
+        assert str(db.execute.call_args_list[1].args[0]).startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert result["rows"] == [
+            {"period": "2025-11-01T00:00:00", "machine_id": 4, "produced": 12.5, "log_count": 3}
+        ]
+        assert result["summary"] == {"total_rows": 1, "truncated": False, "estimated_cost": 120.5}
+
+    def test_expensive_query_rejected_before_execution(self, monkeypatch):
+        """Plans over the cost limit are never executed"""
+        monkeypatch.setattr("app.application.services.report_query_engine.settings.REPORT_MAX_QUERY_COST", 1000.0)
+        db = self._db(50000.0)
+
+        with pytest.raises(ValueError, match="too expensive"):
+            ReportQueryEngine(db).run(DEFINITION, 1, PARAMETERS)
+
+        assert db.execute.call_count == 2
+
+    def test_stream_reads_chunks_from_server_side_cursor(self, monkeypatch):
+        """Exports use the export timeout and stream rows in chunks"""
+        monkeypatch.setattr("app.application.services.report_query_engine.settings.REPORT_EXPORT_STATEMENT_TIMEOUT_MS", 60000)
+        db = MagicMock()
+        explain = MagicMock()
+        explain.scalar.return_value = [{"Plan": {"Total Cost": 10.0, "Plan Rows": 2500}}]
+        result = MagicMock()
+        result.keys.return_value = ["machine_id", "produced"]
+        db.execute.side_effect = [MagicMock(), explain, result]
+
+        columns, estimated_rows, chunks = ReportQueryEngine(db).stream(DEFINITION, 1, PARAMETERS, chunk_size=1000)
+
+        assert db.execute.call_args_list[0].args[1] == {"timeout": "60000"}
+        assert db.execute.call_args_list[2].kwargs["execution_options"] == {
+            "stream_results": True, "max_row_buffer": 1000
+        }
+        result.partitions.assert_called_once_with(1000)
+        assert (columns, estimated_rows, chunks) == (["machine_id", "produced"], 2500, result.partitions.return_value)
@@ -0,0 +1,117 @@
+"""
+Unit tests for ScheduleConflictService
+
+Tests conflict detection over lanes, work centers and operators:
+- Lane overload against daily capacity, with inclusive end dates
+- Machine overload from projected operation times and machine counts
+- Unreleased operator allocations run to the end of the period
+- Assignment re-check reports only conflicts involving the assignment
+"""
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.application.services.schedule_conflict_service import ScheduleConflictService
+
+
+def _assignment(assignment_id, work_order_id, start, end, capacity, lane_id=5):
+    return SimpleNamespace(
+        assignment_id=assignment_id, lane_id=lane_id, lane_code=f"LANE-{lane_id}",
+        capacity_per_day=Decimal("100"), work_order_id=work_order_id,
+        work_order_number=f"WO-{work_order_id}", scheduled_start=start, scheduled_end=end,
+        allocated_capacity=Decimal(capacity)
+    )
+
+
+def _task(work_order_id, operation_id, start_hour, end_hour, status="PENDING", work_center_id=1):
+    return {
+        "work_order_id": work_order_id, "work_order_number": f"WO-{work_order_id}",
+        "operation_id": operation_id, "work_center_id": work_center_id, "work_center_code": "WC-1",
+        "start_date": datetime(2025, 3, 3, start_hour), "end_date": datetime(2025, 3, 3, end_hour),
+        "status": status,
+    }
+
+
+@pytest.fixture
+def service():
+    service = ScheduleConflictService(MagicMock())
+    service.repo = MagicMock()
+    service.projection = MagicMock()
+    return service
+
+
+def test_lane_overload_uses_capacity_and_inclusive_end(service):
+    service.repo.get_lane_bookings.return_value = [
+        _assignment(1, 10, date(2025, 3, 1), date(2025, 3, 10), "60"),
+        _assignment(2, 11, date(2025, 3, 10), date(2025, 3, 12), "50"),
+        _assignment(3, 12, date(2025, 3, 11), date(2025, 3, 12), "40"),
+    ]
+
+    (conflict,) = service.find_lane_conflicts(7, date(2025, 3, 1), date(2025, 3, 31))
+
+    assert conflict["conflict_type"] == "LANE_OVERLOAD"
+    assert conflict["affected_work_orders"] == [10, 11]
+    assert conflict["affected_lanes"] == [5]
+    assert conflict["details"]["overlap_start"] == "2025-03-10"
+    assert conflict["details"]["overlap_end"] == "2025-03-10"
+    assert conflict["details"]["peak_load"] == 110.0
+    assert conflict["details"]["work_orders"] == ["WO-10", "WO-11"]
+
+
+def test_machine_overload_against_machine_count(service):
+    service.repo.get_work_center_machine_counts.return_value = {1: 2}
+    service.projection.iter_work_order_tasks.return_value = iter([
+        [_task(10, 101, 8, 12), _task(10, 102, 12, 14, status="COMPLETED")],
+        [_task(11, 111, 9, 11)],
+        [_task(12, 121, 10, 13)],
+    ])
+
+    (conflict,) = service.find_machine_conflicts(1, 7, date(2025, 3, 3), date(2025, 3, 3))
+
+    assert conflict["conflict_type"] == "MACHINE_OVERLOAD"
+    assert conflict["affected_work_orders"] == [10, 11, 12]
+    assert conflict["details"]["overlap_start"] == "2025-03-03T10:00:00"
+    assert conflict["details"]["overlap_end"] == "2025-03-03T11:00:00"
+    assert conflict["details"]["operation_ids"] == [101, 111, 121]
+
+
+def test_unreleased_operator_allocation_runs_to_period_end(service):
+    service.repo.get_operator_bookings.return_value = [
+        SimpleNamespace(allocation_id=1, user_id=42, work_order_id=10, work_order_number="WO-10",
+                        operation_id=None, allocated_at=datetime(2025, 3, 3, 8, tzinfo=timezone.utc),
+                        released_at=None),
+        SimpleNamespace(allocation_id=2, user_id=42, work_order_id=11, work_order_number="WO-11",
+                        operation_id=None, allocated_at=datetime(2025, 3, 4, 8, tzinfo=timezone.utc),
+                        released_at=datetime(2025, 3, 4, 16, tzinfo=timezone.utc)),
+    ]
+
+    (conflict,) = service.find_operator_conflicts(7, date(2025, 3, 1), date(2025, 3, 31))
+
+    assert conflict["conflict_type"] == "OPERATOR_DOUBLE_BOOKING"
+    assert conflict["details"]["user_id"] == 42
+    assert conflict["details"]["allocation_ids"] == [1, 2]
+
+
+def test_check_lane_assignment_filters_to_assignment(service):
+    service.repo.get_lane_bookings.return_value = [
+        _assignment(1, 10, date(2025, 3, 1), date(2025, 3, 2), "60"),
+        _assignment(2, 11, date(2025, 3, 1), date(2025, 3, 2), "60"),
+        _assignment(3, 12, date(2025, 3, 5), date(2025, 3, 6), "60"),
+    ]
+    saved = SimpleNamespace(id=3, plant_id=7, lane_id=5,
+                            scheduled_start=date(2025, 3, 1), scheduled_end=date(2025, 3, 6))
+
+    assert service.check_lane_assignment(saved) == []
+    assert service.repo.get_lane_bookings.call_args.args == (7, date(2025, 3, 1), date(2025, 3, 6), [5])
+
+    saved.id = 2
+    (conflict,) = service.check_lane_assignment(saved)
+    assert conflict["details"]["assignment_ids"] == [1, 2]
+
+
+def test_detect_rejects_inverted_range(service):
+    with pytest.raises(ValueError):
+        service.detect(7, date(2025, 3, 2), date(2025, 3, 1))
@@ -0,0 +1,125 @@
+"""Unit tests for asynchronous Stripe webhook ingestion and processing."""
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.application.services.stripe_webhook_service import (
+    StripeWebhookService,
+    STRIPE_WEBHOOK_QUEUE,
+    extract_stripe_customer_id,
+)
+from app.infrastructure.messaging.pgmq_client import PGMQMessage
+
+
+def _record(event_type="invoice.payment_succeeded", status="received", attempts=0):
+    record = MagicMock()
+    record.id = 1
+    record.event_id = "evt_1"
+    record.event_type = event_type
+    record.status = status
+    record.attempts = attempts
+    record.stripe_customer_id = "cus_1"
+    record.stripe_created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    record.payload = {"data": {"object": {"customer": "cus_1"}}}
+    return record
+
+
+@pytest.fixture
+def db():
+    return MagicMock()
+
+
+@pytest.fixture
+def service(db):
+    return StripeWebhookService(db, max_attempts=3)
+
+
+def _lock_returns(db, record):
+    db.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = record
+
+
+def test_extract_customer_from_object_and_customer_events():
+    assert extract_stripe_customer_id({"data": {"object": {"customer": "cus_1"}}}) == "cus_1"
+    assert extract_stripe_customer_id({"data": {"object": {"object": "customer", "id": "cus_2"}}}) == "cus_2"
+    assert extract_stripe_customer_id({"data": {"object": {}}}) is None
+
+
+def test_ingest_enqueues_new_event_in_same_transaction(service, db):
+    db.execute.return_value.scalar.return_value = 10
+
+    created = service.ingest({"id": "evt_1", "type": "invoice.payment_succeeded", "created": 1700000000,
+                              "data": {"object": {"customer": "cus_1"}}})
+
+    assert created is True
+    # Insert + pgmq.send, then a single commit
+    assert db.execute.call_count == 2
+    assert db.execute.call_args.args[1]["queue"] == STRIPE_WEBHOOK_QUEUE
+    db.commit.assert_called_once()
+
+
+def test_ingest_duplicate_is_not_enqueued(service, db):
+    db.execute.return_value.scalar.return_value = None
+
+    created = service.ingest({"id": "evt_1", "type": "invoice.payment_succeeded", "data": {"object": {}}})
+
+    assert created is False
+    assert db.execute.call_count == 1
+
+
+def test_process_event_marks_processed_and_commits_once(service, db):
+    record = _record()
+    _lock_returns(db, record)
+    service._has_earlier_pending_event = MagicMock(return_value=False)
+    service._handlers["invoice.payment_succeeded"] = MagicMock(return_value=(True, "ok"))
+
+    assert service.process_event("evt_1") == "processed"
+    assert record.status == "processed"
+    assert record.attempts == 1
+    db.commit.assert_called_once()
+
+
+def test_process_event_skips_already_processed(service, db):
+    _lock_returns(db, _record(status="processed"))
+    handler = MagicMock()
+    service._handlers["invoice.payment_succeeded"] = handler
+
+    assert service.process_event("evt_1") == "duplicate"
+    handler.assert_not_called()
+
+
+def test_process_event_defers_behind_earlier_customer_event(service, db):
+    _lock_returns(db, _record())
+    service._has_earlier_pending_event = MagicMock(return_value=True)
+    handler = MagicMock()
+    service._handlers["invoice.payment_succeeded"] = handler
+
+    assert service.process_event("evt_1") == "deferred"
+    handler.assert_not_called()
+
+
+def test_process_event_failure_becomes_dead_after_max_attempts(service, db):
+    record = _record(attempts=2)
+    _lock_returns(db, record)
+    db.query.return_value.filter.return_value.first.return_value = record
+    service._has_earlier_pending_event = MagicMock(return_value=False)
+    service._handlers["invoice.payment_succeeded"] = MagicMock(side_effect=RuntimeError("boom"))
+
+    assert service.process_event("evt_1") == "dead"
+    assert record.last_error == "boom"
+    db.rollback.assert_called_once()
+
+
+def test_process_queue_batch_archives_finished_messages(service):
+    pgmq_client = MagicMock()
+    pgmq_client.dequeue_batch.return_value = [
+        PGMQMessage(msg_id=1, message={"event_id": "evt_1"}, vt=30),
+        PGMQMessage(msg_id=2, message={"event_id": "evt_2"}, vt=30),
+        PGMQMessage(msg_id=3, message={"event_id": "evt_3"}, vt=30),
+    ]
+    service.process_event = MagicMock(side_effect=["processed", "deferred", "duplicate"])
+
+    outcomes = service.process_queue_batch(pgmq_client, batch_size=10)
+
+    assert outcomes == {"processed": 1, "deferred": 1, "duplicate": 1}
+    pgmq_client.archive_batch.assert_called_once_with(STRIPE_WEBHOOK_QUEUE, [1, 3])
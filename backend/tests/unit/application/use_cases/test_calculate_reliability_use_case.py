@@ -0,0 +1,107 @@
+"""
+Unit tests for CalculateReliabilityUseCase
+
+Tests fleet-wide MTBF/MTTR/availability:
+- Per-machine figures from the grouped downtime rollup
+- Machines without downtime are still reported
+- Trend buckets clipped to the period
+- Cached results skip the database
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from app.application.use_cases.metrics.calculate_reliability import (
+    CalculateReliabilityUseCase,
+    CalculateReliabilityDTO,
+)
+from app.core.exceptions import ValidationException
+from app.domain.entities.maintenance import DowntimeCategory
+
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 1, 3)  # 48 hours
+
+
+def _row(machine_id, category, count, minutes, clipped=None, bucket=None):
+    return {
+        "machine_id": machine_id,
+        "category": category,
+        "bucket": bucket,
+        "event_count": count,
+        "downtime_minutes": minutes,
+        "clipped_downtime_minutes": minutes if clipped is None else clipped,
+    }
+
+
+@pytest.fixture
+def use_case():
+    db = Mock()
+    db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [
+        SimpleNamespace(id=1, machine_code="M-1", machine_name="Press 1"),
+        SimpleNamespace(id=2, machine_code="M-2", machine_name="Press 2"),
+    ]
+    use_case = CalculateReliabilityUseCase(db)
+    use_case.cache = Mock()
+    use_case.cache.get.return_value = None
+    use_case.repo = Mock()
+    return use_case
+
+
+class TestCalculateReliabilityUseCase:
+    """Test suite for fleet reliability calculation"""
+
+    def test_machine_figures_from_rollup(self, use_case):
+        use_case.repo.get_downtime_rollup.return_value = [
+            _row(1, DowntimeCategory.BREAKDOWN, 2, 120.0),
+            _row(1, DowntimeCategory.CHANGEOVER, 0, 0.0, clipped=60.0),
+        ]
+
+        result = use_case.execute(CalculateReliabilityDTO(1, 10, START, END))
+
+        machine = result["machine_metrics"][0]
+        # 48h - 3h downtime = 45h operating over 2 failures
+        assert machine["mtbf_hours"] == 22.5
+        assert machine["mttr_hours"] == 1.0
+        assert machine["total_downtime_hours"] == 3.0
+        assert machine["availability_percent"] == 93.75
+        use_case.repo.get_downtime_rollup.assert_called_once()
+
+    def test_machines_without_downtime_are_reported(self, use_case):
+        use_case.repo.get_downtime_rollup.return_value = [_row(1, DowntimeCategory.BREAKDOWN, 1, 60.0)]
+
+        result = use_case.execute(CalculateReliabilityDTO(1, 10, START, END))
+
+        idle = result["machine_metrics"][1]
+        assert idle["machine_id"] == 2
+        assert idle["mtbf_hours"] is None
+        assert idle["availability_percent"] == 100.0
+        assert result["plant_aggregate"]["machine_count"] == 2
+        assert result["plant_aggregate"]["total_failures"] == 1
+
+    def test_trend_buckets(self, use_case):
+        use_case.repo.get_downtime_rollup.return_value = [
+            _row(1, DowntimeCategory.BREAKDOWN, 1, 60.0, bucket=datetime(2025, 1, 1)),
+            _row(2, DowntimeCategory.BREAKDOWN, 1, 30.0, bucket=datetime(2025, 1, 2)),
+        ]
+
+        result = use_case.execute(CalculateReliabilityDTO(1, 10, START, END, bucket="day"))
+
+        assert [point["bucket"] for point in result["trend"]] == [
+            "2025-01-01T00:00:00", "2025-01-02T00:00:00"
+        ]
+        # Two machines x 24h per bucket
+        assert result["trend"][0]["total_operating_hours"] == 47.0
+
+    def test_cached_result_skips_queries(self, use_case):
+        use_case.cache.get.return_value = {"machine_metrics": []}
+
+        assert use_case.execute(CalculateReliabilityDTO(1, 10, START, END)) == {"machine_metrics": []}
+        use_case.repo.get_downtime_rollup.assert_not_called()
+
+    def test_invalid_bucket_raises_validation(self, use_case):
+        use_case.repo.get_downtime_rollup.side_effect = ValueError("Unsupported bucket")
+
+        with pytest.raises(ValidationException):
+            use_case.execute(CalculateReliabilityDTO(1, 10, START, END, bucket="year"))
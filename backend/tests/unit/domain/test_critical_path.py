@@ -0,0 +1,166 @@
+"""
+Unit tests for the critical path method (CriticalPathNetwork).
+
+Tests:
+- Earliest/latest times, total and free float on a textbook network
+- Overlap dependencies and per-activity deadlines (negative float)
+- Incremental duration updates match a full recomputation
+- Cycles and unknown activities are rejected
+- Milestone networks derive durations from dependency dates
+- Milestone float against the earliest finish, with the planned end as slack
+"""
+import random
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.domain.services.critical_path import CriticalPathNetwork, build_milestone_network, planned_end_slack
+
+
+def _textbook_network():
+    #   A(3) -> B(4) -> D(2)
+    #   A(3) -> C(2) -> D(2)
+    #   C(2) -> E(1)
+    return CriticalPathNetwork(
+        {"A": 3, "B": 4, "C": 2, "D": 2, "E": 1},
+        [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D"), ("C", "E")]
+    )
+
+
+def test_forward_and_backward_pass():
+    network = _textbook_network()
+
+    assert network.project_finish == 9
+    assert network.critical_path() == ["A", "B", "D"]
+
+    c = network.activity("C")
+    assert (c.earliest_start, c.earliest_finish) == (3, 5)
+    assert (c.latest_start, c.latest_finish) == (5, 7)
+    assert c.total_float == 2
+    # E starts as soon as C finishes
+    assert c.free_float == 0
+    assert not c.is_critical
+
+    e = network.activity("E")
+    assert e.total_float == 3
+    assert e.free_float == 3
+
+
+def test_free_float_smaller_than_total_float():
+    network = CriticalPathNetwork(
+        {"A": 2, "B": 1, "C": 5, "D": 1},
+        [("A", "B"), ("B", "D"), ("C", "D")]
+    )
+
+    a = network.activity("A")
+    assert a.total_float == 2
+    # A's slack is shared with B: A slipping alone delays nothing until B's slack is used
+    assert a.free_float == 0
+    assert network.activity("B").free_float == 2
+
+
+def test_overlap_and_deadlines():
+    network = CriticalPathNetwork(
+        {"cut": 10, "weld": 10, "done": 0},
+        [("cut", "weld", 0.5), ("weld", "done")],
+        release_times={"cut": 2},
+        deadlines={"done": 15}
+    )
+
+    weld = network.activity("weld")
+    assert weld.earliest_start == 7
+    assert weld.earliest_finish == 17
+    # Due at 15 but finishes at 17: two hours late
+    assert weld.total_float == -2
+    assert network.activity("cut").latest_start == 0
+    assert network.critical_path() == ["cut", "weld", "done"]
+
+
+def test_incremental_update_matches_full_recomputation():
+    rng = random.Random(7)
+    nodes = list(range(300))
+    durations = {node: rng.randint(0, 20) for node in nodes}
+    dependencies = [
+        (p, s, rng.choice([1.0, 1.0, 0.5]))
+        for s in nodes for p in rng.sample(nodes[:s], min(s, rng.randint(0, 3)))
+    ]
+    network = CriticalPathNetwork(durations, dependencies, deadlines={299: 150})
+
+    for _ in range(50):
+        node = rng.choice(nodes)
+        durations[node] = rng.randint(0, 40)
+        network.update_duration(node, durations[node])
+
+        expected = CriticalPathNetwork(durations, dependencies, deadlines={299: 150})
+        assert network.project_finish == expected.project_finish
+        assert network.schedule() == expected.schedule()
+
+
+def test_update_reports_changed_activities():
+    network = _textbook_network()
+
+    assert network.update_duration("E", 2) == {"E"}
+    changed = network.update_duration("C", 6)
+    assert network.project_finish == 11
+    assert network.critical_path() == ["A", "C", "D", "E"]
+    assert {"C", "D", "E"} <= changed
+    assert network.update_duration("C", 6) == set()
+
+
+@pytest.mark.parametrize("durations,dependencies", [
+    ({"A": 1, "B": 1}, [("A", "B"), ("B", "A")]),
+    ({"A": 1}, [("A", "missing")]),
+    ({"A": -1}, []),
+])
+def test_invalid_networks_rejected(durations, dependencies):
+    with pytest.raises(ValueError):
+        CriticalPathNetwork(durations, dependencies)
+
+
+def _milestone(milestone_id, planned, dependencies=None, actual=None):
+    return SimpleNamespace(id=milestone_id, planned_date=planned, actual_date=actual, dependencies=dependencies)
+
+
+def test_milestone_network_float_against_earliest_finish():
+    milestones = [
+        _milestone(1, date(2025, 1, 31)),
+        _milestone(2, date(2025, 2, 28), [1]),
+        _milestone(3, date(2025, 2, 10), [1, 99]),
+        _milestone(4, date(2025, 3, 31), [2, 3]),
+    ]
+
+    network, origin = build_milestone_network(milestones, date(2025, 1, 1))
+
+    assert origin == date(2025, 1, 1)
+    third = network.activity(3)
+    assert third.duration == 10
+    assert third.latest_finish == 58  # 2025-02-28
+    assert third.total_float == 18
+    assert network.critical_path() == [1, 2, 4]
+    assert planned_end_slack(network, origin, date(2025, 3, 31)) == 0
+
+    # What-if: the first milestone takes ten days longer
+    network.update_duration(1, 40)
+    assert network.activity(4).earliest_finish == 99  # 2025-04-10
+    assert network.activity(4).total_float == 0
+    # Ten days past the planned end
+    assert planned_end_slack(network, origin, date(2025, 3, 31)) == -10
+
+
+def test_planned_end_after_last_milestone_keeps_critical_path():
+    milestones = [
+        _milestone(1, date(2026, 1, 5)),
+        _milestone(2, date(2026, 1, 20), [1]),
+        _milestone(3, date(2026, 2, 1), [2]),
+        _milestone(4, date(2026, 1, 10), [1]),
+    ]
+
+    network, origin = build_milestone_network(milestones, date(2026, 1, 1))
+
+    assert network.critical_path() == [1, 2, 3]
+    slack = planned_end_slack(network, origin, date(2026, 3, 1))
+    assert slack == 28
+    assert network.activity(3).total_float + slack == 28
+    assert network.activity(4).total_float + slack == 50
+    assert planned_end_slack(network, origin, None) == 0
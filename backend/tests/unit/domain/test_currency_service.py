@@ -474,3 +474,95 @@ class TestValidation:
             )
 
         assert "Exchange rate must be positive" in str(exc_info.value)
+
+
+class TestBatchConversion:
+    """Test convert_many and the exchange rate cache"""
+
+    @pytest.fixture
+    def setup_rates(self, db_session, setup_currencies):
+        rates = [
+            ExchangeRateModel(
+                from_currency_code="USD",
+                to_currency_code="EUR",
+                rate=Decimal("0.80"),
+                effective_date=datetime(2025, 10, 1, tzinfo=timezone.utc),
+                created_by="system"
+            ),
+            ExchangeRateModel(
+                from_currency_code="USD",
+                to_currency_code="EUR",
+                rate=Decimal("0.85"),
+                effective_date=datetime(2025, 11, 1, tzinfo=timezone.utc),
+                created_by="system"
+            ),
+            ExchangeRateModel(
+                from_currency_code="USD",
+                to_currency_code="JPY",
+                rate=Decimal("110.50"),
+                effective_date=datetime(2025, 10, 1, tzinfo=timezone.utc),
+                created_by="system"
+            ),
+        ]
+        db_session.add_all(rates)
+        db_session.commit()
+
+    def test_convert_many_matches_convert(self, db_session, setup_rates):
+        """Test batch conversion returns same values as single conversions"""
+        service = CurrencyService(db_session)
+        amounts = [Decimal("100.00"), Decimal("100.00"), Decimal("85.00"), Decimal("10.00")]
+        from_currencies = ["USD", "USD", "EUR", "EUR"]
+        to_currencies = ["EUR", "EUR", "USD", "JPY"]
+        dates = [
+            datetime(2025, 10, 15, tzinfo=timezone.utc),
+            datetime(2025, 11, 8, tzinfo=timezone.utc),
+            datetime(2025, 11, 8, tzinfo=timezone.utc),
+            datetime(2025, 11, 8, tzinfo=timezone.utc),
+        ]
+
+        results = service.convert_many(amounts, from_currencies, to_currencies, dates)
+
+        assert results == [Decimal("80.00"), Decimal("85.00"), Decimal("100.00"), Decimal("1300")]
+        assert results == [
+            service.convert(amount, from_code, to_code, date)
+            for amount, from_code, to_code, date in zip(amounts, from_currencies, to_currencies, dates)
+        ]
+
+    def test_convert_many_broadcasts_scalars(self, db_session, setup_rates):
+        """Test scalar currency codes and date apply to every amount"""
+        service = CurrencyService(db_session)
+
+        results = service.convert_many(
+            [Decimal("1.00"), Decimal("2.00")],
+            "USD",
+            "EUR",
+            datetime(2025, 11, 8, tzinfo=timezone.utc)
+        )
+
+        assert results == [Decimal("0.85"), Decimal("1.70")]
+
+    def test_convert_many_length_mismatch_raises_error(self, db_session, setup_rates):
+        """Test per-amount sequences must match the number of amounts"""
+        service = CurrencyService(db_session)
+
+        with pytest.raises(ValueError) as exc_info:
+            service.convert_many([Decimal("1.00"), Decimal("2.00")], ["USD"], "EUR", datetime(2025, 11, 8))
+
+        assert "from_currencies" in str(exc_info.value)
+
+    def test_create_exchange_rate_invalidates_cache(self, db_session, setup_rates):
+        """Test new rates are visible to conversions after creation"""
+        service = CurrencyService(db_session)
+        conversion_date = datetime(2025, 11, 20, tzinfo=timezone.utc)
+
+        assert service.convert(Decimal("100.00"), "USD", "EUR", conversion_date) == Decimal("85.00")
+
+        service.create_exchange_rate(
+            from_currency="USD",
+            to_currency="EUR",
+            rate=Decimal("0.90"),
+            effective_date=datetime(2025, 11, 15, tzinfo=timezone.utc),
+            created_by="admin"
+        )
+
+        assert service.convert(Decimal("100.00"), "USD", "EUR", conversion_date) == Decimal("90.00")
@@ -0,0 +1,75 @@
+"""
+Unit tests for the resource conflict detector (sweep line).
+
+Tests:
+- Any overlap double-books a unit-capacity resource; touching intervals do not
+- Capacity-aware overload with fractional loads
+- Overloaded moments merge into one period with every booking involved
+- Resources are swept independently
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.domain.services.resource_conflict_detector import ResourceBooking, find_overloads
+
+
+def _booking(booking_id, resource_id, start, end, load=1, work_order_id=None):
+    return ResourceBooking(booking_id, resource_id, start, end, load, work_order_id)
+
+
+def test_overlap_double_books_unit_resource():
+    overloads = find_overloads([
+        _booking(1, "op-1", datetime(2025, 3, 3, 8), datetime(2025, 3, 3, 12), work_order_id=10),
+        _booking(2, "op-1", datetime(2025, 3, 3, 11), datetime(2025, 3, 3, 14), work_order_id=11),
+        _booking(3, "op-1", datetime(2025, 3, 3, 14), datetime(2025, 3, 3, 16), work_order_id=12),
+    ])
+
+    (overload,) = overloads
+    assert (overload.start, overload.end) == (datetime(2025, 3, 3, 11), datetime(2025, 3, 3, 12))
+    assert overload.peak_load == 2
+    assert overload.work_order_ids == [10, 11]
+
+
+def test_capacity_aware_overload():
+    bookings = [
+        _booking(1, 5, date(2025, 3, 1), date(2025, 3, 11), Decimal("60")),
+        _booking(2, 5, date(2025, 3, 5), date(2025, 3, 8), Decimal("30")),
+        _booking(3, 5, date(2025, 3, 7), date(2025, 3, 9), Decimal("20")),
+    ]
+
+    (overload,) = find_overloads(bookings, capacities={5: Decimal("100")})
+
+    # 60 + 30 fits; the third booking tips days 7..8 over, peaking at 110
+    assert (overload.start, overload.end) == (date(2025, 3, 7), date(2025, 3, 8))
+    assert overload.peak_load == Decimal("110")
+    assert [booking.booking_id for booking in overload.bookings] == [1, 2, 3]
+
+
+def test_overloaded_moments_form_one_period():
+    bookings = [
+        _booking(1, "wc", 0, 10),
+        _booking(2, "wc", 2, 5),
+        _booking(3, "wc", 4, 8),
+        _booking(4, "wc", 12, 15),
+    ]
+
+    (overload,) = find_overloads(bookings)
+
+    assert (overload.start, overload.end) == (2, 8)
+    assert overload.peak_load == 3
+    assert [booking.booking_id for booking in overload.bookings] == [1, 2, 3]
+
+
+def test_resources_swept_independently():
+    bookings = [
+        _booking(1, 1, 0, 10),
+        _booking(2, 2, 0, 10),
+        _booking(3, 2, 5, 15),
+        _booking(4, 3, 0, 10),
+        _booking(5, 3, 5, 15),
+        _booking(6, 3, 7, 7),
+    ]
+
+    overloads = find_overloads(bookings, capacities={3: 2})
+
+    assert [(overload.resource_id, overload.start, overload.end) for overload in overloads] == [(2, 5, 10)]
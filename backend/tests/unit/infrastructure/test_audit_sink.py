@@ -0,0 +1,178 @@
+"""
+Unit tests for the admin audit pipeline
+
+Tests AuditLogger with audit sinks:
+- log_action never commits the caller's session
+- Buffered events are written in batches, hash-chained per organization
+- Tampering is detected by chain verification
+- Failed batches are retried; PGMQ events are buffered and sent with one pgmq.send_batch per batch
+"""
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, Mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.infrastructure.logging.audit_logger import AuditLogger
+from app.infrastructure.logging.audit_sink import (
+    AUDIT_QUEUE,
+    GENESIS_HASH,
+    AuditEvent,
+    InMemoryAuditSink,
+    PgmqAuditSink,
+    drain_audit_queue,
+    verify_audit_chain,
+)
+from app.infrastructure.messaging.pgmq_client import PGMQMessage
+from app.models.admin_audit_log import AdminAuditChainHead, AdminAuditLogModel
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(
+        engine, tables=[AdminAuditLogModel.__table__, AdminAuditChainHead.__table__]
+    )
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def sink(session_factory):
+    sink = InMemoryAuditSink(session_factory, batch_size=2, flush_interval=60)
+    sink.start = Mock()  # flush explicitly instead of from the background thread
+    return sink
+
+
+class TestInMemoryAuditSink:
+    """Test buffered, batched audit writes"""
+
+    def test_log_action_buffers_without_committing(self, sink):
+        db = Mock()
+
+        event = AuditLogger(db, sink=sink).log_action(
+            admin_user_id=1, action="suspend_organization", target_type="organization", target_id=7
+        )
+
+        assert event.organization_id == 7
+        assert sink.pending() == 1
+        db.commit.assert_not_called()
+        db.add.assert_not_called()
+
+    def test_flush_writes_batches_with_hash_chain(self, sink, session_factory):
+        for target_id in (1, 2, 1):
+            sink.emit(AuditEvent(admin_user_id=9, action="extend_trial", target_type="organization",
+                                 target_id=target_id, organization_id=target_id, details={"days": 7}))
+        sink.emit(AuditEvent(admin_user_id=9, action="view_metrics", target_type="platform"))
+
+        assert sink.flush() == 4
+        db = session_factory()
+        org_one = db.query(AdminAuditLogModel).filter_by(organization_id=1).order_by(AdminAuditLogModel.id).all()
+        assert org_one[0].prev_hash == GENESIS_HASH
+        assert org_one[1].prev_hash == org_one[0].entry_hash
+        assert db.get(AdminAuditChainHead, 1).last_hash == org_one[1].entry_hash
+        assert db.get(AdminAuditChainHead, 0) is not None  # platform-wide chain
+        assert verify_audit_chain(db, 1) is None
+        assert verify_audit_chain(db, None) is None
+
+    def test_tampering_breaks_chain(self, sink, session_factory):
+        for days in (7, 14, 30):
+            sink.emit(AuditEvent(admin_user_id=9, action="extend_trial", target_type="organization",
+                                 target_id=3, organization_id=3, details={"days": days}))
+        sink.flush()
+
+        db = session_factory()
+        edited = db.query(AdminAuditLogModel).order_by(AdminAuditLogModel.id).all()[1]
+        edited.details = {"days": 365}
+        db.commit()
+        assert verify_audit_chain(db, 3) == edited.id
+
+        db.delete(edited)
+        db.commit()
+        assert verify_audit_chain(db, 3) == edited.id + 1
+
+    def test_failed_flush_keeps_events(self, sink):
+        broken = MagicMock()
+        broken.execute.side_effect = RuntimeError("database unavailable")
+        sink.session_factory = lambda: broken
+        sink.hash_chain = False
+        sink.emit(AuditEvent(admin_user_id=1, action="a", target_type="user"))
+
+        assert sink.flush() == 0
+        assert sink.pending() == 1
+        broken.rollback.assert_called_once()
+
+    def test_overflow_drops_oldest(self, session_factory):
+        sink = InMemoryAuditSink(session_factory, batch_size=10, max_buffered=2)
+        sink.start = Mock()
+        for action in ("a", "b", "c"):
+            sink.emit(AuditEvent(admin_user_id=1, action=action, target_type="user"))
+
+        assert sink.pending() == 2
+        assert sink.dropped == 1
+
+
+class TestPgmqAuditSink:
+    """Test PGMQ-backed audit events"""
+
+    def test_emit_buffers_and_flush_sends_batches(self):
+        db = Mock()
+        sessions = []
+
+        def session_factory():
+            sessions.append(Mock())
+            return sessions[-1]
+
+        sink = PgmqAuditSink(session_factory, batch_size=2, flush_interval=60)
+        sink.start = Mock()
+        logger = AuditLogger(db, sink=sink)
+        for target_id in (4, 5, 6):
+            logger.log_action(
+                admin_user_id=1, action="impersonate_user", target_type="user", target_id=target_id,
+                organization_id=2
+            )
+
+        # Nothing on the request path: no session opened, caller's session untouched
+        assert sessions == []
+        db.execute.assert_not_called()
+        db.commit.assert_not_called()
+
+        assert sink.flush() == 3
+        assert len(sessions) == 2
+        sql, params = sessions[0].execute.call_args[0]
+        assert "pgmq.send_batch" in str(sql)
+        assert params["queue"] == AUDIT_QUEUE
+        assert [m["target_id"] for m in json.loads(params["messages"])] == [4, 5]
+        assert [m["target_id"] for m in json.loads(sessions[1].execute.call_args[0][1]["messages"])] == [6]
+        for session in sessions:
+            session.execute.assert_called_once()
+            session.commit.assert_called_once()
+            session.close.assert_called_once()
+
+    def test_failed_send_stays_buffered(self):
+        session = Mock()
+        session.execute.side_effect = RuntimeError("queue missing")
+        sink = PgmqAuditSink(lambda: session, batch_size=10, flush_interval=60)
+        sink.start = Mock()
+        sink.emit(AuditEvent(admin_user_id=1, action="a", target_type="user"))
+
+        assert sink.flush() == 0
+        assert sink.pending() == 1
+        session.rollback.assert_called_once()
+        session.close.assert_called_once()
+
+    def test_drain_writes_batch_and_archives(self, session_factory):
+        event = AuditEvent(admin_user_id=1, action="a", target_type="user",
+                           created_at=datetime(2025, 1, 1, tzinfo=timezone.utc))
+        client = MagicMock()
+        client.dequeue_batch.return_value = [
+            PGMQMessage(msg_id=5, message=event.to_message(), vt=30),
+            PGMQMessage(msg_id=6, message=event.to_message(), vt=30),
+        ]
+
+        db = session_factory()
+        assert drain_audit_queue(client, db, batch_size=10) == 2
+        client.archive_batch.assert_called_once_with(AUDIT_QUEUE, [5, 6])
+        assert verify_audit_chain(db) is None
@@ -0,0 +1,166 @@
+"""Unit tests for pooled, batched email delivery."""
+import smtplib
+import socket
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+def _message(email="test@example.com"):
+    from app.infrastructure.email.models import EmailMessage, EmailRecipient
+
+    return EmailMessage(
+        to=EmailRecipient(email=email, name="Test User"),
+        subject="Test Email",
+        body_text="This is a test",
+        from_email="sender@example.com"
+    )
+
+
+def test_pool_reuses_authenticated_connection():
+    """Test pool logs in once and reuses the connection for later messages."""
+    from app.infrastructure.email.smtp_pool import SMTPConnectionPool
+
+    pool = SMTPConnectionPool(host="mail.example.com", port=587, user="u", password="p")
+
+    with patch('smtplib.SMTP') as mock_smtp:
+        server = mock_smtp.return_value
+        for _ in range(3):
+            pool.send_message(MagicMock())
+
+        assert mock_smtp.call_count == 1
+        server.starttls.assert_called_once()
+        server.login.assert_called_once_with("u", "p")
+        assert server.send_message.call_count == 3
+
+
+def test_pool_reconnects_after_server_disconnect():
+    """Test a dropped connection is replaced and the message resent once."""
+    from app.infrastructure.email.smtp_pool import SMTPConnectionPool
+
+    pool = SMTPConnectionPool(host="mail.example.com", port=587, use_tls=False)
+
+    stale, fresh = MagicMock(), MagicMock()
+    stale.send_message.side_effect = smtplib.SMTPServerDisconnected("gone")
+
+    with patch('smtplib.SMTP', side_effect=[stale, fresh]):
+        pool.send_message(MagicMock())
+
+    fresh.send_message.assert_called_once()
+
+
+def test_pool_health_checks_idle_connection():
+    """Test idle connections failing NOOP are replaced before reuse."""
+    from app.infrastructure.email.smtp_pool import SMTPConnectionPool
+
+    pool = SMTPConnectionPool(host="mail.example.com", port=587, use_tls=False, max_idle_seconds=0)
+
+    first, second = MagicMock(), MagicMock()
+    first.noop.return_value = (421, b"closing")
+
+    with patch('smtplib.SMTP', side_effect=[first, second]):
+        pool.send_message(MagicMock())
+        pool.send_message(MagicMock())
+
+    first.send_message.assert_called_once()
+    second.send_message.assert_called_once()
+
+
+def test_smtp_client_uses_pool_when_configured():
+    """Test BillionMailSMTPClient delegates to the pool instead of connecting."""
+    from app.infrastructure.email.smtp_client import BillionMailSMTPClient
+
+    pool = MagicMock()
+    client = BillionMailSMTPClient(
+        host="mail.example.com", port=587, user="sender@example.com", password="secret", pool=pool
+    )
+
+    with patch('smtplib.SMTP') as mock_smtp:
+        assert client.send(_message()) is True
+        mock_smtp.assert_not_called()
+
+    pool.send_message.assert_called_once()
+
+
+def test_rate_limiter_waits_when_bucket_empty():
+    """Test provider buckets are independent and sleep when exhausted."""
+    from app.infrastructure.email.rate_limiter import ProviderRateLimiter
+
+    sleeps = []
+    limiter = ProviderRateLimiter(
+        limits={"aws_ses": (1.0, 1)},
+        default_rate=100.0,
+        default_burst=100,
+        clock=lambda: 0.0,
+        sleep=sleeps.append
+    )
+
+    limiter.acquire("aws_ses")
+    limiter.acquire("smtp")
+    assert sleeps == []
+
+    assert limiter.try_acquire("aws_ses") is False
+    limiter.acquire("aws_ses")
+    assert sleeps == [1.0]
+
+
+def test_process_batch_archives_sent_and_retries_failed():
+    """Test queue batch delivery archives successes and retries failures."""
+    from app.infrastructure.email.delivery import EmailDeliveryEngine
+    from app.infrastructure.messaging.pgmq_client import PGMQMessage
+
+    smtp_client = MagicMock()
+    smtp_client.send.side_effect = [True, False]
+    engine = EmailDeliveryEngine(smtp_client=smtp_client, batch_size=10)
+
+    pgmq_client = MagicMock()
+    pgmq_client.max_retries = 3
+    pgmq_client.dequeue_batch.return_value = [
+        PGMQMessage(msg_id=1, message={"email": _message("a@example.com").model_dump(mode="json")}, vt=30),
+        PGMQMessage(msg_id=2, message={"email": _message("b@example.com").model_dump(mode="json")}, vt=30),
+    ]
+
+    counts = engine.process_batch(pgmq_client)
+
+    assert counts == {"read": 2, "sent": 1, "failed": 1}
+    pgmq_client.dequeue_batch.assert_called_once_with("email_delivery", 10, vt=30)
+    pgmq_client.archive_batch.assert_called_once_with("email_delivery", [1])
+    pgmq_client.retry_message.assert_called_once()
+
+
+def test_delivery_to_local_smtp_sink():
+    """Test batch delivery end to end against a local aiosmtpd sink."""
+    aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+    from aiosmtpd.handlers import Sink
+    from app.infrastructure.email.delivery import EmailDeliveryEngine
+    from app.infrastructure.email.smtp_client import BillionMailSMTPClient
+    from app.infrastructure.email.smtp_pool import SMTPConnectionPool
+
+    class CountingSink(Sink):
+        def __init__(self):
+            self.messages = 0
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages += 1
+            return "250 OK"
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    handler = CountingSink()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        pool = SMTPConnectionPool(host="127.0.0.1", port=port, use_tls=False, max_size=1)
+        client = BillionMailSMTPClient(
+            host="127.0.0.1", port=port, user="", password="", use_tls=False, pool=pool
+        )
+        engine = EmailDeliveryEngine(smtp_client=client)
+
+        results = engine.send_batch([_message(f"user{i}@example.com") for i in range(5)])
+
+        assert results == [True] * 5
+        assert handler.messages == 5
+        pool.close()
+    finally:
+        controller.stop()
@@ -0,0 +1,130 @@
+"""
+Unit tests for scan telemetry in QRCodeScanRepository and BarcodeLabelRepository
+
+Tests:
+- Scan analytics come from one GROUPING SETS query
+- Batched scans are one INSERT ... ON CONFLICT DO NOTHING
+- Label changes invalidate cached barcode resolutions
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.cache.barcode_resolution_cache import barcode_resolution_cache
+from app.infrastructure.repositories.logistics_repository import (
+    BarcodeLabelRepository,
+    QRCodeScanRepository,
+)
+from app.models.logistics import ScanResolution
+
+
+DIMENSIONS = (
+    "scans_by_resolution",
+    "scans_by_user",
+    "scans_by_operation",
+    "scans_by_entity_type",
+    "scans_by_device",
+    "scans_by_day",
+)
+
+
+def _row(count, **keys):
+    """Result row grouped by the given dimension (none = total row)."""
+    grouping_id = sum(
+        1 << (len(DIMENSIONS) - 1 - index)
+        for index, name in enumerate(DIMENSIONS)
+        if name not in keys
+    )
+    values = {name: keys.get(name) for name in DIMENSIONS}
+    return SimpleNamespace(grouping_id=grouping_id, scan_count=count, **values)
+
+
+@pytest.fixture
+def db():
+    return Mock()
+
+
+class TestScanAnalytics:
+    """Test suite for grouped scan analytics"""
+
+    def test_analytics_from_grouping_sets_rows(self, db):
+        query = db.query.return_value
+        query.filter.return_value = query
+        query.group_by.return_value = query
+        query.all.return_value = [
+            _row(5),
+            _row(4, scans_by_resolution=ScanResolution.SUCCESS),
+            _row(1, scans_by_resolution=ScanResolution.NOT_FOUND),
+            _row(5, scans_by_user=7),
+            _row(3, scans_by_operation="receiving"),
+            _row(2, scans_by_operation=None),
+            _row(4, scans_by_entity_type="shipment_item"),
+            _row(5, scans_by_device="SCANNER-001"),
+            _row(5, scans_by_day=datetime(2025, 11, 3)),
+        ]
+
+        analytics = QRCodeScanRepository(db).get_scan_analytics(1, datetime(2025, 11, 1), datetime(2025, 11, 30))
+
+        assert db.query.call_count == 1
+        group_by = query.group_by.call_args[0][0]
+        assert "GROUPING SETS" in str(group_by.compile(dialect=postgresql.dialect()))
+        assert analytics["total_scans"] == 5
+        assert analytics["resolved_scans"] == 4
+        assert analytics["not_found_scans"] == 1
+        assert analytics["scans_by_user"] == {7: 5}
+        assert analytics["scans_by_operation"] == {"receiving": 3}
+        assert analytics["scans_by_day"] == {"2025-11-03": 5}
+
+    def test_empty_period(self, db):
+        query = db.query.return_value
+        query.filter.return_value = query
+        query.group_by.return_value = query
+        query.all.return_value = []
+
+        analytics = QRCodeScanRepository(db).get_scan_analytics(1, datetime(2025, 11, 1), datetime(2025, 11, 2))
+
+        assert analytics["total_scans"] == 0
+        assert analytics["resolved_scans"] == 0
+
+
+class TestScanBatch:
+    """Test suite for batched scan ingestion"""
+
+    def test_batch_is_one_insert_skipping_resends(self, db):
+        db.execute.return_value.rowcount = 1
+
+        inserted = QRCodeScanRepository(db).create_batch([
+            {"organization_id": 1, "plant_id": 1, "scan_code": "A", "device_id": "D1",
+             "scan_timestamp": datetime(2025, 11, 3), "scanned_by_user_id": 7,
+             "scan_resolution": "SUCCESS", "unknown_field": "dropped"},
+            {"organization_id": 1, "plant_id": 1, "scan_code": "B", "device_id": "D1",
+             "scan_timestamp": datetime(2025, 11, 3), "scanned_by_user_id": 7,
+             "scan_resolution": "NOT_FOUND"},
+        ])
+
+        assert inserted == 1
+        assert db.execute.call_count == 1
+        sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (organization_id, device_id, scan_code, scan_timestamp) DO NOTHING" in sql
+        assert "unknown_field" not in sql
+        db.commit.assert_called_once()
+
+    def test_empty_batch_skips_database(self, db):
+        assert QRCodeScanRepository(db).create_batch([]) == 0
+        db.execute.assert_not_called()
+
+
+class TestBarcodeResolutionInvalidation:
+    """Test suite for cache invalidation on label changes"""
+
+    def test_label_update_discards_cached_resolution(self, db):
+        label = SimpleNamespace(id=3, organization_id=1, barcode_value="SHIP-1", updated_at=None)
+        db.query.return_value.filter.return_value.first.return_value = label
+        barcode_resolution_cache.set(1, "SHIP-1", {}, 60)
+
+        BarcodeLabelRepository(db).update(3, {"label_format": "PNG"})
+
+        assert barcode_resolution_cache.get(1, "SHIP-1") is None
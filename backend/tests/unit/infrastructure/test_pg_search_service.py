@@ -10,7 +10,13 @@ from unittest.mock import Mock, MagicMock, patch
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import ProgrammingError
 
-from app.infrastructure.search.pg_search_service import PgSearchService, SearchResult
+from app.infrastructure.search.pg_search_service import (
+    MaterialFilters,
+    PgSearchService,
+    SearchResult,
+    highlight_text,
+)
+from app.infrastructure.search.search_cache import SearchResultCache
 from app.infrastructure.search.search_config import SearchConfig
 from app.models.material import Material, ProcurementType, MRPType
 
@@ -104,24 +110,12 @@ class TestPgSearchServiceBM25Search:
         material2.lead_time_days = 14
         material2.is_active = True
 
-        # Mock rows with BM25 scores
-        row1 = Mock()
-        row1.id = 1
-        row1.paradedb_score = 12.5
-
-        row2 = Mock()
-        row2.id = 2
-        row2.paradedb_score = 8.3
+        # Ranked rows carry the material columns and BM25 score
+        material1.paradedb_score = 12.5
+        material2.paradedb_score = 8.3
 
         # Mock execute to return rows
-        db_mock.execute.return_value.fetchall.return_value = [row1, row2]
-
-        # Mock query chain to return materials
-        query_mock = Mock()
-        filter_mock = Mock()
-        filter_mock.first.side_effect = [material1, material2]
-        query_mock.filter.return_value = filter_mock
-        db_mock.query.return_value = query_mock
+        db_mock.execute.return_value.fetchall.return_value = [material1, material2]
 
         # Act
         results = service.search_materials(
@@ -138,6 +132,8 @@ class TestPgSearchServiceBM25Search:
         assert results[0].material_number == "MAT-001"
         assert results[1].score == 8.3
         db_mock.execute.assert_called_once()
+        # Hits are hydrated from the ranked rows, not re-fetched one by one
+        db_mock.query.assert_not_called()
 
     def test_search_materials_empty_query_returns_empty(self, db_mock, config_pg_search):
         """Test empty query returns empty results."""
@@ -191,17 +187,9 @@ class TestPgSearchServiceBM25Search:
         material.lead_time_days = 3
         material.is_active = True
 
-        row = Mock()
-        row.id = 1
-        row.paradedb_score = 10.0
+        material.paradedb_score = 10.0
 
-        db_mock.execute.return_value.fetchall.return_value = [row]
-
-        query_mock = Mock()
-        filter_mock = Mock()
-        filter_mock.first.return_value = material
-        query_mock.filter.return_value = filter_mock
-        db_mock.query.return_value = query_mock
+        db_mock.execute.return_value.fetchall.return_value = [material]
 
         # Act
         results = service.search_materials(
@@ -498,3 +486,306 @@ class TestPgSearchServiceEdgeCases:
         # Assert
         # Should use default limit (20) instead of -1
         assert isinstance(results, list)
+
+
+class TestPgSearchServiceHighlighting:
+    """Test snippet highlighting in LIKE fallback mode."""
+
+    def test_highlight_text_wraps_every_term(self):
+        """Test all query terms are wrapped, case-insensitively."""
+        snippet = highlight_text("High carbon Steel plate", "steel plate", "<b>", "</b>", 150)
+
+        assert snippet == "High carbon <b>Steel</b> <b>plate</b>"
+
+    def test_highlight_text_no_match_returns_none(self):
+        """Test fields without a match produce no snippet."""
+        assert highlight_text("Copper wire", "steel", "<b>", "</b>", 150) is None
+        assert highlight_text(None, "steel", "<b>", "</b>", 150) is None
+
+    def test_highlight_text_windows_long_values(self):
+        """Test snippet is cut to max_chars around the first match."""
+        value = "x" * 500 + " steel " + "y" * 500
+
+        snippet = highlight_text(value, "steel", "<b>", "</b>", 40)
+
+        assert "<b>steel</b>" in snippet
+        assert len(snippet) == 40 + len("<b></b>")
+
+    def test_fallback_search_with_highlight(self):
+        """Test fallback results carry highlights when requested."""
+        db_mock = Mock(spec=Session)
+        material = Mock(spec=Material)
+        material.id = 1
+        material.organization_id = 1
+        material.plant_id = 1
+        material.material_number = "MAT-001"
+        material.material_name = "Steel Plate"
+        material.description = "Cold rolled"
+        material.material_category_id = 10
+        material.base_uom_id = 5
+        material.procurement_type = ProcurementType.PURCHASE
+        material.mrp_type = MRPType.MRP
+        material.safety_stock = 10.0
+        material.reorder_point = 5.0
+        material.lot_size = 1.0
+        material.lead_time_days = 3
+        material.is_active = True
+        db_mock.query.return_value.filter.return_value.filter.return_value.limit.return_value.all.return_value = [material]
+
+        service = PgSearchService(db_mock, SearchConfig(use_pg_search=False))
+
+        results = service.search_materials("steel", organization_id=1, highlight=True)
+
+        assert results[0].highlights == {"material_name": "<b>Steel</b> Plate"}
+
+
+class TestPgSearchServiceFacetsAndMultiEntity:
+    """Test facet counts, multi-entity search and type-ahead."""
+
+    @pytest.fixture
+    def db_mock(self):
+        """Create mock database session."""
+        return Mock(spec=Session)
+
+    @staticmethod
+    def _facet_row(count, procurement_type=None, plant_id=None, material_category_id=None):
+        return Mock(
+            procurement_type=procurement_type,
+            plant_id=plant_id,
+            material_category_id=material_category_id,
+            procurement_type_grouping=0 if procurement_type is not None else 1,
+            plant_id_grouping=0 if plant_id is not None else 1,
+            material_category_id_grouping=0 if material_category_id is not None else 1,
+            count=count,
+        )
+
+    def test_facet_materials_single_grouped_query(self, db_mock):
+        """Test facets and total come from one query, sorted by count."""
+        db_mock.execute.return_value.fetchall.return_value = [
+            self._facet_row(2, procurement_type=ProcurementType.PURCHASE),
+            self._facet_row(5, procurement_type=ProcurementType.MANUFACTURE),
+            self._facet_row(7, plant_id=1),
+            self._facet_row(7, material_category_id=10),
+            self._facet_row(7),
+        ]
+        service = PgSearchService(db_mock, SearchConfig(use_pg_search=True))
+
+        facets = service.facet_materials("steel", organization_id=1)
+
+        assert db_mock.execute.call_count == 1
+        assert "GROUPING SETS" in str(db_mock.execute.call_args[0][0]).upper()
+        assert facets.total == 7
+        assert [(f.value, f.count) for f in facets.procurement_type] == [
+            (ProcurementType.MANUFACTURE.value, 5),
+            (ProcurementType.PURCHASE.value, 2),
+        ]
+        assert facets.plant_id[0].value == 1
+        assert facets.material_category_id[0].count == 7
+
+    def test_search_all_groups_hits_by_entity(self, db_mock):
+        """Test one UNION ALL query is split into per-entity hits."""
+        db_mock.execute.return_value.fetchall.return_value = [
+            Mock(entity="materials", id=1, code="MAT-001", title="Steel", plant_id=1, score=2.5),
+            Mock(entity="lots", id=9, code="LOT-1", title="Steel", plant_id=None, score=None),
+        ]
+        service = PgSearchService(db_mock, SearchConfig(use_pg_search=True))
+
+        hits = service.search_all("steel", organization_id=1)
+
+        assert db_mock.execute.call_count == 1
+        sql = str(db_mock.execute.call_args[0][0])
+        assert sql.count("UNION ALL") == 2
+        assert "paradedb.score" in sql
+        assert hits["materials"][0].score == 2.5
+        assert hits["work_orders"] == []
+        assert hits["lots"][0].code == "LOT-1"
+
+    def test_search_all_rejects_unknown_entity(self, db_mock):
+        """Test unsupported entities raise ValueError."""
+        service = PgSearchService(db_mock)
+
+        with pytest.raises(ValueError):
+            service.search_all("steel", organization_id=1, entities=["customers"])
+
+        db_mock.execute.assert_not_called()
+
+    def test_suggest_materials_uses_prefix_match(self, db_mock):
+        """Test type-ahead matches lower-cased prefixes with escaped wildcards."""
+        db_mock.execute.return_value.fetchall.return_value = [
+            Mock(id=1, material_number="MAT-001", material_name="Steel", plant_id=1),
+        ]
+        service = PgSearchService(db_mock)
+
+        suggestions = service.suggest_materials("Ma_", organization_id=1)
+
+        stmt = db_mock.execute.call_args[0][0]
+        assert "ma\\_%" in stmt.compile().params.values()
+        assert suggestions[0].code == "MAT-001"
+
+    def test_cached_results_skip_database(self, db_mock):
+        """Test repeated queries are served from the cache when enabled."""
+        db_mock.execute.return_value.fetchall.return_value = []
+        service = PgSearchService(
+            db_mock, SearchConfig(cache_ttl_seconds=5), cache=SearchResultCache()
+        )
+
+        service.suggest_materials("mat", organization_id=1)
+        service.suggest_materials("MAT", organization_id=1)
+        service.suggest_materials("mat", organization_id=2)
+
+        assert db_mock.execute.call_count == 2
+
+
+class TestPgSearchServiceMaterialQuery:
+    """Test filtered, keyset-paginated material queries with counts."""
+
+    @pytest.fixture
+    def db_mock(self):
+        """Create mock database session."""
+        return Mock(spec=Session)
+
+    @staticmethod
+    def _row(material_id, sort_key):
+        return Mock(
+            id=material_id, organization_id=1, plant_id=1,
+            material_number=f"MAT-{material_id:03d}", material_name="Steel", description=None,
+            material_category_id=10, base_uom_id=1,
+            procurement_type=ProcurementType.PURCHASE, mrp_type=MRPType.MRP,
+            safety_stock=0.0, reorder_point=0.0, lot_size=1.0, lead_time_days=0,
+            is_active=True, sort_key=sort_key,
+        )
+
+    @staticmethod
+    def _facet_row(count, counts=None, **grouped):
+        fields = ("procurement_type", "mrp_type", "plant_id", "material_category_id", "is_active")
+        row = Mock(count=count)
+        for name in fields:
+            setattr(row, name, grouped.get(name))
+            setattr(row, f"{name}_grouping", 0 if name in grouped else 1)
+            setattr(row, f"{name}_count", (counts or {}).get(name, 0))
+        return row
+
+    def test_filters_and_page_size_are_in_sql(self, db_mock):
+        """Test filters reach the query and one extra row signals a next page."""
+        db_mock.execute.return_value.fetchall.return_value = [
+            self._row(1, 9.5), self._row(2, 7.25), self._row(3, 7.0),
+        ]
+        service = PgSearchService(db_mock, SearchConfig(use_pg_search=True))
+        filters = MaterialFilters(procurement_type=("PURCHASE",), material_category_id=(10, 4), is_active=True)
+
+        page = service.query_materials("steel", 1, filters=filters, limit=2, with_counts=False)
+
+        stmt, params = db_mock.execute.call_args[0]
+        sql = str(stmt)
+        assert "procurement_type IN" in sql
+        assert "material_category_id IN" in sql
+        assert "paradedb.score" in sql
+        assert params["material_category_id"] == [4, 10]
+        assert params["procurement_type"] == [ProcurementType.PURCHASE]
+        assert params["page_size"] == 3
+        assert [item.id for item in page.items] == [1, 2]
+        assert page.items[1].score == 7.25
+        assert page.next_cursor is not None
+        assert page.total is None
+
+    def test_cursor_continues_after_last_row(self, db_mock):
+        """Test the next page is keyed on the last row, reusing the built statement."""
+        db_mock.execute.return_value.fetchall.return_value = [self._row(1, "MAT-001"), self._row(2, "MAT-002")]
+        service = PgSearchService(db_mock)
+        filters = MaterialFilters(is_active=True)
+
+        first = service.query_materials("mat", 1, filters=filters, sort="material_number", limit=1, with_counts=False)
+        service.query_materials("mat", 1, filters=filters, sort="material_number", limit=1, cursor=first.next_cursor,
+                                with_counts=False)
+        service.query_materials("other", 2, filters=MaterialFilters(is_active=False), sort="material_number",
+                                limit=1, cursor=first.next_cursor, with_counts=False)
+
+        (first_stmt, _), (second_stmt, second_params), (third_stmt, _) = [
+            call[0] for call in db_mock.execute.call_args_list
+        ]
+        assert (second_params["after_key"], second_params["after_id"]) == ("MAT-001", 1)
+        assert "ranked.sort_key, ranked.id) >" in str(second_stmt)
+        assert "ranked.sort_key, ranked.id) >" not in str(first_stmt)
+        # Same query shape, same statement object
+        assert third_stmt is second_stmt
+
+    def test_invalid_sort_or_cursor_rejected(self, db_mock):
+        """Test unknown sorts and foreign or garbled cursors raise ValueError."""
+        db_mock.execute.return_value.fetchall.return_value = [self._row(1, "MAT-001"), self._row(2, "MAT-002")]
+        service = PgSearchService(db_mock)
+        cursor = service.query_materials("mat", 1, sort="material_number", limit=1, with_counts=False).next_cursor
+
+        with pytest.raises(ValueError):
+            service.query_materials("mat", 1, sort="price")
+        with pytest.raises(ValueError):
+            service.query_materials("mat", 1, sort="material_name", cursor=cursor)
+        with pytest.raises(ValueError):
+            service.query_materials("mat", 1, cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            MaterialFilters(mrp_type=("WEEKLY",))
+
+    def test_counts_exclude_own_facet_filter(self, db_mock):
+        """Test total and facet counts come from one query, each facet without its own filter."""
+        page_result, facet_result = Mock(), Mock()
+        page_result.fetchall.return_value = [self._row(1, "MAT-001")]
+        facet_result.fetchall.return_value = [
+            self._facet_row(0, {"procurement_type": 4}, procurement_type=ProcurementType.PURCHASE),
+            self._facet_row(0, {"procurement_type": 9}, procurement_type=ProcurementType.MANUFACTURE),
+            self._facet_row(0, {"is_active": 0}, is_active=False),
+            self._facet_row(4),
+        ]
+        db_mock.execute.side_effect = [page_result, facet_result]
+        service = PgSearchService(db_mock)
+
+        page = service.query_materials(
+            "steel", 1, filters=MaterialFilters(procurement_type=("PURCHASE",)), sort="material_number"
+        )
+
+        facet_sql = str(db_mock.execute.call_args_list[1][0][0]).upper()
+        assert "GROUPING SETS" in facet_sql
+        assert "FILTER (WHERE" in facet_sql
+        assert page.total == 4
+        assert [(f.value, f.count) for f in page.facets.procurement_type] == [
+            (ProcurementType.MANUFACTURE.value, 9),
+            (ProcurementType.PURCHASE.value, 4),
+        ]
+        assert page.facets.is_active == []
+
+
+class TestSearchResultCache:
+    """Test per-tenant TTL/LRU result cache."""
+
+    def test_expired_entries_are_misses(self):
+        """Test entries are not served after their TTL."""
+        cache = SearchResultCache()
+
+        with patch("app.infrastructure.search.search_cache.time.monotonic", return_value=100.0):
+            cache.set(1, "q", ["hit"], ttl_seconds=5)
+            assert cache.get(1, "q") == ["hit"]
+        with patch("app.infrastructure.search.search_cache.time.monotonic", return_value=106.0):
+            assert cache.get(1, "q") is None
+
+        assert cache.stats() == {"entries": 0, "hits": 1, "misses": 1}
+
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used entry is evicted at capacity."""
+        cache = SearchResultCache(max_entries=2)
+        cache.set(1, "a", 1, ttl_seconds=60)
+        cache.set(1, "b", 2, ttl_seconds=60)
+        cache.get(1, "a")
+
+        cache.set(1, "c", 3, ttl_seconds=60)
+
+        assert cache.get(1, "b") is None
+        assert cache.get(1, "a") == 1
+
+    def test_invalidate_single_tenant(self):
+        """Test invalidation only drops the given organization."""
+        cache = SearchResultCache()
+        cache.set(1, "q", 1, ttl_seconds=60)
+        cache.set(2, "q", 2, ttl_seconds=60)
+
+        cache.invalidate(1)
+
+        assert cache.get(1, "q") is None
+        assert cache.get(2, "q") == 2
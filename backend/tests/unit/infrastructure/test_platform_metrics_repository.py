@@ -0,0 +1,85 @@
+"""
+Unit tests for PlatformMetricsRepository
+
+Tests platform KPIs and the daily metrics series:
+- Prices derived from PRICING_TIERS (annual billed / 12)
+- Daily refresh is a single upsert
+- Stored snapshots are read by range; only later days are computed live
+"""
+import pytest
+from datetime import date
+from unittest.mock import Mock
+
+from app.config.pricing import PRICING_TIERS
+from app.domain.entities.subscription import SubscriptionTier
+from app.infrastructure.repositories.platform_metrics_repository import (
+    PlatformMetricsRepository,
+    _prices_cte,
+)
+
+
+def _day(metric_date, mrr_cents=0):
+    return {
+        "metric_date": metric_date,
+        "mrr_cents": mrr_cents,
+        "active_subscriptions": 0,
+        "trial_subscriptions": 0,
+        "total_organizations": 0,
+        "signups": 0,
+        "new_subscriptions": 0,
+        "trial_conversions": 0,
+        "churned_subscriptions": 0,
+    }
+
+
+@pytest.fixture
+def db():
+    return Mock()
+
+
+class TestPlatformMetricsRepository:
+    """Test suite for platform metrics reads and snapshots"""
+
+    def test_prices_from_pricing_config(self):
+        sql, params = _prices_cte()
+
+        pricing = PRICING_TIERS[SubscriptionTier.PROFESSIONAL]
+        index = list(PRICING_TIERS).index(SubscriptionTier.PROFESSIONAL)
+        assert sql.startswith("WITH prices(tier, billing_cycle, monthly_cents) AS (VALUES")
+        assert params[f"tier_{index}"] == "professional"
+        assert params[f"monthly_{index}"] == pricing["monthly_price_cents"]
+        assert params[f"annual_{index}"] == pricing["annual_price_cents"] // 12
+
+    def test_refresh_daily_is_one_upsert(self, db):
+        db.execute.return_value.rowcount = 2
+
+        written = PlatformMetricsRepository(db).refresh_daily(date(2025, 1, 1), date(2025, 1, 2))
+
+        assert written == 2
+        assert db.execute.call_count == 1
+        sql = str(db.execute.call_args[0][0])
+        assert "INSERT INTO platform_metrics_daily" in sql
+        assert "ON CONFLICT (metric_date) DO UPDATE" in sql
+        assert db.execute.call_args[0][1]["start_date"] == date(2025, 1, 1)
+
+    def test_series_computes_only_missing_tail(self, db):
+        stored = Mock()
+        stored.mappings.return_value.all.return_value = [_day(date(2025, 1, 1), 100)]
+        live = Mock()
+        live.mappings.return_value.all.return_value = [_day(date(2025, 1, 2), 200)]
+        db.execute.side_effect = [stored, live]
+
+        series = PlatformMetricsRepository(db).get_daily_series(date(2025, 1, 1), date(2025, 1, 2))
+
+        assert [day["mrr_cents"] for day in series] == [100, 200]
+        assert db.execute.call_args_list[1][0][1]["start_date"] == date(2025, 1, 2)
+
+    def test_series_fully_stored_skips_live_query(self, db):
+        db.execute.return_value.mappings.return_value.all.return_value = [
+            _day(date(2025, 1, 1)), _day(date(2025, 1, 2))
+        ]
+
+        series = PlatformMetricsRepository(db).get_daily_series(date(2025, 1, 1), date(2025, 1, 2))
+
+        assert len(series) == 2
+        assert db.execute.call_count == 1
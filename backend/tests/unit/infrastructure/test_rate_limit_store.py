@@ -0,0 +1,72 @@
+"""Unit tests for GCRA rate limit stores."""
+import pytest
+from unittest.mock import MagicMock
+
+from app.infrastructure.cache.rate_limit_store import (
+    InMemoryRateLimitStore,
+    PostgresRateLimitStore,
+    RateLimit,
+    gcra_decide,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_gcra_allows_burst_then_rejects():
+    rate = RateLimit(limit=10, period=60.0)
+    tat = None
+    for i in range(10):
+        decision, tat = gcra_decide(tat, 0.0, rate)
+        assert decision.allowed
+        assert decision.remaining == 9 - i
+
+    decision, new_tat = gcra_decide(tat, 0.0, rate)
+    assert not decision.allowed
+    assert new_tat is None
+    assert decision.retry_after == 6
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_refills_over_time():
+    clock = FakeClock()
+    store = InMemoryRateLimitStore(clock=clock)
+    rate = RateLimit(limit=2, period=60.0)
+
+    assert (await store.hit("ip:1", rate)).allowed
+    assert (await store.hit("ip:1", rate)).allowed
+    assert not (await store.hit("ip:1", rate)).allowed
+
+    clock.now += 30.0  # one emission interval
+    assert (await store.hit("ip:1", rate)).allowed
+    assert not (await store.hit("ip:1", rate)).allowed
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_state_is_one_entry_per_key():
+    store = InMemoryRateLimitStore(clock=FakeClock())
+    rate = RateLimit(limit=1000, period=60.0)
+
+    for _ in range(500):
+        await store.hit("ip:1", rate)
+
+    assert len(store._tats) == 1
+
+
+@pytest.mark.asyncio
+async def test_postgres_store_rejects_when_upsert_returns_no_row():
+    engine = MagicMock()
+    conn = engine.begin.return_value.__enter__.return_value
+    # Upsert skipped by the WHERE clause, then the current TAT is read
+    conn.execute.return_value.scalar.side_effect = [None, 1000.0 + 60.0]
+    store = PostgresRateLimitStore(engine, clock=FakeClock(1000.0))
+
+    decision = await store.hit("org:1", RateLimit(limit=2, period=60.0))
+
+    assert not decision.allowed
+    assert decision.retry_after == 30
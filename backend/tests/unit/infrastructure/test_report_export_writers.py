@@ -0,0 +1,91 @@
+"""
+Unit tests for streamed report export writers
+
+Tests that CSV, XLSX and PDF files written chunk by chunk are well formed.
+"""
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime
+from decimal import Decimal
+from xml.etree import ElementTree
+
+import pytest
+
+from app.infrastructure.reporting import export_writers
+from app.infrastructure.reporting.export_writers import create_export_writer
+
+
+COLUMNS = ["period", "machine_id", "produced"]
+CHUNKS = [
+    [(datetime(2025, 11, 1), 1, Decimal("10.5")), (datetime(2025, 11, 1), 2, None)],
+    [(datetime(2025, 11, 2), 1, Decimal("7")), (datetime(2025, 11, 2), 3, Decimal("1.25"))],
+]
+
+NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _write(export_format):
+    fileobj = io.BytesIO()
+    writer = create_export_writer(export_format, fileobj, COLUMNS)
+    for chunk in CHUNKS:
+        writer.write_rows(chunk)
+    writer.close()
+    assert writer.rows_written == 4
+    return fileobj.getvalue()
+
+
+def test_csv_has_header_and_all_rows():
+    """CSV rows follow the header in chunk order"""
+    rows = list(csv.reader(io.StringIO(_write("CSV").decode("utf-8"))))
+
+    assert rows[0] == COLUMNS
+    assert rows[1] == ["2025-11-01T00:00:00", "1", "10.5"]
+    assert rows[2] == ["2025-11-01T00:00:00", "2", ""]
+    assert len(rows) == 5
+
+
+def test_xlsx_is_valid_workbook(monkeypatch):
+    """Rows beyond the per-sheet limit continue on a new sheet with its own header"""
+    monkeypatch.setattr(export_writers, "XLSX_MAX_ROWS_PER_SHEET", 3)
+
+    package = zipfile.ZipFile(io.BytesIO(_write("XLSX")))
+
+    workbook = ElementTree.fromstring(package.read("xl/workbook.xml"))
+    assert [sheet.get("name") for sheet in workbook.iterfind(".//s:sheet", NS)] == ["Report 1", "Report 2"]
+
+    sheet_rows = []
+    for n in (1, 2):
+        sheet = ElementTree.fromstring(package.read(f"xl/worksheets/sheet{n}.xml"))
+        sheet_rows.append([
+            [cell.findtext("s:v", namespaces=NS) or cell.findtext("s:is/s:t", namespaces=NS) for cell in row]
+            for row in sheet.iterfind(".//s:row", NS)
+        ])
+    assert sheet_rows[0][0] == COLUMNS
+    assert sheet_rows[0][1] == ["2025-11-01T00:00:00", "1", "10.5"]
+    assert sheet_rows[1][0] == COLUMNS
+    assert len(sheet_rows[0]) + len(sheet_rows[1]) == 4 + 2
+
+
+def test_pdf_xref_points_at_objects(monkeypatch):
+    """Every xref entry points at its object, one page per LINES_PER_PAGE rows"""
+    monkeypatch.setattr(export_writers.PdfExportWriter, "LINES_PER_PAGE", 3)
+
+    data = _write("PDF")
+
+    assert data.startswith(b"%PDF-1.4")
+    assert data.rstrip().endswith(b"%%EOF")
+    startxref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    assert data[startxref:startxref + 4] == b"xref"
+
+    entries = re.findall(rb"(\d{10}) 00000 n", data[startxref:])
+    for object_id, offset in enumerate(entries, start=1):
+        assert data[int(offset):].startswith(b"%d 0 obj" % object_id)
+    assert b"/Count 2" in data
+
+
+def test_unknown_format_rejected():
+    """Only file formats have writers"""
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        create_export_writer("JSON", io.BytesIO(), COLUMNS)
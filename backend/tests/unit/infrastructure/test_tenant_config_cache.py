@@ -0,0 +1,201 @@
+"""
+Unit tests for TenantConfigCache and TenantConfigListener.
+
+Tests:
+- Snapshots load once per tenant and serve typed settings and feature flags
+- A load racing an invalidation is not cached
+- Subdomain index follows invalidation
+- NOTIFY payloads invalidate one tenant or all of them
+- BrandingService reads through the cache and invalidates on writes
+- Callers from another tenant (RLS context) get a miss
+"""
+import socket
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.application.services.branding_service import BrandingService
+from app.infrastructure.cache.tenant_config_cache import TenantConfigCache, TenantConfigListener
+from app.models.branding import OrganizationBranding
+
+
+def _branding(organization_id, subdomain=None, flags=None):
+    branding = SimpleNamespace(
+        id=organization_id * 10, organization_id=organization_id, company_name=f"Org {organization_id}",
+        custom_subdomain=subdomain, custom_domain=None, feature_flags=flags, is_active=True
+    )
+    branding.is_feature_enabled = lambda name: OrganizationBranding.is_feature_enabled(branding, name)
+    return branding
+
+
+def _session(organization_id):
+    """Request session whose RLS context is organization_id."""
+    db = MagicMock()
+    db.execute.return_value.scalar.return_value = str(organization_id) if organization_id else None
+    return db
+
+
+class _Loader:
+    """Counts loads; rows per organization."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, organization_id):
+        self.calls.append(organization_id)
+        return self.rows.get(organization_id, (None, {}))
+
+
+def test_snapshot_loaded_once_per_tenant():
+    loader = _Loader({1: (_branding(1, flags={"hide_powered_by": True}), {"max_users": 25.0, "theme": None})})
+    cache = TenantConfigCache(loader=loader)
+
+    first = cache.get(1)
+    second = cache.get(1)
+    cache.get(2)
+
+    assert first is second
+    assert loader.calls == [1, 2]
+    assert first.get_setting("max_users") == 25.0
+    assert first.get_setting("theme", "light") == "light"
+    assert first.is_feature_enabled("hide_powered_by")
+    assert not cache.get(2).is_feature_enabled("hide_powered_by")
+    assert cache.stats() == {"tenants": 2, "hits": 2, "misses": 2}
+
+
+def test_expired_snapshot_reloads():
+    loader = _Loader({})
+    cache = TenantConfigCache(ttl_seconds=0, loader=loader)
+
+    cache.get(1)
+    cache.get(1)
+
+    assert loader.calls == [1, 1]
+
+
+def test_load_racing_invalidation_is_not_cached():
+    cache = TenantConfigCache()
+
+    def loader(organization_id):
+        # A NOTIFY for the tenant arrives while its rows are being read
+        cache.invalidate(organization_id)
+        return _branding(organization_id), {}
+
+    cache._loader = loader
+    snapshot = cache.get(1)
+
+    assert snapshot.branding.organization_id == 1
+    assert cache.stats()["tenants"] == 0
+    assert cache.version(1) == 1
+
+
+def test_subdomain_index_follows_invalidation():
+    cache = TenantConfigCache(loader=_Loader({1: (_branding(1, "acme"), {})}))
+
+    assert cache.organization_for_subdomain("acme") is None
+    cache.get(1)
+    assert cache.organization_for_subdomain("acme") == 1
+
+    cache.invalidate(1)
+    assert cache.organization_for_subdomain("acme") is None
+
+
+def test_listener_payloads():
+    cache = MagicMock()
+    listener = TenantConfigListener(cache)
+
+    listener.handle("42")
+    listener.handle("*")
+    listener.handle("not-an-id")
+
+    assert [call.args for call in cache.invalidate.call_args_list] == [(42,), ()]
+
+
+def test_listener_thread_applies_notifications():
+    cache = TenantConfigCache(loader=_Loader({}))
+    reader, writer = socket.socketpair()
+    listening = threading.Event()
+
+    class _Connection:
+        """psycopg2-like connection; a byte on the socket is one notification."""
+
+        def __init__(self):
+            self.notifies = []
+
+        def cursor(self):
+            listening.set()
+            return MagicMock()
+
+        def fileno(self):
+            return reader.fileno()
+
+        def poll(self):
+            reader.recv(1)
+            self.notifies.append(SimpleNamespace(payload="7"))
+
+        def close(self):
+            pass
+
+    listener = TenantConfigListener(cache, connect=_Connection, poll_interval=0.05)
+    listener.start()
+    try:
+        assert listening.wait(2)
+        cache.get(7)
+        writer.send(b"x")
+        deadline = time.monotonic() + 2
+        while cache.version(7) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        listener.stop()
+        reader.close()
+        writer.close()
+
+    assert cache.version(7) == 1
+    assert cache.stats()["tenants"] == 0
+
+
+def test_branding_service_reads_through_cache_and_invalidates_on_write():
+    loader = _Loader({3: (_branding(3, "acme", {"custom_login": True}), {})})
+    cache = TenantConfigCache(loader=loader)
+    service = BrandingService(_session(3), config_cache=cache)
+    service.repo = MagicMock()
+    service.repo.get_by_subdomain.return_value = _branding(3, "acme")
+
+    assert service.get_by_subdomain("acme").organization_id == 3
+    assert service.get_by_subdomain("acme").organization_id == 3
+    assert service.get_by_organization(3).custom_subdomain == "acme"
+    assert service.is_feature_enabled(3, "custom_login")
+    # Subdomain resolved in the database once; everything else from one snapshot
+    assert service.repo.get_by_subdomain.call_count == 1
+    assert loader.calls == [3]
+
+    service.repo.get_by_id.return_value = _branding(3, "acme")
+    service.repo.get_by_subdomain.return_value = None
+    service.update_branding(30, MagicMock(custom_subdomain=None, custom_domain=None), updated_by=9)
+
+    assert service.get_by_subdomain("acme") is None
+    assert service.get_by_organization(3) is not None
+    assert loader.calls == [3, 3]
+
+
+def test_other_tenant_gets_a_miss(monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.RLS_ENABLED", True)
+    loader = _Loader({3: (_branding(3, "acme", {"custom_login": True}), {"max_users": 25.0})})
+    cache = TenantConfigCache(loader=loader)
+    cache.get(3)
+
+    for db in (_session(4), _session(None)):
+        snapshot = cache.get_for_session(db, 3)
+        assert snapshot.branding is None
+        assert snapshot.get_setting("max_users") is None
+
+        service = BrandingService(db, config_cache=cache)
+        assert service.get_by_organization(3) is None
+        assert service.get_contact_info(3) is None
+        assert service.get_logo_for_variant(3) is None
+        assert not service.is_feature_enabled(3, "custom_login")
+
+    assert cache.get_for_session(_session(3), 3).get_setting("max_users") == 25.0
+    assert loader.calls == [3]
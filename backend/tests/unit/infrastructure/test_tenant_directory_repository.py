@@ -0,0 +1,85 @@
+"""
+Unit tests for TenantDirectoryRepository
+
+Tests the set-based platform admin tenant directory:
+- One statement per page (no per-organization queries)
+- has_more from the extra fetched row
+- Total count carried on the page rows
+"""
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from app.infrastructure.repositories.tenant_directory_repository import TenantDirectoryRepository
+
+
+def _row(org_id, total_count=3, **overrides):
+    values = {
+        "id": org_id,
+        "org_code": f"ORG{org_id}",
+        "org_name": f"Org {org_id}",
+        "subdomain": f"org{org_id}",
+        "is_active": True,
+        "created_at": datetime(2025, 1, 1),
+        "tier": "professional",
+        "status": "active",
+        "current_users": 5,
+        "current_plants": 1,
+        "storage_used_gb": Decimal("2.50"),
+        "last_active_at": datetime(2025, 2, 1),
+        "total_count": total_count,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture
+def db():
+    return Mock()
+
+
+class TestTenantDirectoryRepository:
+    """Test suite for tenant directory reads"""
+
+    def test_page_is_one_query(self, db):
+        db.execute.return_value.all.return_value = [_row(1), _row(2)]
+
+        organizations, total, has_more = TenantDirectoryRepository(db).list_page(limit=5)
+
+        assert db.execute.call_count == 1
+        assert total == 3
+        assert has_more is False
+        assert organizations[0]["subscription_tier"] == "professional"
+        assert organizations[0]["storage_used_gb"] == 2.5
+
+    def test_extra_row_sets_has_more(self, db):
+        db.execute.return_value.all.return_value = [_row(1), _row(2), _row(3)]
+
+        organizations, _, has_more = TenantDirectoryRepository(db).list_page(limit=2, after_id=0)
+
+        assert [org["id"] for org in organizations] == [1, 2]
+        assert has_more is True
+
+    def test_missing_usage_defaults_to_zero(self, db):
+        db.execute.return_value.all.return_value = [
+            _row(1, current_users=None, current_plants=None, storage_used_gb=None, last_active_at=None)
+        ]
+
+        organizations, _, _ = TenantDirectoryRepository(db).list_page()
+
+        assert organizations[0]["user_count"] == 0
+        assert organizations[0]["plant_count"] == 0
+        assert organizations[0]["storage_used_gb"] == 0.0
+        assert organizations[0]["last_active_at"] is None
+
+    def test_empty_page_counts_separately(self, db):
+        db.execute.return_value.all.return_value = []
+        db.execute.return_value.scalar.return_value = 7
+
+        organizations, total, has_more = TenantDirectoryRepository(db).list_page(offset=100)
+
+        assert organizations == []
+        assert total == 7
+        assert has_more is False
@@ -0,0 +1,176 @@
+"""
+Unit tests for compiled tenant email templates and mail-merge rendering.
+
+Tests:
+- Compiled templates match the placeholder semantics of EmailTemplate.render
+- Context values are escaped in HTML and the sandbox blocks unsafe access
+- Branding chrome is built once per branding snapshot
+- EmailTemplateService compiles once per template version
+- Bulk rendering reports failing recipients without aborting the batch
+- Bulk sending enqueues rendered emails in batches
+"""
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.application.dtos.branding_dto import EmailBulkRenderRequest, EmailRenderRequest
+from app.application.services.branding_service import EmailTemplateService
+from app.infrastructure.cache.tenant_config_cache import TenantConfigCache
+from app.infrastructure.email.tenant_templates import CompiledEmailTemplate
+from app.infrastructure.search.search_cache import SearchResultCache
+from app.models.branding import EmailTemplate
+
+
+def _template(**overrides):
+    fields = dict(
+        id=1, organization_id=5, template_code="welcome", version=1, updated_at=datetime(2025, 1, 1),
+        subject="Welcome {{name}}", body_html="<p>Hi {{name}}, order {{order}}</p>", body_text="Hi {{name}}",
+        variables=[{"name": "name", "required": True}, {"name": "order"}],
+        include_header=True, include_footer=True, custom_header_html=None, custom_footer_html=None,
+        from_name="Acme", from_email="noreply@acme.test", reply_to_email=None, is_active=True
+    )
+    fields.update(overrides)
+    template = SimpleNamespace(**fields)
+    template.get_required_variables = lambda: EmailTemplate.get_required_variables(template)
+    template._substitute_variables = lambda text, context: EmailTemplate._substitute_variables(template, text, context)
+    return template
+
+
+def _branding(**overrides):
+    fields = dict(
+        logo_email_url="https://cdn.test/logo.png", email_footer_text="Acme & Co", support_email="help@acme.test",
+        custom_subdomain=None
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def test_compiled_template_keeps_missing_placeholders():
+    compiled = CompiledEmailTemplate(_template())
+
+    rendered = compiled.render({"name": "Ada"})
+
+    assert rendered == {
+        "subject": "Welcome Ada",
+        "body_html": "<p>Hi Ada, order {{order}}</p>",
+        "body_text": "Hi Ada",
+    }
+    assert compiled.missing_variables({}) == ["name"]
+    assert compiled.render({"name": "Ada"}, chrome=None)["body_text"] == "Hi Ada"
+    assert CompiledEmailTemplate(_template(body_text=None)).render({"name": "Ada"})["body_text"] is None
+
+
+def test_values_escaped_in_html_only_and_sandboxed():
+    compiled = CompiledEmailTemplate(_template())
+
+    rendered = compiled.render({"name": "<b>Ada</b>"})
+
+    assert "&lt;b&gt;Ada&lt;/b&gt;" in rendered["body_html"]
+    assert rendered["subject"] == "Welcome <b>Ada</b>"
+
+    unsafe = CompiledEmailTemplate(_template(body_html="{{ name.__class__.__mro__ }}"))
+    with pytest.raises(ValueError):
+        unsafe.render({"name": "Ada"})
+
+    with pytest.raises(ValueError):
+        CompiledEmailTemplate(_template(subject="{% if %}"))
+
+
+def test_chrome_matches_full_html_and_is_built_once_per_branding():
+    template = _template()
+    compiled = CompiledEmailTemplate(template)
+    branding = _branding()
+
+    chrome = compiled.chrome(branding)
+    assert compiled.chrome(branding) is chrome
+
+    expected = EmailTemplate.get_full_html(template, {"name": "Ada", "order": 7}, branding)
+    # Branding values are escaped in the compiled chrome
+    assert chrome.wrap("<p>Hi Ada, order 7</p>") == expected.replace("Acme & Co", "Acme &amp; Co")
+
+    assert compiled.chrome(_branding(email_footer_text=None)) is not chrome
+    custom = CompiledEmailTemplate(_template(custom_header_html="<h1>Top</h1>", include_footer=False))
+    assert custom.chrome(None).wrap("body") == "<h1>Top</h1>\nbody"
+
+
+def _service(template, branding=None):
+    repo = MagicMock()
+    repo.get_fingerprint_by_code.side_effect = lambda org, code: (
+        (template.template_code, template.version, template.updated_at) if code == template.template_code else None
+    )
+    repo.get_by_code.return_value = template
+    config_cache = TenantConfigCache(loader=lambda org: (branding, {}))
+    db = MagicMock()
+    db.execute.return_value.scalar.return_value = "5"  # RLS context: organization 5
+    service = EmailTemplateService(db, config_cache=config_cache, template_cache=SearchResultCache())
+    service.repo = repo
+    return service
+
+
+def test_service_compiles_once_per_template_version():
+    template = _template()
+    service = _service(template, _branding())
+    request = EmailRenderRequest(template_code="welcome", context={"name": "Ada"})
+
+    first = service.render_template(5, request)
+    service.render_template(5, request)
+    assert service.repo.get_by_code.call_count == 1
+    assert first.body_html.startswith('<div style="text-align:center;padding:20px;">')
+    assert first.from_email == "noreply@acme.test"
+
+    template.version = 2
+    template.subject = "Hello {{name}}"
+    assert service.render_template(5, request).subject == "Hello Ada"
+    assert service.repo.get_by_code.call_count == 2
+
+    with pytest.raises(ValueError, match="Required variable 'name'"):
+        service.render_template(5, EmailRenderRequest(template_code="welcome", context={}))
+    with pytest.raises(ValueError, match="not found"):
+        service.render_template(5, EmailRenderRequest(template_code="missing", context={}))
+
+
+def _bulk_request():
+    return EmailBulkRenderRequest(
+        template_code="welcome",
+        shared_context={"order": 42},
+        recipients=[
+            {"to_email": "ada@example.com", "to_name": "Ada", "context": {"name": "Ada"}},
+            {"to_email": "not-an-email", "context": {"name": "Bob"}},
+            {"to_email": "cy@example.com", "context": {}},
+            {"to_email": "di@example.com", "context": {"name": "Di", "order": 7}},
+        ]
+    )
+
+
+def test_render_bulk_collects_recipient_errors():
+    service = _service(_template())
+
+    result = service.render_bulk(5, _bulk_request())
+
+    assert [email.index for email in result.rendered] == [0, 3]
+    assert result.rendered[0].body_html == "<p>Hi Ada, order 42</p>"
+    assert result.rendered[1].body_html == "<p>Hi Di, order 7</p>"
+    assert [(error.index, error.to_email) for error in result.errors] == [(1, "not-an-email"), (2, "cy@example.com")]
+    assert "Invalid email" in result.errors[0].error
+    assert "name" in result.errors[1].error
+    assert service.repo.get_by_code.call_count == 1
+
+
+def test_send_bulk_enqueues_rendered_emails_in_batches():
+    service = _service(_template())
+    pgmq_client = MagicMock()
+    pgmq_client.enqueue_batch.side_effect = lambda queue, payloads: list(range(len(payloads)))
+
+    result = service.send_bulk(5, _bulk_request(), pgmq_client, batch_size=1)
+
+    assert result.queued == 2
+    assert len(result.errors) == 2
+    assert pgmq_client.enqueue_batch.call_count == 2
+    queue, payloads = pgmq_client.enqueue_batch.call_args_list[0].args
+    assert queue == "email_delivery"
+    email = payloads[0]["email"]
+    assert email["to"] == {"email": "ada@example.com", "name": "Ada"}
+    assert email["subject"] == "Welcome Ada"
+    assert email["from_email"] == "noreply@acme.test"
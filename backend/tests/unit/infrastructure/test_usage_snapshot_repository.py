@@ -0,0 +1,75 @@
+"""
+Unit tests for UsageSnapshotRepository
+
+Tests set-based usage tracking statements:
+- Usage snapshot is a single GROUP BY upsert keyed by snapshot slot
+- Trials are suspended with one UPDATE ... RETURNING
+- Notifications are sent with one pgmq.send_batch
+"""
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from app.infrastructure.repositories.usage_snapshot_repository import (
+    BILLING_NOTIFICATIONS_QUEUE,
+    UsageSnapshotRepository,
+)
+
+
+SLOT = datetime(2025, 11, 24, 6, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db():
+    return Mock()
+
+
+class TestUsageSnapshotRepository:
+    """Test suite for set-based usage statements"""
+
+    def test_snapshot_is_one_upsert(self, db):
+        db.execute.return_value.rowcount = 50000
+
+        assert UsageSnapshotRepository(db).snapshot_usage(SLOT) == 50000
+        assert db.execute.call_count == 1
+        sql = str(db.execute.call_args[0][0])
+        assert "GROUP BY organization_id" in sql
+        assert "ON CONFLICT (organization_id, measured_at) DO UPDATE" in sql
+        assert db.execute.call_args[0][1] == {"snapshot_at": SLOT}
+
+    def test_limit_crossings_computed_in_sql(self, db):
+        db.execute.return_value.mappings.return_value.all.return_value = [
+            {"organization_id": 1, "resource": "users", "current_value": 11,
+             "limit_value": 10, "level": 2, "escalated": True}
+        ]
+
+        crossings = UsageSnapshotRepository(db).find_limit_crossings(SLOT, 0.9)
+
+        assert crossings[0]["resource"] == "users"
+        assert db.execute.call_args[0][1] == {"snapshot_at": SLOT, "threshold": 0.9}
+        assert "removed_at IS NULL" in str(db.execute.call_args[0][0])
+
+    def test_expired_trials_suspended_in_one_update(self, db):
+        db.execute.return_value.mappings.return_value.all.return_value = [
+            {"organization_id": 3, "billing_email": "a@example.com", "trial_ends_at": SLOT}
+        ]
+
+        expired = UsageSnapshotRepository(db).suspend_expired_trials(SLOT)
+
+        assert [trial["organization_id"] for trial in expired] == [3]
+        sql = str(db.execute.call_args[0][0])
+        assert "SET status = 'suspended'" in sql and "RETURNING" in sql
+
+    def test_notifications_sent_in_one_batch(self, db):
+        repository = UsageSnapshotRepository(db)
+
+        assert repository.enqueue_notifications([]) == 0
+        db.execute.assert_not_called()
+
+        assert repository.enqueue_notifications([{"type": "a"}, {"type": "b"}]) == 2
+        params = db.execute.call_args[0][1]
+        assert "pgmq.send_batch" in str(db.execute.call_args[0][0])
+        assert params["queue"] == BILLING_NOTIFICATIONS_QUEUE
+        assert json.loads(params["messages"]) == [{"type": "a"}, {"type": "b"}]
+        db.commit.assert_not_called()
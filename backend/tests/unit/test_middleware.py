@@ -287,3 +287,51 @@ class TestRateLimitMiddleware:
         assert response.status_code == 429
         assert "retry-after" in response.headers
         assert int(response.headers["retry-after"]) > 0
+
+    @pytest.mark.asyncio
+    async def test_uses_subscription_tier_limits_for_tenants(self):
+        """Should apply per-tenant route limits from the subscription tier"""
+        from app.presentation.middleware.rate_limit_middleware import (
+            RateLimitMiddleware, SubscriptionTierCache, RateLimitMetrics
+        )
+        from app.config.pricing import API_RATE_LIMITS
+        from app.domain.entities.subscription import SubscriptionTier
+
+        metrics = RateLimitMetrics()
+        middleware = RateLimitMiddleware(
+            AsyncMock(),
+            tier_cache=SubscriptionTierCache(loader=lambda org_id: "starter"),
+            metrics=metrics
+        )
+        route_limit = API_RATE_LIMITS[SubscriptionTier.STARTER]["routes"]["/api/v1/reports"]
+        user = {"id": 1, "organization_id": 7}
+
+        for _ in range(route_limit):
+            assert await middleware.check("10.0.0.1", "GET", "/api/v1/reports", user) is None
+
+        response = await middleware.check("10.0.0.2", "GET", "/api/v1/reports", user)
+        assert response.status_code == 429
+        assert metrics.snapshot()["starter_route"] == {"allowed": route_limit, "rejected": 1}
+
+        # Other routes of the same tenant are unaffected
+        assert await middleware.check("10.0.0.1", "GET", "/api/v1/materials", user) is None
+
+    @pytest.mark.asyncio
+    async def test_asgi_call_rejects_without_calling_app(self):
+        """Should answer 429 directly from the ASGI interface"""
+        from app.presentation.middleware.rate_limit_middleware import RateLimitMiddleware
+
+        inner_app = AsyncMock()
+        middleware = RateLimitMiddleware(inner_app)
+        scope = {"type": "http", "method": "POST", "path": "/api/v1/materials",
+                 "client": ("127.0.0.1", 5000), "headers": []}
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        for _ in range(11):
+            await middleware(scope, AsyncMock(), send)
+
+        assert inner_app.await_count == 10
+        assert sent[0]["status"] == 429
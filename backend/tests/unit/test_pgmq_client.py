@@ -88,6 +88,17 @@ class TestPGMQClient:
         assert result is True
         queue_instance.archive.assert_called_once_with("test_queue", 123)
 
+    def test_set_visibility_timeout_puts_message_back(self, client, mock_pgmq):
+        """Test set_visibility_timeout makes a read message visible again"""
+        # Arrange
+        queue_instance = mock_pgmq.return_value
+
+        # Act
+        client.set_visibility_timeout("test_queue", 123, 15)
+
+        # Assert
+        queue_instance.set_vt.assert_called_once_with("test_queue", 123, 15)
+
     def test_delete_queue_removes_queue(self, client, mock_pgmq):
         """Test delete_queue removes queue from system"""
         # Arrange